@@ -3,128 +3,130 @@
 # calcular φ segn las correlaciones aplicables y generar un informe detallado en formato Word.
 
 import streamlit as st
-from docx import Document
 import io
+import math
 import pandas as pd
 
+from correlaciones import phi, registro, spt
+from atlas_ui import panel_curvas
+from montecarlo_ui import panel_montecarlo
+from informe_ui import descarga_html
+import informes
+import informes_html
+
 def calcular_angulo_rozamiento(IP=None, Nspt=None):
     """
     Calcula el ángulo de rozamiento (φ) según los datos disponibles.
-    Solo aplica fórmulas para las que todos los parámetros necesarios estén disponibles.
+    Solo aplica fórmulas para las que todos los parámetros necesarios estén disponibles
+    (correlaciones.phi.calcular).
     """
-    resultados = {}
-    formulas_usadas = {}
-
-    def valor_aceptable(valor):
-        return valor if valor is not None and valor > 0 else None
-
-    IP = valor_aceptable(IP)
-    Nspt = valor_aceptable(Nspt)
-
-    if IP is not None:
-        # Fórmula de Jimenes Salas y Justo Alpañes
-        phi = 1.1616 * IP
-        resultados['Jimenes Salas y Justo Alpañes'] = phi 
-        formulas_usadas['Jimenes Salas y Justo Alpañes'] = {'formula': 'φ ≈ 1.1616 × IP', 'parametros': ['IP']}
-
-    if Nspt is not None:
-        # Fórmula de Peck
-        phi = 2.0986 * Nspt
-        resultados['Peck'] = phi
-        formulas_usadas['Peck'] = {'formula': 'φ ≈ 2.0986 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Muromachi, 1974
-        phi = 2.2370 * Nspt
-        resultados['Muromachi, 1974'] = phi 
-        formulas_usadas['Muromachi, 1974'] = {'formula': 'φ ≈ 2.2370 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Terzaghi & Peck 1948
-        phi = 2.1500 * Nspt
-        resultados['Terzaghi & Peck 1948'] = phi
-        formulas_usadas['Terzaghi & Peck 1948'] = {'formula': 'φ ≈ 2.1500 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Kishida, 1969
-        phi = 2.1547 * Nspt
-        resultados['Kishida, 1969'] = phi 
-        formulas_usadas['Kishida, 1969'] = {'formula': 'φ ≈ 2.1547 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Japan National Railway, 1999
-        phi = 2.1000 * Nspt
-        resultados['Japan National Railway, 1999'] = phi
-        formulas_usadas['Japan National Railway, 1999'] = {'formula': 'φ ≈ 2.1000 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Japan Road Bureau, 1986
-        phi = 1.7906 * Nspt + 15
-        resultados['Japan Road Bureau, 1986'] = phi
-        formulas_usadas['Japan Road Bureau, 1986'] = {'formula': 'φ ≈ 1.7906 × Nspt + 15', 'parametros': ['Nspt']}
-
-        # Fórmula de Hatanaka & Uchida, 1996
-        phi = 2.4880 * Nspt
-        resultados['Hatanaka & Uchida, 1996'] = phi 
-        formulas_usadas['Hatanaka & Uchida, 1996'] = {'formula': 'φ ≈ 2.4880 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Montenegro & Gonzalez
-        phi = 2.1657 * Nspt
-        resultados['Montenegro & Gonzalez'] = phi
-        formulas_usadas['Montenegro & Gonzalez'] = {'formula': 'φ ≈ 2.1657 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Shiol-Fukuni 1982
-        phi = 2.0000 * Nspt + 15
-        resultados['Shiol-Fukuni 1982'] = phi 
-        formulas_usadas['Shiol-Fukuni 1982'] = {'formula': 'φ ≈ 2.0000 × Nspt + 15', 'parametros': ['Nspt']}
-
-    return resultados, formulas_usadas
+    return phi.calcular(IP=IP, Nspt=Nspt)
 
 def generar_informe(IP, Nspt, resultados, formulas_usadas):
-    doc = Document()
-    doc.add_heading('Informe de Cálculo del Ángulo de Rozamiento (φ)', level=1)
-
-    doc.add_heading('Datos Introducidos', level=2)
-    table = doc.add_table(rows=1, cols=2)
-    table.style = 'Table Grid'
-    hdr_cells = table.rows[0].cells
-
-    hdr_cells[0].text = 'Parámetro'
-    hdr_cells[1].text = 'Valor'
-    for cell in hdr_cells:
-        for paragraph in cell.paragraphs:
-            for run in paragraph.runs:
-                run.bold = True
-
-    datos = []
-    if IP is not None:
-        datos.append(("Índice plástico (IP, %)", IP))
-    if Nspt is not None:
-        datos.append(("Número de golpes SPT (Nspt)", Nspt))
-
-    for parametro, valor in datos:
-        row_cells = table.add_row().cells
-        row_cells[0].text = parametro
-        row_cells[1].text = str(valor)
-
-    doc.add_heading('Resultados', level=2)
-    doc.add_paragraph(f"Se calcularon {len(resultados)} correlaciones para φ con los datos proporcionados.")
-
-    for metodo, valor in resultados.items():
-        doc.add_heading(metodo, level=3)
-        formula_info = formulas_usadas[metodo]
-        p = doc.add_paragraph()
-        run = p.add_run(f"Fórmula: {formula_info['formula']}")
-        run.bold = True
-        doc.add_paragraph(f"Parámetros usados: {', '.join(formula_info['parametros'])}")
-        if isinstance(valor, str):
-            doc.add_paragraph(f"Resultado: {valor}")
+    """Informe Word del cálculo (informes.docx_phi)."""
+    return informes.docx_phi(IP, Nspt, resultados, formulas_usadas)
+
+@st.cache_data(show_spinner="Calculando φ en todas las muestras…")
+def phi_listado(data: bytes, corregir_n: bool, parametros: dict):
+    """φ de todas las correlaciones para cada muestra del listado."""
+    from geolab_engine import load_and_clean, to_long, cross_family
+    long = to_long(load_and_clean(io.BytesIO(data)))
+    tabla = cross_family(long, phi.PARAMETROS_LISTADO)
+    valores, resumen = phi.lote(tabla, corregir_n=corregir_n, **parametros)
+    meta = tabla[["prospeccion", "muestra", "profundidad"]]
+    return meta.join(valores), meta.join(resumen)
+
+
+def figura_perfiles(resumen, columnas=4):
+    """Perfil φ–profundidad por prospección: mediana y envolvente entre fórmulas."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    datos = resumen.dropna(subset=["Mediana", "profundidad"]).sort_values("profundidad")
+    prospecciones = sorted(datos["prospeccion"].unique())
+    if not prospecciones:
+        return None
+    filas = math.ceil(len(prospecciones) / columnas)
+    fig = make_subplots(rows=filas, cols=min(columnas, len(prospecciones)),
+                        subplot_titles=prospecciones, shared_xaxes=True,
+                        vertical_spacing=0.3 / filas)
+    for i, p in enumerate(prospecciones):
+        d = datos[datos["prospeccion"] == p]
+        pos = dict(row=i // columnas + 1, col=i % columnas + 1)
+        fig.add_trace(go.Scatter(x=d["Mínimo"], y=d["profundidad"], mode="lines",
+                                 line=dict(width=0), showlegend=False, hoverinfo="skip"), **pos)
+        fig.add_trace(go.Scatter(x=d["Máximo"], y=d["profundidad"], mode="lines",
+                                 line=dict(width=0), fill="tonextx",
+                                 fillcolor="rgba(31,119,180,0.25)", name="Envolvente",
+                                 showlegend=i == 0, hoverinfo="skip"), **pos)
+        fig.add_trace(go.Scatter(x=d["Mediana"], y=d["profundidad"], mode="lines+markers",
+                                 line=dict(color="#1f77b4"), name="Mediana",
+                                 showlegend=i == 0, customdata=d[["muestra", "N"]],
+                                 hovertemplate="φ = %{x:.1f}°<br>z = %{y} m<br>"
+                                               "%{customdata[0]} (%{customdata[1]} fórmulas)"),
+                      **pos)
+    fig.update_yaxes(autorange="reversed", title_text="Profundidad (m)", col=1)
+    fig.update_xaxes(title_text="φ (°)", row=filas)
+    fig.update_layout(height=380 * filas, margin=dict(l=0, r=0, t=40, b=0))
+    return fig
+
+
+def pagina_listado():
+    """Modo por lotes: φ de todas las muestras del listado y perfiles."""
+    st.sidebar.markdown("Sube el listado de laboratorio (.xlsx): se usan el golpeo central "
+                        "del SPT y el IP de cada muestra.")
+    up = st.sidebar.file_uploader("Listado de laboratorio", type=["xlsx"])
+    corregir_n = st.sidebar.checkbox("Usar (N1)60 en lugar de N")
+    parametros = {}
+    if corregir_n:
+        with st.sidebar.expander("Parámetros de corrección SPT", expanded=True):
+            martillo = st.selectbox("Martillo", list(spt.MARTILLOS))
+            diametro = st.selectbox("Diámetro", list(spt.DIAMETROS))
+            muestreador = st.selectbox("Muestreador", list(spt.MUESTREADORES))
+            parametros = dict(
+                eficiencia=spt.MARTILLOS[martillo], diametro_mm=spt.DIAMETROS[diametro],
+                cs=spt.MUESTREADORES[muestreador],
+                gamma=st.number_input("γ (kN/m³)", 10.0, 25.0, 18.0, 0.5),
+                gamma_sat=st.number_input("γsat (kN/m³)", 10.0, 25.0, 20.0, 0.5),
+                nivel_freatico=st.number_input("Nivel freático (m)", 0.0, 200.0, 10.0, 0.5))
+    if up is None:
+        st.info("👈 Sube un listado de laboratorio para calcular φ en todas sus muestras.")
+        return
+    valores, resumen = phi_listado(up.getvalue(), corregir_n, parametros)
+    if not (resumen["N"] > 0).any():
+        st.warning("Ninguna muestra del listado tiene SPT o IP para las correlaciones de φ.")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Muestras evaluadas", int((resumen["N"] > 0).sum()))
+    c2.metric("Prospecciones", resumen.loc[resumen["N"] > 0, "prospeccion"].nunique())
+    c3.metric("Mediana global de φ (°)", round(resumen["Mediana"].median(), 1))
+
+    tab1, tab2 = st.tabs(["📉 Perfiles por prospección", "📄 φ por muestra y fórmula"])
+    with tab1:
+        fig = figura_perfiles(resumen)
+        if fig is None:
+            st.info("Las muestras con φ no tienen profundidad: no se dibujan perfiles.")
         else:
-            doc.add_paragraph(f"Resultado: φ ≈ {valor:.2f}°")
+            st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(resumen.round(2), use_container_width=True, hide_index=True)
+        st.download_button("⬇️ Descargar resumen (CSV)",
+                           resumen.to_csv(index=False).encode("utf-8-sig"),
+                           "phi_resumen_muestras.csv", "text/csv")
+    with tab2:
+        st.dataframe(valores.round(2), use_container_width=True, hide_index=True)
+        st.download_button("⬇️ Descargar φ por fórmula (CSV)",
+                           valores.to_csv(index=False).encode("utf-8-sig"),
+                           "phi_muestras_formulas.csv", "text/csv")
 
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
 
 def main():
     st.set_page_config(layout="wide")
     st.title("Calculadora del Ángulo de Rozamiento (φ)")
+    if st.sidebar.radio("Modo", ["Ensayo individual", "Listado de laboratorio"]) \
+            == "Listado de laboratorio":
+        pagina_listado()
+        return
     st.markdown("Introduce los datos disponibles para calcular φ según diferentes correlaciones.")
 
     if 'data' not in st.session_state:
@@ -153,17 +155,17 @@ def main():
             key="data_editor"
         )
 
-        if st.button("Calcular φ"):
-            try:
-                IP = float(edited_df.loc[edited_df["Símbolo"] == "IP", "Valor"].values[0]) if edited_df.loc[edited_df["Símbolo"] == "IP", "Valor"].values[0] and float(edited_df.loc[edited_df["Símbolo"] == "IP", "Valor"].values[0]) > 0 else None
-            except (ValueError, TypeError):
-                IP = None
+        try:
+            IP = float(edited_df.loc[edited_df["Símbolo"] == "IP", "Valor"].values[0]) if edited_df.loc[edited_df["Símbolo"] == "IP", "Valor"].values[0] and float(edited_df.loc[edited_df["Símbolo"] == "IP", "Valor"].values[0]) > 0 else None
+        except (ValueError, TypeError):
+            IP = None
 
-            try:
-                Nspt = float(edited_df.loc[edited_df["Símbolo"] == "Nspt", "Valor"].values[0]) if edited_df.loc[edited_df["Símbolo"] == "Nspt", "Valor"].values[0] and float(edited_df.loc[edited_df["Símbolo"] == "Nspt", "Valor"].values[0]) > 0 else None
-            except (ValueError, TypeError):
-                Nspt = None
+        try:
+            Nspt = float(edited_df.loc[edited_df["Símbolo"] == "Nspt", "Valor"].values[0]) if edited_df.loc[edited_df["Símbolo"] == "Nspt", "Valor"].values[0] and float(edited_df.loc[edited_df["Símbolo"] == "Nspt", "Valor"].values[0]) > 0 else None
+        except (ValueError, TypeError):
+            Nspt = None
 
+        if st.button("Calcular φ"):
             resultados, formulas_usadas = calcular_angulo_rozamiento(IP=IP, Nspt=Nspt)
 
             if resultados:
@@ -185,9 +187,16 @@ def main():
                     file_name="informe_angulo_rozamiento.docx",
                     mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
                 )
+                descarga_html("html_phi", None,
+                              lambda: informes_html.html_phi(IP, Nspt, resultados,
+                                                             formulas_usadas),
+                              "informe_angulo_rozamiento")
             else:
                 st.warning("No hay suficientes datos para aplicar ninguna correlación.")
 
+        with st.expander("🎲 Incertidumbre de IP y Nspt (Monte Carlo)"):
+            panel_montecarlo("phi", {"IP": IP, "Nspt": Nspt}, key="mc_phi")
+
     with col2:
         with st.expander("Correlaciones Disponibles", expanded=False):
             st.markdown("""
@@ -201,21 +210,16 @@ def main():
             """, unsafe_allow_html=True)
 
             correlaciones = [
-                {"name": "Jimenes Salas y Justo Alpañes", "formula": "φ ≈ 1.1616 × IP", "params": "IP"},
-                {"name": "Peck", "formula": "φ ≈ 2.0986 × Nspt", "params": "Nspt"},
-                {"name": "Muromachi, 1974", "formula": "φ ≈ 2.2370 × Nspt", "params": "Nspt"},
-                {"name": "Terzaghi & Peck 1948", "formula": "φ ≈ 2.1500 × Nspt", "params": "Nspt"},
-                {"name": "Kishida, 1969", "formula": "φ ≈ 2.1547 × Nspt", "params": "Nspt"},
-                {"name": "Japan National Railway, 1999", "formula": "φ ≈ 2.1000 × Nspt", "params": "Nspt"},
-                {"name": "Japan Road Bureau, 1986", "formula": "φ ≈ 1.7906 × Nspt + 15", "params": "Nspt"},
-                {"name": "Hatanaka & Uchida, 1996", "formula": "φ ≈ 2.4880 × Nspt", "params": "Nspt"},
-                {"name": "Montenegro & Gonzalez", "formula": "φ ≈ 2.1657 × Nspt", "params": "Nspt"},
-                {"name": "Shiol-Fukuni 1982", "formula": "φ ≈ 2.0000 × Nspt + 15", "params": "Nspt"}
+                {"name": c["autor"], "formula": c["texto"], "params": ", ".join(c["entradas"])}
+                for c in registro.correlaciones("phi")
             ]
 
             for correlacion in correlaciones:
                 st.markdown(f'<div class="formula"><b>{correlacion["name"]}</b><br>Fórmula: {correlacion["formula"]}<br>Parámetros: {correlacion["params"]}</div>', unsafe_allow_html=True)
 
+        with st.expander("📈 Curvas de todas las correlaciones", expanded=True):
+            panel_curvas("phi", {"IP": IP, "Nspt": Nspt}, ["Nspt", "IP"], key="atlas_phi")
+
 
 
 
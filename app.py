@@ -1,11 +1,19 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib
-import re
+import io
 
-matplotlib.rcParams["font.family"] = "DejaVu Sans"
+from geolab_engine import (
+    PAGES, OVERVIEW_PROFILES, read_raw, ingest_incremental, cross_family,
+    outlier_flags, flag_matrix, OUTLIER_METODOS,
+    correlations,
+    depth_bins, make_edges, page_subset, stats_table, overview_kpis,
+)
+from geolab_plots import boxplot_panel, depth_profile, binned_profile, correlation_heatmap
+from correlaciones import spt
+from geolab_cli import pagina_html
+from informe_ui import descarga_bajo_demanda, firma
+from informes_html import MIME_HTML
 
 st.set_page_config(
     page_title="GeoLab Viewer",
@@ -28,163 +36,25 @@ CSS = """
 """
 st.markdown(CSS, unsafe_allow_html=True)
 
-def to_float(x):
-    if pd.isna(x): return np.nan
-    try:
-        return float(str(x).replace(",", ".").strip())
-    except:
-        return np.nan
-
-def clean_col(s):
-    return s.apply(to_float)
-
-def prospect_from_sample(name):
-    if pd.isna(name): return "Desconocido"
-    name = str(name).strip()
-    m = re.match(r"([A-Za-z]+[-_]?\d+)", name)
-    if m: return m.group(1)
-    return name.split()[0] if name.split() else name
-
-def prospect_colors(label_series):
-    prospects = sorted(label_series.apply(prospect_from_sample).unique())
-    palette = plt.cm.get_cmap("tab20", max(len(prospects), 1))
-    return {p: matplotlib.colors.to_hex(palette(i)) for i, p in enumerate(prospects)}
-
-def stats_metrics(s):
-    s2 = pd.to_numeric(s, errors="coerce").dropna()
-    if len(s2) == 0: return {}
-    q1, q3 = s2.quantile(0.25), s2.quantile(0.75)
-    iqr = q3 - q1
-    outliers = int(((s2 < q1 - 1.5*iqr) | (s2 > q3 + 1.5*iqr)).sum())
-    cv = round(s2.std() / s2.mean() * 100, 1) if s2.mean() != 0 else np.nan
-    return {"N": int(len(s2)), "Media": round(s2.mean(),3), "Mediana": round(s2.median(),3),
-            "Desv.Tip": round(s2.std(),3), "Min": round(s2.min(),3), "Max": round(s2.max(),3),
-            "CV(%)": cv, "Atipicos": outliers}
-
-
-
-def load_and_clean(file):
-    # KEY FIX: header=0 because row 0 IS the header (not row 1 or 2)
-    df = pd.read_excel(file, header=0)
-    df.columns = [str(c).strip() for c in df.columns]
-    text_cols = {
-        "Unidad geotecnica","Descripcion Muestra","Descripcion Muestra.1",
-        "Descripcion Muestra.2","Ensayo geotecnia","Ensayo geotecnia.1",
-        "Ensayo geotecnia.2","Clasificacion USCS","Tipo Ensayo con drenaje",
-        "Tipo Ensayo sin drenaje","Tipo Proctor","Calificacion","COL",
-        # include accented versions too
-        "Unidad geot\u00e9cnica",
-        "Descripci\u00f3n Muestra","Descripci\u00f3n Muestra.1","Descripci\u00f3n Muestra.2",
-        "Clasificaci\u00f3n USCS",
-        "\u00c1ngulo de Rozamiento con denaje","\u00c1ngulo de Rozamiento sin denaje",
-        "Calificaci\u00f3n",
-    }
-    for c in df.columns:
-        if c not in text_cols:
-            df[c] = clean_col(df[c])
-    return df
-
-COLS_SPT  = ["Unidad geot\u00e9cnica","Descripci\u00f3n Muestra","Ensayo geotecnia",
-             "Profundidad inicial","ISPT_INC1","ISPT_INC2","ISPT_INC3","ISPT_INC4",
-             "SPT (valores centrales)","MI (valores centrales)"]
-COLS_GRAN = ["Descripci\u00f3n Muestra","Ensayo geotecnia","Profundidad inicial",
-             "20","5","2","0.4","0.08",
-             "Tamiz Grava","Tamiz Arena","Tamiz Finos","LL","LP","IP","Clasificaci\u00f3n USCS"]
-COLS_ATTER= ["Descripci\u00f3n Muestra","Profundidad inicial","LL","LP","IP","Clasificaci\u00f3n USCS"]
-COLS_QUIM = ["Descripci\u00f3n Muestra","Profundidad inicial","MO","SU",
-             "Sulfatos (mg/kg de suelo) Media.",
-             "Grado acidez (ml/kg de suelo seco) Medio","YE","SS","% CO3CA"]
-COLS_MEC  = ["Descripci\u00f3n Muestra.1","Ensayo geotecnia.1","Profundidad inicial.1",
-             "Peso espec\u00edfico","Densidad Seca Kn/m3","Densidad H\u00fameda KN/m3","Humedad",
-             "RCS (kpa)","Tipo Ensayo con drenaje",
-             "\u00c1ngulo de Rozamiento con denaje","Cohesi\u00f3n KPa con drenaje",
-             "Tipo Ensayo sin drenaje",
-             "\u00c1ngulo de Rozamiento sin denaje","Cohesi\u00f3n KPa sin drenaje"]
-COLS_CON  = ["Descripci\u00f3n Muestra.2","Ensayo geotecnia.2","Profundidad inicial.2",
-             "Indice de Poros","Presi\u00f3n de Preconsolidaci\u00f3n (kPa)","Presi\u00f3n Hinchamiento",
-             "HL","Calificaci\u00f3n","COL","Tipo Proctor","\u03c1 KN","W","CBR","CBR 95%"]
-
-def _sub(df, cols):
-    available = [c for c in cols if c in df.columns]
-    return df[available].copy() if available else pd.DataFrame()
-
-def get_spt(df):    return _sub(df, COLS_SPT)
-def get_gran(df):   return _sub(df, COLS_GRAN)
-def get_atter(df):  return _sub(df, COLS_ATTER)
-def get_mec(df):    return _sub(df, COLS_MEC)
-def get_consol(df): return _sub(df, COLS_CON)
-def get_quim(df):   return _sub(df, COLS_QUIM)
-
-
-
-def boxplot_panel(data_dict, title, ncols=3):
-    valid = {k: pd.to_numeric(v, errors="coerce").dropna()
-             for k, v in data_dict.items()}
-    valid = {k: v for k, v in valid.items() if len(v) > 0}
-    if not valid: return None
-    n = len(valid)
-    ncols = min(ncols, n)
-    nrows = int(np.ceil(n / ncols))
-    fig, axes = plt.subplots(nrows, ncols, figsize=(4.5*ncols, 3.8*nrows))
-    fig.suptitle(title, fontsize=13, fontweight="bold", color="#1a252f", y=1.01)
-    axes = np.array(axes).flatten()
-    for i, (lbl, s) in enumerate(valid.items()):
-        ax = axes[i]
-        ax.boxplot(s.values, patch_artist=True, widths=0.45,
-                   medianprops=dict(color="#e74c3c", linewidth=2.5),
-                   boxprops=dict(facecolor="#d6e4f0", color="#2471a3"),
-                   whiskerprops=dict(color="#2471a3", linewidth=1.5),
-                   capprops=dict(color="#2471a3", linewidth=1.5),
-                   flierprops=dict(marker="o", color="#e74c3c",
-                                   markerfacecolor="#e74c3c", markersize=6, alpha=0.8))
-        ax.set_title(lbl, fontsize=9.5, fontweight="bold", color="#1a252f")
-        ax.set_xticks([])
-        ax.grid(axis="y", linestyle="--", alpha=0.4)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-        m = stats_metrics(s)
-        info = ("N=" + str(m["N"]) + "  Med=" + str(m["Mediana"]) +
-                "\nMedia=" + str(m["Media"]) + "  DS=" + str(m["Desv.Tip"]) +
-                "\nCV=" + str(m["CV(%)"]) + "%  Atip=" + str(m["Atipicos"]))
-        ax.set_xlabel(info, fontsize=7.5, color="#5d6d7e")
-    for j in range(i+1, len(axes)):
-        axes[j].set_visible(False)
-    plt.tight_layout()
-    return fig
-
-def depth_profile(df_sub, value_col, label_col, depth_col, title, xlabel, invert_y=True):
-    sub = df_sub[[label_col, depth_col, value_col]].copy()
-    sub[value_col] = pd.to_numeric(sub[value_col], errors="coerce")
-    sub[depth_col] = pd.to_numeric(sub[depth_col], errors="coerce")
-    sub = sub.dropna(subset=[value_col, depth_col])
-    if sub.empty: return None
-    sub["_prospect"] = sub[label_col].apply(prospect_from_sample)
-    cmap = prospect_colors(sub[label_col])
-    fig, ax = plt.subplots(figsize=(5, 7))
-    for pname, grp in sub.groupby("_prospect"):
-        col = cmap.get(pname, "#2471a3")
-        ax.scatter(grp[value_col], grp[depth_col], color=col, s=55, label=pname,
-                   zorder=4, edgecolors="white", linewidths=0.5)
-    ax.set_xlabel(xlabel, fontsize=10)
-    ax.set_ylabel("Profundidad (m)", fontsize=10)
-    ax.set_title(title, fontsize=11, fontweight="bold", color="#1a252f")
-    if invert_y: ax.invert_yaxis()
-    ax.grid(linestyle="--", alpha=0.35)
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    ax.legend(fontsize=7.5, title="Prospeccion", title_fontsize=8, loc="best", framealpha=0.7)
-    plt.tight_layout()
-    return fig
+METODOS_LBL = {"ninguno": "Ninguno", "atipico": "Cualquier criterio", "iqr": "IQR",
+               "mad": "MAD (Hampel)", "z_robusto": "z robusto"}
+GRUPOS_LBL = {"global": "Todo el listado", "prospeccion": "Cada prospección",
+              "unidad": "Cada unidad geotécnica", "uscs": "Cada clase USCS"}
+
+# _prev (ingesta anterior de la sesión) no forma parte de la clave de caché:
+# solo sirve para limpiar y compactar únicamente las filas nuevas o
+# modificadas. cache_resource devuelve el mismo objeto que se guarda en la
+# sesión (cache_data guardaría además una copia serializada); la app solo lo
+# lee. La versión sin compactar no sale de ingest_incremental.
+@st.cache_resource(show_spinner="Leyendo listado...", max_entries=4)
+def ingest(data: bytes, compact: bool = True, _prev=None):
+    return ingest_incremental(read_raw(io.BytesIO(data)), _prev, compact)
+
+
 
 def show_stats_table(series_dict):
-    rows = []
-    for lbl, s in series_dict.items():
-        m = stats_metrics(s)
-        if m:
-            m["Parametro"] = lbl
-            rows.append(m)
-    if rows:
-        tdf = pd.DataFrame(rows).set_index("Parametro")
+    tdf = stats_table(series_dict)
+    if not tdf.empty:
         float_cols = [c for c in tdf.columns if c not in ["N","Atipicos"]]
         st.dataframe(
             tdf.style
@@ -208,48 +78,18 @@ def sidebar_upload():
         help="Sube el listado de ensayos de laboratorio")
     return f
 
-def page_overview(df):
+def page_overview(df, long=None):
     st.markdown('<div class="main-title">🪨 GeoLab Viewer</div>', unsafe_allow_html=True)
     st.markdown('<div class="sub-title">Resumen General del Proyecto</div>', unsafe_allow_html=True)
 
-    spt_col   = "SPT (valores centrales)"
-    mi_col    = "MI (valores centrales)"
-    grava_col = "Tamiz Grava"
-    ll_col    = "LL"
-    dens_col  = "Densidad Seca Kn/m3"
-    cbr_col   = "CBR"
-
-    def _count(col):
-        if col not in df.columns: return 0
-        return int(df[col].notna().sum())
-
-    c1,c2,c3,c4,c5,c6 = st.columns(6)
-    with c1: kpi_box(len(df), "Registros totales")
-    with c2: kpi_box(_count(spt_col) + _count(mi_col), "SPT / MI")
-    with c3: kpi_box(_count(grava_col), "Granulometrías")
-    with c4: kpi_box(_count(ll_col), "Atterberg")
-    with c5: kpi_box(_count(dens_col), "Mecánicos")
-    with c6: kpi_box(_count(cbr_col), "Consol/CBR")
+    kpis = overview_kpis(df)
+    for col, (lbl, val) in zip(st.columns(len(kpis)), kpis.items()):
+        with col: kpi_box(val, lbl)
 
     st.markdown('<div class="section-header">Perfiles por Profundidad</div>', unsafe_allow_html=True)
     cols_row = st.columns(3)
 
-    profiles = [
-        (spt_col, "Descripción Muestra", "Profundidad inicial",
-         "SPT vs Profundidad", "N SPT"),
-        (mi_col, "Descripción Muestra", "Profundidad inicial",
-         "MI vs Profundidad", "N MI"),
-        (grava_col, "Descripción Muestra", "Profundidad inicial",
-         "Grava (%) vs Profundidad", "Grava (%)"),
-        ("Tamiz Arena", "Descripción Muestra", "Profundidad inicial",
-         "Arena (%) vs Profundidad", "Arena (%)"),
-        (ll_col, "Descripción Muestra", "Profundidad inicial",
-         "LL vs Profundidad", "LL (%)"),
-        (dens_col, "Descripción Muestra.1", "Profundidad inicial.1",
-         "Densidad Seca vs Profundidad", "Dens. Seca (kN/m\u00b3)"),
-    ]
-
-    for idx, (vcol, lcol, dcol, title, xlabel) in enumerate(profiles):
+    for idx, (vcol, lcol, dcol, title, xlabel) in enumerate(OVERVIEW_PROFILES):
         if vcol not in df.columns or lcol not in df.columns or dcol not in df.columns:
             with cols_row[idx % 3]:
                 st.warning("Sin columna: " + vcol)
@@ -264,16 +104,17 @@ def page_overview(df):
 
 
 
-def _generic_page(df, title, getter_fn, num_cols, depth_col_name,
-                  sample_col_name, profile_pairs, units=None):
+def _generic_page(df, spec, long):
+    title = spec["title"]
+    depth_col_name, sample_col_name = spec["depth_col"], spec["sample_col"]
+    profile_pairs = spec["profiles"]
     st.markdown('<div class="main-title">' + title + '</div>', unsafe_allow_html=True)
-    sub = getter_fn(df)
+    sub = page_subset(df, spec)
     if sub.empty or sub.shape[0] == 0:
         st.warning("No hay datos disponibles para este tipo de ensayo.")
         return
 
     # Filter by prospection
-    sub["_prospect"] = sub[sample_col_name].apply(prospect_from_sample)
     prospects = sorted(sub["_prospect"].unique())
     sel = st.sidebar.multiselect("Filtrar prospección", prospects, default=prospects,
                                   key=title + "_filter")
@@ -286,7 +127,7 @@ def _generic_page(df, title, getter_fn, num_cols, depth_col_name,
 
     # Stats table
     st.markdown('<div class="section-header">Estadísticos</div>', unsafe_allow_html=True)
-    num_data = {c: sub[c] for c in num_cols if c in sub.columns}
+    num_data = {c: sub[c] for c in spec["num_cols"] if c in sub.columns}
     show_stats_table(num_data)
 
     # Box plots
@@ -306,67 +147,181 @@ def _generic_page(df, title, getter_fn, num_cols, depth_col_name,
             if fig: st.pyplot(fig); plt.close(fig)
             else: st.info("Sin datos: " + lbl)
 
+    # Informe HTML autocontenido de la página (tablas y figuras SVG, geolab_cli)
+    pagina = next(k for k, v in PAGES.items() if v is spec)
+    descarga_bajo_demanda(title + "_html", firma(sub), lambda: pagina_html(sub, pagina),
+                          pagina + ".html", "🌐 Descargar informe de la página (HTML)",
+                          MIME_HTML)
+
     # Raw data
     with st.expander("Ver datos completos"):
         disp = sub.drop(columns=["_prospect"], errors="ignore")
-        st.dataframe(disp, use_container_width=True)
-
-def page_spt(df):
-    _generic_page(df, "SPT / MI",
-        get_spt,
-        ["ISPT_INC1","ISPT_INC2","ISPT_INC3","ISPT_INC4",
-         "SPT (valores centrales)","MI (valores centrales)"],
-        "Profundidad inicial", "Descripción Muestra",
-        [("SPT (valores centrales)","SPT"),
-         ("MI (valores centrales)","MI"),
-         ("ISPT_INC3","Inc3")])
-
-def page_gran(df):
-    _generic_page(df, "Granulometría",
-        get_gran,
-        ["Tamiz Grava","Tamiz Arena","Tamiz Finos","LL","LP","IP"],
-        "Profundidad inicial", "Descripción Muestra",
-        [("Tamiz Grava","Grava (%)"),
-         ("Tamiz Arena","Arena (%)"),
-         ("Tamiz Finos","Finos (%)")])
-
-def page_atter(df):
-    _generic_page(df, "Límites de Atterberg",
-        get_atter,
-        ["LL","LP","IP"],
-        "Profundidad inicial", "Descripción Muestra",
-        [("LL","Límite Líquido"),
-         ("LP","Límite Plástico"),
-         ("IP","Índice de Plasticidad")])
-
-def page_mec(df):
-    _generic_page(df, "Parámetros Mecánicos",
-        get_mec,
-        ["Densidad Seca Kn/m3","Densidad Húmeda KN/m3","Humedad",
-         "RCS (kpa)","Ángulo de Rozamiento con denaje","Cohesión KPa con drenaje",
-         "Ángulo de Rozamiento sin denaje","Cohesión KPa sin drenaje"],
-        "Profundidad inicial.1", "Descripción Muestra.1",
-        [("Densidad Seca Kn/m3","Dens. Seca"),
-         ("Ángulo de Rozamiento con denaje","Ang CD"),
-         ("Cohesión KPa con drenaje","Coh CD")])
-
-def page_consol(df):
-    _generic_page(df, "Consolidación / CBR / Proctor",
-        get_consol,
-        ["Indice de Poros","Presión de Preconsolidación (kPa)",
-         "Presión Hinchamiento","HL","CBR","CBR 95%","ρ KN","W"],
-        "Profundidad inicial.2", "Descripción Muestra.2",
-        [("CBR","CBR"),("CBR 95%","CBR 95%"),
-         ("Indice de Poros","Indice de Poros")])
-
-def page_quim(df):
-    _generic_page(df, "Ensayos Químicos",
-        get_quim,
-        ["MO","SU","Sulfatos (mg/kg de suelo) Media.",
-         "Grado acidez (ml/kg de suelo seco) Medio","YE","SS","% CO3CA"],
-        "Profundidad inicial", "Descripción Muestra",
-        [("Sulfatos (mg/kg de suelo) Media.","Sulfatos"),
-         ("MO","MO"),("% CO3CA","CO3Ca")])
+        c1, c2, c3 = st.columns(3)
+        metodo = c1.selectbox("Resaltar atípicos", ["ninguno", "atipico", *OUTLIER_METODOS],
+                              format_func=METODOS_LBL.get, key=title + "_out_metodo")
+        by = c2.selectbox("Dentro de", ["global", "prospeccion", "unidad", "uscs"],
+                          format_func=GRUPOS_LBL.get, key=title + "_out_by")
+        if metodo == "ninguno":
+            st.dataframe(disp, use_container_width=True)
+        else:
+            mat = flag_matrix(long, outlier_flags(long, by=by), metodo)
+            mat = mat.reindex(index=disp.index, columns=disp.columns, fill_value=False)
+            if c3.checkbox("Solo filas con atípicos", key=title + "_out_solo"):
+                disp, mat = disp[mat.any(axis=1)], mat[mat.any(axis=1)]
+            st.caption(str(int(mat.to_numpy().sum())) + " valores atípicos")
+            st.dataframe(disp.style.apply(
+                lambda _: np.where(mat, "background-color:#f5b7b1", ""), axis=None),
+                use_container_width=True)
+    return sub
+
+def page_spt(df, long):
+    spec = PAGES["spt"]
+    sub = _generic_page(df, spec, long)
+    if sub is None:
+        return
+    st.markdown('<div class="section-header">Golpeo Corregido (N1)60</div>',
+                unsafe_allow_html=True)
+    with st.expander("Equipo y terreno"):
+        c1, c2, c3 = st.columns(3)
+        martillo = c1.selectbox("Martillo", list(spt.MARTILLOS), key="spt_martillo")
+        diametro = c2.selectbox("Diámetro", list(spt.DIAMETROS), key="spt_diametro")
+        muestreador = c3.selectbox("Muestreador", list(spt.MUESTREADORES), key="spt_muestreador")
+        c1, c2, c3 = st.columns(3)
+        gamma = c1.number_input("γ (kN/m³)", 10.0, 25.0, 18.0, 0.5, key="spt_gamma")
+        gamma_sat = c2.number_input("γsat (kN/m³)", 10.0, 25.0, 20.0, 0.5, key="spt_gamma_sat")
+        nf = c3.number_input("Nivel freático (m)", 0.0, 200.0, 10.0, 0.5, key="spt_nf")
+    res = spt.lote(sub, spec["depth_col"], "SPT (valores centrales)",
+                   eficiencia=spt.MARTILLOS[martillo], diametro_mm=spt.DIAMETROS[diametro],
+                   cs=spt.MUESTREADORES[muestreador], gamma=gamma, gamma_sat=gamma_sat,
+                   nivel_freatico=nf)
+    if res.empty:
+        st.info("Sin ensayos SPT con profundidad y golpeo numéricos.")
+        return
+    res = sub.loc[res.index, [spec["sample_col"]]].join(res)
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        fig = depth_profile(res, "(N1)60", spec["sample_col"], "Profundidad",
+                            "(N1)60", "(N1)60")
+        if fig: st.pyplot(fig); plt.close(fig)
+    with c2:
+        st.dataframe(res.round(3), use_container_width=True, hide_index=True)
+        st.download_button("Descargar (N1)60 (CSV)",
+                           res.to_csv(index=False).encode("utf-8-sig"),
+                           "spt_n1_60.csv", "text/csv")
+
+def page_gran(df, long):   _generic_page(df, PAGES["gran"], long)
+def page_atter(df, long):  _generic_page(df, PAGES["atter"], long)
+def page_mec(df, long):    _generic_page(df, PAGES["mec"], long)
+def page_consol(df, long): _generic_page(df, PAGES["consol"], long)
+def page_quim(df, long):   _generic_page(df, PAGES["quim"], long)
+
+
+
+def page_cross(df, long):
+    st.markdown('<div class="main-title">Cruce de Ensayos</div>', unsafe_allow_html=True)
+    st.markdown('<div class="sub-title">Parámetros de distintas familias alineados por '
+                'muestra y profundidad</div>', unsafe_allow_html=True)
+    if long.empty:
+        st.warning("No hay datos disponibles.")
+        return
+
+    params = list(long["parametro"].cat.categories)
+    defaults = [p for p in ("LL", "IP", "Indice de Poros", "CBR") if p in params]
+    sel = st.multiselect("Parámetros", params, default=defaults, key="cross_params")
+    if not sel:
+        st.info("Selecciona al menos un parámetro.")
+        return
+
+    tabla = cross_family(long, sel)
+    prospects = sorted(tabla["prospeccion"].astype(str).unique())
+    psel = st.sidebar.multiselect("Filtrar prospección", prospects, default=prospects,
+                                  key="cross_filter")
+    if psel:
+        tabla = tabla[tabla["prospeccion"].astype(str).isin(psel)]
+
+    solo_completas = st.checkbox("Solo muestras con todos los parámetros", value=False)
+    if solo_completas:
+        tabla = tabla.dropna(subset=sel)
+
+    st.caption(str(len(tabla)) + " muestras")
+    st.dataframe(tabla, use_container_width=True)
+
+
+
+def page_bins(df, long):
+    st.markdown('<div class="main-title">Perfiles por Intervalos</div>', unsafe_allow_html=True)
+    st.markdown('<div class="sub-title">Estadísticos por tramo de profundidad '
+                '(media, P10–P90 y envolvente min–max)</div>', unsafe_allow_html=True)
+    if long.empty or long["profundidad"].notna().sum() == 0:
+        st.warning("No hay datos con profundidad.")
+        return
+
+    params = list(long["parametro"].cat.categories)
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        param = st.selectbox("Parámetro", params,
+                             index=params.index("SPT (valores centrales)")
+                             if "SPT (valores centrales)" in params else 0)
+    with c2:
+        step = st.number_input("Intervalo (m)", min_value=0.25, value=2.0, step=0.25)
+    with c3:
+        by = st.selectbox("Agrupar por", ["global", "prospeccion", "unidad", "uscs"],
+                          format_func=GRUPOS_LBL.get)
+
+    edges = make_edges(step, float(long["profundidad"].max()))
+    tabla = depth_bins(long, edges, by=by, params=[param])
+    if tabla.empty:
+        st.info("Sin datos para: " + param)
+        return
+
+    col_fig, col_tab = st.columns([1, 1.6])
+    with col_fig:
+        fig = binned_profile(tabla, param + " por intervalos", param)
+        st.pyplot(fig); plt.close(fig)
+    with col_tab:
+        st.dataframe(tabla.drop(columns=["parametro", "intervalo"]).round(3),
+                     use_container_width=True, hide_index=True)
+
+    todos = depth_bins(long, edges, by=by)
+    st.download_button("⬇️ Descargar todos los parámetros (CSV)",
+                       todos.to_csv(index=False).encode("utf-8"),
+                       file_name="perfiles_por_intervalos.csv", mime="text/csv")
+
+
+
+def page_corr(df, long):
+    st.markdown('<div class="main-title">Correlaciones entre Parámetros</div>', unsafe_allow_html=True)
+    st.markdown('<div class="sub-title">Coeficientes por pares de muestras completas '
+                '(n = muestras comunes)</div>', unsafe_allow_html=True)
+    if long.empty:
+        st.warning("No hay datos disponibles.")
+        return
+
+    counts = long["parametro"].value_counts()
+    params = [p for p in counts.index if counts[p] >= 3]
+    defaults = [p for p in ("LL", "IP", "Humedad", "Densidad Seca Kn/m3", "CBR",
+                            "Indice de Poros", "RCS (kpa)") if p in params]
+    sel = st.multiselect("Parámetros", params, default=defaults or params[:6], key="corr_params")
+    c1, c2 = st.columns(2)
+    method = c1.selectbox("Método", ["pearson", "spearman"], format_func=str.capitalize)
+    by = c2.selectbox("Calcular para", ["global", "unidad", "uscs", "prospeccion"],
+                      format_func=GRUPOS_LBL.get, key="corr_by")
+    if len(sel) < 2:
+        st.info("Selecciona al menos dos parámetros.")
+        return
+
+    res = correlations(long, sel, method=method, by=by)
+    for grupo, (r, n) in res.items():
+        if len(res) > 1:
+            st.markdown('<div class="section-header">' + grupo + '</div>', unsafe_allow_html=True)
+        col_fig, col_tab = st.columns([1.3, 1])
+        with col_fig:
+            fig = correlation_heatmap(r, n, method.capitalize() + " — " + grupo)
+            if fig: st.pyplot(fig); plt.close(fig)
+        with col_tab:
+            st.dataframe(r.round(3), use_container_width=True)
+            st.caption("Muestras comunes (n)")
+            st.dataframe(n, use_container_width=True)
 
 
 
@@ -380,7 +335,21 @@ if file is None:
     st.info("Usa el panel izquierdo para cargar el listado de ensayos de laboratorio.")
     st.stop()
 
-df = load_and_clean(file)
+compact = st.sidebar.checkbox("Tipos compactos (menos memoria)", value=True,
+                              help="Texto repetitivo como categorías y números en float32")
+estado, cambios, mem_report = ingest(file.getvalue(), compact,
+                                     st.session_state.get("geolab_ingesta"))
+st.session_state["geolab_ingesta"] = estado
+df, long = estado["df"], estado["long"]
+st.sidebar.caption("Filas: " + str(cambios["nuevas"]) + " nuevas, " +
+                   str(cambios["modificadas"]) + " modificadas, " +
+                   str(cambios["eliminadas"]) + " eliminadas, " +
+                   str(cambios["sin_cambios"]) + " sin cambios")
+if mem_report is not None:
+    total = mem_report.loc["TOTAL"]
+    with st.sidebar.expander("Memoria: " + format(total["KB después"], ".0f") + " KB (−" +
+                             str(total["Ahorro (%)"]) + " %)"):
+        st.dataframe(mem_report.round(1), use_container_width=True)
 
 pages = {
     "📊 Resumen General":   page_overview,
@@ -390,7 +359,10 @@ pages = {
     "🔧 Mecánicos":    page_mec,
     "📈 Consol / CBR":      page_consol,
     "⚗️ Químicos":   page_quim,
+    "🔗 Cruce de ensayos":  page_cross,
+    "📏 Perfiles por intervalos": page_bins,
+    "📈 Correlaciones":     page_corr,
 }
 
 choice = st.sidebar.radio("Navegación", list(pages.keys()))
-pages[choice](df)
+pages[choice](df, long)
@@ -0,0 +1,62 @@
+"""
+atlas_ui.py
+===========
+Curvas de todas las correlaciones de una magnitud sobre todo el rango de
+una entrada, a partir del atlas precalculado (correlaciones.atlas):
+
+    figura_curvas(magnitud, eje, fijos, marcador) -> plotly.Figure
+    panel_curvas(magnitud, valores, ejes, key)     -> selector de eje + gráfico
+
+La figura se cachea por (magnitud, eje, entradas fijas); el valor actual
+del caso solo añade una línea vertical. plotly se importa al dibujar.
+"""
+import streamlit as st
+
+from correlaciones import atlas, registro
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _figura_base(magnitud: str, eje: str, fijos: tuple):
+    import plotly.express as px
+
+    tabla = atlas.curvas(magnitud, eje, dict(fijos))
+    if tabla.empty:
+        return None
+    meta = registro.get_magnitud(magnitud)["meta"]
+    spec = registro.variables(magnitud)[eje] or {}
+    tabla["Correlación"] = tabla["Autor"] + " — " + tabla["Grupo"]
+    fig = px.line(tabla, x=eje, y="Valor", color="Correlación",
+                  labels={eje: f"{spec.get('nombre', eje)} ({spec.get('unidad', '-')})",
+                          "Valor": f"{meta['simbolo']} ({meta['unidad']})"},
+                  color_discrete_sequence=px.colors.qualitative.Dark24)
+    fig.update_layout(height=520, margin=dict(l=0, r=0, t=30, b=0),
+                      legend=dict(font=dict(size=10)))
+    return fig
+
+
+def figura_curvas(magnitud: str, eje: str, fijos: dict | None = None, marcador=None):
+    """Curvas valor–`eje` de todos los autores (None si no hay ninguna)."""
+    fijos = tuple(sorted((k, float(v)) for k, v in (fijos or {}).items()
+                         if v is not None and k != eje))
+    base = _figura_base(magnitud, eje, fijos)
+    if base is None:
+        return None
+    import plotly.graph_objects as go
+
+    fig = go.Figure(base)                      # copia: la base cacheada no se toca
+    if marcador is not None:
+        fig.add_vline(x=float(marcador), line_dash="dash", line_color="black",
+                      annotation_text=f"{eje} = {float(marcador):g}")
+    return fig
+
+
+def panel_curvas(magnitud: str, valores: dict, ejes: list, key: str = "atlas"):
+    """Gráfico de curvas con el eje elegido entre `ejes`; el resto de
+    entradas se fijan en `valores` (el caso actual)."""
+    eje = ejes[0] if len(ejes) == 1 else st.radio("Eje", ejes, horizontal=True,
+                                                  key=f"{key}_eje")
+    fig = figura_curvas(magnitud, eje, valores, valores.get(eje))
+    if fig is None:
+        st.info("Faltan datos de entrada para dibujar las curvas frente a este eje.")
+    else:
+        st.plotly_chart(fig, use_container_width=True, key=f"{key}_fig")
@@ -0,0 +1,21 @@
+"""
+correlaciones
+=============
+Cálculo de correlaciones geotécnicas sin dependencia de Streamlit.
+
+Cada módulo evalúa sus fórmulas sobre escalares o sobre arrays completos
+(NumPy), de modo que las apps, los modos por lotes y los notebooks usan
+exactamente las mismas expresiones. Ningún módulo importa streamlit,
+plotly ni python-docx:
+
+    registro  Registro declarativo (data/*.yaml) compilado a funciones NumPy
+    cc        Índice de compresión (Cc) por lotes sobre el listado
+    phi       Ángulo de rozamiento (φ) de un caso y por lotes, con N o (N1)60
+    elasticidad Módulo de elasticidad (E) de un caso en arenas y arcillas
+    spt       Corrección del golpeo SPT a (N1)60
+    tensiones σv, u y σ'v en un perfil estratificado
+    montecarlo Propagación de la incertidumbre de las entradas (Monte Carlo)
+    barrido   Mallas paramétricas de entradas (mapas de calor y ábacos)
+    atlas     Atlas precalculado de curvas y consultas por interpolación
+    memo      Lotes grandes ya calculados guardados en disco (SQLite) por versión
+"""
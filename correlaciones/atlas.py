@@ -0,0 +1,243 @@
+"""
+correlaciones/atlas.py — Atlas precalculado de curvas de correlación
+====================================================================
+Cada correlación del registro con hasta MAX_DIMENSIONES entradas se evalúa
+una sola vez sobre una malla densa de sus entradas (rango `atlas` de cada
+variable en el YAML; las variables categóricas toman todas sus clases) y se
+guarda en float32:
+
+    cargar(magnitud)                     -> {id: (ejes, valores, irregular)}
+    curvas(magnitud, eje, fijos)         -> familias de curvas de todos los autores
+    consultar(magnitud, datos)           -> valores por interpolación multilineal
+
+Al construir el atlas se compara, en el centro de cada celda, la
+interpolación de sus nodos con el valor exacto; las celdas que se apartan
+más de TOLERANCIA o que cortan un límite de validez (ramas, tramos de
+tablas, rangos) se marcan como `irregular` y las consultas que caen en
+ellas se evalúan directamente con el registro. Fuera de la malla no se
+extrapola (NaN). Las correlaciones con más entradas se evalúan siempre con
+el registro.
+
+El atlas de cada magnitud se guarda en DIR_CACHE (un .npz con la huella del
+YAML en el nombre): se calcula una vez por versión del registro y lo
+comparten todas las sesiones y procesos.
+"""
+from __future__ import annotations
+import itertools
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import barrido, registro
+
+VERSION = 1
+MAX_DIMENSIONES = 3
+PUNTOS = {1: 1001, 2: 201, 3: 101}          # nodos por eje según la dimensión
+TOLERANCIA = 1e-3                           # error relativo admitido en el centro de celda
+DIR_CACHE = Path(os.environ.get("CORRELACIONES_CACHE",
+                                Path.home() / ".cache" / "correlaciones"))
+
+
+def _categoricas(magnitud: str) -> set:
+    return {v for v, s in registro.variables(magnitud).items() if (s or {}).get("categorias")}
+
+
+# --------------------------------------------------------------------------- #
+#  Construcción y caché en disco                                               #
+# --------------------------------------------------------------------------- #
+def _ejes(magnitud: str, entradas) -> dict | None:
+    especs = registro.variables(magnitud)
+    ejes = {}
+    for v in entradas:
+        spec = especs[v] or {}
+        if spec.get("categorias"):
+            ejes[v] = np.arange(len(spec["categorias"]), dtype=float)
+        elif spec.get("atlas"):
+            ejes[v] = np.linspace(*map(float, spec["atlas"]), PUNTOS[len(entradas)])
+        else:
+            return None
+    return ejes
+
+
+def _irregulares(magnitud: str, id_: str, ejes: dict, valores: np.ndarray,
+                 categoricas: set) -> np.ndarray:
+    """Celdas cuya interpolación no reproduce el valor exacto en su centro.
+
+    Una celda abarca dos nodos en cada eje continuo y un solo nodo en los
+    categóricos."""
+    continuos = [v not in categoricas for v in ejes]
+    centros = {v: (e[:-1] + e[1:]) / 2 if c else e for (v, e), c in zip(ejes.items(), continuos)}
+    exacto = barrido.malla(magnitud, centros, ids=[id_])["valores"][..., 0]
+    esquinas = np.stack([_esquina(valores, continuos, e)
+                         for e in itertools.product((0, 1), repeat=sum(continuos))])
+    finitos = np.isfinite(esquinas).all(axis=0) & np.isfinite(exacto)
+    vacios = ~np.isfinite(esquinas).any(axis=0) & ~np.isfinite(exacto)
+    with np.errstate(invalid="ignore"):
+        cerca = np.abs(esquinas.mean(axis=0) - exacto) <= TOLERANCIA * np.abs(exacto)
+    return ~((finitos & cerca) | vacios)
+
+
+def _esquina(valores: np.ndarray, continuos, esquina) -> np.ndarray:
+    """Valores del nodo `esquina` (0/1 por eje continuo) de todas las celdas."""
+    desplaz = iter(esquina)
+    sel = []
+    for eje_n, c in zip(valores.shape, continuos):
+        if c:
+            d = next(desplaz)
+            sel.append(slice(d, eje_n - 1 + d))
+        else:
+            sel.append(slice(None))
+    return valores[tuple(sel)]
+
+
+def construir(magnitud: str) -> dict:
+    """{id: (ejes, valores float32, irregular)} de las correlaciones tabulables."""
+    atlas = {}
+    categoricas = _categoricas(magnitud)
+    for c in registro.correlaciones(magnitud):
+        ejes = (_ejes(magnitud, c["entradas"])
+                if len(c["entradas"]) <= MAX_DIMENSIONES else None)
+        if ejes is not None:
+            valores = barrido.malla(magnitud, ejes, ids=[c["id"]])["valores"][..., 0]
+            atlas[c["id"]] = (ejes, valores.astype(np.float32),
+                              _irregulares(magnitud, c["id"], ejes, valores, categoricas))
+    return atlas
+
+
+def ruta(magnitud: str, dir_cache=None) -> Path:
+    huella = registro.get_magnitud(magnitud)["huella"][:12]
+    return Path(dir_cache or DIR_CACHE) / f"atlas_{magnitud}_v{VERSION}_{huella}.npz"
+
+
+def _guardar(atlas: dict, destino: Path):
+    arrays = {}
+    for id_, (ejes, valores, irregular) in atlas.items():
+        arrays[f"{id_}:ejes"] = np.array(list(ejes))
+        arrays.update({f"{id_}:eje:{v}": a for v, a in ejes.items()})
+        arrays[f"{id_}:valores"] = valores
+        arrays[f"{id_}:irregular"] = irregular
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destino.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        np.savez_compressed(fh, **arrays)
+    os.replace(tmp, destino)                 # escritura atómica
+
+
+def _leer(origen: Path) -> dict:
+    with np.load(origen) as z:
+        ids = [k[:-len(":ejes")] for k in z.files if k.endswith(":ejes")]
+        return {id_: ({str(v): z[f"{id_}:eje:{v}"] for v in z[f"{id_}:ejes"]},
+                      z[f"{id_}:valores"], z[f"{id_}:irregular"]) for id_ in ids}
+
+
+@lru_cache(maxsize=None)
+def cargar(magnitud: str, dir_cache: str | None = None) -> dict:
+    """Atlas de `magnitud` desde la caché en disco (o lo construye y guarda)."""
+    destino = ruta(magnitud, dir_cache)
+    if destino.exists():
+        try:
+            return _leer(destino)
+        except (OSError, ValueError, KeyError):
+            pass                              # caché dañada: se reconstruye
+    atlas = construir(magnitud)
+    try:
+        _guardar(atlas, destino)
+    except OSError:
+        pass                                  # sin permisos: solo en memoria
+    return atlas
+
+
+# --------------------------------------------------------------------------- #
+#  Consultas                                                                   #
+# --------------------------------------------------------------------------- #
+def _interpolar(magnitud: str, id_: str, entrada: tuple, datos: dict,
+                categoricas: set) -> np.ndarray:
+    """Interpolación multilineal en la malla regular (exacta en celdas
+    irregulares, NaN fuera de la malla)."""
+    ejes, valores, irregular = entrada
+    cols = [c.ravel() for c in np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(datos.get(v, np.nan), dtype=float)) for v in ejes))]
+    n = cols[0].size
+    fuera = np.zeros(n, dtype=bool)
+    celdas, fracs = [], []
+    with np.errstate(invalid="ignore"):
+        for (v, eje), x in zip(ejes.items(), cols):
+            if v in categoricas:
+                t = np.rint(x - eje[0])
+                i0 = np.clip(np.nan_to_num(t), 0, eje.size - 1).astype(np.intp)
+                f = None
+            else:
+                t = (x - eje[0]) / (eje[1] - eje[0])
+                i0 = np.clip(np.nan_to_num(np.floor(t)), 0, eje.size - 2).astype(np.intp)
+                f = np.clip(np.nan_to_num(t - i0), 0.0, 1.0)
+            fuera |= ~((t >= 0) & (t <= eje.size - 1))
+            celdas.append(i0)
+            fracs.append(f)
+
+    res = np.zeros(n)
+    continuos = [f is not None for f in fracs]
+    for esquina in itertools.product((0, 1), repeat=sum(continuos)):
+        w, idx, it = np.ones(n), [], iter(esquina)
+        for i0, f in zip(celdas, fracs):
+            if f is None:
+                idx.append(i0)
+                continue
+            e = next(it)
+            w *= f if e else 1.0 - f
+            idx.append(i0 + e)
+        res += w * valores[tuple(idx)]
+    res[fuera] = np.nan
+
+    exactos = irregular[tuple(celdas)] & ~fuera
+    if exactos.any():
+        sub = {v: c[exactos] for v, c in zip(ejes, cols)}
+        res[exactos] = registro.evaluar(magnitud, sub, [id_])[0][:, 0]
+    return res
+
+
+def consultar(magnitud: str, datos: dict, ids=None) -> np.ndarray:
+    """
+    Valores de las correlaciones `ids` (todas si None) para `datos`
+    ({variable: escalar o array}), como registro.evaluar()[0]: matriz
+    muestras × correlaciones, interpolada en el atlas cuando existe.
+    """
+    atlas = cargar(magnitud)
+    ids = [c["id"] for c in registro.correlaciones(magnitud)] if ids is None else list(ids)
+    categoricas = _categoricas(magnitud)
+    n = max([np.size(v) for v in datos.values() if v is not None] or [1])
+    res = np.full((n, len(ids)), np.nan)
+    directos = [j for j, i in enumerate(ids) if i not in atlas]
+    if directos:
+        res[:, directos] = registro.evaluar(magnitud, datos, [ids[j] for j in directos])[0]
+    for j, id_ in enumerate(ids):
+        if id_ in atlas:
+            res[:, j] = _interpolar(magnitud, id_, atlas[id_], datos, categoricas)
+    return res
+
+
+def curvas(magnitud: str, eje: str, fijos: dict | None = None, ids=None) -> pd.DataFrame:
+    """
+    Curvas valor–`eje` de todas las correlaciones del atlas que dependen de
+    `eje` y cuyas demás entradas están en `fijos`. Tabla larga con id,
+    Autor, Grupo, <eje> y Valor (NaN fuera de validez, para cortar la línea).
+    """
+    fijos = {k: v for k, v in (fijos or {}).items() if v is not None and k != eje}
+    atlas = cargar(magnitud)
+    categoricas = _categoricas(magnitud)
+    partes = []
+    for c in registro.correlaciones(magnitud):
+        if (ids is not None and c["id"] not in ids) or c["id"] not in atlas \
+                or eje not in c["entradas"] \
+                or any(v not in fijos for v in c["entradas"] if v != eje):
+            continue
+        ejes, valores, _ = atlas[c["id"]]
+        x = ejes[eje]
+        y = (valores.astype(float) if len(ejes) == 1
+             else _interpolar(magnitud, c["id"], atlas[c["id"]], {**fijos, eje: x}, categoricas))
+        partes.append(pd.DataFrame({"id": c["id"], "Autor": c["autor"],
+                                    "Grupo": c["grupo"], eje: x, "Valor": y}))
+    columnas = ["id", "Autor", "Grupo", eje, "Valor"]
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=columnas)
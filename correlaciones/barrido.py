@@ -0,0 +1,76 @@
+"""
+correlaciones/barrido.py — Barridos paramétricos sobre mallas de entradas
+=========================================================================
+Evalúa las correlaciones de una magnitud del registro sobre el producto
+cartesiano de varios ejes (p. ej. N × IP × Cu con OCR fijo) para dibujar
+mapas de calor y ábacos de diseño.
+
+Cada correlación se evalúa solo sobre los ejes de los que depende (Stroud:
+N × IP; CTE: IP × Cu) y se difunde al resto de la malla, de modo que una
+malla 100 × 100 × 100 cuesta lo mismo que sus submallas de 10⁴ puntos.
+
+    malla(magnitud, ejes, fijos)  -> {"ejes", "ids", "valores"}
+    corte(res, id, **fijar)       -> DataFrame 2-D (o Serie 1-D) de una correlación
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from . import registro
+
+
+def malla(magnitud: str, ejes: dict, fijos: dict | None = None, ids=None) -> dict:
+    """
+    Correlaciones `ids` (todas si None) de `magnitud` sobre la malla `ejes`
+    ({variable: valores}, en ese orden) con el resto de entradas en `fijos`.
+
+    Devuelve {"ejes": {variable: array}, "ids": [...], "valores": array de
+    forma (len(eje1), …, len(ejeN), len(ids))}; NaN donde no aplica.
+    """
+    fijos = dict(fijos or {})
+    ejes = {v: np.asarray(a, dtype=float).ravel() for v, a in ejes.items()}
+    repetidos = set(ejes) & set(fijos)
+    if repetidos:
+        raise ValueError("Variables a la vez en ejes y fijos: " + ", ".join(sorted(repetidos)))
+    desconocidas = set(ejes) - set(registro.variables(magnitud))
+    if desconocidas:
+        raise ValueError(f"{magnitud}: variables desconocidas: {', '.join(sorted(desconocidas))}")
+
+    corrs = registro.correlaciones(magnitud)
+    ids = [c["id"] for c in corrs] if ids is None else list(ids)
+    por_id = {c["id"]: c for c in corrs}
+    forma = tuple(a.size for a in ejes.values())
+    valores = np.empty(forma + (len(ids),))
+    for j, id_ in enumerate(ids):
+        propios = [v for v in ejes if v in por_id[id_]["entradas"]]
+        sub = np.meshgrid(*(ejes[v] for v in propios), indexing="ij")
+        datos = {**fijos, **{v: s.ravel() for v, s in zip(propios, sub)}}
+        val = registro.evaluar(magnitud, datos, [id_])[0][:, 0]
+        parcial = [ejes[v].size if v in propios else 1 for v in ejes]
+        valores[..., j] = val.reshape(parcial)
+    return {"ejes": ejes, "ids": ids, "valores": valores}
+
+
+def corte(res: dict, id_: str, **fijar):
+    """
+    Valores de la correlación `id_` con los ejes de `fijar` en el valor de
+    malla más próximo: DataFrame (primer eje libre en filas, segundo en
+    columnas) o Serie si solo queda un eje libre.
+    """
+    j = res["ids"].index(id_)
+    sel, libres = [], []
+    for v, eje in res["ejes"].items():
+        if v in fijar:
+            sel.append(int(np.abs(eje - float(fijar[v])).argmin()))
+        else:
+            sel.append(slice(None))
+            libres.append(v)
+    datos = res["valores"][tuple(sel) + (j,)]
+    if len(libres) == 1:
+        return pd.Series(datos, index=pd.Index(res["ejes"][libres[0]], name=libres[0]),
+                         name=id_)
+    if len(libres) != 2:
+        raise ValueError("El corte debe dejar uno o dos ejes libres")
+    return pd.DataFrame(datos, index=pd.Index(res["ejes"][libres[0]], name=libres[0]),
+                        columns=pd.Index(res["ejes"][libres[1]], name=libres[1]))
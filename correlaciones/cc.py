@@ -0,0 +1,91 @@
+"""
+correlaciones/cc.py — Índice de compresión (Cc)
+===============================================
+Evaluación por lotes de las fórmulas empíricas de Cc del registro
+(data/cc.yaml) para todas las muestras de un listado de laboratorio.
+
+Entradas (arrays o escalares, NaN = dato no disponible):
+    LL  límite líquido [%]        PL  límite plástico [%]
+    IP  índice de plasticidad [%] w   humedad natural [%]
+    e   índice de poros           Gs  peso específico de las partículas
+    F   porcentaje de finos [%]
+
+Cada fórmula declara las variables que requiere; su máscara de
+disponibilidad es «todas presentes y > 0». Los resultados Cc ≤ 0 se
+descartan (NaN), igual que en las calculadoras interactivas.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from . import memo, registro
+
+MAGNITUD = "cc"
+FORMULAS = registro.correlaciones(MAGNITUD)
+VARIABLES = tuple(registro.variables(MAGNITUD))
+AUTORES = [f["autor"] for f in FORMULAS]
+
+# Columnas del listado de laboratorio (tabla ancha de geolab_engine.cross_family)
+# de las que se toma cada variable; si hay varias, la primera no nula.
+COLUMNAS_LISTADO = {
+    "LL": ("LL",),
+    "PL": ("LP",),
+    "IP": ("IP",),
+    "w": ("W", "Humedad"),
+    "e": ("Indice de Poros",),
+    "F": ("Tamiz Finos",),
+}
+
+# Parámetros que hay que pedir a cross_family para alimentar `lote`
+PARAMETROS_LISTADO = list(dict.fromkeys(c for cols in COLUMNAS_LISTADO.values()
+                                        for c in cols))
+
+AGREGADOS = registro.AGREGADOS
+
+
+def evaluar(datos: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evalúa todas las fórmulas sobre `datos` ({variable: escalar o array}).
+
+    Devuelve (valores, aplicable): matrices muestras × fórmulas. `aplicable`
+    es la máscara de disponibilidad (todas las entradas presentes y > 0);
+    `valores` es NaN donde la fórmula no aplica o da Cc ≤ 0. Los lotes
+    grandes ya evaluados se leen de correlaciones.memo.
+    """
+    return memo.evaluar(MAGNITUD, datos)
+
+
+def desde_tabla(tabla: pd.DataFrame, columnas: dict = COLUMNAS_LISTADO) -> dict:
+    """Variables de entrada a partir de una tabla ancha de muestras
+    (registro.desde_tabla con las columnas del listado)."""
+    return registro.desde_tabla(tabla, columnas)
+
+
+def lote(tabla: pd.DataFrame, columnas: dict = COLUMNAS_LISTADO
+          ) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Cc de todas las fórmulas aplicables para cada muestra de `tabla`.
+
+    Devuelve:
+      largo    — una fila por (muestra, fórmula) con resultado válido:
+                 <índice de tabla>, Autor, Variable, Cc
+      resumen  — agregados robustos por muestra (N, Mediana, P25, P75, MAD,
+                 Mínimo, Máximo), con el mismo índice que `tabla`.
+    """
+    valores, _ = evaluar(desde_tabla(tabla, columnas))
+    idx = tabla.index
+
+    fila, col = np.nonzero(np.isfinite(valores))
+    largo = pd.DataFrame({
+        "Autor": np.asarray(AUTORES, dtype=object)[col],
+        "Variable": np.asarray([f["grupo"] for f in FORMULAS], dtype=object)[col],
+        "Cc": valores[fila, col],
+    }, index=idx[fila])
+
+    return largo, resumir(valores, idx)
+
+
+def resumir(valores: np.ndarray, index=None) -> pd.DataFrame:
+    """Agregados robustos por fila de una matriz muestras × fórmulas."""
+    return registro.resumir(valores, index)
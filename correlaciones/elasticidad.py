@@ -0,0 +1,78 @@
+"""
+correlaciones/elasticidad.py — Módulo de elasticidad (E) de un caso
+===================================================================
+Tablas de resultados de las calculadoras de E, sin dependencias de
+interfaz (registro data/e_arenas.yaml y data/e_arcillas.yaml):
+
+    arenas(N)                      -> E de suelos granulares
+    filtrar_arenas(tabla, tipo)    -> filas aplicables a un tipo de suelo
+    arcillas(N, IP, Cu, OCR)       -> E de suelos cohesivos
+    estadisticas(valores)          -> mínimo, máximo, media, mediana, desviación
+    con_seleccion(tabla, marcas)   -> copia con la columna Seleccionar delante
+
+Columnas de las tablas: Autor, Aplicación, Fórmula Original y E (MPa).
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+from . import registro
+
+COLUMNAS = ["Autor", "Aplicación", "Fórmula Original", "E (MPa)"]
+OCR_CATEGORIAS = registro.variables("e_arcillas")["OCR"]["categorias"]
+
+# Tipo de suelo -> texto que debe contener la aplicación (None = todas)
+TIPOS_SUELO = {
+    "Arenas": "arena",
+    "Gravas": "grava",
+    "Limos": "limo",
+    "Suelos Intermedios": "intermedios",
+    "Mostrar Todo": None,
+}
+
+
+def _columnas(tabla: pd.DataFrame) -> pd.DataFrame:
+    return (tabla.rename(columns={"Ecuación": "Fórmula Original", "Valor": "E (MPa)"})
+            [COLUMNAS].reset_index(drop=True))
+
+
+def arenas(N: float) -> pd.DataFrame:
+    """Todas las correlaciones de E en suelos granulares aplicables a N."""
+    return _columnas(registro.tabla("e_arenas", N=N))
+
+
+def filtrar_arenas(tabla: pd.DataFrame, tipo_suelo: str) -> pd.DataFrame:
+    """Filas cuya aplicación corresponde a `tipo_suelo` (ver TIPOS_SUELO)."""
+    clave = TIPOS_SUELO.get(tipo_suelo)
+    if clave is None:
+        return tabla
+    return tabla[tabla["Aplicación"].str.lower().str.contains(clave)]
+
+
+def arcillas(N: float, IP: float, Cu_kPa: float, OCR_cat: str) -> pd.DataFrame:
+    """E en arcillas con Stroud (N, IP) y la tabla F.2 del CTE (IP, Cu, OCR)."""
+    tabla = registro.tabla("e_arcillas", N=N, IP=IP, Cu=Cu_kPa,
+                           OCR=OCR_CATEGORIAS.index(OCR_cat))
+    tabla.loc[tabla.index == "cte_f2", "Aplicación"] += f", {OCR_cat}"
+    return _columnas(tabla)
+
+
+def clave_seleccion(fila) -> str:
+    return f"{fila['Autor']}_{fila['Aplicación']}"
+
+
+def con_seleccion(tabla: pd.DataFrame, marcas: dict) -> pd.DataFrame:
+    """Copia de `tabla` con la columna Seleccionar al principio (marcas por
+    clave_seleccion, True si no hay marca). No modifica `tabla`, que puede
+    ser la misma en cada ejecución de un fragmento."""
+    seleccion = [marcas.get(clave_seleccion(f), True) for f in tabla.to_dict("records")]
+    return tabla.assign(Seleccionar=seleccion)[["Seleccionar", *tabla.columns]]
+
+
+def estadisticas(valores) -> pd.DataFrame:
+    """Estadísticos de los valores de E seleccionados (una fila)."""
+    s = pd.Series(valores, dtype=float)
+    return pd.DataFrame({
+        "Mínimo": [s.min()], "Máximo": [s.max()], "Promedio": [s.mean()],
+        "Mediana": [s.median()], "Desv. Típica": [s.std() if len(s) > 1 else 0.0],
+    })
@@ -0,0 +1,251 @@
+"""
+correlaciones/memo.py — Memoria persistente de resultados por lotes
+===================================================================
+Guarda en disco (SQLite, DIR_CACHE/memo.sqlite) los resultados de las
+evaluaciones grandes, de modo que los lotes repetidos (listados de Cc y φ,
+trabajos del servidor, Monte Carlo con semilla) se reutilizan entre
+sesiones, procesos y reinicios:
+
+    evaluar(magnitud, datos, ids=None) -> (valores, aplicable)   como registro.evaluar
+    clave(*partes)                     -> clave de cualquier otro cálculo
+    leer(clave) / guardar(clave, **arrays)
+    version(correlación)               -> versión que entra en la clave
+    estado()                           -> {"entradas", "bytes", "ruta"}
+    vaciar()
+
+Cada fila es un lote entero, guardado como arrays NumPy (.npy, sin pickle).
+En evaluar() su clave es el sha1 de la magnitud, el id y la versión de cada
+correlación evaluada y las entradas normalizadas: solo las variables que
+usan, con la mantisa cortada a BITS bits y lo no disponible (None, NaN)
+normalizado igual. La versión combina registro.VERSION, el `version` del
+YAML y la huella de la definición, así que al cambiar una fórmula sus lotes
+dejan de coincidir. No se borran al abrir (varias copias del proyecto
+pueden compartir DIR_CACHE): salen los primeros, por último uso, cuando lo
+guardado supera MAX_BYTES.
+
+Solo se memorizan los lotes de al menos MIN_CELDAS muestras × correlaciones.
+Por debajo, NumPy evalúa en menos tiempo del que cuesta calcular la clave y
+leerla (un caso de las calculadoras: ~0.3 ms evaluado), y se evalúa sin
+tocar el disco; registro.tabla no pasa por aquí. Un acierto solo lee: su
+uso se anota en memoria y se escribe con el siguiente guardado. Si la base
+no se puede abrir o escribir se calcula sin ella. CORRELACIONES_MEMO=0 la
+desactiva.
+"""
+from __future__ import annotations
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from . import registro
+
+VERSION = 2
+BITS = 40                                    # bits de mantisa de la clave (≈ 12 cifras)
+MIN_CELDAS = 200_000                         # muestras × correlaciones para memorizar
+MAX_BYTES = int(float(os.environ.get("CORRELACIONES_MEMO_MB", 256)) * 2 ** 20)
+ACTIVA = os.environ.get("CORRELACIONES_MEMO", "1") != "0"
+DIR_CACHE = Path(os.environ.get("CORRELACIONES_CACHE",
+                                Path.home() / ".cache" / "correlaciones"))
+MAX_USOS = 100                               # usos anotados antes de escribirlos
+_MASCARA = np.int64(-(1 << (52 - BITS)))
+
+_cerrojo = threading.Lock()
+_conexion: sqlite3.Connection | None = None
+_pid = None
+_ruta_abierta = None
+_bytes = 0                                   # bytes guardados (aprox. entre procesos)
+_usos: dict = {}                             # clave -> último uso aún no escrito
+
+
+def version(c: dict) -> str:
+    return f"{registro.VERSION}.{c['version']}.{c['huella'][:12]}"
+
+
+def _abrir() -> sqlite3.Connection:
+    """Conexión del proceso (se reabre tras un fork o si cambia DIR_CACHE)."""
+    global _conexion, _pid, _ruta_abierta, _bytes
+    ruta = Path(DIR_CACHE) / "memo.sqlite"
+    if _conexion is not None and _pid == os.getpid() and _ruta_abierta == ruta:
+        return _conexion
+    if _conexion is not None and _pid == os.getpid():
+        _conexion.close()
+    _usos.clear()
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(ruta, timeout=30, check_same_thread=False, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript("""
+        CREATE TABLE IF NOT EXISTS lotes (clave BLOB PRIMARY KEY, nombres TEXT,
+            datos BLOB, bytes INTEGER, usado INTEGER);
+        CREATE INDEX IF NOT EXISTS lotes_usado ON lotes (usado);
+    """)
+    _bytes = con.execute("SELECT COALESCE(SUM(bytes), 0) FROM lotes").fetchone()[0]
+    _conexion, _pid, _ruta_abierta = con, os.getpid(), ruta
+    return con
+
+
+def _digerir(h, x):
+    if isinstance(x, dict):
+        h.update(b"{")
+        for k in sorted(x, key=str):
+            _digerir(h, str(k))
+            _digerir(h, x[k])
+        h.update(b"}")
+    elif isinstance(x, (list, tuple)):
+        h.update(b"[%d" % len(x))
+        for v in x:
+            _digerir(h, v)
+        h.update(b"]")
+    elif isinstance(x, np.ndarray):
+        a = np.ascontiguousarray(x)
+        h.update(f"<{a.dtype.str}{a.shape}>".encode())
+        h.update(a.tobytes())
+    else:
+        h.update(f"{type(x).__name__}:{x!r};".encode())
+
+
+def clave(*partes) -> bytes:
+    """sha1 de `partes` (texto, números, arrays NumPy, listas y dicts anidados;
+    el orden de las claves de un dict no cuenta)."""
+    h = hashlib.sha1(b"memo:%d" % VERSION)
+    _digerir(h, partes)
+    return h.digest()
+
+
+def _normalizar(a: np.ndarray) -> np.ndarray:
+    """Bits de `a` con la mantisa cortada a BITS bits (−0 → 0 y todo lo no
+    finito → NaN)."""
+    x = np.asarray(a, dtype=float) + 0.0
+    x = np.where(np.isfinite(x), x, np.nan)
+    return x.view(np.int64) & _MASCARA
+
+
+def _empaquetar(arrays: dict) -> tuple[str, bytes]:
+    """Nombres y arrays seguidos en formato .npy (sin zip: leerlos es una copia)."""
+    buf = io.BytesIO()
+    for a in arrays.values():
+        np.save(buf, np.asarray(a), allow_pickle=False)
+    return ",".join(arrays), buf.getvalue()
+
+
+def _desempaquetar(nombres: str, datos: bytes) -> dict:
+    buf = io.BytesIO(datos)
+    return {nombre: np.load(buf, allow_pickle=False) for nombre in nombres.split(",")}
+
+
+def _recortar(con):
+    """Si lo guardado supera MAX_BYTES, borra los lotes usados hace más
+    tiempo hasta quedar en el 90 %."""
+    global _bytes
+    if _bytes <= MAX_BYTES:
+        return
+    _bytes = con.execute("SELECT COALESCE(SUM(bytes), 0) FROM lotes").fetchone()[0]
+    sobran, claves = _bytes - int(0.9 * MAX_BYTES), []
+    for k, b in con.execute("SELECT clave, bytes FROM lotes ORDER BY usado"):
+        if sobran <= 0:
+            break
+        claves.append((k,))
+        sobran -= b
+        _bytes -= b
+    con.executemany("DELETE FROM lotes WHERE clave = ?", claves)
+
+
+def _escribir(con, nuevo: tuple | None = None):
+    """Guarda `nuevo` (clave, nombres, datos) y los usos anotados en una
+    transacción."""
+    global _bytes
+    usos = list(_usos.items())
+    with con:
+        con.execute("BEGIN IMMEDIATE")
+        con.executemany("UPDATE lotes SET usado = ? WHERE clave = ?",
+                        [(t, k) for k, t in usos])
+        if nuevo is not None:
+            k, nombres, datos = nuevo
+            if con.execute("INSERT OR IGNORE INTO lotes VALUES (?, ?, ?, ?, ?)",
+                           (k, nombres, datos, len(datos), time.time_ns())).rowcount:
+                _bytes += len(datos)
+            _recortar(con)
+    for k, t in usos:
+        if _usos.get(k) == t:
+            del _usos[k]
+
+
+def leer(k: bytes) -> dict | None:
+    """Arrays guardados con la clave `k` (None si no están)."""
+    if not ACTIVA:
+        return None
+    try:
+        with _cerrojo:
+            con = _abrir()
+            fila = con.execute("SELECT nombres, datos FROM lotes WHERE clave = ?",
+                               (k,)).fetchone()
+            if fila is None:
+                return None
+            _usos[k] = time.time_ns()
+            if len(_usos) >= MAX_USOS:
+                _escribir(con)
+        return _desempaquetar(*fila)
+    except (sqlite3.Error, OSError, ValueError):
+        return None
+
+
+def guardar(k: bytes, **arrays):
+    """Guarda `arrays` con la clave `k` (si caben en una cuarta parte de
+    MAX_BYTES: un lote no desplaza toda la memoria)."""
+    if not ACTIVA:
+        return
+    nombres, datos = _empaquetar(arrays)
+    if len(datos) > MAX_BYTES // 4:
+        return
+    try:
+        with _cerrojo:
+            _escribir(_abrir(), (k, nombres, datos))
+    except (sqlite3.Error, OSError):         # base bloqueada o de solo lectura
+        pass
+
+
+def evaluar(magnitud: str, datos: dict, ids=None) -> tuple[np.ndarray, np.ndarray]:
+    """registro.evaluar con el lote leído de disco si ya se evaluó (solo
+    lotes de al menos MIN_CELDAS muestras × correlaciones)."""
+    doc = registro.get_magnitud(magnitud)
+    corrs = doc["correlaciones"]
+    if ids is not None:
+        por_id = {c["id"]: c for c in corrs}
+        corrs = [por_id[i] for i in ids]
+    v, _ = registro._entradas(doc, datos)
+    n = next(iter(v.values())).size
+    if not ACTIVA or n * len(corrs) < MIN_CELDAS:
+        return registro.evaluar(magnitud, datos, ids)
+    usadas = sorted({x for c in corrs for x in c["entradas"]})
+    k = clave("evaluar", magnitud, [(c["id"], version(c)) for c in corrs], n,
+              {x: _normalizar(v[x]) for x in usadas})
+    guardado = leer(k)
+    if guardado is not None:
+        return guardado["valores"], guardado["aplicable"]
+    valores, aplicable = registro.evaluar(magnitud, datos, ids)
+    guardar(k, valores=valores, aplicable=aplicable)
+    return valores, aplicable
+
+
+def estado() -> dict:
+    """Lotes guardados y bytes que ocupan."""
+    with _cerrojo:
+        con = _abrir()
+        entradas, ocupado = con.execute(
+            "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM lotes").fetchone()
+    return {"entradas": entradas, "bytes": ocupado, "ruta": _ruta_abierta}
+
+
+def vaciar():
+    """Borra todos los lotes memorizados."""
+    global _bytes
+    with _cerrojo:
+        con = _abrir()
+        con.execute("DELETE FROM lotes")
+        _usos.clear()
+        _bytes = 0
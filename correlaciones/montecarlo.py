@@ -0,0 +1,203 @@
+"""
+correlaciones/montecarlo.py — Propagación de la incertidumbre de las entradas
+=============================================================================
+Muestrea las variables de entrada de una magnitud del registro (N, IP, Cu,
+LL…) según una distribución y evalúa todas las correlaciones elegidas
+sobre millones de muestras.
+
+Distribuciones ({variable: especificación}):
+
+    {"tipo": "fijo",      "valor": x}
+    {"tipo": "normal",    "media": m, "desv": s}
+    {"tipo": "lognormal", "media": m, "desv": s}   (media y desv. de la variable)
+    {"tipo": "uniforme",  "min": a, "max": b}
+    {"tipo": "empirica",  "valores": [...]}        (remuestreo del listado)
+
+Las muestras se evalúan por bloques (`bloque`) para acotar la memoria: de
+cada bloque solo se guardan un histograma fino por correlación y sumas para
+media y desviación, así que el resultado no depende del número de bloques
+ni de procesos (`procesos` > 1 reparte los bloques en un ProcessPoolExecutor).
+Los percentiles se interpolan en ese histograma fino (resolución =
+rango / BINS_FINOS). Las muestras fuera del dominio de una variable (p. ej.
+N ≤ 0 de una normal) quedan fuera por la máscara de disponibilidad del
+registro: la columna N del resumen cuenta las muestras válidas.
+
+Con `semilla` el resultado es repetible y se guarda en correlaciones.memo
+(histograma fino y sumas, unos KB por correlación): repetir la misma
+simulación lo lee en lugar de volver a muestrear.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import memo, registro
+
+TIPOS = ("fijo", "normal", "lognormal", "uniforme", "empirica")
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+BLOQUE = 250_000
+BINS_FINOS = 4000
+N_PILOTO = 20_000
+
+
+def muestrear(spec: dict, n: int, rng: np.random.Generator) -> np.ndarray:
+    """`n` muestras de la distribución `spec`."""
+    tipo = spec["tipo"]
+    if tipo == "fijo":
+        return np.full(n, float(spec["valor"]))
+    if tipo == "normal":
+        return rng.normal(spec["media"], spec["desv"], n)
+    if tipo == "lognormal":
+        m, s = float(spec["media"]), float(spec["desv"])
+        if m <= 0:
+            raise ValueError("La distribución lognormal requiere media > 0")
+        s2 = np.log1p((s / m) ** 2)
+        return rng.lognormal(np.log(m) - s2 / 2, np.sqrt(s2), n)
+    if tipo == "uniforme":
+        return rng.uniform(spec["min"], spec["max"], n)
+    if tipo == "empirica":
+        valores = np.asarray(spec["valores"], dtype=float)
+        valores = valores[np.isfinite(valores)]
+        if valores.size == 0:
+            raise ValueError("La distribución empírica no tiene valores")
+        return rng.choice(valores, n)
+    raise ValueError(f"Distribución no reconocida: {tipo!r} (use {', '.join(TIPOS)})")
+
+
+def _evaluar_bloque(magnitud, distribuciones, ids, n, semilla):
+    rng = np.random.default_rng(semilla)
+    datos = {v: muestrear(spec, n, rng) for v, spec in distribuciones.items()}
+    return registro.evaluar(magnitud, datos, ids)[0]
+
+
+def _acumular(magnitud, distribuciones, ids, n, semilla, bordes):
+    """Histograma fino (con desbordes) y sumas de un bloque."""
+    valores = _evaluar_bloque(magnitud, distribuciones, ids, n, semilla)
+    k = valores.shape[1]
+    cuentas = np.zeros((k, BINS_FINOS + 2), dtype=np.int64)
+    sumas = np.zeros((k, 3))
+    for j in range(k):
+        v = valores[:, j]
+        v = v[np.isfinite(v)]
+        if v.size == 0:
+            continue
+        # bins uniformes: índice directo; 0 y BINS+1 son los desbordes
+        lo, ancho = bordes[j, 0], bordes[j, 1] - bordes[j, 0]
+        pos = np.clip(np.floor((v - lo) / ancho), -1, BINS_FINOS).astype(np.intp) + 1
+        cuentas[j] = np.bincount(pos, minlength=BINS_FINOS + 2)
+        sumas[j] = v.size, v.sum(), np.square(v).sum()
+    return cuentas, sumas
+
+
+def _bordes(piloto: np.ndarray) -> np.ndarray:
+    """Bordes del histograma fino de cada correlación a partir del piloto
+    (rango del piloto ampliado un 50 % por cada lado)."""
+    bordes = np.empty((piloto.shape[1], BINS_FINOS + 1))
+    for j in range(piloto.shape[1]):
+        v = piloto[:, j][np.isfinite(piloto[:, j])]
+        lo, hi = (v.min(), v.max()) if v.size else (0.0, 1.0)
+        margen = 0.5 * (hi - lo) or max(abs(hi), 1.0) * 0.5
+        bordes[j] = np.linspace(lo - margen, hi + margen, BINS_FINOS + 1)
+    return bordes
+
+
+def _percentil(cuentas: np.ndarray, bordes: np.ndarray, q: float) -> float:
+    total = cuentas.sum()
+    if total == 0:
+        return np.nan
+    acum = np.cumsum(cuentas)
+    objetivo = q / 100 * total
+    i = int(np.searchsorted(acum, objetivo, side="left"))
+    i = min(max(i, 1), BINS_FINOS)          # desbordes -> borde del histograma
+    previo = acum[i - 1]
+    frac = (objetivo - previo) / cuentas[i] if cuentas[i] else 0.0
+    return float(bordes[i - 1] + np.clip(frac, 0, 1) * (bordes[i] - bordes[i - 1]))
+
+
+def simular(magnitud: str, distribuciones: dict, n: int = 1_000_000, ids=None,
+            bloque: int = BLOQUE, semilla: int | None = None,
+            procesos: int | None = None, bins: int = 50) -> tuple[pd.DataFrame, dict]:
+    """
+    Monte Carlo de las correlaciones `ids` (todas si None) de `magnitud`.
+
+    Devuelve (resumen, histogramas):
+      resumen      — por correlación: Autor, Grupo, N válidas, Media, Desv,
+                     P5…P95; índice = id
+      histogramas  — {id: (cuentas, bordes)} con `bins` intervalos entre
+                     P0.5 y P99.5
+    """
+    corrs = registro.correlaciones(magnitud)
+    ids = [c["id"] for c in corrs] if ids is None else list(ids)
+    por_id = {c["id"]: c for c in corrs}
+    clave = None
+    if semilla is not None:                  # repetible: se memoriza el resultado
+        clave = memo.clave("montecarlo", magnitud,
+                           [(i, memo.version(por_id[i])) for i in ids],
+                           _normalizar(distribuciones), n, bloque, semilla,
+                           BINS_FINOS, N_PILOTO)
+        guardado = memo.leer(clave)
+        if guardado is not None:
+            return _resumir(guardado["bordes"], guardado["cuentas"], guardado["sumas"],
+                            ids, por_id, bins)
+
+    semillas = np.random.SeedSequence(semilla)
+    s_piloto, s_bloques = semillas.spawn(2)
+    tamanos = [bloque] * (n // bloque) + ([n % bloque] if n % bloque else [])
+    hijos = s_bloques.spawn(len(tamanos))
+
+    bordes = _bordes(_evaluar_bloque(magnitud, distribuciones, ids,
+                                     min(N_PILOTO, n), s_piloto))
+    args = [(magnitud, distribuciones, ids, t, h, bordes) for t, h in zip(tamanos, hijos)]
+    if procesos and procesos > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            partes = list(pool.map(_acumular, *zip(*args)))
+    else:
+        partes = [_acumular(*a) for a in args]
+    cuentas = sum(p[0] for p in partes)
+    sumas = sum(p[1] for p in partes)
+    if clave is not None:
+        memo.guardar(clave, bordes=bordes, cuentas=cuentas, sumas=sumas)
+    return _resumir(bordes, cuentas, sumas, ids, por_id, bins)
+
+
+def _normalizar(distribuciones: dict) -> dict:
+    """Distribuciones con los valores empíricos como array (clave de memo)."""
+    return {v: {k: np.asarray(x, dtype=float) if k == "valores" else x
+                for k, x in spec.items()}
+            for v, spec in distribuciones.items()}
+
+
+def _resumir(bordes, cuentas, sumas, ids, por_id, bins):
+    """Resumen e histogramas a partir del histograma fino y las sumas."""
+    filas, histogramas = [], {}
+    for j, id_ in enumerate(ids):
+        cnt, s, s2 = sumas[j]
+        media = s / cnt if cnt else np.nan
+        desv = np.sqrt(max(s2 / cnt - media ** 2, 0.0) * cnt / (cnt - 1)) if cnt > 1 else np.nan
+        fila = {"id": id_, "Autor": por_id[id_]["autor"], "Grupo": por_id[id_]["grupo"],
+                "N": int(cnt), "Media": media, "Desv": desv}
+        fila.update({f"P{q}": _percentil(cuentas[j], bordes[j], q) for q in PERCENTILES})
+        filas.append(fila)
+        if cnt:
+            histogramas[id_] = _histograma(cuentas[j], bordes[j], bins)
+    return pd.DataFrame(filas).set_index("id"), histogramas
+
+
+def _histograma(cuentas, bordes, bins):
+    """Reagrupa el histograma fino en `bins` intervalos entre P0.5 y P99.5."""
+    lo, hi = _percentil(cuentas, bordes, 0.5), _percentil(cuentas, bordes, 99.5)
+    if not hi > lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    nuevos = np.linspace(lo, hi, bins + 1)
+    centros = (bordes[:-1] + bordes[1:]) / 2
+    pos = np.searchsorted(nuevos, centros, side="right") - 1
+    dentro = (pos >= 0) & (pos < bins)
+    agrupado = np.bincount(pos[dentro], weights=cuentas[1:-1][dentro], minlength=bins)
+    return agrupado.astype(np.int64), nuevos
+
+
+def desde_listado(valores) -> dict:
+    """Especificación empírica a partir de una columna del listado."""
+    return {"tipo": "empirica", "valores": pd.to_numeric(pd.Series(valores),
+                                                          errors="coerce").dropna().to_numpy()}
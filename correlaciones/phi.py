@@ -0,0 +1,89 @@
+"""
+correlaciones/phi.py — Ángulo de rozamiento (φ) por lotes
+=========================================================
+Evaluación de las correlaciones de φ del registro (data/phi.yaml) para
+todas las muestras de una campaña en una sola llamada vectorizada.
+
+calcular(IP, Nspt) devuelve los resultados de un caso con las fórmulas
+usadas; evaluar() y lote() trabajan sobre campañas completas.
+
+Entradas (arrays o escalares, NaN = dato no disponible):
+    IP    índice de plasticidad [%]
+    Nspt  golpeo SPT; con `corregir_n` se sustituye por (N1)60
+          (correlaciones.spt, a partir de la profundidad de cada ensayo)
+
+Del listado de laboratorio se toman el golpeo central del SPT y el IP de
+la misma muestra (bloque de muestra común en geolab_engine).
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from . import memo, registro, spt
+
+MAGNITUD = "phi"
+FORMULAS = registro.correlaciones(MAGNITUD)
+AUTORES = [f["autor"] for f in FORMULAS]
+
+# Columnas del listado (tabla ancha de geolab_engine.cross_family)
+COLUMNAS_LISTADO = {"IP": ("IP",), "Nspt": (spt.COL_N,)}
+PARAMETROS_LISTADO = list(dict.fromkeys(c for cols in COLUMNAS_LISTADO.values()
+                                        for c in cols))
+COL_PROFUNDIDAD = "profundidad"
+
+
+def calcular(IP: float | None = None, Nspt: float | None = None) -> tuple[dict, dict]:
+    """
+    φ de un caso con las correlaciones cuyas entradas estén disponibles.
+
+    Devuelve (resultados, formulas_usadas): {autor: φ} y
+    {autor: {"formula": ecuación, "parametros": entradas}}.
+    """
+    tabla = registro.tabla(MAGNITUD, IP=IP, Nspt=Nspt)
+    resultados, formulas_usadas = {}, {}
+    for fila in tabla.itertuples():
+        resultados[fila.Autor] = fila.Valor
+        formulas_usadas[fila.Autor] = {"formula": fila.Ecuación, "parametros": fila.Entradas}
+    return resultados, formulas_usadas
+
+
+def evaluar(datos: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    φ de todas las correlaciones sobre `datos` ({"IP": …, "Nspt": …}).
+
+    Devuelve (valores, aplicable): matrices muestras × correlaciones, en el
+    orden de FORMULAS. Los lotes grandes ya evaluados se leen de
+    correlaciones.memo.
+    """
+    return memo.evaluar(MAGNITUD, datos)
+
+
+def lote(tabla: pd.DataFrame, columnas: dict = COLUMNAS_LISTADO,
+          corregir_n: bool = False, col_profundidad: str = COL_PROFUNDIDAD,
+          **parametros_spt) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    φ de todas las correlaciones para cada muestra de `tabla`.
+
+    Con `corregir_n` el golpeo se corrige a (N1)60 con la profundidad de
+    `col_profundidad` y `parametros_spt` (ver spt.corregir: eficiencia,
+    diametro_mm, cs, gamma, nivel_freatico, gamma_sat, perfil).
+
+    Devuelve:
+      valores  — una columna por autor (φ en grados, NaN si no aplica)
+      resumen  — IP y golpeo usados (Nspt o (N1)60), agregados por muestra
+                 (N, Mediana, P25, P75, MAD) y la envolvente Mínimo–Máximo
+                 entre fórmulas
+    Ambos con el mismo índice que `tabla`.
+    """
+    datos = registro.desde_tabla(tabla, columnas)
+    if corregir_n:
+        z = pd.to_numeric(tabla[col_profundidad], errors="coerce").to_numpy(dtype=float)
+        datos["Nspt"] = spt.corregir(z, datos["Nspt"], **parametros_spt)["(N1)60"].to_numpy()
+    valores, _ = evaluar(datos)
+    idx = tabla.index
+    resumen = pd.concat([pd.DataFrame({"IP": datos["IP"],
+                                       "(N1)60" if corregir_n else "Nspt": datos["Nspt"]},
+                                      index=idx),
+                         registro.resumir(valores, idx)], axis=1)
+    return pd.DataFrame(valores, index=idx, columns=AUTORES), resumen
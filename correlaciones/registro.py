@@ -0,0 +1,281 @@
+"""
+correlaciones/registro.py — Registro declarativo de correlaciones
+=================================================================
+Carga los YAML de ./data/ (uno por magnitud: cc, phi, e_arenas,
+e_arcillas…) y compila cada expresión una sola vez en una función NumPy,
+de modo que la misma correlación sirve para un valor tecleado a mano, para
+una columna del listado o para una malla de cálculo.
+
+Estructura de cada YAML:
+
+    meta:         magnitud, nombre, simbolo, unidad, positivo (descarta ≤ 0)
+    constantes:   nombres utilizables en las expresiones (números o listas)
+    variables:    {símbolo: {nombre, unidad, minimo, categorias, atlas}}
+                  (atlas: [mín, máx] de la malla de correlaciones.atlas)
+    correlaciones:
+    - id, autor, grupo, entradas, expresion, texto
+      rango:      {variable: [mín, máx]}  validez (inclusiva, null = abierto)
+      condicion:  expresión booleana (ramas de fórmulas a trozos)
+      version:    entero (1 por defecto); subirlo invalida los resultados
+                  guardados en correlaciones.memo aunque la fórmula no cambie
+
+Cada correlación compilada lleva `huella`: sha1 de lo que determina su
+resultado (versión, entradas, expresión, condición, rango, constantes
+usadas, `positivo` y `minimo` de sus variables).
+
+Una variable está disponible si es finita y > 0 (o ≥ `minimo` si se
+declara). Funciones del motor:
+
+    cargar()                    -> {magnitud: documento compilado}
+    correlaciones(magnitud)     -> [correlación, ...]
+    evaluar(magnitud, datos)    -> (valores, aplicable) muestras × correlaciones
+    tabla(magnitud, **datos)    -> DataFrame de resultados de un único caso
+    desde_tabla(tabla, columnas) -> entradas a partir de columnas de un listado
+    resumir(valores)            -> agregados robustos por muestra
+"""
+from __future__ import annotations
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+DIR_DATOS = Path(__file__).resolve().parent / "data"
+VERSION = 1                     # versión del motor de evaluación (claves de memo)
+AGREGADOS = ["N", "Mediana", "P25", "P75", "MAD", "Mínimo", "Máximo"]
+
+
+def _lookup(tabla, i, j):
+    """tabla[i, j] elemento a elemento (índices enteros o booleanos)."""
+    return np.asarray(tabla, dtype=float)[np.asarray(i, dtype=int),
+                                          np.asarray(j, dtype=int)]
+
+
+# Funciones disponibles en las expresiones (todas aceptan arrays)
+FUNCIONES = {
+    "sqrt": np.sqrt, "exp": np.exp, "log": np.log, "log10": np.log10,
+    "where": np.where, "interp": np.interp, "minimum": np.minimum,
+    "maximum": np.maximum, "clip": np.clip, "lookup": _lookup,
+}
+
+
+# --------------------------------------------------------------------------- #
+#  Compilación                                                                 #
+# --------------------------------------------------------------------------- #
+def _compilar(expr: str, nombre: str, ns: dict, entradas) -> callable:
+    code = compile(str(expr), f"<{nombre}>", "eval")
+    desconocidos = set(code.co_names) - set(ns) - set(entradas)
+    if desconocidos:
+        raise ValueError(f"{nombre}: nombres no definidos en la expresión "
+                         f"{expr!r}: {', '.join(sorted(desconocidos))}")
+    fn = lambda v: eval(code, ns, v)  # noqa: E731, S307 — espacio de nombres cerrado
+    fn.nombres = set(code.co_names)
+    return fn
+
+
+def _huella(c: dict, doc: dict) -> str:
+    """sha1 de todo lo que determina el resultado de la correlación `c`."""
+    constantes = doc.get("constantes") or {}
+    usados = c["fn"].nombres | (c["cond"].nombres if c["cond"] else set())
+    definicion = {
+        "version": c["version"], "entradas": list(c["entradas"]),
+        "expresion": str(c["expresion"]), "condicion": c.get("condicion"),
+        "rango": c["rango"], "positivo": doc["meta"]["positivo"],
+        "constantes": {k: constantes[k] for k in sorted(usados & set(constantes))},
+        "minimo": {k: (doc["variables"][k] or {}).get("minimo") for k in c["entradas"]},
+    }
+    return hashlib.sha1(json.dumps(definicion, sort_keys=True, default=str)
+                        .encode()).hexdigest()
+
+
+def _compilar_doc(doc: dict, origen: str) -> dict:
+    ns = {"__builtins__": {}, **FUNCIONES, **(doc.get("constantes") or {})}
+    variables = doc["variables"]
+    vistos = set()
+    for c in doc["correlaciones"]:
+        nombre = f"{origen}:{c['id']}"
+        if c["id"] in vistos:
+            raise ValueError(f"{nombre}: id repetido")
+        vistos.add(c["id"])
+        faltan = [v for v in c["entradas"] if v not in variables]
+        if faltan:
+            raise ValueError(f"{nombre}: variables no declaradas: {', '.join(faltan)}")
+        c["fn"] = _compilar(c["expresion"], nombre, ns, c["entradas"])
+        c["cond"] = (_compilar(c["condicion"], nombre, ns, c["entradas"])
+                     if c.get("condicion") else None)
+        c.setdefault("rango", {})
+        c.setdefault("aplicacion", c["grupo"])
+        c.setdefault("version", 1)
+    doc["meta"].setdefault("positivo", True)
+    for c in doc["correlaciones"]:
+        c["huella"] = _huella(c, doc)
+    return doc
+
+
+@lru_cache(maxsize=1)
+def cargar(dir_datos: str | None = None) -> dict:
+    base = Path(dir_datos) if dir_datos else DIR_DATOS
+    docs = {}
+    for ruta in sorted(base.glob("*.yaml")):
+        texto = ruta.read_bytes()
+        doc = _compilar_doc(yaml.safe_load(texto.decode("utf-8")), ruta.stem)
+        doc["huella"] = hashlib.sha1(texto).hexdigest()     # clave de cachés derivadas
+        docs[doc["meta"]["magnitud"]] = doc
+    if not docs:
+        raise FileNotFoundError(f"No se encontraron correlaciones YAML en {base}")
+    return docs
+
+
+def get_magnitud(magnitud: str) -> dict:
+    return cargar()[magnitud]
+
+
+def correlaciones(magnitud: str) -> list[dict]:
+    return get_magnitud(magnitud)["correlaciones"]
+
+
+def variables(magnitud: str) -> dict:
+    return get_magnitud(magnitud)["variables"]
+
+
+# --------------------------------------------------------------------------- #
+#  Evaluación                                                                  #
+# --------------------------------------------------------------------------- #
+def _entradas(doc: dict, datos: dict) -> tuple[dict, dict]:
+    """Arrays float de longitud común y máscara de disponibilidad por variable."""
+    arrs = {k: np.atleast_1d(np.asarray(np.nan if datos.get(k) is None else datos[k],
+                                        dtype=float))
+            for k in doc["variables"]}
+    n = max(a.size for a in arrs.values())
+    v, ok = {}, {}
+    for k, spec in doc["variables"].items():
+        a = np.broadcast_to(arrs[k], (n,))
+        minimo = (spec or {}).get("minimo")
+        v[k] = a
+        ok[k] = np.isfinite(a) & ((a >= minimo) if minimo is not None else (a > 0))
+    return v, ok
+
+
+def evaluar(magnitud: str, datos: dict, ids=None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evalúa las correlaciones de `magnitud` sobre `datos` ({variable: escalar
+    o array}); `ids` limita a un subconjunto (en ese orden).
+
+    Devuelve (valores, aplicable): matrices muestras × correlaciones.
+    `aplicable` = entradas disponibles, dentro de `rango` y con `condicion`
+    cierta; `valores` es NaN donde no aplica (o ≤ 0 si la magnitud es
+    `positivo`).
+    """
+    doc = get_magnitud(magnitud)
+    corrs = doc["correlaciones"]
+    if ids is not None:
+        por_id = {c["id"]: c for c in corrs}
+        corrs = [por_id[i] for i in ids]
+    v, ok = _entradas(doc, datos)
+    n = next(iter(v.values())).size
+    valores = np.full((n, len(corrs)), np.nan)
+    aplicable = np.zeros((n, len(corrs)), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j, c in enumerate(corrs):
+            m = np.logical_and.reduce([ok[k] for k in c["entradas"]])
+            for k, (lo, hi) in c["rango"].items():
+                if lo is not None:
+                    m &= v[k] >= lo
+                if hi is not None:
+                    m &= v[k] <= hi
+            if not m.any():
+                continue
+            sub = {k: v[k][m] for k in c["entradas"]}
+            if c["cond"] is not None:
+                m[m] = np.broadcast_to(c["cond"](sub), (int(m.sum()),))
+                if not m.any():
+                    continue
+                sub = {k: v[k][m] for k in c["entradas"]}
+            aplicable[:, j] = m
+            res = np.broadcast_to(np.asarray(c["fn"](sub), dtype=float), (int(m.sum()),))
+            valores[m, j] = np.where(res > 0, res, np.nan) if doc["meta"]["positivo"] else res
+    return valores, aplicable
+
+
+def tabla(magnitud: str, **datos) -> pd.DataFrame:
+    """
+    Resultados de un único caso (entradas escalares): una fila por
+    correlación aplicable, con Autor, Grupo, Aplicación, Ecuación, Entradas y
+    Valor (NaN si el resultado se descarta). `aplicacion` admite campos
+    {variable} que se rellenan con las entradas.
+    """
+    valores, aplicable = evaluar(magnitud, datos)
+    campos = {k: float(val) for k, val in datos.items() if val is not None}
+    filas = []
+    for j, c in enumerate(correlaciones(magnitud)):
+        if aplicable[0, j]:
+            filas.append({"id": c["id"], "Autor": c["autor"], "Grupo": c["grupo"],
+                          "Aplicación": _formatear(c["aplicacion"], campos),
+                          "Ecuación": c["texto"], "Entradas": list(c["entradas"]),
+                          "Valor": valores[0, j]})
+    cols = ["id", "Autor", "Grupo", "Aplicación", "Ecuación", "Entradas", "Valor"]
+    return pd.DataFrame(filas, columns=cols).set_index("id")
+
+
+def desde_tabla(tabla: pd.DataFrame, columnas: dict) -> dict:
+    """
+    Variables de entrada a partir de una tabla ancha de muestras.
+
+    Para cada variable se toma la primera columna disponible no nula de
+    `columnas[variable]` (p. ej. w = W y, si falta, Humedad).
+    """
+    datos = {}
+    for var, cols in columnas.items():
+        serie = pd.Series(np.nan, index=tabla.index, dtype=float)
+        for c in cols:
+            if c in tabla.columns:
+                serie = serie.fillna(pd.to_numeric(tabla[c], errors="coerce"))
+        datos[var] = serie.to_numpy(dtype=float)
+    return datos
+
+
+def _percentil(orden: np.ndarray, n: np.ndarray, q: float) -> np.ndarray:
+    """Percentil q (interpolación lineal, como np.nanpercentile) de cada fila
+    ya ordenada, con sus n primeros valores finitos; sin recorrer las filas."""
+    pos = (n - 1) * (q / 100)
+    filas, bajo = np.arange(len(orden)), np.floor(pos).astype(int)
+    a, b = orden[filas, bajo], orden[filas, np.minimum(bajo + 1, n - 1)]
+    return a + (b - a) * (pos - bajo)
+
+
+def resumir(valores: np.ndarray, index=None) -> pd.DataFrame:
+    """Agregados robustos por fila de una matriz muestras × correlaciones
+    (N, Mediana, P25, P75, MAD y la envolvente Mínimo–Máximo)."""
+    n = np.isfinite(valores).sum(axis=1)
+    res = pd.DataFrame(index=index if index is not None else range(len(valores)),
+                       columns=AGREGADOS, dtype=float)
+    res["N"] = n
+    hay = n > 0
+    if hay.any():
+        v, n = valores[hay], n[hay]
+        orden = np.sort(v, axis=1)                          # NaN al final de cada fila
+        p25, med, p75 = (_percentil(orden, n, q) for q in (25, 50, 75))
+        mad = _percentil(np.sort(np.abs(v - med[:, None]), axis=1), n, 50)
+        filas = np.arange(len(v))
+        res.loc[hay, AGREGADOS[1:]] = np.column_stack(
+            [med, p25, p75, mad, orden[:, 0], orden[filas, n - 1]])
+    res["N"] = res["N"].astype(int)
+    return res
+
+
+def _formatear(texto: str, campos: dict) -> str:
+    try:
+        return texto.format(**campos)
+    except (KeyError, ValueError, IndexError):
+        return texto
+
+
+def fichas(magnitud: str) -> pd.DataFrame:
+    """Descripción de todas las correlaciones (para tablas de 'Fórmulas')."""
+    return pd.DataFrame([{"Autor": c["autor"], "Grupo": c["grupo"],
+                          "Ecuación": c["texto"],
+                          "Parámetros": ", ".join(c["entradas"])}
+                         for c in correlaciones(magnitud)])
@@ -0,0 +1,110 @@
+"""
+correlaciones/spt.py — Corrección del golpeo SPT a (N1)60
+=========================================================
+Skempton (1986) y Youd et al. (2001):
+
+    (N1)60 = N · Ce · Cb · Cs · Cr · Cn
+
+    Ce = ER / 60                    energía del martillo
+    Cb = f(diámetro del sondeo)     1.00 (65–115 mm), 1.05 (150), 1.15 (200)
+    Cs = 1.0 / 1.2                  muestreador estándar / con liners
+    Cr = f(longitud de varillaje)   escalones en 3, 4, 6 y 10 m
+    Cn = √(Pa/σ'v) ≤ 1.7            Liao & Whitman, Pa = 100 kPa
+                                    (σ'v de correlaciones.tensiones)
+
+Todas las funciones aceptan escalares o arrays (se difunden entre sí), de
+modo que una columna completa de profundidades y golpeos se corrige en una
+sola llamada.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from . import tensiones
+
+# Opciones del equipo (etiqueta -> valor) tal como las ofrece la app
+MARTILLOS = {                       # eficiencia ER por defecto (%)
+    "Martillo Automático (Estándar moderno)": 80,
+    "Martillo de Seguridad (Safety)": 60,
+    "Martillo Donut (Antiguo)": 45,
+}
+DIAMETROS = {"65 - 115 mm": 115, "150 mm": 150, "200 mm": 200}   # mm
+MUESTREADORES = {"Estándar (sin liners)": 1.0, "Con liners (camisas)": 1.2}
+
+ER_REFERENCIA = 60.0                # %
+PA = 100.0                          # kPa
+CN_MAX = 1.7
+GAMMA_W = tensiones.GAMMA_W         # kN/m³
+SIGMA_MIN = 1.0                     # kPa, evita Cn infinito en superficie
+
+# Cr: profundidades límite (m) y valor en cada tramo [<3, <4, <6, <10, ≥10]
+CR_LIMITES = np.array([3.0, 4.0, 6.0, 10.0])
+CR_VALORES = np.array([0.75, 0.80, 0.85, 0.95, 1.0])
+
+# Columnas del listado de laboratorio
+COL_PROFUNDIDAD = "Profundidad inicial"
+COL_N = "SPT (valores centrales)"
+
+COLUMNAS = ["Profundidad", "N", "σ'v (kPa)", "Ce", "Cb", "Cs", "Cr", "Cn",
+            "N60", "(N1)60"]
+
+
+def factor_ce(eficiencia):
+    return np.asarray(eficiencia, dtype=float) / ER_REFERENCIA
+
+
+def factor_cb(diametro_mm):
+    d = np.asarray(diametro_mm, dtype=float)
+    return np.select([d <= 115, d <= 150, d > 150], [1.0, 1.05, 1.15], np.nan)
+
+
+def factor_cr(profundidad):
+    z = np.asarray(profundidad, dtype=float)
+    cr = CR_VALORES[np.searchsorted(CR_LIMITES, np.nan_to_num(z), side="right")]
+    return np.where(np.isnan(z), np.nan, cr)
+
+
+def tension_efectiva(profundidad, gamma=18.0, nivel_freatico=np.inf,
+                     gamma_sat=None, perfil=None):
+    """σ'v (kPa) con el perfil de estratos dado o, si no, un terreno uniforme
+    de peso específico `gamma` (`gamma_sat` bajo el nivel freático)."""
+    if perfil is None:
+        perfil = tensiones.uniforme(gamma, nivel_freatico, gamma_sat)
+    return np.maximum(tensiones.tensiones_arrays(perfil, profundidad)[2], SIGMA_MIN)
+
+
+def factor_cn(sigma_v):
+    return np.minimum(np.sqrt(PA / np.asarray(sigma_v, dtype=float)), CN_MAX)
+
+
+def corregir(profundidad, n, eficiencia=ER_REFERENCIA, diametro_mm=115,
+             cs=1.0, gamma=18.0, nivel_freatico=np.inf, gamma_sat=None,
+             perfil=None, sigma_v=None) -> pd.DataFrame:
+    """
+    Factores y (N1)60 para cada par (profundidad, N).
+
+    Los parámetros del equipo pueden ser escalares o arrays de la misma
+    longitud. σ'v sale de `perfil` (correlaciones.tensiones.perfil) o de un
+    terreno uniforme `gamma`/`gamma_sat`/`nivel_freatico`; `sigma_v` (kPa)
+    la sustituye si ya se conoce.
+    """
+    z = np.asarray(profundidad, dtype=float)
+    n = np.asarray(n, dtype=float)
+    z, n = np.broadcast_arrays(z, n)
+    sv = (tension_efectiva(z, gamma, nivel_freatico, gamma_sat, perfil) if sigma_v is None
+          else np.maximum(np.asarray(sigma_v, dtype=float), SIGMA_MIN))
+    ce, cb, cr, cn = (factor_ce(eficiencia), factor_cb(diametro_mm),
+                      factor_cr(z), factor_cn(sv))
+    n60 = n * ce * cb * cs * cr
+    cols = [z, n, sv, ce, cb, cs, cr, cn, n60, n60 * cn]
+    return pd.DataFrame(dict(zip(COLUMNAS, np.broadcast_arrays(*cols))))
+
+
+def lote(tabla: pd.DataFrame, col_profundidad: str = COL_PROFUNDIDAD,
+         col_n: str = COL_N, **parametros) -> pd.DataFrame:
+    """(N1)60 de cada fila de `tabla` con profundidad y N; mismo índice."""
+    sel = tabla[[col_profundidad, col_n]].apply(pd.to_numeric, errors="coerce").dropna()
+    res = corregir(sel[col_profundidad].to_numpy(), sel[col_n].to_numpy(), **parametros)
+    res.index = sel.index
+    return res
@@ -0,0 +1,90 @@
+"""
+correlaciones/tensiones.py — Tensiones verticales en un perfil estratificado
+============================================================================
+Tensión total σv, presión intersticial u y tensión efectiva σ'v a cualquier
+conjunto de profundidades de un perfil de estratos horizontales:
+
+    estrato:  techo, base (m), gamma (kN/m³, sobre el nivel freático) y
+              gamma_sat (kN/m³, bajo el nivel freático; por defecto = gamma)
+    perfil:   estratos contiguos desde la superficie (z = 0), nivel freático
+              (m, inf = sin agua; < 0 = lámina de agua sobre el terreno) y
+              sobrecarga uniforme q (kPa)
+
+`perfil()` compila una sola vez los puntos de quiebre (contactos entre
+estratos y nivel freático) y la σv acumulada en cada uno; `tensiones()`
+resuelve cada profundidad con `searchsorted` y una interpolación lineal.
+Por debajo del último estrato se prolonga el último peso específico.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+GAMMA_W = 9.81          # kN/m³
+COLUMNAS = ["Profundidad", "σv (kPa)", "u (kPa)", "σ'v (kPa)"]
+
+
+def _estratos(estratos) -> pd.DataFrame:
+    tabla = pd.DataFrame(estratos)
+    faltan = {"techo", "base", "gamma"} - set(tabla.columns)
+    if faltan:
+        raise ValueError("Faltan columnas en los estratos: " + ", ".join(sorted(faltan)))
+    tabla = tabla.astype({"techo": float, "base": float, "gamma": float})
+    if "gamma_sat" not in tabla.columns:
+        tabla["gamma_sat"] = np.nan
+    tabla["gamma_sat"] = pd.to_numeric(tabla["gamma_sat"]).fillna(tabla["gamma"])
+    tabla = tabla.sort_values("techo", ignore_index=True)
+    if tabla.empty:
+        raise ValueError("El perfil no tiene estratos")
+    if tabla["techo"].iloc[0] != 0:
+        raise ValueError("El primer estrato debe empezar en la superficie (techo = 0)")
+    if (tabla["base"] <= tabla["techo"]).any():
+        raise ValueError("Cada estrato debe tener base > techo")
+    if not np.allclose(tabla["techo"].iloc[1:], tabla["base"].iloc[:-1]):
+        raise ValueError("Los estratos deben ser contiguos (sin huecos ni solapes)")
+    return tabla
+
+
+def perfil(estratos, nivel_freatico: float = np.inf, sobrecarga: float = 0.0,
+           gamma_w: float = GAMMA_W) -> dict:
+    """
+    Compila el perfil: tramos homogéneos (entre contactos y nivel freático),
+    su peso específico y la σv acumulada en el techo de cada tramo.
+    """
+    tabla = _estratos(estratos)
+    nf = float(nivel_freatico)
+    quiebres = np.unique(np.concatenate([
+        tabla["techo"].to_numpy(), tabla["base"].to_numpy()[-1:],
+        [nf] if 0 < nf < np.inf else []]))
+    # estrato de cada tramo; el último tramo se prolonga en profundidad
+    idx = np.searchsorted(tabla["techo"].to_numpy(), quiebres, side="right") - 1
+    gamma = np.where(quiebres >= nf, tabla["gamma_sat"].to_numpy()[idx],
+                     tabla["gamma"].to_numpy()[idx])
+    q0 = float(sobrecarga) + gamma_w * max(-nf, 0.0)      # lámina de agua
+    sv = q0 + np.concatenate([[0.0], np.cumsum(gamma[:-1] * np.diff(quiebres))])
+    return {"quiebres": quiebres, "gamma": gamma, "sv": sv, "nivel_freatico": nf,
+            "gamma_w": float(gamma_w), "estratos": tabla}
+
+
+def uniforme(gamma: float, nivel_freatico: float = np.inf, gamma_sat: float | None = None,
+             sobrecarga: float = 0.0, gamma_w: float = GAMMA_W) -> dict:
+    """Perfil de un solo estrato (infinito en profundidad)."""
+    return perfil([{"techo": 0.0, "base": 1.0, "gamma": gamma,
+                    "gamma_sat": gamma if gamma_sat is None else gamma_sat}],
+                  nivel_freatico, sobrecarga, gamma_w)
+
+
+def tensiones_arrays(p: dict, profundidad) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(σv, u, σ'v) en kPa para un array de profundidades (NaN fuera del terreno)."""
+    z = np.asarray(profundidad, dtype=float)
+    i = np.clip(np.searchsorted(p["quiebres"], z, side="right") - 1, 0, None)
+    sv = p["sv"][i] + p["gamma"][i] * (z - p["quiebres"][i])
+    u = p["gamma_w"] * np.clip(z - p["nivel_freatico"], 0.0, None)
+    sv = np.where(z >= 0, sv, np.nan)
+    return sv, u, sv - u
+
+
+def tensiones(p: dict, profundidad) -> pd.DataFrame:
+    """σv, u y σ'v (kPa) en cada profundidad."""
+    z = np.asarray(profundidad, dtype=float).ravel()
+    return pd.DataFrame(dict(zip(COLUMNAS, (z, *tensiones_arrays(p, z)))))
@@ -0,0 +1,251 @@
+"""
+geolab_cli.py — Informe por lotes de GeoLab Viewer
+===================================================
+Genera, sin navegador ni Streamlit, las tablas de estadísticos y las figuras
+de todas las páginas de GeoLab Viewer para uno o varios listados de
+laboratorio. Cada (listado, página) es una tarea del pool de procesos: el
+proceso lee cada listado una sola vez (y lo conserva para sus siguientes
+páginas) y al padre solo vuelven las rutas de los ficheros. Una página que
+falla queda anotada en <salida>/resumen.csv sin detener el lote, y el
+programa termina con código 1.
+
+Salida:  <salida>/<listado>/<página>/{estadisticos.csv, *.png, <página>.pdf,
+                                       <página>.html}
+         <salida>/resumen.csv   (listado, página, ficheros, estado)
+
+El .html es autocontenido (tablas y figuras como SVG en línea, ver
+informes_html.py); pagina_html() genera el mismo informe en memoria para la
+descarga desde GeoLab Viewer.
+
+Ejecutar:
+    python geolab_cli.py listado1.xlsx listado2.xlsx -o informes
+    python geolab_cli.py proyectos/*.xlsx -o informes --formatos png,csv -j 4
+"""
+from __future__ import annotations
+import argparse
+import os
+import re
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.backends.backend_pdf import PdfPages  # noqa: E402
+
+from geolab_engine import (  # noqa: E402
+    PAGES, OVERVIEW_PROFILES, load_and_clean, to_long, depth_bins, make_edges,
+    page_subset, stats_table, overview_kpis,
+)
+from geolab_plots import boxplot_panel, depth_profile  # noqa: E402
+import informes_html  # noqa: E402
+
+FORMATOS = ("png", "csv", "pdf", "html")
+PAGINAS = ["overview", *PAGES, "intervalos"]
+PASO_INTERVALOS = 2.0   # m
+
+
+def _slug(texto: str) -> str:
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return re.sub(r"[^0-9A-Za-z]+", "_", texto).strip("_").lower() or "x"
+
+
+def _titulo(pagina: str) -> str:
+    if pagina in PAGES:
+        return PAGES[pagina]["title"]
+    return {"overview": "Resumen general", "intervalos": "Estadísticos por intervalos"
+            }.get(pagina, pagina)
+
+
+class _Html:
+    """Bloques del informe HTML de una página (ver informes_html)."""
+
+    def __init__(self):
+        self.bloques: list = []
+
+    def figura(self, fig, nombre: str, cerrar: bool = True) -> None:
+        if fig is None:
+            return
+        self.bloques += [informes_html.encabezado(nombre.replace("_", " ").capitalize()),
+                         informes_html.figura(informes_html.svg_matplotlib(fig))]
+        if cerrar:
+            plt.close(fig)
+
+    def tabla(self, df, nombre: str, index: bool = True) -> None:
+        if not df.empty:
+            self.bloques += [informes_html.encabezado(nombre.replace("_", " ").capitalize()),
+                             informes_html.tabla_df(df, index=index)]
+
+
+class _Salida:
+    """Escribe las figuras y tablas de una página según los formatos pedidos."""
+
+    def __init__(self, carpeta: Path, nombre: str, formatos):
+        self.carpeta, self.nombre, self.formatos = carpeta, nombre, set(formatos)
+        self.ficheros: list[Path] = []
+        carpeta.mkdir(parents=True, exist_ok=True)
+        self._pdf = (PdfPages(carpeta / f"{nombre}.pdf")
+                     if "pdf" in self.formatos else None)
+        self._html = _Html() if "html" in self.formatos else None
+
+    def figura(self, fig, nombre: str) -> None:
+        if fig is None:
+            return
+        if self._html is not None:
+            self._html.figura(fig, nombre, cerrar=False)
+        if "png" in self.formatos:
+            ruta = self.carpeta / f"{_slug(nombre)}.png"
+            fig.savefig(ruta, dpi=150, bbox_inches="tight")
+            self.ficheros.append(ruta)
+        if self._pdf is not None:
+            self._pdf.savefig(fig, bbox_inches="tight")
+        plt.close(fig)
+
+    def tabla(self, df, nombre: str, index: bool = True) -> None:
+        if "csv" in self.formatos and not df.empty:
+            ruta = self.carpeta / f"{_slug(nombre)}.csv"
+            df.to_csv(ruta, index=index, encoding="utf-8-sig")
+            self.ficheros.append(ruta)
+        if self._html is not None:
+            self._html.tabla(df, nombre, index)
+
+    def cerrar(self) -> list[Path]:
+        if self._pdf is not None:
+            n = self._pdf.get_pagecount()
+            self._pdf.close()
+            ruta = self.carpeta / f"{self.nombre}.pdf"
+            if n:
+                self.ficheros.append(ruta)
+            else:
+                ruta.unlink(missing_ok=True)
+        if self._html is not None and self._html.bloques:
+            ruta = self.carpeta / f"{self.nombre}.html"
+            informes_html.escribir(ruta, _titulo(self.nombre), self._html.bloques)
+            self.ficheros.append(ruta)
+        return self.ficheros
+
+
+def render_page(df, pagina: str, carpeta: Path, formatos=FORMATOS) -> list[Path]:
+    """Renderiza una página de GeoLab Viewer a disco; devuelve los ficheros."""
+    out = _Salida(Path(carpeta) / pagina, pagina, formatos)
+    try:
+        _contenido(df, pagina, out)
+    finally:
+        ficheros = out.cerrar()
+    return ficheros
+
+
+def pagina_html(df, pagina: str) -> bytes:
+    """Informe HTML autocontenido de una página de GeoLab Viewer."""
+    out = _Html()
+    _contenido(df, pagina, out)
+    return informes_html.render(_titulo(pagina), out.bloques)
+
+
+def _contenido(df, pagina: str, out) -> None:
+    """Tablas y figuras de `pagina`, entregadas a `out` (figura() y tabla())."""
+    if pagina == "overview":
+        kpis = pd.Series(overview_kpis(df), name="N").rename_axis("Indicador")
+        out.tabla(kpis.to_frame(), "indicadores")
+        for vcol, lcol, dcol, title, xlabel in OVERVIEW_PROFILES:
+            if {vcol, lcol, dcol} <= set(df.columns):
+                out.figura(depth_profile(df, vcol, lcol, dcol, title, xlabel), title)
+
+    elif pagina == "intervalos":
+        long = to_long(df)
+        if long["profundidad"].notna().any():
+            edges = make_edges(PASO_INTERVALOS, float(long["profundidad"].max()))
+            for by in ("global", "prospeccion", "unidad", "uscs"):
+                out.tabla(depth_bins(long, edges, by=by), f"intervalos_{by}",
+                          index=False)
+
+    else:
+        spec = PAGES[pagina]
+        sub = page_subset(df, spec)
+        if not sub.empty:
+            num_data = {c: sub[c] for c in spec["num_cols"] if c in sub.columns}
+            out.tabla(stats_table(num_data), "estadisticos")
+            out.figura(boxplot_panel(num_data, spec["title"]), "diagramas_caja")
+            for vcol, lbl in spec["profiles"]:
+                if vcol in sub.columns and spec["depth_col"] in sub.columns:
+                    fig = depth_profile(sub, vcol, spec["sample_col"],
+                                        spec["depth_col"], lbl, lbl)
+                    out.figura(fig, "perfil_" + lbl)
+
+
+@lru_cache(maxsize=4)
+def _listado(ruta: str):
+    """Listado limpio, leído una vez por proceso para todas sus páginas."""
+    return load_and_clean(ruta)
+
+
+def _tarea(ruta: str, pagina: str, salida, formatos):
+    try:
+        carpeta = Path(salida) / Path(ruta).stem
+        return ruta, pagina, render_page(_listado(ruta), pagina, carpeta, formatos), None
+    except Exception as exc:                 # una página mala no detiene el lote
+        return ruta, pagina, [], f"{type(exc).__name__}: {exc}"
+
+
+def run(listados, salida, formatos=FORMATOS, paginas=PAGINAS, jobs=None) -> pd.DataFrame:
+    """Informe de todos los listados, una tarea por (listado, página).
+
+    jobs  tamaño del pool (1 = en este proceso, sin pool)
+    Devuelve el resumen (listado, pagina, ficheros, estado), también escrito
+    en <salida>/resumen.csv; estado es "ok" o el error de la página.
+    """
+    tareas = [(str(ruta), pagina, salida, formatos)
+              for ruta in listados for pagina in paginas]
+    if jobs == 1:
+        hechas = [_tarea(*t) for t in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            hechas = [fut.result() for fut in as_completed(
+                [pool.submit(_tarea, *t) for t in tareas])]
+    resumen = pd.DataFrame(
+        [{"listado": Path(ruta).stem, "pagina": pagina, "ficheros": len(ficheros),
+          "estado": error or "ok"} for ruta, pagina, ficheros, error in hechas],
+        columns=["listado", "pagina", "ficheros", "estado"])
+    resumen = resumen.sort_values(["listado", "pagina"], ignore_index=True)
+    Path(salida).mkdir(parents=True, exist_ok=True)
+    resumen.to_csv(Path(salida) / "resumen.csv", index=False, encoding="utf-8-sig")
+    return resumen
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Informe por lotes de GeoLab Viewer (PNG/CSV/PDF/HTML).")
+    ap.add_argument("listados", nargs="+", help="Listados de laboratorio (.xlsx)")
+    ap.add_argument("-o", "--salida", default="informes_geolab",
+                    help="Carpeta de salida (por defecto: informes_geolab)")
+    ap.add_argument("--formatos", default=",".join(FORMATOS),
+                    help="Formatos separados por comas: png,csv,pdf,html")
+    ap.add_argument("--paginas", default=",".join(PAGINAS),
+                    help="Páginas separadas por comas: " + ",".join(PAGINAS))
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                    help="Procesos en paralelo (por defecto: nº de núcleos)")
+    args = ap.parse_args(argv)
+
+    formatos = [f.strip() for f in args.formatos.split(",") if f.strip()]
+    paginas = [p.strip() for p in args.paginas.split(",") if p.strip()]
+    malos = [f for f in formatos if f not in FORMATOS] + \
+            [p for p in paginas if p not in PAGINAS]
+    if malos:
+        ap.error("opción no reconocida: " + ", ".join(malos))
+
+    resumen = run(args.listados, args.salida, formatos, paginas, args.jobs)
+    errores = resumen[resumen["estado"] != "ok"]
+    print(f"{len(args.listados)} listado(s), {len(resumen)} página(s), "
+          f"{resumen['ficheros'].sum()} fichero(s) en {args.salida}, "
+          f"{len(errores)} con error")
+    for fila in errores.itertuples():
+        print(f"  {fila.listado}/{fila.pagina}: {fila.estado}", file=sys.stderr)
+    return 1 if len(errores) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,769 @@
+"""
+geolab_engine.py
+================
+Motor de ingesta del listado de ensayos de laboratorio (GeoLab Viewer).
+
+Sin dependencia de Streamlit: puede usarse desde la app, desde notebooks o
+desde otras herramientas de cálculo. Ofrece:
+
+    load_and_clean(file)          -> DataFrame "ancho" tal como viene la hoja
+    compact_dtypes(df)            -> mismo DataFrame con tipos que ocupan menos
+    memory_report(antes, despues) -> memoria por columna antes/después
+    ingest_incremental(raw, prev) -> limpia y reordena solo las filas nuevas o
+                                     modificadas respecto a la ingesta anterior
+    to_long(df)                   -> tabla larga normalizada (una fila por valor)
+    sample_index(long)            -> índice de muestras (sample_id, prospección…)
+    cross_family(long, params)    -> parámetros de distintas familias, alineados
+                                     por muestra y profundidad
+    depth_bins(long, edges, by)   -> estadísticos por intervalo de profundidad
+    outlier_flags(long, by)       -> marcas de valor atípico (IQR, MAD, z robusto)
+    flag_matrix(long, flags)      -> marcas por fila del listado y parámetro
+    correlation_matrix(X)         -> matrices de correlación y de pares (n)
+    correlations(long, params, by)-> correlaciones por grupo desde la tabla larga
+    PAGES / page_subset(df, spec) -> definición y datos de cada página de ensayo
+
+La hoja repite los metadatos de muestra en tres bloques (sin sufijo, ``.1`` y
+``.2``); cada familia de ensayos lee su descripción y profundidad del bloque
+que le corresponde. La tabla larga resuelve ese reparto una sola vez.
+"""
+from __future__ import annotations
+import re
+
+import numpy as np
+import pandas as pd
+
+# --------------------------------------------------------------------------- #
+#  Columnas del listado                                                        #
+# --------------------------------------------------------------------------- #
+TEXT_COLS = {
+    "Unidad geotecnica", "Descripcion Muestra", "Descripcion Muestra.1",
+    "Descripcion Muestra.2", "Ensayo geotecnia", "Ensayo geotecnia.1",
+    "Ensayo geotecnia.2", "Clasificacion USCS", "Tipo Ensayo con drenaje",
+    "Tipo Ensayo sin drenaje", "Tipo Proctor", "Calificacion", "COL",
+    # include accented versions too
+    "Unidad geotécnica",
+    "Descripción Muestra", "Descripción Muestra.1", "Descripción Muestra.2",
+    "Clasificación USCS",
+    "Ángulo de Rozamiento con denaje", "Ángulo de Rozamiento sin denaje",
+    "Calificación",
+}
+
+COLS_SPT  = ["Unidad geotécnica","Descripción Muestra","Ensayo geotecnia",
+             "Profundidad inicial","ISPT_INC1","ISPT_INC2","ISPT_INC3","ISPT_INC4",
+             "SPT (valores centrales)","MI (valores centrales)"]
+COLS_GRAN = ["Descripción Muestra","Ensayo geotecnia","Profundidad inicial",
+             "20","5","2","0.4","0.08",
+             "Tamiz Grava","Tamiz Arena","Tamiz Finos","LL","LP","IP","Clasificación USCS"]
+COLS_ATTER= ["Descripción Muestra","Profundidad inicial","LL","LP","IP","Clasificación USCS"]
+COLS_QUIM = ["Descripción Muestra","Profundidad inicial","MO","SU",
+             "Sulfatos (mg/kg de suelo) Media.",
+             "Grado acidez (ml/kg de suelo seco) Medio","YE","SS","% CO3CA"]
+COLS_MEC  = ["Descripción Muestra.1","Ensayo geotecnia.1","Profundidad inicial.1",
+             "Peso específico","Densidad Seca Kn/m3","Densidad Húmeda KN/m3","Humedad",
+             "RCS (kpa)","Tipo Ensayo con drenaje",
+             "Ángulo de Rozamiento con denaje","Cohesión KPa con drenaje",
+             "Tipo Ensayo sin drenaje",
+             "Ángulo de Rozamiento sin denaje","Cohesión KPa sin drenaje"]
+COLS_CON  = ["Descripción Muestra.2","Ensayo geotecnia.2","Profundidad inicial.2",
+             "Indice de Poros","Presión de Preconsolidación (kPa)","Presión Hinchamiento",
+             "HL","Calificación","COL","Tipo Proctor","ρ KN","W","CBR","CBR 95%"]
+
+# Bloque de metadatos de muestra: (descripción, ensayo, profundidad)
+BLOQUES = {
+    0: ("Descripción Muestra", "Ensayo geotecnia", "Profundidad inicial"),
+    1: ("Descripción Muestra.1", "Ensayo geotecnia.1", "Profundidad inicial.1"),
+    2: ("Descripción Muestra.2", "Ensayo geotecnia.2", "Profundidad inicial.2"),
+}
+
+# Familia -> (bloque, columnas). El orden importa: un parámetro que aparece en
+# varias familias (LL, LP, IP) se asigna a la primera.
+FAMILIAS = {
+    "spt":           (0, COLS_SPT),
+    "atterberg":     (0, COLS_ATTER),
+    "granulometria": (0, COLS_GRAN),
+    "quimicos":      (0, COLS_QUIM),
+    "mecanicos":     (1, COLS_MEC),
+    "consolidacion": (2, COLS_CON),
+}
+
+# Páginas de GeoLab Viewer: columnas, parámetros numéricos, bloque de muestra
+# y perfiles (columna, etiqueta). Las usan la app y el informe por lotes.
+PAGES = {
+    "spt": {
+        "title": "SPT / MI", "cols": COLS_SPT,
+        "num_cols": ["ISPT_INC1","ISPT_INC2","ISPT_INC3","ISPT_INC4",
+                     "SPT (valores centrales)","MI (valores centrales)"],
+        "depth_col": "Profundidad inicial", "sample_col": "Descripción Muestra",
+        "profiles": [("SPT (valores centrales)","SPT"),
+                     ("MI (valores centrales)","MI"),
+                     ("ISPT_INC3","Inc3")],
+    },
+    "gran": {
+        "title": "Granulometría", "cols": COLS_GRAN,
+        "num_cols": ["Tamiz Grava","Tamiz Arena","Tamiz Finos","LL","LP","IP"],
+        "depth_col": "Profundidad inicial", "sample_col": "Descripción Muestra",
+        "profiles": [("Tamiz Grava","Grava (%)"),
+                     ("Tamiz Arena","Arena (%)"),
+                     ("Tamiz Finos","Finos (%)")],
+    },
+    "atter": {
+        "title": "Límites de Atterberg", "cols": COLS_ATTER,
+        "num_cols": ["LL","LP","IP"],
+        "depth_col": "Profundidad inicial", "sample_col": "Descripción Muestra",
+        "profiles": [("LL","Límite Líquido"),
+                     ("LP","Límite Plástico"),
+                     ("IP","Índice de Plasticidad")],
+    },
+    "mec": {
+        "title": "Parámetros Mecánicos", "cols": COLS_MEC,
+        "num_cols": ["Densidad Seca Kn/m3","Densidad Húmeda KN/m3","Humedad",
+                     "RCS (kpa)","Ángulo de Rozamiento con denaje","Cohesión KPa con drenaje",
+                     "Ángulo de Rozamiento sin denaje","Cohesión KPa sin drenaje"],
+        "depth_col": "Profundidad inicial.1", "sample_col": "Descripción Muestra.1",
+        "profiles": [("Densidad Seca Kn/m3","Dens. Seca"),
+                     ("Ángulo de Rozamiento con denaje","Ang CD"),
+                     ("Cohesión KPa con drenaje","Coh CD")],
+    },
+    "consol": {
+        "title": "Consolidación / CBR / Proctor", "cols": COLS_CON,
+        "num_cols": ["Indice de Poros","Presión de Preconsolidación (kPa)",
+                     "Presión Hinchamiento","HL","CBR","CBR 95%","ρ KN","W"],
+        "depth_col": "Profundidad inicial.2", "sample_col": "Descripción Muestra.2",
+        "profiles": [("CBR","CBR"),("CBR 95%","CBR 95%"),
+                     ("Indice de Poros","Indice de Poros")],
+    },
+    "quim": {
+        "title": "Ensayos Químicos", "cols": COLS_QUIM,
+        "num_cols": ["MO","SU","Sulfatos (mg/kg de suelo) Media.",
+                     "Grado acidez (ml/kg de suelo seco) Medio","YE","SS","% CO3CA"],
+        "depth_col": "Profundidad inicial", "sample_col": "Descripción Muestra",
+        "profiles": [("Sulfatos (mg/kg de suelo) Media.","Sulfatos"),
+                     ("MO","MO"),("% CO3CA","CO3Ca")],
+    },
+}
+
+# Resumen general: indicadores (etiqueta, columnas contadas) y perfiles
+# (columna, muestra, profundidad, título, etiqueta del eje)
+OVERVIEW_KPIS = [
+    ("SPT / MI", ["SPT (valores centrales)", "MI (valores centrales)"]),
+    ("Granulometrías", ["Tamiz Grava"]),
+    ("Atterberg", ["LL"]),
+    ("Mecánicos", ["Densidad Seca Kn/m3"]),
+    ("Consol/CBR", ["CBR"]),
+]
+OVERVIEW_PROFILES = [
+    ("SPT (valores centrales)", "Descripción Muestra", "Profundidad inicial",
+     "SPT vs Profundidad", "N SPT"),
+    ("MI (valores centrales)", "Descripción Muestra", "Profundidad inicial",
+     "MI vs Profundidad", "N MI"),
+    ("Tamiz Grava", "Descripción Muestra", "Profundidad inicial",
+     "Grava (%) vs Profundidad", "Grava (%)"),
+    ("Tamiz Arena", "Descripción Muestra", "Profundidad inicial",
+     "Arena (%) vs Profundidad", "Arena (%)"),
+    ("LL", "Descripción Muestra", "Profundidad inicial",
+     "LL vs Profundidad", "LL (%)"),
+    ("Densidad Seca Kn/m3", "Descripción Muestra.1", "Profundidad inicial.1",
+     "Densidad Seca vs Profundidad", "Dens. Seca (kN/m\u00b3)"),
+]
+
+LONG_KEYS = ["prospeccion", "muestra", "profundidad", "familia"]
+COL_UNIDAD = "Unidad geotécnica"
+COL_USCS = "Clasificación USCS"
+
+# Atributos de muestra del primer bloque que se propagan a toda la muestra en
+# la tabla larga: columna larga -> (columna del listado, valor si falta)
+SAMPLE_ATTRS = {"unidad": (COL_UNIDAD, "Sin unidad"),
+                "uscs": (COL_USCS, "Sin clasificar")}
+
+# compact_dtypes: texto -> category si hay como mucho esta proporción de valores
+# distintos; float64 -> float32 si ningún valor tiene más de FLOAT32_DIGITS
+# cifras significativas (las que float32 conserva exactas al mostrarlas).
+CAT_MAX_RATIO = 0.5
+FLOAT32_DIGITS = 6
+
+# Agrupaciones admitidas por depth_bins / outlier_flags -> columna de la tabla larga
+AGRUPACIONES = {"global": None, "prospeccion": "prospeccion", "unidad": "unidad",
+                "uscs": "uscs"}
+PERCENTILES = (0.10, 0.50, 0.90)
+
+# outlier_flags: criterios y umbrales
+#   iqr        fuera de [Q1 − k·IQR, Q3 + k·IQR]
+#   mad        |x − mediana| > k · 1.4826·MAD        (filtro de Hampel)
+#   z_robusto  0.6745·|x − mediana| / MAD > k        (Iglewicz & Hoaglin)
+OUTLIER_METODOS = {"iqr": 1.5, "mad": 3.0, "z_robusto": 3.5}
+OUTLIER_MIN_N = 4       # grupos más pequeños no se marcan
+
+CORR_METODOS = ("pearson", "spearman")
+CORR_MIN_N = 3          # pares con menos muestras comunes -> NaN
+
+
+# --------------------------------------------------------------------------- #
+#  Limpieza                                                                    #
+# --------------------------------------------------------------------------- #
+def to_float(x):
+    if pd.isna(x): return np.nan
+    try:
+        return float(str(x).replace(",", ".").strip())
+    except:
+        return np.nan
+
+def clean_col(s):
+    return s.apply(to_float)
+
+def prospect_from_sample(name):
+    if pd.isna(name): return "Desconocido"
+    name = str(name).strip()
+    m = re.match(r"([A-Za-z]+[-_]?\d+)", name)
+    if m: return m.group(1)
+    return name.split()[0] if name.split() else name
+
+def stats_metrics(s):
+    s2 = pd.to_numeric(s, errors="coerce").dropna()
+    if len(s2) == 0: return {}
+    q1, q3 = s2.quantile(0.25), s2.quantile(0.75)
+    iqr = q3 - q1
+    outliers = int(((s2 < q1 - 1.5*iqr) | (s2 > q3 + 1.5*iqr)).sum())
+    cv = round(s2.std() / s2.mean() * 100, 1) if s2.mean() != 0 else np.nan
+    return {"N": int(len(s2)), "Media": round(s2.mean(),3), "Mediana": round(s2.median(),3),
+            "Desv.Tip": round(s2.std(),3), "Min": round(s2.min(),3), "Max": round(s2.max(),3),
+            "CV(%)": cv, "Atipicos": outliers}
+
+def read_raw(file):
+    # KEY FIX: header=0 because row 0 IS the header (not row 1 or 2)
+    df = pd.read_excel(file, header=0)
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+def clean_frame(raw):
+    df = raw.copy()
+    for c in df.columns:
+        if c not in TEXT_COLS:
+            df[c] = clean_col(df[c])
+    return df
+
+def load_and_clean(file, compact=False):
+    df = clean_frame(read_raw(file))
+    return compact_dtypes(df) if compact else df
+
+
+# --------------------------------------------------------------------------- #
+#  Tipos compactos                                                             #
+# --------------------------------------------------------------------------- #
+def _fits_float32(v: np.ndarray, digits: int) -> bool:
+    x = np.abs(v[np.isfinite(v) & (v != 0)])
+    if len(x) == 0:
+        return True
+    info = np.finfo(np.float32)
+    if x.max() > info.max or x.min() < info.tiny:
+        return False
+    scale = 10.0 ** (digits - 1 - np.floor(np.log10(x)))
+    return bool(np.allclose(np.round(x * scale) / scale, x, rtol=1e-12, atol=0))
+
+
+def compact_dtypes(df: pd.DataFrame, cat_max_ratio: float = CAT_MAX_RATIO,
+                   digits: int = FLOAT32_DIGITS) -> pd.DataFrame:
+    """Texto de baja cardinalidad -> category; float64 -> float32 cuando todos
+    los valores de la columna caben en ``digits`` cifras significativas."""
+    cols = {}
+    for c in df.columns:
+        s = df[c]
+        if pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            n = int(s.notna().sum())
+            if n and s.nunique() <= cat_max_ratio * n:
+                s = s.astype("category")
+        elif s.dtype == np.float64 and _fits_float32(s.to_numpy(), digits):
+            s = s.astype(np.float32)
+        cols[c] = s
+    return pd.DataFrame(cols, index=df.index)
+
+
+def memory_report(antes: pd.DataFrame, despues: pd.DataFrame) -> pd.DataFrame:
+    """Memoria (KB) y tipo de cada columna antes y después, con fila TOTAL."""
+    return _informe_memoria(antes.dtypes.astype(str), despues.dtypes.astype(str),
+                            antes.memory_usage(deep=True, index=False),
+                            despues.memory_usage(deep=True, index=False))
+
+
+def _bytes_sin_compactar(s: pd.Series) -> tuple[str, int]:
+    """Tipo y bytes que ocuparía ``s`` antes de compact_dtypes (category ->
+    el tipo de sus categorías, float32 -> float64). La columna se reconstruye
+    de una en una y se descarta tras medirla."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(s.cat.categories.dtype)
+    elif s.dtype == np.float32:
+        s = s.astype(np.float64)
+    return str(s.dtype), int(s.memory_usage(deep=True, index=False))
+
+
+def compact_memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """memory_report de un DataFrame ya compactado (compact_dtypes) frente a
+    su versión sin compactar, reconstruida a partir de los tipos: no hace
+    falta conservar el original para informar de todo el listado."""
+    antes = {c: _bytes_sin_compactar(df[c]) for c in df.columns}
+    return _informe_memoria(pd.Series({c: t for c, (t, _) in antes.items()}, dtype=str),
+                            df.dtypes.astype(str),
+                            pd.Series({c: b for c, (_, b) in antes.items()}, dtype=float),
+                            df.memory_usage(deep=True, index=False))
+
+
+def _informe_memoria(tipo_a, tipo_d, bytes_a, bytes_d) -> pd.DataFrame:
+    kb_a, kb_d = bytes_a / 1024, bytes_d / 1024
+    rep = pd.DataFrame({
+        "Tipo antes": tipo_a, "Tipo después": tipo_d,
+        "KB antes": kb_a, "KB después": kb_d,
+    })
+    rep.loc["TOTAL"] = ["", "", kb_a.sum(), kb_d.sum()]
+    rep["Ahorro (%)"] = (100 * (1 - rep["KB después"] / rep["KB antes"])).round(1)
+    rep.index.name = "Columna"
+    return rep
+
+
+def subset(df, cols):
+    available = [c for c in cols if c in df.columns]
+    return df[available].copy() if available else pd.DataFrame()
+
+def page_subset(df: pd.DataFrame, spec: dict) -> pd.DataFrame:
+    """Columnas de una página de PAGES con la prospección en ``_prospect``."""
+    sub = subset(df, spec["cols"])
+    if sub.empty or spec["sample_col"] not in sub.columns:
+        return pd.DataFrame()
+    sub["_prospect"] = sub[spec["sample_col"]].apply(prospect_from_sample)
+    return sub
+
+def stats_table(series_dict) -> pd.DataFrame:
+    """stats_metrics de cada serie, una fila por parámetro."""
+    rows = []
+    for lbl, s in series_dict.items():
+        m = stats_metrics(s)
+        if m:
+            m["Parametro"] = lbl
+            rows.append(m)
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).set_index("Parametro")
+
+def overview_kpis(df: pd.DataFrame) -> dict:
+    """{etiqueta: nº de registros} del resumen general."""
+    def _count(col):
+        if col not in df.columns: return 0
+        return int(df[col].notna().sum())
+    kpis = {"Registros totales": len(df)}
+    for lbl, cols in OVERVIEW_KPIS:
+        kpis[lbl] = sum(_count(c) for c in cols)
+    return kpis
+
+
+# --------------------------------------------------------------------------- #
+#  Formato largo                                                               #
+# --------------------------------------------------------------------------- #
+def family_params(df: pd.DataFrame) -> dict:
+    """{familia: [parámetros numéricos presentes en df]} sin repeticiones."""
+    meta = {c for cols in BLOQUES.values() for c in cols}
+    vistos, out = set(), {}
+    for fam, (_, cols) in FAMILIAS.items():
+        params = [c for c in cols
+                  if c in df.columns and c not in meta and c not in TEXT_COLS
+                  and c not in vistos]
+        vistos.update(params)
+        out[fam] = params
+    return out
+
+
+def _melt(df: pd.DataFrame) -> pd.DataFrame:
+    """Parte fila a fila de to_long: un registro por valor numérico, con la
+    etiqueta de fila del DataFrame ancho en ``fila``."""
+    partes = []
+    for fam, params in family_params(df).items():
+        bloque = FAMILIAS[fam][0]
+        desc, _, prof = BLOQUES[bloque]
+        if not params or desc not in df.columns:
+            continue
+        ids = [desc] + [c for c in (prof,) if c in df.columns]
+        if bloque == 0:
+            ids += [c for c, _ in SAMPLE_ATTRS.values() if c in df.columns]
+        sub = df[ids + params].rename(columns={
+            desc: "muestra", prof: "profundidad",
+            **{c: attr for attr, (c, _) in SAMPLE_ATTRS.items()}})
+        for c in ("profundidad", *SAMPLE_ATTRS):
+            if c not in sub.columns:
+                sub = sub.assign(**{c: np.nan})
+        sub = sub[sub["muestra"].notna()].astype(
+            {c: object for c in ("muestra", *SAMPLE_ATTRS)})
+        sub = sub.assign(fila=sub.index)
+        larga = sub.melt(id_vars=["fila", "muestra", "profundidad", *SAMPLE_ATTRS],
+                         value_vars=params, var_name="parametro", value_name="valor")
+        larga = larga[larga["valor"].notna()]
+        larga["familia"] = fam
+        partes.append(larga)
+
+    if not partes:
+        return pd.DataFrame(columns=["fila", "muestra", "profundidad", *SAMPLE_ATTRS,
+                                     "parametro", "valor", "familia", "prospeccion"])
+    long = pd.concat(partes, ignore_index=True)
+    long["muestra"] = long["muestra"].astype(str).str.strip()
+    long["profundidad"] = pd.to_numeric(long["profundidad"], errors="coerce")
+    long["valor"] = long["valor"].astype(float)
+    long["prospeccion"] = long["muestra"].map(prospect_from_sample)
+    return long
+
+
+def _finish_long(long: pd.DataFrame) -> pd.DataFrame:
+    """Parte global de to_long: índice de muestra, atributos y categorías."""
+    cols = LONG_KEYS + ["parametro", "valor", *SAMPLE_ATTRS, "sample_id", "fila"]
+    if long.empty:
+        return pd.DataFrame(columns=cols)
+    long = long.copy()
+    long["sample_id"] = long.groupby(["prospeccion", "muestra", "profundidad"],
+                                     sort=True, dropna=False).ngroup()
+    for attr, (_, falta) in SAMPLE_ATTRS.items():
+        long[attr] = (long.groupby("sample_id")[attr].transform("first")
+                      .fillna(falta).astype(str))
+    for c in ("prospeccion", "familia", "parametro", *SAMPLE_ATTRS):
+        long[c] = long[c].astype(str).astype("category")
+    return long[cols].sort_values(["sample_id", "familia", "parametro", "fila"],
+                                  ignore_index=True)
+
+
+def to_long(df: pd.DataFrame) -> pd.DataFrame:
+    """Reordena los tres bloques de muestra en una tabla larga normalizada.
+
+    Columnas: prospeccion, muestra, profundidad, familia, parametro, valor,
+    unidad, uscs, sample_id y fila (etiqueta de la fila en ``df``). Solo se
+    guardan valores numéricos no vacíos; el resto de columnas de texto (tipo
+    de ensayo…) siguen disponibles en el DataFrame ancho. La unidad
+    geotécnica y la clasificación USCS solo figuran en el primer bloque y se
+    propagan a toda la muestra.
+    """
+    return _finish_long(_melt(df))
+
+
+def sample_index(long: pd.DataFrame) -> pd.DataFrame:
+    """Una fila por muestra física, indexada por sample_id, con las familias
+    de ensayo disponibles para ella."""
+    grupos = long.groupby("sample_id", sort=True, observed=True)
+    idx = grupos[["prospeccion", "muestra", "profundidad", *SAMPLE_ATTRS]].first()
+    idx["familias"] = grupos["familia"].agg(
+        lambda s: ", ".join(sorted(s.astype(str).unique())))
+    return idx
+
+
+def cross_family(long: pd.DataFrame, params: list[str]) -> pd.DataFrame:
+    """Tabla ancha con los parámetros pedidos (de cualquier familia), una fila
+    por muestra que tenga al menos uno de ellos."""
+    sel = long[long["parametro"].isin(params)]
+    ancha = sel.pivot_table(index="sample_id", columns="parametro",
+                            values="valor", aggfunc="mean", observed=True)
+    ancha = ancha.reindex(columns=[p for p in params if p in ancha.columns])
+    ancha.columns.name = None
+    meta = ["prospeccion", "muestra", "profundidad", *SAMPLE_ATTRS]
+    return sample_index(long)[meta].join(ancha, how="inner")
+
+
+# --------------------------------------------------------------------------- #
+#  Ingesta incremental                                                         #
+# --------------------------------------------------------------------------- #
+# Columnas que identifican una fila: descripción y profundidad de cada bloque
+ROW_KEY_COLS = [c for desc, _, prof in BLOQUES.values() for c in (desc, prof)]
+
+
+def _hash_rows(df: pd.DataFrame) -> np.ndarray:
+    if df.shape[1] == 0:
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+def row_fingerprints(raw: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """(clave, huella) de cada fila del listado sin limpiar.
+
+    La clave identifica la fila por muestra y profundidad de los tres bloques
+    (más un contador si se repiten); la huella cambia si cambia cualquier
+    celda.
+    """
+    base = _hash_rows(raw[[c for c in ROW_KEY_COLS if c in raw.columns]])
+    ocurrencia = pd.Series(base).groupby(base).cumcount().to_numpy()
+    claves = _hash_rows(pd.DataFrame({"k": base, "n": ocurrencia}))
+    return claves, _hash_rows(raw)
+
+
+def _compact_like(nuevas: pd.DataFrame, prev: pd.DataFrame) -> pd.DataFrame:
+    """compact_dtypes de las filas nuevas, con las categorías de ``prev``
+    ampliadas para que la concatenación siga siendo category."""
+    nuevas = compact_dtypes(nuevas)
+    for c in prev.columns:
+        if isinstance(prev[c].dtype, pd.CategoricalDtype):
+            extra = pd.Index(nuevas[c].dropna().unique()).difference(prev[c].cat.categories)
+            tipo = pd.CategoricalDtype(prev[c].cat.categories.append(extra))
+            nuevas[c] = nuevas[c].astype(object).astype(tipo)
+    return nuevas
+
+
+def _unir_categorias(df: pd.DataFrame, prev: pd.DataFrame) -> pd.DataFrame:
+    """Las columnas category de ``prev`` con las categorías ya ampliadas de
+    ``df`` (solo cambia el tipo: los códigos se conservan)."""
+    tipos = {c: df[c].dtype for c in prev.columns
+             if isinstance(prev[c].dtype, pd.CategoricalDtype)
+             and isinstance(df[c].dtype, pd.CategoricalDtype)}
+    return prev.astype(tipos) if tipos else prev
+
+
+def ingest_incremental(raw: pd.DataFrame, prev: dict | None = None, compact: bool = False
+                       ) -> tuple[dict, dict, pd.DataFrame | None]:
+    """Ingesta del listado reutilizando la anterior (``prev``).
+
+    Solo se limpian (clean_frame), reordenan (to_long) y, con ``compact``,
+    compactan (compact_dtypes) las filas cuya clave es nueva o cuya huella ha
+    cambiado; el resto se toma de ``prev``. Si las columnas del libro o
+    ``compact`` cambian, se rehace todo. El estado solo guarda claves,
+    huellas, ``df`` (compacto si se pide; la versión sin compactar de las
+    filas procesadas se descarta en cuanto se compacta) y ``long``. Devuelve
+    el estado, el recuento de cambios y, con ``compact``, el informe de
+    memoria de todo el listado (compact_memory_report; None sin compactar).
+    """
+    claves, huellas = row_fingerprints(raw)
+    n = len(raw)
+    if (prev is None or list(prev["df"].columns) != list(raw.columns)
+            or prev.get("compacto", False) != compact):
+        pos = np.full(n, -1)
+        igual = np.zeros(n, dtype=bool)
+        n_prev = 0 if prev is None else len(prev["claves"])
+    else:
+        pos = pd.Index(prev["claves"]).get_indexer(claves)
+        igual = (pos >= 0) & (prev["huellas"][np.clip(pos, 0, None)] == huellas)
+        n_prev = len(prev["claves"])
+
+    nuevas = clean_frame(raw[~igual]).set_axis(claves[~igual])
+    parcial = _melt(nuevas)
+    if compact:                               # la versión sin compactar se descarta aquí
+        nuevas = (_compact_like(nuevas, prev["df"]) if igual.any()
+                  else compact_dtypes(nuevas))
+    if igual.any():
+        viejas = prev["df"].iloc[pos[igual]].set_axis(claves[igual])
+        partes = [_unir_categorias(nuevas, viejas)] + ([nuevas] if len(nuevas) else [])
+        df = pd.concat(partes).reindex(claves)     # un bloque vacío volvería object las columnas
+        # filas de la tabla larga anterior que siguen igual, con los atributos
+        # de muestra de su propia fila (como en _melt), para que _finish_long
+        # los propague de nuevo sin las filas eliminadas
+        largo = prev["long"]
+        largo = largo[np.isin(largo["fila"].to_numpy(), pos[igual])]
+        fila_prev = largo["fila"].to_numpy()
+        bloque0 = largo["familia"].astype(str).map(lambda f: FAMILIAS[f][0] == 0).to_numpy()
+        propios = {attr: np.where(bloque0, prev["df"][col].astype(object).to_numpy()[fila_prev]
+                                  if col in prev["df"].columns else np.nan, np.nan)
+                   for attr, (col, _) in SAMPLE_ATTRS.items()}
+        largo = largo.assign(fila=prev["claves"][fila_prev], **propios)
+        parcial = pd.concat([largo.drop(columns="sample_id"), parcial], ignore_index=True)
+    else:
+        df = nuevas
+
+    filas = pd.Index(claves).get_indexer(parcial["fila"])
+    long = _finish_long(parcial.assign(fila=filas))
+    df = df.reset_index(drop=True)
+
+    modificadas = int(((pos >= 0) & ~igual).sum())
+    cambios = {"nuevas": int((pos < 0).sum()), "modificadas": modificadas,
+               "sin_cambios": int(igual.sum()),
+               "eliminadas": n_prev - int(igual.sum()) - modificadas}
+    estado = {"claves": claves, "huellas": huellas, "compacto": compact, "df": df,
+              "long": long}
+    return estado, cambios, compact_memory_report(df) if compact else None
+
+
+# --------------------------------------------------------------------------- #
+#  Agregación por intervalos de profundidad                                    #
+# --------------------------------------------------------------------------- #
+def make_edges(step: float, z_max: float, z_min: float = 0.0) -> np.ndarray:
+    """Límites de intervalo regulares que cubren [z_min, z_max]."""
+    if step <= 0:
+        raise ValueError("El paso de profundidad debe ser positivo")
+    n = max(int(np.ceil((z_max - z_min) / step)), 1)
+    return z_min + step * np.arange(n + 1)
+
+
+def depth_bins(long: pd.DataFrame, edges, by: str = "global",
+               params: list[str] | None = None) -> pd.DataFrame:
+    """Estadísticos de cada parámetro por intervalo de profundidad.
+
+    ``edges`` son los límites de intervalo (crecientes); ``by`` es una de
+    AGRUPACIONES. Todos los parámetros y grupos se agregan en una sola
+    pasada (np.digitize + groupby). Devuelve una fila por
+    (parametro, grupo, intervalo) con N, Media, P10, P50, P90, Min y Max,
+    además de los límites z_sup/z_inf y la profundidad media del intervalo.
+    """
+    if by not in AGRUPACIONES:
+        raise ValueError(f"Agrupación desconocida: {by!r}")
+    edges = np.asarray(edges, dtype=float)
+    if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+        raise ValueError("Los límites de intervalo deben ser crecientes")
+
+    sel = long if params is None else long[long["parametro"].isin(params)]
+    z = sel["profundidad"].to_numpy(dtype=float)
+    bins = np.digitize(z, edges) - 1
+    ok = (bins >= 0) & (bins < len(edges) - 1)          # NaN -> fuera
+    col = AGRUPACIONES[by]
+    datos = pd.DataFrame({
+        "parametro": sel["parametro"].astype(str).to_numpy()[ok],
+        "grupo": (sel[col].astype(str).to_numpy()[ok] if col else "Global"),
+        "intervalo": bins[ok],
+        "valor": sel["valor"].to_numpy(dtype=float)[ok],
+    })
+    claves = ["parametro", "grupo", "intervalo"]
+    out_cols = claves + ["z_sup", "z_inf", "z_med", "N", "Media",
+                         "P10", "P50", "P90", "Min", "Max"]
+    if datos.empty:
+        return pd.DataFrame(columns=out_cols)
+
+    g = datos.groupby(claves, sort=True)["valor"]
+    res = g.agg(N="count", Media="mean", Min="min", Max="max")
+    pct = g.quantile(list(PERCENTILES)).unstack()
+    pct.columns = [f"P{round(q * 100)}" for q in PERCENTILES]
+    res = res.join(pct).reset_index()
+    res["z_sup"] = edges[res["intervalo"]]
+    res["z_inf"] = edges[res["intervalo"] + 1]
+    res["z_med"] = 0.5 * (res["z_sup"] + res["z_inf"])
+    return res[out_cols]
+
+
+# --------------------------------------------------------------------------- #
+#  Valores atípicos                                                            #
+# --------------------------------------------------------------------------- #
+def outlier_flags(long: pd.DataFrame, by: str = "global",
+                  umbrales: dict | None = None) -> pd.DataFrame:
+    """Marca los valores atípicos de cada parámetro dentro de su grupo.
+
+    Todos los parámetros y grupos se evalúan a la vez con transformaciones
+    agrupadas. Devuelve un DataFrame alineado con ``long`` con el z robusto
+    (``z``) y una columna booleana por criterio de OUTLIER_METODOS, más
+    ``atipico`` (cualquiera de ellos). Los grupos con menos de OUTLIER_MIN_N
+    valores no se marcan.
+    """
+    if by not in AGRUPACIONES:
+        raise ValueError(f"Agrupación desconocida: {by!r}")
+    k = {**OUTLIER_METODOS, **(umbrales or {})}
+    col = AGRUPACIONES[by]
+    claves = [long["parametro"]] + ([long[col]] if col else [])
+    x = long["valor"].astype(float)
+    g = x.groupby(claves, observed=True, sort=False)
+
+    n = g.transform("count")
+    q1, q3 = g.transform("quantile", 0.25), g.transform("quantile", 0.75)
+    med = g.transform("median")
+    dev = (x - med).abs()
+    mad = dev.groupby(claves, observed=True, sort=False).transform("median")
+
+    iqr = q3 - q1
+    ok = n >= OUTLIER_MIN_N
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(mad > 0, 0.6745 * (x - med) / mad, 0.0)
+    flags = pd.DataFrame({
+        "z": z,
+        "iqr": ok & ((x < q1 - k["iqr"] * iqr) | (x > q3 + k["iqr"] * iqr)),
+        "mad": ok & (mad > 0) & (dev > k["mad"] * 1.4826 * mad),
+        "z_robusto": ok & (np.abs(z) > k["z_robusto"]),
+    }, index=long.index)
+    flags["atipico"] = flags[list(OUTLIER_METODOS)].any(axis=1)
+    return flags
+
+
+def flag_matrix(long: pd.DataFrame, flags: pd.DataFrame,
+                metodo: str = "atipico") -> pd.DataFrame:
+    """Matriz booleana fila del listado × parámetro con las marcas de
+    ``metodo`` (un criterio de OUTLIER_METODOS o ``atipico``)."""
+    if long.empty:
+        return pd.DataFrame(dtype=bool)
+    m = pd.DataFrame({"fila": long["fila"].to_numpy(),
+                      "parametro": long["parametro"].astype(str).to_numpy(),
+                      "flag": flags[metodo].to_numpy()})
+    mat = m.pivot_table(index="fila", columns="parametro", values="flag",
+                        aggfunc="any", fill_value=False)
+    mat.columns.name = None
+    return mat.astype(bool)
+
+
+# --------------------------------------------------------------------------- #
+#  Correlaciones entre parámetros                                              #
+# --------------------------------------------------------------------------- #
+def _spearman_pares(v: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Spearman por pares completos: los rangos de cada par se calculan solo
+    sobre sus filas comunes, como DataFrame.corr("spearman").
+
+    Cada columna se ordena una vez; para cada columna j, el rango medio de
+    x_i entre las filas donde hay x_j sale de contar en ese orden las filas
+    presentes (los empates comparten el rango medio de su grupo). r[i, j] es
+    la correlación de Pearson entre los rangos de x_i (filas con x_j) y los
+    de x_j (filas con x_i), que son las mismas filas."""
+    k, filas = v.shape[1], v.shape[0]
+    vt = v.T
+    orden = np.argsort(vt, axis=1, kind="stable")              # NaN al final
+    ordenado = np.take_along_axis(vt, orden, axis=1)
+    nuevo = np.ones((k, filas), dtype=bool)                     # empieza un grupo de empates
+    nuevo[:, 1:] = ordenado[:, 1:] != ordenado[:, :-1]
+    grupo = np.cumsum(nuevo.ravel()).reshape(k, filas) - 1
+    fin = np.ones((k, filas), dtype=bool)
+    fin[:, :-1] = nuevo[:, 1:]
+    valido = ~np.isnan(ordenado)
+
+    # a[j, :, i]: rango de x_i entre las filas con x_i y x_j, centrado en (n+1)/2
+    a = np.zeros((k, filas, k))
+    for j in range(k):
+        dentro = valido & ~np.isnan(v[:, j])[orden]
+        acumulado = np.cumsum(dentro, axis=1)
+        cuenta = np.bincount(grupo.ravel(), dentro.ravel(), grupo[-1, -1] + 1)
+        rango = acumulado[fin] - cuenta + (cuenta + 1) / 2
+        centrado = np.where(dentro, rango[grupo] - (n[:, [j]] + 1) / 2, 0.0)
+        np.put_along_axis(a[j].T, orden, centrado, axis=1)
+    cov = np.einsum("jri,irj->ij", a, a)
+    var = np.einsum("jri,jri->ij", a, a)                        # var[i, j] de x_i en el par
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return cov / np.sqrt(var * var.T)
+
+
+def correlation_matrix(X: pd.DataFrame, method: str = "pearson",
+                       min_n: int = CORR_MIN_N) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Correlación por pares completos entre las columnas de ``X``.
+
+    Las sumas de cada par se obtienen con productos matriciales sobre la
+    máscara de datos presentes (sin bucles sobre pares de columnas); en
+    Spearman los rangos se recalculan sobre las filas comunes de cada par,
+    como DataFrame.corr("spearman").
+    Devuelve (r, n): coeficientes y número de muestras comunes; r es NaN si
+    n < min_n o si una de las series es constante en el tramo común.
+    """
+    if method not in CORR_METODOS:
+        raise ValueError(f"Método desconocido: {method!r}")
+    X = X.apply(pd.to_numeric, errors="coerce")
+    v = X.to_numpy(dtype=float)
+    m = (~np.isnan(v)).astype(float)
+    n = m.T @ m                       # muestras comunes de cada par
+    if method == "spearman":
+        r = _spearman_pares(v, n)
+    else:
+        media = np.nansum(v, axis=0) / np.maximum(m.sum(axis=0), 1)
+        v0 = np.nan_to_num(v - media)     # centrar mejora la estabilidad numérica
+        s = v0.T @ m                      # s[i, j] = Σ x_i  (donde hay x_j)
+        ss = (v0 * v0).T @ m              # ss[i, j] = Σ x_i² (donde hay x_j)
+        sxy = v0.T @ v0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sxy - s * s.T / n
+            var_i = ss - s * s / n
+            r = cov / np.sqrt(var_i * var_i.T)
+    r = np.clip(r, -1.0, 1.0)
+    r[(n < min_n) | ~np.isfinite(r)] = np.nan
+
+    cols = X.columns
+    return (pd.DataFrame(r, index=cols, columns=cols),
+            pd.DataFrame(n.astype(int), index=cols, columns=cols))
+
+
+def correlations(long: pd.DataFrame, params: list[str], method: str = "pearson",
+                 by: str = "global", min_n: int = CORR_MIN_N) -> dict:
+    """{grupo: (r, n)} con las correlaciones de ``params`` alineados por
+    muestra (cross_family), para todo el listado o por grupo."""
+    if by not in AGRUPACIONES:
+        raise ValueError(f"Agrupación desconocida: {by!r}")
+    tabla = cross_family(long, params)
+    cols = [p for p in params if p in tabla.columns]
+    col = AGRUPACIONES[by]
+    if col is None:
+        return {"Global": correlation_matrix(tabla[cols], method, min_n)}
+    return {str(g): correlation_matrix(sub[cols], method, min_n)
+            for g, sub in tabla.groupby(col, observed=True, sort=True)}
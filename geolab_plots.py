@@ -0,0 +1,133 @@
+"""
+geolab_plots.py
+===============
+Figuras de GeoLab Viewer (matplotlib) sin dependencia de Streamlit.
+
+La app las muestra con st.pyplot y el informe por lotes (geolab_cli.py) las
+guarda en disco; ambos parten de las mismas funciones:
+
+    boxplot_panel(data_dict, title)         -> diagramas de caja con estadísticos
+    depth_profile(df, valor, muestra, z, …) -> puntos por prospección vs profundidad
+    binned_profile(tabla, title, xlabel)    -> media, P10–P90 y envolvente por tramo
+    correlation_heatmap(r, n, title)        -> matriz de correlación anotada con r y n
+"""
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.pyplot as plt
+
+from geolab_engine import prospect_from_sample, stats_metrics
+
+matplotlib.rcParams["font.family"] = "DejaVu Sans"
+
+def prospect_colors(label_series):
+    prospects = sorted(label_series.apply(prospect_from_sample).unique())
+    palette = plt.get_cmap("tab20", max(len(prospects), 1))
+    return {p: matplotlib.colors.to_hex(palette(i)) for i, p in enumerate(prospects)}
+
+def boxplot_panel(data_dict, title, ncols=3):
+    valid = {k: pd.to_numeric(v, errors="coerce").dropna()
+             for k, v in data_dict.items()}
+    valid = {k: v for k, v in valid.items() if len(v) > 0}
+    if not valid: return None
+    n = len(valid)
+    ncols = min(ncols, n)
+    nrows = int(np.ceil(n / ncols))
+    fig, axes = plt.subplots(nrows, ncols, figsize=(4.5*ncols, 3.8*nrows))
+    fig.suptitle(title, fontsize=13, fontweight="bold", color="#1a252f", y=1.01)
+    axes = np.array(axes).flatten()
+    for i, (lbl, s) in enumerate(valid.items()):
+        ax = axes[i]
+        ax.boxplot(s.values, patch_artist=True, widths=0.45,
+                   medianprops=dict(color="#e74c3c", linewidth=2.5),
+                   boxprops=dict(facecolor="#d6e4f0", color="#2471a3"),
+                   whiskerprops=dict(color="#2471a3", linewidth=1.5),
+                   capprops=dict(color="#2471a3", linewidth=1.5),
+                   flierprops=dict(marker="o", color="#e74c3c",
+                                   markerfacecolor="#e74c3c", markersize=6, alpha=0.8))
+        ax.set_title(lbl, fontsize=9.5, fontweight="bold", color="#1a252f")
+        ax.set_xticks([])
+        ax.grid(axis="y", linestyle="--", alpha=0.4)
+        ax.spines["top"].set_visible(False)
+        ax.spines["right"].set_visible(False)
+        m = stats_metrics(s)
+        info = ("N=" + str(m["N"]) + "  Med=" + str(m["Mediana"]) +
+                "\nMedia=" + str(m["Media"]) + "  DS=" + str(m["Desv.Tip"]) +
+                "\nCV=" + str(m["CV(%)"]) + "%  Atip=" + str(m["Atipicos"]))
+        ax.set_xlabel(info, fontsize=7.5, color="#5d6d7e")
+    for j in range(i+1, len(axes)):
+        axes[j].set_visible(False)
+    plt.tight_layout()
+    return fig
+
+def depth_profile(df_sub, value_col, label_col, depth_col, title, xlabel, invert_y=True):
+    sub = df_sub[[label_col, depth_col, value_col]].copy()
+    sub[value_col] = pd.to_numeric(sub[value_col], errors="coerce")
+    sub[depth_col] = pd.to_numeric(sub[depth_col], errors="coerce")
+    sub = sub.dropna(subset=[value_col, depth_col])
+    if sub.empty: return None
+    sub["_prospect"] = sub[label_col].apply(prospect_from_sample)
+    cmap = prospect_colors(sub[label_col])
+    fig, ax = plt.subplots(figsize=(5, 7))
+    for pname, grp in sub.groupby("_prospect"):
+        col = cmap.get(pname, "#2471a3")
+        ax.scatter(grp[value_col], grp[depth_col], color=col, s=55, label=pname,
+                   zorder=4, edgecolors="white", linewidths=0.5)
+    ax.set_xlabel(xlabel, fontsize=10)
+    ax.set_ylabel("Profundidad (m)", fontsize=10)
+    ax.set_title(title, fontsize=11, fontweight="bold", color="#1a252f")
+    if invert_y: ax.invert_yaxis()
+    ax.grid(linestyle="--", alpha=0.35)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.legend(fontsize=7.5, title="Prospeccion", title_fontsize=8, loc="best", framealpha=0.7)
+    plt.tight_layout()
+    return fig
+
+def binned_profile(tabla, title, xlabel, invert_y=True):
+    if tabla.empty: return None
+    grupos = sorted(tabla["grupo"].unique())
+    palette = plt.get_cmap("tab20", max(len(grupos), 1))
+    fig, ax = plt.subplots(figsize=(5, 7))
+    for gname, grp in tabla.groupby("grupo"):
+        col = matplotlib.colors.to_hex(palette(grupos.index(gname)))
+        ax.fill_betweenx(grp["z_med"], grp["Min"], grp["Max"], color=col, alpha=0.12,
+                         step="mid", linewidth=0)
+        ax.fill_betweenx(grp["z_med"], grp["P10"], grp["P90"], color=col, alpha=0.3,
+                         step="mid", linewidth=0)
+        ax.plot(grp["Media"], grp["z_med"], color=col, marker="o", markersize=4,
+                linewidth=1.8, label=gname + " (media)")
+        ax.plot(grp["P50"], grp["z_med"], color=col, linestyle="--", linewidth=1)
+    ax.set_xlabel(xlabel, fontsize=10)
+    ax.set_ylabel("Profundidad (m)", fontsize=10)
+    ax.set_title(title, fontsize=11, fontweight="bold", color="#1a252f")
+    if invert_y: ax.invert_yaxis()
+    ax.grid(linestyle="--", alpha=0.35)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.legend(fontsize=7.5, loc="best", framealpha=0.7)
+    plt.tight_layout()
+    return fig
+
+
+def correlation_heatmap(r, n, title):
+    if r.empty: return None
+    k = len(r)
+    size = max(4.5, 0.75 * k + 2)
+    fig, ax = plt.subplots(figsize=(size, size * 0.85))
+    im = ax.imshow(r.to_numpy(dtype=float), cmap="RdBu_r", vmin=-1, vmax=1)
+    ax.set_xticks(range(k))
+    ax.set_yticks(range(k))
+    ax.set_xticklabels(r.columns, rotation=45, ha="right", fontsize=8)
+    ax.set_yticklabels(r.index, fontsize=8)
+    if k <= 15:
+        for i in range(k):
+            for j in range(k):
+                val = r.iat[i, j]
+                txt = "—" if np.isnan(val) else format(val, ".2f")
+                ax.text(j, i, txt + "\nn=" + str(n.iat[i, j]), ha="center", va="center",
+                        fontsize=6.5, color="white" if abs(np.nan_to_num(val)) > 0.6 else "#1a252f")
+    ax.set_title(title, fontsize=11, fontweight="bold", color="#1a252f")
+    fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04, label="r")
+    plt.tight_layout()
+    return fig
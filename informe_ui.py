@@ -0,0 +1,84 @@
+"""
+informe_ui.py
+=============
+Descarga de informes bajo demanda, común a las calculadoras:
+
+    firma(*partes)                                   -> huella de las entradas
+    selector_motor(key)                              -> motor de la gráfica
+    descarga_bajo_demanda(clave, firma, construir, nombre)
+    descarga_html(clave, firma, construir, nombre)   -> HTML y, si hay weasyprint, PDF
+
+El informe no se genera en cada rerun: se muestra un botón "Preparar
+informe" y solo al pulsarlo se llama a `construir()` (normalmente una
+función con st.cache_data, de modo que el mismo caso no se rehace). Si las
+entradas o la selección cambian, la firma deja de coincidir y el botón de
+descarga vuelve a pedir que se prepare el informe.
+
+El informe HTML (informes_html) se genera en milisegundos, así que se
+ofrece directamente; su PDF sí se prepara bajo demanda.
+"""
+import hashlib
+
+import pandas as pd
+import streamlit as st
+
+import informes_html
+
+MIME_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+MOTORES = {"matplotlib": "Matplotlib (rápido, sin navegador)",
+           "kaleido": "Plotly / kaleido (idéntica a pantalla)"}
+
+
+def firma(*partes) -> str:
+    """sha1 de las entradas del informe (tablas por contenido, resto por repr)."""
+    h = hashlib.sha1()
+    for parte in partes:
+        if isinstance(parte, pd.DataFrame):
+            h.update(repr(list(parte.columns)).encode())
+            h.update(pd.util.hash_pandas_object(parte, index=False).to_numpy().tobytes())
+        else:
+            h.update(repr(parte).encode())
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def selector_motor(key: str) -> str:
+    """Motor con el que se rasteriza la gráfica del informe (ver rasterizado)."""
+    return st.radio("Gráfica del informe", list(MOTORES), format_func=MOTORES.get,
+                    horizontal=True, key=key)
+
+
+def descarga_bajo_demanda(clave: str, firma_actual: str, construir, nombre: str,
+                          etiqueta: str = "📄 Descargar Informe Word (.docx)",
+                          mime: str = MIME_DOCX, preparar: str = "📝 Preparar informe"):
+    """Botón "Preparar informe" y, una vez preparado para `firma_actual`,
+    botón de descarga con los bytes de `construir()`."""
+    if st.session_state.get(clave) != firma_actual:
+        if not st.button(preparar, key=f"{clave}_preparar"):
+            st.caption("El informe se genera al pulsar el botón con los datos y "
+                       "métodos seleccionados en ese momento.")
+            return
+        st.session_state[clave] = firma_actual
+    st.download_button(etiqueta, construir(), nombre, mime, type="primary",
+                       key=f"{clave}_descarga")
+
+
+def descarga_html(clave: str, firma_actual, construir, nombre: str):
+    """
+    Descarga del informe HTML `construir()` como `nombre`.html y, si
+    weasyprint está instalado, de su PDF. Con `firma_actual` el PDF se
+    prepara bajo demanda; con None (p. ej. dentro de la rama de un botón,
+    que no sobrevive al rerun) se genera directamente.
+    """
+    datos = construir()
+    st.download_button("🌐 Descargar Informe HTML", datos, f"{nombre}.html",
+                       informes_html.MIME_HTML, key=f"{clave}_html")
+    if not informes_html.pdf_disponible():
+        return
+    if firma_actual is None:
+        st.download_button("📄 Descargar Informe PDF", informes_html.pdf(datos),
+                           f"{nombre}.pdf", informes_html.MIME_PDF, key=f"{clave}_pdf")
+    else:
+        descarga_bajo_demanda(f"{clave}_pdf", firma_actual, lambda: informes_html.pdf(datos),
+                              f"{nombre}.pdf", "📄 Descargar Informe PDF",
+                              informes_html.MIME_PDF, preparar="📝 Preparar PDF")
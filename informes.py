@@ -0,0 +1,400 @@
+"""
+informes.py — Informes Word de las calculadoras, sin Streamlit
+==============================================================
+Generadores de los informes .docx que descargan las calculadoras y que
+genera por lotes lote_informes.py (en procesos sin interfaz):
+
+    docx_e_arenas(N, métodos, estadísticos, fig, tipo_suelo)   -> bytes
+    docx_e_arcillas(N, IP, Cu, OCR, métodos, estadísticos, fig) -> bytes
+    docx_phi(IP, Nspt, resultados, fórmulas)                   -> bytes
+    docx_cc(LL, IP, tabla)                                     -> bytes
+    barras(tabla, titulo, …)  -> figura (dict plotly) de la gráfica comparativa
+
+Todos parten de la misma plantilla (PLANTILLA: márgenes, fuentes y colores
+del documento modelo), que se lee una vez por proceso y se clona para cada
+informe con documento(). Las tablas se escriben con agregar_tabla(), que
+genera el XML de la tabla completa de una vez: con cientos de filas, editar
+celda a celda con python-docx era la mayor parte del tiempo del informe.
+
+La gráfica del informe se describe como dict plotly (no hace falta plotly
+para construirla) y se rasteriza con rasterizado.png, con el motor elegido.
+python-docx se importa al generar cada informe.
+"""
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+import rasterizado
+
+# Paletas plotly.express.colors.qualitative (las de la pantalla)
+PRISM = ["rgb(95, 70, 144)", "rgb(29, 105, 150)", "rgb(56, 166, 165)", "rgb(15, 133, 84)",
+         "rgb(115, 175, 72)", "rgb(237, 173, 8)", "rgb(225, 124, 5)", "rgb(204, 80, 62)",
+         "rgb(148, 52, 110)", "rgb(111, 64, 112)", "rgb(102, 102, 102)"]
+PASTEL = ["rgb(102, 197, 204)", "rgb(246, 207, 113)", "rgb(248, 156, 116)",
+          "rgb(220, 176, 242)", "rgb(135, 197, 95)", "rgb(158, 185, 243)",
+          "rgb(254, 136, 177)", "rgb(201, 219, 116)", "rgb(139, 224, 164)",
+          "rgb(180, 151, 231)", "rgb(179, 179, 179)"]
+ESTADISTICOS = ["Mínimo", "Máximo", "Promedio", "Mediana", "Desv. Típica"]
+PLANTILLA = Path(__file__).parent / "Resources" / "plantilla_informe.docx"
+ESTILO_TABLA = "Light List Accent 1"
+
+BIBLIOGRAFIA_E_ARENAS = [
+    "Begemann, H. K. S. (1974). General report for central and western Europe. Proceedings of the ESOPT, Stockholm.",
+    "Bowles, J. E. (1996). Foundation Analysis and Design (5th ed.). McGraw-Hill.",
+    "D'Appolonia, D. J., D'Appolonia, E., & Brissette, R. F. (1970). Settlement of spread footings on sand. Journal of the Soil Mechanics and Foundations Division, ASCE.",
+    "Denver, H. (1982). Modulus of elasticity for sand determined by SPT and CPT. Proceedings of the 2nd ESOPT, Amsterdam.",
+    "Meigh, A. C., & Nixon, I. K. (1961). Comparison of in-situ tests for granular soils. Proceedings of the 5th ICSMFE, Paris.",
+    "Schmertmann, J. H. (1970). Static cone to compute static settlement over sand. Journal of the Soil Mechanics and Foundations Division, ASCE.",
+    "Webb, D. L. (1969). Settlement of structures on deep alluvial sandy sediments. Proceedings of the Conference on In Situ Investigations in Soils and Rocks, BGS, London.",
+    "Wrench, B. P., & Nowatzki, E. A. (1986). A relationship between deformation modulus and SPT N for gravels. The Civil Engineer in South Africa."
+]
+
+BIBLIOGRAFIA_E_ARCILLAS = [
+    "CTE DB SE-C. Código Técnico de la Edificación. Seguridad Estructural - Cimientos.",
+    "Stroud, M. A. (1974). The standard penetration test in insensitive clays and soft rocks. Proceedings of the ESOPT, Stockholm.",
+    "Butler, F. G. (1975). Heavily overconsolidated clays. Settlement of Structures.",
+    "Bowles, J. E. (1996). Foundation Analysis and Design (5th ed.). McGraw-Hill."
+]
+
+
+def barras(tabla: pd.DataFrame, titulo: str, valor: str = "E (MPa)",
+           grupo: str = "Aplicación", etiqueta: str = "{Autor}: {valor:.1f} MPa",
+           paleta=PRISM) -> dict:
+    """
+    Barras horizontales de `valor` (una por fila, coloreadas por `grupo`),
+    como la gráfica de las calculadoras. `etiqueta` se formatea con las
+    columnas de la fila y `valor`.
+    """
+    filas = tabla.reset_index(drop=True)
+    trazas = []
+    for i, (nombre, g) in enumerate(filas.groupby(grupo, sort=False)):
+        trazas.append({
+            "type": "bar", "orientation": "h", "name": str(nombre),
+            "x": g[valor].astype(float).tolist(), "y": [str(j) for j in g.index],
+            "text": [etiqueta.format(**fila, valor=fila[valor])
+                     for fila in g.to_dict("records")],
+            "marker": {"color": paleta[i % len(paleta)]},
+            "textposition": "inside", "insidetextanchor": "start",
+            "textfont": {"size": 14, "color": "black"},
+        })
+    return {"data": trazas,
+            "layout": {"title": {"text": titulo}, "xaxis": {"title": {"text": valor}},
+                       "yaxis": {"visible": False}, "uniformtext": {"minsize": 14,
+                                                                    "mode": "show"},
+                       "legend": {"orientation": "h"}}}
+
+
+# --------------------------------------------------------------------------- #
+# Plantilla y tablas comunes a todos los informes
+# --------------------------------------------------------------------------- #
+def _estilar(doc):
+    """Márgenes y estilos del documento modelo (los de la plantilla)."""
+    from docx.shared import Inches, Pt, RGBColor
+
+    # Márgenes: 1.25" laterales, 1.0" verticales
+    for section in doc.sections:
+        section.left_margin = section.right_margin = Inches(1.25)
+        section.top_margin = section.bottom_margin = Inches(1.0)
+    for nombre, fuente, tamano, color in [
+            ("Normal", "Calibri", 11, None),
+            ("List Bullet", "Calibri", 11, None),
+            ("Title", "Calibri Light", 26, RGBColor(0x17, 0x36, 0x5D)),       # azul oscuro
+            ("Heading 1", "Calibri Light", 14, RGBColor(0x36, 0x5F, 0x91))]:  # azul medio
+        estilo = doc.styles[nombre]
+        estilo.font.name = fuente
+        estilo.font.size = Pt(tamano)
+        if color is not None:
+            estilo.font.color.rgb = color
+
+
+@lru_cache(maxsize=None)
+def _plantilla(ruta=None) -> bytes:
+    """Bytes de la plantilla; si el fichero no existe, se estiliza la de
+    python-docx (una sola vez por proceso)."""
+    ruta = Path(ruta or PLANTILLA)
+    if ruta.exists():
+        return ruta.read_bytes()
+    from docx import Document
+
+    doc = Document()
+    _estilar(doc)
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def documento(plantilla=None):
+    """Documento nuevo, copia de la plantilla (PLANTILLA por defecto)."""
+    from docx import Document
+
+    return Document(BytesIO(_plantilla(plantilla)))
+
+
+def _guardar(doc) -> bytes:
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _celdas(textos, prefijos, formato) -> str:
+    partes = []
+    for texto, prefijo in zip(textos, prefijos):
+        lineas = escape(str(texto)).split("\n")
+        partes.append(f'{prefijo}<w:r>{formato}<w:t xml:space="preserve">'
+                      + '</w:t><w:br/><w:t xml:space="preserve">'.join(lineas)
+                      + "</w:t></w:r></w:p></w:tc>")
+    return "<w:tr>" + "".join(partes) + "</w:tr>"
+
+
+def agregar_tabla(doc, encabezados, filas, anchos=None, estilo=ESTILO_TABLA,
+                  alineacion=None, alineacion_tabla=None, centrar_vertical=False,
+                  tamano=None):
+    """
+    Añade al final de `doc` una tabla con `encabezados` (en negrita) y una
+    fila por elemento de `filas` (textos o valores, uno por columna).
+
+    La tabla se construye como un único bloque XML en lugar de editar celda
+    a celda con python-docx, cuyo coste crece con el número de filas.
+
+    anchos            anchos de columna en pulgadas (None: a partes iguales
+                      y ajuste automático)
+    alineacion        alineación del texto: "left", "center", "right"
+    alineacion_tabla  alineación de la tabla en la página
+    centrar_vertical  centra el texto verticalmente en la celda
+    tamano            tamaño de letra en puntos (None: el del estilo)
+    """
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+    from docx.table import Table
+
+    n = len(encabezados)
+    try:
+        estilo_id = doc.styles[estilo].style_id
+    except KeyError:                    # la plantilla no trae el estilo
+        estilo_id = "TableGrid"
+    if anchos is None:
+        seccion = doc.sections[-1]
+        util = seccion.page_width - seccion.left_margin - seccion.right_margin
+        twips = [int(util / 635 / n)] * n            # 635 EMU por twip
+    else:
+        twips = [int(a * 1440) for a in anchos]
+
+    pr_tabla = [f'<w:tblStyle w:val="{estilo_id}"/>', '<w:tblW w:type="auto" w:w="0"/>']
+    if alineacion_tabla:
+        pr_tabla.append(f'<w:jc w:val="{alineacion_tabla}"/>')
+    if anchos is not None:
+        pr_tabla.append('<w:tblLayout w:type="fixed"/>')
+    pr_tabla.append('<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+                    'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>')
+
+    # Todo lo que precede al texto de cada celda es igual en toda la columna
+    v_align = '<w:vAlign w:val="center"/>' if centrar_vertical else ""
+    jc = f'<w:pPr><w:jc w:val="{alineacion}"/></w:pPr>' if alineacion else ""
+    prefijos = [f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{w}"/>{v_align}</w:tcPr><w:p>{jc}'
+                for w in twips]
+    sz = f'<w:sz w:val="{int(tamano * 2)}"/>' if tamano else ""
+    formato = f"<w:rPr>{sz}</w:rPr>" if sz else ""
+
+    xml = [f"<w:tbl {nsdecls('w')}><w:tblPr>", *pr_tabla, "</w:tblPr><w:tblGrid>",
+           *(f'<w:gridCol w:w="{w}"/>' for w in twips), "</w:tblGrid>",
+           _celdas(encabezados, prefijos, f"<w:rPr><w:b/>{sz}</w:rPr>")]
+    xml.extend(_celdas(fila, prefijos, formato) for fila in filas)
+    xml.append("</w:tbl>")
+    tbl = parse_xml("".join(xml))
+    doc.element.body._insert_tbl(tbl)
+    return Table(tbl, doc._body)
+
+
+def _fecha(doc):
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    p_fecha = doc.add_paragraph()
+    p_fecha.add_run(f'Fecha de emisión: {pd.Timestamp.now().strftime("%d/%m/%Y")}').bold = True
+    p_fecha.alignment = WD_ALIGN_PARAGRAPH.LEFT
+
+
+def _grafica(doc, fig, n_barras, motor_grafica, centrada=True):
+    """Gráfica rasterizada (rasterizado.png) a 6" de ancho, o el motivo por
+    el que no está disponible."""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches
+
+    try:
+        img_bytes = rasterizado.png(fig, 1300, n_barras * 60 + 200, escala=3,
+                                    motor=motor_grafica)
+        p = doc.add_paragraph()
+        if centrada:
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        # 6.0" es el ancho útil de la página con márgenes de 1.25"
+        p.add_run().add_picture(BytesIO(img_bytes), width=Inches(6.0))
+    except Exception as e:
+        doc.add_paragraph(f"[Gráfica no disponible: {str(e)}]")
+
+
+def _bibliografia(doc, referencias):
+    from docx.shared import Pt
+
+    for ref in referencias:
+        p = doc.add_paragraph(ref, style='List Bullet')
+        p.paragraph_format.space_after = Pt(6)
+
+
+def _metodos_e(df_final):
+    return ([str(row['Autor']), str(row['Aplicación']), str(row['Fórmula Original']),
+             f"{row['E (MPa)']:.2f}"] for row in df_final.to_dict("records"))
+
+
+# --------------------------------------------------------------------------- #
+# Informes
+# --------------------------------------------------------------------------- #
+def docx_e_arenas(n_val, df_final, df_stats, fig, tipo_suelo_selec,
+                  motor_grafica="matplotlib") -> bytes:
+    """Informe Word de E en suelos granulares (métodos de `df_final`)."""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    doc = documento()
+    doc.add_heading('Informe estimación Módulo de Elasticidad en Suelos Granulares', 0).alignment = WD_ALIGN_PARAGRAPH.LEFT
+    _fecha(doc)
+
+    # Sección 1
+    doc.add_heading('1. Datos de Entrada', level=1)
+    p = doc.add_paragraph()
+    p.add_run(f'• Valor N (SPT) de diseño: ').bold = True
+    p.add_run(f'{n_val} golpes/30 cm')
+
+    p2 = doc.add_paragraph()
+    p2.add_run(f'• Tipo de suelo seleccionado: ').bold = True
+    p2.add_run(f'{tipo_suelo_selec}')
+
+    # Sección 2 - Tabla Principal (anchos ajustados al margen de 1.25")
+    doc.add_heading('2. Métodos de Cálculo Seleccionados', level=1)
+    agregar_tabla(doc, ['Autor', 'Aplicación', 'Fórmula Original', 'E (MPa)'],
+                  _metodos_e(df_final), anchos=[2.0, 1.5, 2.0, 1.0],
+                  alineacion="center", centrar_vertical=True)
+
+    # Sección 3 - Estadísticas
+    doc.add_heading('3. Análisis Estadístico', level=1)
+    if df_stats is not None:
+        doc.add_paragraph('Resumen estadístico de los métodos seleccionados:')
+        agregar_tabla(doc, ESTADISTICOS,
+                      [[f"{df_stats.iloc[0][k]:.2f}" for k in ESTADISTICOS]],
+                      alineacion="right", alineacion_tabla="center", tamano=10)
+    else:
+        doc.add_paragraph('No procede cálculo estadístico (selección insuficiente).')
+
+    # Sección 4 - Gráfica
+    doc.add_heading('4. Gráfica Comparativa', level=1)
+    _grafica(doc, fig, len(df_final), motor_grafica)
+
+    doc.add_heading('5. Referencias Bibliográficas', level=1)
+    _bibliografia(doc, BIBLIOGRAFIA_E_ARENAS)
+    return _guardar(doc)
+
+
+def docx_e_arcillas(n_val, ip_val, cu_val, ocr_val, df_final, df_stats, fig,
+                    motor_grafica="matplotlib") -> bytes:
+    """Informe Word de E en suelos cohesivos (métodos de `df_final`)."""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    doc = documento()
+    doc.add_heading('Informe estimación Módulo de Elasticidad en Arcillas', 0).alignment = WD_ALIGN_PARAGRAPH.LEFT
+    _fecha(doc)
+
+    # Sección 1
+    doc.add_heading('1. Datos de Entrada', level=1)
+    datos_entrada = [
+        f"Valor N (SPT) de diseño: {n_val} golpes/30 cm",
+        f"Índice de Plasticidad (IP): {ip_val} %",
+        f"Cohesión sin drenaje (Cu): {cu_val} kPa",
+        f"Grado de Sobreconsolidación: {ocr_val}"
+    ]
+    for dato in datos_entrada:
+        doc.add_paragraph(dato, style='List Bullet')
+
+    # Sección 2 - Tabla
+    doc.add_heading('2. Métodos de Cálculo Seleccionados', level=1)
+    agregar_tabla(doc, ['Autor', 'Aplicación', 'Fórmula', 'E (MPa)'],
+                  _metodos_e(df_final), anchos=[2.0, 2.0, 1.5, 1.0],
+                  alineacion="center", centrar_vertical=True)
+
+    # Sección 3 - Estadísticas
+    doc.add_heading('3. Análisis Estadístico', level=1)
+    if df_stats is not None:
+        doc.add_paragraph('Resumen estadístico de los métodos seleccionados:')
+        agregar_tabla(doc, ESTADISTICOS,
+                      [[f"{df_stats.iloc[0][k]:.2f}" for k in ESTADISTICOS]],
+                      alineacion="right", alineacion_tabla="center")
+
+    # Sección 4 - Gráfica
+    doc.add_heading('4. Gráfica Comparativa', level=1)
+    _grafica(doc, fig, len(df_final), motor_grafica)
+
+    doc.add_heading('5. Referencias Bibliográficas', level=1)
+    _bibliografia(doc, BIBLIOGRAFIA_E_ARCILLAS)
+    return _guardar(doc)
+
+
+def docx_phi(IP, Nspt, resultados, formulas_usadas) -> bytes:
+    """Informe Word de φ con las correlaciones aplicables (phi.calcular)."""
+    doc = documento()
+    doc.add_heading('Informe de Cálculo del Ángulo de Rozamiento (φ)', level=1)
+
+    doc.add_heading('Datos Introducidos', level=2)
+    datos = []
+    if IP is not None:
+        datos.append(("Índice plástico (IP, %)", IP))
+    if Nspt is not None:
+        datos.append(("Número de golpes SPT (Nspt)", Nspt))
+    agregar_tabla(doc, ['Parámetro', 'Valor'], datos, estilo='Table Grid')
+
+    doc.add_heading('Resultados', level=2)
+    doc.add_paragraph(f"Se calcularon {len(resultados)} correlaciones para φ con los datos proporcionados.")
+
+    for metodo, valor in resultados.items():
+        doc.add_heading(metodo, level=3)
+        formula_info = formulas_usadas[metodo]
+        p = doc.add_paragraph()
+        run = p.add_run(f"Fórmula: {formula_info['formula']}")
+        run.bold = True
+        doc.add_paragraph(f"Parámetros usados: {', '.join(formula_info['parametros'])}")
+        if isinstance(valor, str):
+            doc.add_paragraph(f"Resultado: {valor}")
+        else:
+            doc.add_paragraph(f"Resultado: φ ≈ {valor:.2f}°")
+    return _guardar(doc)
+
+
+def docx_cc(LL, IP, tabla: pd.DataFrame, motor_grafica="matplotlib", otros=()) -> bytes:
+    """
+    Informe Word de Cc: `tabla` con las columnas Variable, Autor, Ecuación
+    y Cc de las fórmulas incluidas; `otros` añade datos de entrada
+    [(nombre, valor, unidad)] tras LL e IP.
+    """
+    doc = documento()
+    doc.add_heading('Informe de estimación del Índice de Compresión (Cc)', level=1)
+    _fecha(doc)
+
+    doc.add_heading('Datos de Entrada', level=2)
+    for nombre, v, unidad in [("Límite Líquido (LL)", LL, "%"),
+                              ("Índice de Plasticidad (IP)", IP, "%"), *otros]:
+        if v is not None and pd.notna(v):
+            doc.add_paragraph(f"{nombre}: {v:g} {unidad}".rstrip(), style='List Bullet')
+
+    doc.add_heading('Fórmulas Aplicadas', level=2)
+    agregar_tabla(doc, ['Variable', 'Autor', 'Fórmula', 'Cc'],
+                  ([f.Variable, f.Autor, f.Ecuación, f"{f.Cc:.4f}"]
+                   for f in tabla.itertuples()), estilo='Table Grid')
+
+    doc.add_heading('Análisis Estadístico', level=2)
+    cc = tabla["Cc"].astype(float)
+    stats = [cc.min(), cc.max(), cc.mean(), cc.median(), cc.std() if len(cc) > 1 else 0.0]
+    agregar_tabla(doc, ESTADISTICOS, [[f"{v:.3f}" for v in stats]], estilo='Table Grid')
+
+    doc.add_heading('Gráfica Comparativa', level=2)
+    fig = barras(tabla, f"Cc (LL={LL}, IP={IP})", valor="Cc", grupo="Variable",
+                 etiqueta="{Autor}: {valor:.3f}")
+    _grafica(doc, fig, len(tabla), motor_grafica, centrada=False)
+    return _guardar(doc)
@@ -0,0 +1,369 @@
+"""
+informes_html.py — Informes HTML autocontenidos (y PDF opcional)
+================================================================
+Alternativa ligera a los informes Word de informes.py para intercambio
+rápido: un único fichero .html, sin recursos externos, con las gráficas como
+SVG en línea. Lo usan las calculadoras y GeoLab Viewer (geolab_cli.py).
+
+    html_e_arenas(N, métodos, estadísticos, fig, tipo_suelo)   -> bytes
+    html_e_arcillas(N, IP, Cu, OCR, métodos, estadísticos, fig) -> bytes
+    html_phi(IP, Nspt, resultados, fórmulas)                   -> bytes
+    html_cc(LL, IP, tabla)                                     -> bytes
+    documento(titulo, bloques) -> iterador de trozos de texto
+    escribir(destino, titulo, bloques)
+    pdf(html) -> bytes            (necesita weasyprint; ver pdf_disponible())
+
+El informe se genera en una sola pasada de la plantilla: documento() emite
+la cabecera, después cada bloque (las tablas fila a fila) y el pie, de modo
+que escribir() lo vuelca a disco sin tenerlo entero en memoria. Las
+gráficas de barras se dibujan como SVG directamente desde la figura (dict
+plotly de informes.barras), sin matplotlib, kaleido ni navegador: el informe
+tarda milisegundos frente a los cientos del .docx con su PNG.
+
+Solo usa la biblioteca estándar; weasyprint es opcional y solo para PDF.
+"""
+from __future__ import annotations
+import html
+import importlib.util
+import io
+import math
+from string import Template
+
+import pandas as pd
+
+from informes import BIBLIOGRAFIA_E_ARCILLAS, BIBLIOGRAFIA_E_ARENAS, ESTADISTICOS, barras
+
+MIME_HTML = "text/html"
+MIME_PDF = "application/pdf"
+
+# Estilos del documento modelo de los informes Word (márgenes, Calibri,
+# azules del título y los encabezados, tablas "Light List Accent 1")
+ESTILO = """
+@page { size: A4; margin: 1in 1.25in; }
+body { font-family: Calibri, Carlito, "Segoe UI", Arial, sans-serif; font-size: 11pt;
+       color: #222; max-width: 46em; margin: 2em auto; padding: 0 1em; line-height: 1.35; }
+h1, h2, h3 { font-family: "Calibri Light", Calibri, Carlito, Arial, sans-serif;
+             font-weight: normal; }
+h1 { font-size: 26pt; color: #17365D; border-bottom: 1px solid #4F81BD;
+     padding-bottom: 4px; margin-bottom: .3em; }
+h2 { font-size: 14pt; color: #365F91; margin-top: 1.4em; }
+h3 { font-size: 12pt; color: #4F81BD; margin-bottom: .2em; }
+table { border-collapse: collapse; margin: .6em 0; border: 1px solid #4F81BD; }
+th { background: #4F81BD; color: #fff; font-weight: bold; }
+th, td { padding: 3px 8px; border-top: 1px solid #4F81BD; vertical-align: middle; }
+table.centro th, table.centro td { text-align: center; }
+table.derecha th, table.derecha td { text-align: right; }
+table.derecha { margin-left: auto; margin-right: auto; }
+.fecha { font-weight: bold; }
+figure { margin: 1em 0; text-align: center; }
+svg { max-width: 100%; height: auto; }
+li { margin-bottom: 6pt; }
+"""
+
+_PLANTILLA = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$titulo</title>
+<style>$estilo</style>
+</head>
+<body>
+<h1>$titulo</h1>
+$cuerpo
+</body>
+</html>
+"""
+_CABECERA, _PIE = _PLANTILLA.split("$cuerpo")
+_CABECERA = Template(_CABECERA)
+
+# Colores de plotly por defecto, para trazas sin marker.color
+_COLORES = ["#636efa", "#EF553B", "#00cc96", "#ab63fa", "#FFA15A", "#19d3f3"]
+
+
+def _e(texto) -> str:
+    return html.escape(str(texto))
+
+
+# --------------------------------------------------------------------------- #
+# Plantilla y bloques
+# --------------------------------------------------------------------------- #
+def documento(titulo: str, bloques):
+    """Trozos del informe: cabecera, cada bloque y pie. Un bloque es un texto
+    HTML o un iterable de textos (p. ej. tabla(), que se emite fila a fila)."""
+    yield _CABECERA.substitute(titulo=_e(titulo), estilo=ESTILO)
+    for bloque in bloques:
+        if isinstance(bloque, str):
+            yield bloque
+        else:
+            yield from bloque
+    yield _PIE
+
+
+def render(titulo: str, bloques) -> bytes:
+    return "".join(documento(titulo, bloques)).encode("utf-8")
+
+
+def escribir(destino, titulo: str, bloques):
+    """Escribe el informe en `destino` (ruta o fichero de texto) a medida que
+    se genera."""
+    if isinstance(destino, io.TextIOBase):
+        destino.writelines(documento(titulo, bloques))
+        return
+    with open(destino, "w", encoding="utf-8") as f:
+        f.writelines(documento(titulo, bloques))
+
+
+def encabezado(texto: str, nivel: int = 2) -> str:
+    return f"<h{nivel}>{_e(texto)}</h{nivel}>\n"
+
+
+def parrafo(texto: str, clase: str | None = None) -> str:
+    atributo = f' class="{clase}"' if clase else ""
+    return f"<p{atributo}>{_e(texto)}</p>\n"
+
+
+def lista(elementos) -> str:
+    """Lista con viñetas; cada elemento es un texto o (etiqueta en negrita, valor)."""
+    items = []
+    for el in elementos:
+        if isinstance(el, tuple):
+            items.append(f"<li><b>{_e(el[0])}</b> {_e(el[1])}</li>")
+        else:
+            items.append(f"<li>{_e(el)}</li>")
+    return "<ul>\n" + "\n".join(items) + "\n</ul>\n"
+
+
+def fecha() -> str:
+    return parrafo(f'Fecha de emisión: {pd.Timestamp.now().strftime("%d/%m/%Y")}', "fecha")
+
+
+def tabla(encabezados, filas, clase: str | None = None):
+    """Tabla HTML, emitida fila a fila. `clase`: "centro" o "derecha"."""
+    atributo = f' class="{clase}"' if clase else ""
+    yield (f"<table{atributo}>\n<thead><tr>"
+           + "".join(f"<th>{_e(h)}</th>" for h in encabezados) + "</tr></thead>\n<tbody>\n")
+    for fila in filas:
+        yield "<tr>" + "".join(f"<td>{_e(v)}</td>" for v in fila) + "</tr>\n"
+    yield "</tbody>\n</table>\n"
+
+
+def tabla_df(df: pd.DataFrame, index: bool = True, decimales: int = 3, clase=None):
+    """tabla() de un DataFrame, con los números redondeados a `decimales`."""
+    def celda(v):
+        if isinstance(v, float):
+            return "" if math.isnan(v) else f"{v:.{decimales}f}"
+        return v
+
+    encabezados = ([df.index.name or ""] if index else []) + [str(c) for c in df.columns]
+    filas = df.itertuples(index=index, name=None)
+    return tabla(encabezados, ([celda(v) for v in fila] for fila in filas), clase)
+
+
+def figura(svg: str) -> str:
+    return f"<figure>\n{svg}\n</figure>\n"
+
+
+# --------------------------------------------------------------------------- #
+# Gráficas SVG
+# --------------------------------------------------------------------------- #
+def _paso(maximo: float) -> float:
+    """Paso "redondo" (1, 2 o 5 × 10^k) para unas 5 divisiones del eje."""
+    bruto = maximo / 5
+    base = 10 ** math.floor(math.log10(bruto))
+    return next(m * base for m in (1, 2, 5, 10) if m * base >= bruto)
+
+
+def barras_svg(fig, ancho: int = 900, alto_barra: int = 34) -> str:
+    """
+    Barras horizontales de una figura plotly (o su dict, p. ej. el de
+    informes.barras) dibujadas como SVG: una barra por valor, con su texto
+    dentro al inicio, eje X con rejilla, título y leyenda por traza.
+    """
+    spec = fig if isinstance(fig, dict) else fig.to_plotly_json()
+    layout = spec.get("layout") or {}
+    titulo = layout.get("title") or {}
+    titulo = titulo.get("text", "") if isinstance(titulo, dict) else titulo
+    eje = (layout.get("xaxis") or {}).get("title") or {}
+    eje = eje.get("text", "") if isinstance(eje, dict) else eje
+
+    filas: dict = {}                       # categoría -> fila (orden de aparición)
+    valores, leyenda = [], []
+    for i, t in enumerate(spec.get("data") or []):
+        color = (t.get("marker") or {}).get("color") or _COLORES[i % len(_COLORES)]
+        textos = list(t.get("text") or [])
+        for j, (y, x) in enumerate(zip(list(t.get("y") or []), list(t.get("x") or []))):
+            fila = filas.setdefault(str(y), len(filas))
+            valores.append((fila, max(float(x), 0.0), textos[j] if j < len(textos) else "",
+                            color))
+        if t.get("name"):
+            leyenda.append((t["name"], color))
+
+    n = max(len(filas), 1)
+    izq, der, arriba = 10, 30, 44
+    abajo = 50 + (26 if leyenda else 0)
+    alto = arriba + n * alto_barra + abajo
+    maximo = max((x for _, x, _, _ in valores), default=0.0) or 1.0
+    paso = _paso(maximo)
+    tope = math.ceil(maximo / paso) * paso
+    escala = (ancho - izq - der) / tope
+    base = arriba + n * alto_barra
+
+    p = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {ancho} {alto}" '
+         f'width="{ancho}" height="{alto}" font-family="Calibri, Carlito, Arial, sans-serif" '
+         f'role="img" aria-label="{_e(titulo)}">',
+         f'<text x="{izq}" y="24" font-size="17" fill="#2a3f5f">{_e(titulo)}</text>']
+    for k in range(int(round(tope / paso)) + 1):
+        x = izq + k * paso * escala
+        p.append(f'<line x1="{x:.1f}" y1="{arriba}" x2="{x:.1f}" y2="{base}" '
+                 f'stroke="#e5ecf6"/>'
+                 f'<text x="{x:.1f}" y="{base + 16}" font-size="12" text-anchor="middle" '
+                 f'fill="#444">{k * paso:g}</text>')
+    # la primera categoría abajo, como en plotly
+    for fila, x, texto, color in valores:
+        y = arriba + (n - 1 - fila) * alto_barra
+        p.append(f'<rect x="{izq}" y="{y + 3}" width="{x * escala:.1f}" '
+                 f'height="{alto_barra - 6}" fill="{_e(color)}"/>'
+                 f'<text x="{izq + 5}" y="{y + alto_barra / 2 + 5:.1f}" font-size="14">'
+                 f'{_e(texto)}</text>')
+    p.append(f'<line x1="{izq}" y1="{base}" x2="{ancho - der}" y2="{base}" stroke="#444"/>'
+             f'<text x="{(izq + ancho - der) / 2:.0f}" y="{base + 36}" font-size="14" '
+             f'text-anchor="middle">{_e(eje)}</text>')
+    x = izq
+    for nombre, color in leyenda:
+        p.append(f'<rect x="{x}" y="{alto - 20}" width="12" height="12" fill="{_e(color)}"/>'
+                 f'<text x="{x + 17}" y="{alto - 10}" font-size="12">{_e(nombre)}</text>')
+        x += 30 + 7 * len(str(nombre))
+    p.append("</svg>")
+    return "\n".join(p)
+
+
+def svg_matplotlib(fig) -> str:
+    """SVG en línea de una figura matplotlib (sin la cabecera XML)."""
+    buffer = io.StringIO()
+    fig.savefig(buffer, format="svg", bbox_inches="tight")
+    svg = buffer.getvalue()
+    return svg[svg.index("<svg"):]
+
+
+# --------------------------------------------------------------------------- #
+# PDF (opcional)
+# --------------------------------------------------------------------------- #
+def pdf_disponible() -> bool:
+    return importlib.util.find_spec("weasyprint") is not None
+
+
+def pdf(documento_html) -> bytes:
+    """PDF de un informe HTML con weasyprint, en local (el HTML no tiene
+    recursos externos)."""
+    try:
+        from weasyprint import HTML
+    except ImportError as exc:
+        raise ImportError("La exportación a PDF necesita weasyprint "
+                          "(pip install weasyprint)") from exc
+    if isinstance(documento_html, bytes):
+        documento_html = documento_html.decode("utf-8")
+    return HTML(string=documento_html).write_pdf()
+
+
+# --------------------------------------------------------------------------- #
+# Informes de las calculadoras (mismo contenido que los .docx de informes.py)
+# --------------------------------------------------------------------------- #
+def _metodos_e(df_final):
+    return ([row['Autor'], row['Aplicación'], row['Fórmula Original'],
+             f"{row['E (MPa)']:.2f}"] for row in df_final.to_dict("records"))
+
+
+def _estadisticos_e(df_stats):
+    return tabla(ESTADISTICOS, [[f"{df_stats.iloc[0][k]:.2f}" for k in ESTADISTICOS]],
+                 "derecha")
+
+
+def html_e_arenas(n_val, df_final, df_stats, fig, tipo_suelo_selec) -> bytes:
+    """Informe HTML de E en suelos granulares (métodos de `df_final`)."""
+    return render('Informe estimación Módulo de Elasticidad en Suelos Granulares', [
+        fecha(),
+        encabezado('1. Datos de Entrada'),
+        lista([('Valor N (SPT) de diseño:', f'{n_val} golpes/30 cm'),
+               ('Tipo de suelo seleccionado:', tipo_suelo_selec)]),
+        encabezado('2. Métodos de Cálculo Seleccionados'),
+        tabla(['Autor', 'Aplicación', 'Fórmula Original', 'E (MPa)'], _metodos_e(df_final),
+              "centro"),
+        encabezado('3. Análisis Estadístico'),
+        *([parrafo('Resumen estadístico de los métodos seleccionados:'),
+           _estadisticos_e(df_stats)] if df_stats is not None else
+          [parrafo('No procede cálculo estadístico (selección insuficiente).')]),
+        encabezado('4. Gráfica Comparativa'),
+        figura(barras_svg(fig)),
+        encabezado('5. Referencias Bibliográficas'),
+        lista(BIBLIOGRAFIA_E_ARENAS),
+    ])
+
+
+def html_e_arcillas(n_val, ip_val, cu_val, ocr_val, df_final, df_stats, fig) -> bytes:
+    """Informe HTML de E en suelos cohesivos (métodos de `df_final`)."""
+    return render('Informe estimación Módulo de Elasticidad en Arcillas', [
+        fecha(),
+        encabezado('1. Datos de Entrada'),
+        lista([f"Valor N (SPT) de diseño: {n_val} golpes/30 cm",
+               f"Índice de Plasticidad (IP): {ip_val} %",
+               f"Cohesión sin drenaje (Cu): {cu_val} kPa",
+               f"Grado de Sobreconsolidación: {ocr_val}"]),
+        encabezado('2. Métodos de Cálculo Seleccionados'),
+        tabla(['Autor', 'Aplicación', 'Fórmula', 'E (MPa)'], _metodos_e(df_final), "centro"),
+        encabezado('3. Análisis Estadístico'),
+        *([parrafo('Resumen estadístico de los métodos seleccionados:'),
+           _estadisticos_e(df_stats)] if df_stats is not None else []),
+        encabezado('4. Gráfica Comparativa'),
+        figura(barras_svg(fig)),
+        encabezado('5. Referencias Bibliográficas'),
+        lista(BIBLIOGRAFIA_E_ARCILLAS),
+    ])
+
+
+def html_phi(IP, Nspt, resultados, formulas_usadas) -> bytes:
+    """Informe HTML de φ con las correlaciones aplicables (phi.calcular)."""
+    datos = []
+    if IP is not None:
+        datos.append(("Índice plástico (IP, %)", IP))
+    if Nspt is not None:
+        datos.append(("Número de golpes SPT (Nspt)", Nspt))
+    bloques = [encabezado('Datos Introducidos'), tabla(['Parámetro', 'Valor'], datos),
+               encabezado('Resultados'),
+               parrafo(f"Se calcularon {len(resultados)} correlaciones para φ con los "
+                       f"datos proporcionados.")]
+    for metodo, valor in resultados.items():
+        formula_info = formulas_usadas[metodo]
+        resultado = valor if isinstance(valor, str) else f"φ ≈ {valor:.2f}°"
+        bloques += [encabezado(metodo, 3),
+                    f"<p><b>Fórmula: {_e(formula_info['formula'])}</b></p>\n",
+                    parrafo(f"Parámetros usados: {', '.join(formula_info['parametros'])}"),
+                    parrafo(f"Resultado: {resultado}")]
+    return render('Informe de Cálculo del Ángulo de Rozamiento (φ)', bloques)
+
+
+def html_cc(LL, IP, tabla_cc: pd.DataFrame) -> bytes:
+    """
+    Informe HTML de Cc: `tabla_cc` con las columnas Variable, Autor, Ecuación
+    y Cc de las fórmulas incluidas.
+    """
+    entradas = [f"{nombre}: {v:g} {unidad}" for nombre, v, unidad in
+                [("Límite Líquido (LL)", LL, "%"), ("Índice de Plasticidad (IP)", IP, "%")]
+                if v is not None and pd.notna(v)]
+    cc = tabla_cc["Cc"].astype(float)
+    stats = [cc.min(), cc.max(), cc.mean(), cc.median(), cc.std() if len(cc) > 1 else 0.0]
+    fig = barras(tabla_cc, f"Cc (LL={LL}, IP={IP})", valor="Cc", grupo="Variable",
+                 etiqueta="{Autor}: {valor:.3f}")
+    return render('Informe de estimación del Índice de Compresión (Cc)', [
+        fecha(),
+        encabezado('Datos de Entrada'),
+        lista(entradas),
+        encabezado('Fórmulas Aplicadas'),
+        tabla(['Variable', 'Autor', 'Fórmula', 'Cc'],
+              ([f.Variable, f.Autor, f.Ecuación, f"{f.Cc:.4f}"]
+               for f in tabla_cc.itertuples())),
+        encabezado('Análisis Estadístico'),
+        tabla(ESTADISTICOS, [[f"{v:.3f}" for v in stats]]),
+        encabezado('Gráfica Comparativa'),
+        figura(barras_svg(fig)),
+    ])
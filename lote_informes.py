@@ -0,0 +1,233 @@
+"""
+lote_informes.py — Informes Word por lotes, en un ZIP
+=====================================================
+Genera un informe .docx por fila (muestra, capa o caso) y magnitud (E en
+arenas, E en arcillas, φ, Cc) a partir de una tabla de entradas o de un
+listado de laboratorio, en paralelo, y los escribe en un ZIP a medida que
+terminan: en memoria solo hay los informes en curso (`ventana`), nunca el
+lote completo.
+
+Entradas (columnas de la tabla; la primera que exista y tenga valor):
+    e_arenas    N
+    e_arcillas  N, IP, Cu, OCR (clase o índice; por defecto --ocr)
+    phi         IP, Nspt
+    cc          LL, IP
+Un listado de laboratorio (.xlsx de geolab_engine) se convierte en una fila
+por muestra: golpeo central del SPT, IP, LL y cohesión sin drenaje.
+
+El ZIP incluye resumen.csv con el estado de cada informe (ok, sin datos o
+el error). Las gráficas se rasterizan con rasterizado.py, así que las
+repetidas entre informes se reutilizan desde la caché.
+
+Ejecutar:
+    python lote_informes.py casos.csv -o informes.zip
+    python lote_informes.py listado.xlsx -o informes.zip --magnitudes phi,cc -j 8
+"""
+from __future__ import annotations
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+
+from correlaciones.spt import COL_N
+
+MAGNITUDES = ("e_arenas", "e_arcillas", "phi", "cc")
+COL_CU = "Cohesión KPa sin drenaje"
+
+# magnitud -> {variable: columnas aceptadas, por orden de preferencia}
+COLUMNAS = {
+    "e_arenas":   {"N": ("N", "Nspt", COL_N)},
+    "e_arcillas": {"N": ("N", "Nspt", COL_N), "IP": ("IP",), "Cu": ("Cu", COL_CU),
+                   "OCR": ("OCR",)},
+    "phi":        {"IP": ("IP",), "Nspt": ("Nspt", "N", COL_N)},
+    "cc":         {"LL": ("LL",), "IP": ("IP",)},
+}
+PARAMETROS_LISTADO = [COL_N, "IP", "LL", COL_CU]
+
+
+def _slug(texto: str) -> str:
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode()
+    return re.sub(r"[^0-9A-Za-z]+", "_", texto).strip("_") or "caso"
+
+
+def leer_tabla(ruta) -> pd.DataFrame:
+    """Tabla de entradas (.csv o .xlsx) o listado de laboratorio (una fila por
+    muestra, con prospeccion, muestra y profundidad)."""
+    ruta = Path(ruta)
+    if ruta.suffix.lower() == ".csv":
+        return pd.read_csv(ruta)
+    tabla = pd.read_excel(ruta)
+    tabla.columns = [str(c).strip() for c in tabla.columns]
+    if "Descripción Muestra" not in tabla.columns:
+        return tabla
+    from geolab_engine import clean_frame, cross_family, to_long
+
+    return cross_family(to_long(clean_frame(tabla)), PARAMETROS_LISTADO)
+
+
+def _entradas(fila: dict, columnas: dict) -> dict:
+    entradas = {}
+    for variable, candidatas in columnas.items():
+        valor = next((fila[c] for c in candidatas if c in fila and pd.notna(fila[c])), None)
+        entradas[variable] = valor
+    return entradas
+
+
+def casos(tabla: pd.DataFrame, magnitudes=MAGNITUDES, col_nombre: str | None = None,
+          tipo_suelo: str = "Mostrar Todo", ocr=0):
+    """(fichero, magnitud, entradas) de cada fila y magnitud de `tabla`.
+
+    El nombre sale de `col_nombre`, de la columna "muestra" (listados) o del
+    número de fila; se deduplica añadiendo la fila."""
+    col_nombre = col_nombre or ("muestra" if "muestra" in tabla.columns else None)
+    vistos = set()
+    for i, fila in enumerate(tabla.to_dict("records")):
+        nombre = _slug(fila[col_nombre]) if col_nombre else f"fila_{i + 1:04d}"
+        if nombre in vistos:
+            nombre = f"{nombre}_{i + 1}"
+        vistos.add(nombre)
+        for magnitud in magnitudes:
+            entradas = _entradas(fila, COLUMNAS[magnitud])
+            if magnitud == "e_arenas":
+                entradas["tipo_suelo"] = tipo_suelo
+            if magnitud == "e_arcillas" and entradas["OCR"] is None:
+                entradas["OCR"] = ocr
+            yield f"{nombre}_{magnitud}.docx", magnitud, entradas
+
+
+def informe(magnitud: str, entradas: dict, motor: str = "matplotlib") -> bytes | None:
+    """Informe .docx de un caso con todas las correlaciones aplicables
+    (None si no se puede aplicar ninguna)."""
+    import informes
+    from correlaciones import elasticidad, phi, registro
+
+    if magnitud == "phi":
+        resultados, formulas = phi.calcular(entradas["IP"], entradas["Nspt"])
+        return informes.docx_phi(entradas["IP"], entradas["Nspt"], resultados, formulas) \
+            if resultados else None
+    if magnitud == "cc":
+        tabla = (registro.tabla("cc", LL=entradas["LL"], IP=entradas["IP"])
+                 .rename(columns={"Grupo": "Variable", "Valor": "Cc"}))
+        return informes.docx_cc(entradas["LL"], entradas["IP"], tabla, motor) \
+            if len(tabla) else None
+
+    N = entradas["N"]
+    if magnitud == "e_arenas":
+        if N is None:
+            return None
+        tabla = elasticidad.filtrar_arenas(elasticidad.arenas(N), entradas["tipo_suelo"])
+        titulo = f"Módulo de Elasticidad (N={N:g}) - {entradas['tipo_suelo']}"
+        etiqueta, paleta = "{Autor} ({Aplicación}): {valor:.1f} MPa", informes.PRISM
+    else:
+        ocr = entradas["OCR"]
+        ocr = elasticidad.OCR_CATEGORIAS[int(ocr)] if not isinstance(ocr, str) else ocr
+        tabla = elasticidad.arcillas(N, entradas["IP"], entradas["Cu"], ocr)
+        titulo = f"Módulo de Elasticidad (N={N}, IP={entradas['IP']}, Cu={entradas['Cu']})"
+        etiqueta, paleta = "{Autor}: {valor:.1f} MPa", informes.PASTEL
+    if tabla.empty:
+        return None
+    stats = elasticidad.estadisticas(tabla["E (MPa)"])
+    fig = informes.barras(tabla, titulo, etiqueta=etiqueta, paleta=paleta)
+    if magnitud == "e_arenas":
+        return informes.docx_e_arenas(N, tabla, stats if len(tabla) >= 2 else None, fig,
+                                      entradas["tipo_suelo"], motor)
+    return informes.docx_e_arcillas(N, entradas["IP"], entradas["Cu"], ocr, tabla, stats,
+                                    fig, motor)
+
+
+def _tarea(fichero: str, magnitud: str, entradas: dict, motor: str):
+    try:
+        return fichero, magnitud, informe(magnitud, entradas, motor), None
+    except Exception as exc:                 # un caso malo no detiene el lote
+        return fichero, magnitud, None, f"{type(exc).__name__}: {exc}"
+
+
+def generar_zip(lista_casos, destino, procesos: int | None = None,
+                motor: str = "matplotlib", ventana: int | None = None,
+                progreso=None) -> pd.DataFrame:
+    """
+    Escribe en el ZIP `destino` (ruta o fichero binario) el informe de cada
+    caso de `lista_casos` (ver casos()) a medida que terminan.
+
+    procesos  tamaño del pool (1 = en este proceso, sin pool)
+    ventana   informes en curso como máximo (por defecto 4 × procesos)
+    progreso  función opcional llamada con (hechos, fichero) tras cada uno
+    Devuelve el resumen (fichero, magnitud, estado) en el orden de escritura.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    ventana = ventana or 4 * procesos
+    filas = []
+    # los .docx ya van comprimidos: se guardan sin recomprimir
+    with zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_STORED) as zf:
+        def escribir(fichero, magnitud, datos, error):
+            if datos is not None:
+                zf.writestr(fichero, datos)
+            filas.append({"fichero": fichero, "magnitud": magnitud,
+                          "estado": error or ("ok" if datos is not None else "sin datos")})
+            if progreso:
+                progreso(len(filas), fichero)
+
+        if procesos == 1:
+            for caso in lista_casos:
+                escribir(*_tarea(*caso, motor))
+        else:
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                pendientes = set()
+                for caso in lista_casos:
+                    pendientes.add(pool.submit(_tarea, *caso, motor))
+                    if len(pendientes) >= ventana:
+                        hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                        for fut in hechos:
+                            escribir(*fut.result())
+                for fut in wait(pendientes).done:
+                    escribir(*fut.result())
+        resumen = pd.DataFrame(filas, columns=["fichero", "magnitud", "estado"])
+        zf.writestr("resumen.csv", resumen.to_csv(index=False).encode("utf-8-sig"))
+    return resumen
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Informes Word por lotes (E, φ, Cc) en un ZIP.")
+    ap.add_argument("entradas", help="Tabla de casos (.csv/.xlsx) o listado de laboratorio")
+    ap.add_argument("-o", "--salida", default="informes.zip",
+                    help="ZIP de salida (por defecto: informes.zip)")
+    ap.add_argument("--magnitudes", default=",".join(MAGNITUDES),
+                    help="Magnitudes separadas por comas: " + ",".join(MAGNITUDES))
+    ap.add_argument("--nombre", help="Columna con el nombre de cada caso")
+    ap.add_argument("--tipo-suelo", default="Mostrar Todo",
+                    help="Filtro de aplicación de E en arenas (Arenas, Gravas, …)")
+    ap.add_argument("--ocr", type=int, default=0,
+                    help="Clase de OCR (índice) si la tabla no tiene columna OCR")
+    ap.add_argument("--motor", default="matplotlib", choices=("matplotlib", "kaleido"),
+                    help="Motor de las gráficas (por defecto: matplotlib)")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                    help="Procesos en paralelo (por defecto: nº de núcleos)")
+    args = ap.parse_args(argv)
+
+    magnitudes = [m.strip() for m in args.magnitudes.split(",") if m.strip()]
+    malas = [m for m in magnitudes if m not in MAGNITUDES]
+    if malas:
+        ap.error("magnitud no reconocida: " + ", ".join(malas))
+
+    tabla = leer_tabla(args.entradas)
+    inicio = time.perf_counter()
+    resumen = generar_zip(casos(tabla, magnitudes, args.nombre, args.tipo_suelo, args.ocr),
+                          args.salida, args.jobs, args.motor)
+    estados = resumen["estado"].where(resumen["estado"].isin(["ok", "sin datos"]), "error")
+    cuenta = estados.value_counts()
+    print(f"{cuenta.get('ok', 0)} informe(s), {cuenta.get('sin datos', 0)} sin datos, "
+          f"{cuenta.get('error', 0)} con error en {args.salida} "
+          f"({time.perf_counter() - inicio:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
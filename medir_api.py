@@ -0,0 +1,149 @@
+"""
+medir_api.py — Prueba de carga de la API local de correlaciones
+===============================================================
+Lanza `--peticiones` lotes de `--casos` casos aleatorios (dentro del rango
+`atlas` de cada variable) contra servidor_correlaciones con `--concurrencia`
+clientes a la vez y da el rendimiento (peticiones y casos por segundo) y la
+latencia (mediana, P95 y máxima) de cada modo:
+
+    sincrono   POST /calcular/<calculadora>
+    trabajos   POST /trabajos/<calculadora> y espera al resultado (sondeo)
+
+Sin --url arranca el servidor en este proceso, en un puerto libre.
+
+Ejecutar:
+    python medir_api.py
+    python medir_api.py --calculadora phi --casos 2000 --peticiones 200 -c 16
+    python medir_api.py --url http://127.0.0.1:8765 --modo trabajos --casos 50000
+"""
+from __future__ import annotations
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+
+def casos_aleatorios(calculadora: str, n: int, semilla: int = 0) -> dict:
+    """Columnas de `n` casos aleatorios para `calculadora`."""
+    from correlaciones import registro
+
+    rng = np.random.default_rng(semilla)
+    if calculadora == "n1_60":
+        return {"profundidad": rng.uniform(0.5, 30, n).round(2).tolist(),
+                "N": rng.integers(2, 60, n).tolist()}
+    casos = {}
+    for v, spec in registro.variables(calculadora).items():
+        if spec.get("categorias"):
+            casos[v] = rng.integers(0, len(spec["categorias"]), n).tolist()
+        else:
+            casos[v] = rng.uniform(*spec["atlas"], n).round(2).tolist()
+    return casos
+
+
+class _Cliente(threading.local):
+    """Una conexión persistente por hilo."""
+
+    def conexion(self, host, puerto):
+        if getattr(self, "con", None) is None:
+            self.con = http.client.HTTPConnection(host, puerto, timeout=600)
+        return self.con
+
+    def pedir(self, host, puerto, metodo, ruta, cuerpo=None):
+        con = self.conexion(host, puerto)
+        try:
+            con.request(metodo, ruta, cuerpo, {"Content-Type": "application/json"})
+            r = con.getresponse()
+            return r.status, r.read()
+        except (http.client.HTTPException, OSError):
+            con.close()
+            self.con = None
+            raise
+
+
+def _peticion(cliente, host, puerto, modo, calculadora, cuerpo, sondeo):
+    inicio = time.perf_counter()
+    if modo == "sincrono":
+        estado, datos = cliente.pedir(host, puerto, "POST", f"/calcular/{calculadora}", cuerpo)
+    else:
+        estado, datos = cliente.pedir(host, puerto, "POST", f"/trabajos/{calculadora}", cuerpo)
+        if estado == 202:
+            url = json.loads(datos)["url"]
+            while (r := cliente.pedir(host, puerto, "GET", url))[0] == 202:
+                time.sleep(sondeo)
+            estado, datos = r
+    return time.perf_counter() - inicio, estado == 200
+
+
+def medir(url: str, modo: str, calculadora: str, casos: int, peticiones: int,
+          concurrencia: int, sondeo: float = 0.005) -> dict:
+    """Rendimiento y latencias (s) de `peticiones` lotes de `casos` casos."""
+    partes = urlsplit(url)
+    host, puerto = partes.hostname, partes.port or 80
+    cuerpos = [json.dumps({"casos": casos_aleatorios(calculadora, casos, i)}).encode()
+               for i in range(min(peticiones, 16))]
+    cliente = _Cliente()
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(concurrencia) as pool:
+        res = list(pool.map(lambda i: _peticion(cliente, host, puerto, modo, calculadora,
+                                                cuerpos[i % len(cuerpos)], sondeo),
+                            range(peticiones)))
+    total = time.perf_counter() - inicio
+    latencias = [t for t, _ in res]
+    return {"modo": modo, "peticiones": peticiones, "errores": sum(not ok for _, ok in res),
+            "peticiones/s": peticiones / total, "casos/s": peticiones * casos / total,
+            "mediana": statistics.median(latencias),
+            "p95": float(np.percentile(latencias, 95)), "max": max(latencias)}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Prueba de carga de servidor_correlaciones: "
+                                             "rendimiento y latencia P95.")
+    ap.add_argument("--url", help="Servidor ya arrancado (por defecto: uno en este proceso)")
+    ap.add_argument("--calculadora", default="e_arcillas",
+                    help="cc, phi, e_arenas, e_arcillas o n1_60 (por defecto: e_arcillas)")
+    ap.add_argument("--modo", default="ambos", choices=("sincrono", "trabajos", "ambos"))
+    ap.add_argument("--casos", type=int, default=100, help="Casos por petición")
+    ap.add_argument("--peticiones", type=int, default=500)
+    ap.add_argument("-c", "--concurrencia", type=int, default=8, help="Clientes simultáneos")
+    ap.add_argument("-j", "--jobs", type=int, default=None,
+                    help="Procesos del servidor local (por defecto: nº de núcleos)")
+    args = ap.parse_args(argv)
+
+    servidor = None
+    url = args.url
+    if url is None:
+        import servidor_correlaciones
+
+        servidor = servidor_correlaciones.crear_servidor(puerto=0, procesos=args.jobs,
+                                                         max_sincrono=max(args.casos, 1))
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        url = "http://127.0.0.1:%d" % servidor.server_address[1]
+    modos = ("sincrono", "trabajos") if args.modo == "ambos" else (args.modo,)
+    try:
+        medidas = [medir(url, modo, args.calculadora, args.casos, args.peticiones,
+                         args.concurrencia) for modo in modos]
+    finally:
+        if servidor is not None:
+            servidor.shutdown()
+            servidor.server_close()
+
+    print(f"{args.calculadora}: {args.peticiones} peticiones de {args.casos} casos, "
+          f"{args.concurrencia} clientes ({url})")
+    print(f"{'modo':<10}  {'pet/s':>8}  {'casos/s':>10}  {'mediana ms':>10}  "
+          f"{'P95 ms':>8}  {'máx ms':>8}  {'errores':>7}")
+    for m in medidas:
+        print(f"{m['modo']:<10}  {m['peticiones/s']:>8.1f}  {m['casos/s']:>10.0f}  "
+              f"{m['mediana'] * 1000:>10.1f}  {m['p95'] * 1000:>8.1f}  "
+              f"{m['max'] * 1000:>8.1f}  {m['errores']:>7}")
+    return 1 if any(m["errores"] for m in medidas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
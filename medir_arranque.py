@@ -0,0 +1,80 @@
+"""
+medir_arranque.py — Tiempo de importación en frío
+=================================================
+Mide con `python -X importtime` (cada módulo en un intérprete nuevo) lo que
+cuesta importar el núcleo de cálculo `correlaciones` frente a las
+dependencias de interfaz que las calculadoras cargan solo al dibujar o al
+generar el informe (streamlit, plotly, python-docx).
+
+Para cada módulo se indica el tiempo acumulado de su importación (µs del
+propio árbol de `-X importtime`), el tiempo total del intérprete y si el
+núcleo ha arrastrado alguna dependencia de interfaz.
+
+Ejecutar:
+    python medir_arranque.py
+    python medir_arranque.py -n 5 correlaciones.phi plotly.express
+"""
+from __future__ import annotations
+import argparse
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+NUCLEO = ["correlaciones", "correlaciones.registro", "correlaciones.elasticidad",
+          "correlaciones.phi", "correlaciones.cc", "correlaciones.spt",
+          "correlaciones.montecarlo", "correlaciones.barrido", "correlaciones.atlas"]
+INTERFAZ = ["streamlit", "plotly.express", "plotly.graph_objects", "docx"]
+RAICES_INTERFAZ = ("streamlit", "plotly", "docx")
+
+_LINEA = re.compile(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)")
+
+
+def medir(modulo: str) -> dict:
+    """Una importación de `modulo` en un intérprete nuevo."""
+    inicio = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                          capture_output=True, text=True, cwd=Path(__file__).parent)
+    total = time.perf_counter() - inicio
+    if proc.returncode != 0:
+        return {"modulo": modulo, "disponible": False}
+    cargados, acumulado = set(), 0
+    for linea in proc.stderr.splitlines():
+        m = _LINEA.match(linea)
+        if not m:
+            continue
+        nombre = m.group(4)
+        cargados.add(nombre.split(".")[0])
+        if nombre == modulo:
+            acumulado = int(m.group(2))
+    return {"modulo": modulo, "disponible": True, "import_ms": acumulado / 1000,
+            "interprete_ms": total * 1000,
+            "interfaz": sorted(cargados.intersection(RAICES_INTERFAZ))}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Tiempo de importación en frío "
+                                             "(núcleo de cálculo frente a interfaz).")
+    ap.add_argument("modulos", nargs="*", help="módulos a medir (por defecto, "
+                                               "el núcleo y las dependencias de interfaz)")
+    ap.add_argument("-n", "--repeticiones", type=int, default=3,
+                    help="importaciones por módulo; se toma la más rápida")
+    args = ap.parse_args(argv)
+
+    modulos = args.modulos or NUCLEO + INTERFAZ
+    ancho = max(map(len, modulos))
+    print(f"{'módulo':<{ancho}}  {'import (ms)':>11}  {'intérprete (ms)':>15}  interfaz")
+    for modulo in modulos:
+        medidas = [medir(modulo) for _ in range(max(args.repeticiones, 1))]
+        if not medidas[0]["disponible"]:
+            print(f"{modulo:<{ancho}}  {'no instalado':>11}")
+            continue
+        mejor = min(medidas, key=lambda r: r["import_ms"])
+        print(f"{modulo:<{ancho}}  {mejor['import_ms']:>11.1f}  "
+              f"{mejor['interprete_ms']:>15.1f}  {', '.join(mejor['interfaz']) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
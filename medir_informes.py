@@ -0,0 +1,85 @@
+"""
+medir_informes.py — Tiempo y tamaño del informe Word frente al HTML
+===================================================================
+Genera el informe de E en arenas (todas las correlaciones para un N) en
+cada formato y da la mediana de `-n` repeticiones y el tamaño del fichero:
+
+    docx (frío)   gráfica rasterizada con matplotlib, sin caché de PNG
+    docx          con el PNG ya en caché (el caso más favorable del .docx)
+    html          SVG en línea (informes_html)
+    pdf           el HTML con weasyprint, si está instalado
+
+Ejecutar:
+    python medir_informes.py
+    python medir_informes.py -n 20 --filas 500
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _medir(construir, repeticiones: int, preparar=None):
+    tiempos, datos = [], b""
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        datos = construir()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos), len(datos)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Tiempo y tamaño del informe .docx frente al "
+                                             "HTML autocontenido.")
+    ap.add_argument("-n", "--repeticiones", type=int, default=10)
+    ap.add_argument("--filas", type=int, default=0,
+                    help="repite los métodos hasta tener al menos estas filas")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CORRELACIONES_CACHE"] = tmp
+        import pandas as pd
+        import informes
+        import informes_html
+        import rasterizado
+        from correlaciones import elasticidad
+
+        rasterizado.DIR_CACHE = Path(tmp) / "png"
+        tabla = elasticidad.arenas(20)
+        if args.filas > len(tabla):
+            tabla = pd.concat([tabla] * -(-args.filas // len(tabla)), ignore_index=True)
+        stats = elasticidad.estadisticas(tabla["E (MPa)"])
+        fig = informes.barras(tabla, "Módulo de Elasticidad (N=20) - Mostrar Todo",
+                              etiqueta="{Autor} ({Aplicación}): {valor:.1f} MPa")
+        docx = lambda: informes.docx_e_arenas(20, tabla, stats, fig, "Mostrar Todo")  # noqa: E731
+        html = lambda: informes_html.html_e_arenas(20, tabla, stats, fig, "Mostrar Todo")  # noqa: E731
+        docx(), html()                                   # importaciones y plantilla
+
+        def sin_cache():
+            rasterizado.vaciar_memoria()
+            for png in Path(tmp).rglob("*.png"):
+                png.unlink()
+
+        n = max(args.repeticiones, 1)
+        medidas = {"docx (frío)": _medir(docx, n, sin_cache), "docx": _medir(docx, n),
+                   "html": _medir(html, n)}
+        if informes_html.pdf_disponible():
+            datos = html()
+            medidas["pdf"] = _medir(lambda: informes_html.pdf(datos), n)
+
+    print(f"{len(tabla)} métodos, mediana de {n} informes")
+    print(f"{'formato':<12}  {'ms':>8}  {'kB':>8}  {'× html':>8}")
+    base = medidas["html"][0]
+    for formato, (ms, tamano) in medidas.items():
+        print(f"{formato:<12}  {ms:>8.1f}  {tamano / 1024:>8.1f}  {ms / base:>8.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
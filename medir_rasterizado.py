@@ -0,0 +1,96 @@
+"""
+medir_rasterizado.py — Latencia y memoria de los motores de gráfica
+===================================================================
+Compara los motores de rasterizado.py con la gráfica de barras del informe
+de E en arenas (todas las correlaciones para un N): cada motor se mide en
+un intérprete nuevo, sin la caché de PNG, y se informa de
+
+    frío (ms)      primera imagen, incluidas importaciones y arranque
+    caliente (ms)  mediana de las siguientes
+    RSS pico (MB)  memoria máxima del proceso más la de sus hijos
+                   (Chromium de kaleido, que se cierra antes de medir)
+
+Ejecutar:
+    python medir_rasterizado.py
+    python medir_rasterizado.py -n 20 --motores matplotlib
+"""
+from __future__ import annotations
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ANCHO, ESCALA = 1300, 3
+
+
+def figura_ejemplo(N: float = 20) -> dict:
+    """Figura del informe de arenas con todas las correlaciones (sin plotly)."""
+    import informes
+    from correlaciones import elasticidad
+
+    tabla = elasticidad.arenas(N)
+    fig = informes.barras(tabla, f"Módulo de Elasticidad (N={N:g}) - Mostrar Todo",
+                          etiqueta="{Autor} ({Aplicación}): {valor:.1f} MPa")
+    return fig, len(tabla) * 60 + 200
+
+
+def _hijo(motor: str, repeticiones: int) -> dict:
+    """Mide `motor` en este proceso (se llama en un intérprete nuevo)."""
+    import rasterizado
+
+    fig, alto = figura_ejemplo()
+    tiempos = []
+    for _ in range(repeticiones + 1):
+        inicio = time.perf_counter()
+        datos = rasterizado._renderizar(fig, ANCHO, alto, ESCALA, motor)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    if motor == "kaleido":
+        import kaleido
+        getattr(kaleido, "stop_sync_server", lambda: None)()
+    rss = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+           + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+    return {"frio_ms": tiempos[0], "caliente_ms": statistics.median(tiempos[1:]),
+            "rss_mb": rss, "bytes": len(datos)}
+
+
+def medir(motor: str, repeticiones: int) -> dict:
+    proc = subprocess.run([sys.executable, __file__, "--hijo", motor, "-n", str(repeticiones)],
+                          capture_output=True, text=True, cwd=Path(__file__).parent)
+    if proc.returncode != 0:
+        error = (proc.stderr.strip().splitlines() or ["error"])[-1]
+        return {"motor": motor, "error": error}
+    return {"motor": motor, **json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Latencia y RSS pico de los motores de gráfica "
+                                             "de los informes.")
+    ap.add_argument("--motores", default="kaleido,matplotlib",
+                    help="motores separados por comas (kaleido, matplotlib)")
+    ap.add_argument("-n", "--repeticiones", type=int, default=10,
+                    help="imágenes en caliente por motor")
+    ap.add_argument("--hijo", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.hijo:
+        print(json.dumps(_hijo(args.hijo, max(args.repeticiones, 1))))
+        return 0
+
+    print(f"{'motor':<11}  {'frío (ms)':>10}  {'caliente (ms)':>13}  {'RSS pico (MB)':>13}  "
+          f"{'PNG (kB)':>8}")
+    for motor in args.motores.split(","):
+        r = medir(motor.strip(), args.repeticiones)
+        if "error" in r:
+            print(f"{r['motor']:<11}  no disponible: {r['error']}")
+            continue
+        print(f"{r['motor']:<11}  {r['frio_ms']:>10.0f}  {r['caliente_ms']:>13.0f}  "
+              f"{r['rss_mb']:>13.0f}  {r['bytes'] / 1024:>8.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,279 +1,107 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from io import BytesIO
-import copy
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_CELL_VERTICAL_ALIGNMENT, WD_TABLE_ALIGNMENT
+import numpy as np
+
+from correlaciones import barrido, elasticidad, registro
+from atlas_ui import panel_curvas
+from montecarlo_ui import panel_montecarlo
+from informe_ui import descarga_bajo_demanda, descarga_html, firma, selector_motor
+import informes
+import informes_html
 
 # ==============================================================================
 # CONFIGURACIÓN Y CONSTANTES
 # ==============================================================================
 st.set_page_config(page_title="E Suelos Cohesivos (Arcillas)", layout="wide")
 
-BIBLIOGRAFIA = [
-    "CTE DB SE-C. Código Técnico de la Edificación. Seguridad Estructural - Cimientos.",
-    "Stroud, M. A. (1974). The standard penetration test in insensitive clays and soft rocks. Proceedings of the ESOPT, Stockholm.",
-    "Butler, F. G. (1975). Heavily overconsolidated clays. Settlement of Structures.",
-    "Bowles, J. E. (1996). Foundation Analysis and Design (5th ed.). McGraw-Hill."
-]
-
 # ==========================================
 # 1. LÓGICA MATEMÁTICA
 # ==========================================
-def obtener_factor_f2_stroud(ip_val):
-    """
-    Obtiene el factor f2 (MPa/N) interpolando la gráfica de Stroud (1974)
-    basada en el Índice de Plasticidad (IP).
-    Valores aproximados de la curva estándar.
-    """
-    # Puntos de la curva (IP, f2)
-    # f2 disminuye a medida que IP aumenta
-    if ip_val <= 10: return 2.0
-    if ip_val >= 60: return 0.6
-    
-    # Interpolación lineal simple entre puntos clave
-    # (10, 2.0), (20, 1.7), (30, 1.4), (40, 1.0), (50, 0.8), (60, 0.6)
-    puntos = {10: 2.0, 20: 1.7, 30: 1.4, 40: 1.0, 50: 0.8, 60: 0.6}
-    
-    # Buscar tramo
-    x_keys = sorted(puntos.keys())
-    for i in range(len(x_keys)-1):
-        x1, x2 = x_keys[i], x_keys[i+1]
-        if x1 <= ip_val <= x2:
-            y1, y2 = puntos[x1], puntos[x2]
-            return y1 + (ip_val - x1) * (y2 - y1) / (x2 - x1)
-    return 0.6
+OCR_CATEGORIAS = elasticidad.OCR_CATEGORIAS
+
 
+@st.cache_data(max_entries=64, show_spinner=False)
 def calcular_datos_arcillas(N_spt: int, IP: float, Cu_kPa: float, OCR_cat: str):
     """
-    Calcula E para arcillas usando Stroud y CTE.
+    Calcula E para arcillas usando Stroud y CTE
+    (correlaciones.elasticidad.arcillas).
     """
-    resultados = []
-    
-    # --- 1. STROUD (1974) ---
-    # E = f2 * N_spt (MPa)
-    f2 = obtener_factor_f2_stroud(IP)
-    
-    # Stroud suele dar un rango. Asumiremos el calculado como 'Valor Medio'
-    # y crearemos un rango +/- 20% para simular Límite Superior/Inferior del Excel
-    # o usamos la correlación directa.
-    
-    val_stroud = f2 * N_spt
-    
-    # Replicando lógica aproximada del Excel (Upper/Lower)
-    resultados.append({
-        "Autor": "Stroud (1974)", 
-        "Aplicación": f"Límite Superior (IP={IP})", 
-        "Fórmula Original": f"f2(IP)·N ({f2*1.2:.2f}·N)", 
-        "E (MPa)": val_stroud * 1.2 # Asumiendo un rango superior
-    })
-    
-    resultados.append({
-        "Autor": "Stroud (1974)", 
-        "Aplicación": f"Límite Inferior (IP={IP})", 
-        "Fórmula Original": f"f2(IP)·N ({f2*0.8:.2f}·N)", 
-        "E (MPa)": val_stroud * 0.8 # Asumiendo un rango inferior
-    })
-
-    # --- 2. STROUD Y BUTLER ---
-    # Estos autores dan valores para 'Media' y 'Baja' plasticidad directos con N
-    # Media Plasticidad: E ~ 0.5 N (MPa) ? (Revisando Excel: 14.7 para N=30 -> ~0.5)
-    resultados.append({
-        "Autor": "Stroud & Butler", 
-        "Aplicación": "Arcillas Media Plasticidad", 
-        "Fórmula Original": "0.5 · N (MPa)", 
-        "E (MPa)": 0.5 * N_spt
-    })
-    
-    # Baja Plasticidad: E ~ 0.6 N (MPa) ? (Revisando Excel: 17.6 para N=30 -> ~0.6)
-    resultados.append({
-        "Autor": "Stroud & Butler", 
-        "Aplicación": "Arcillas Baja Plasticidad", 
-        "Fórmula Original": "0.6 · N (MPa)", 
-        "E (MPa)": 0.6 * N_spt
-    })
-
-    # --- 3. CTE DB SE-C (TABLA F.2) ---
-    # E = K * Cu
-    # K depende de IP y OCR.
-    
-    # Definir K según tabla (Valores del Excel como referencia)
-    k_val = None
-    condicion_txt = ""
-    
-    if IP < 30:
-        if OCR_cat == "OCR < 3": k_val = 160; condicion_txt = "IP<30, OCR<3"
-        elif OCR_cat == "3 < OCR < 5": k_val = 120; condicion_txt = "IP<30, 3<OCR<5"
-        elif OCR_cat == "OCR > 5": k_val = 60; condicion_txt = "IP<30, OCR>5"
-    elif 30 <= IP <= 50:
-        if OCR_cat == "OCR < 3": k_val = 70; condicion_txt = "30<IP<50, OCR<3"
-        elif OCR_cat == "3 < OCR < 5": k_val = 50; condicion_txt = "30<IP<50, 3<OCR<5"
-        elif OCR_cat == "OCR > 5": k_val = 26; condicion_txt = "30<IP<50, OCR>5"
-    else: # IP > 50
-        if OCR_cat == "OCR < 3": k_val = 30; condicion_txt = "IP>50, OCR<3"
-        elif OCR_cat == "3 < OCR < 5": k_val = 20; condicion_txt = "IP>50, 3<OCR<5"
-        elif OCR_cat == "OCR > 5": k_val = 10; condicion_txt = "IP>50, OCR>5"
-
-    if k_val:
-        # Cu en kPa -> MPa es Cu/1000. Formula E = K * Cu_MPa
-        # Pero los K del CTE (ej. 600) son para Cu en mismas unidades.
-        # Si el Excel dice K=160, para Cu=200 kPa -> E = 160*200 = 32000 kPa = 32 MPa.
-        # Si usamos Cu en MPa (0.2), E = 160 * 0.2 = 32 MPa.
-        # Correcto.
-        
-        e_cte = k_val * (Cu_kPa / 1000.0) # Convertimos Cu a MPa primero
-        
-        resultados.append({
-            "Autor": "CTE DB SE-C", 
-            "Aplicación": f"Tabla F.2 ({condicion_txt})", 
-            "Fórmula Original": f"{k_val} · Cu", 
-            "E (MPa)": e_cte
-        })
-    else:
-        # Fallback si algo falla
-        resultados.append({
-            "Autor": "CTE DB SE-C", 
-            "Aplicación": "Fuera de rango", 
-            "Fórmula Original": "-", 
-            "E (MPa)": 0.0
-        })
-
-    return pd.DataFrame(resultados)
+    return elasticidad.arcillas(N_spt, IP, Cu_kPa, OCR_cat)
 
 # ==========================================
-# 2. GENERADOR DE INFORME WORD (Estilo CTE_2219)
+# 2. GRÁFICA E INFORME BAJO DEMANDA (informes.py)
 # ==========================================
-def generar_docx(n_val, ip_val, cu_val, ocr_val, df_final, df_stats, fig_plotly_original):
-    doc = Document()
-    
-    # --- ESTILOS ---
-    COLOR_TITULO = RGBColor(0x17, 0x36, 0x5D)
-    COLOR_HEADING = RGBColor(0x36, 0x5F, 0x91)
-    
-    for section in doc.sections:
-        section.left_margin = Inches(1.25)
-        section.right_margin = Inches(1.25)
-        section.top_margin = Inches(1.0)
-        section.bottom_margin = Inches(1.0)
-
-    style_normal = doc.styles['Normal']
-    style_normal.font.name = 'Calibri'
-    style_normal.font.size = Pt(11)
-
-    style_title = doc.styles['Title']
-    style_title.font.name = 'Calibri Light'
-    style_title.font.size = Pt(26)
-    style_title.font.color.rgb = COLOR_TITULO
-    
-    style_h1 = doc.styles['Heading 1']
-    style_h1.font.name = 'Calibri Light'
-    style_h1.font.size = Pt(14)
-    style_h1.font.color.rgb = COLOR_HEADING
-    
-    # --- CONTENIDO ---
-    doc.add_heading('Informe estimación Módulo de Elasticidad en Arcillas', 0).alignment = WD_ALIGN_PARAGRAPH.LEFT
-    
-    p_fecha = doc.add_paragraph()
-    p_fecha.add_run(f'Fecha de emisión: {pd.Timestamp.now().strftime("%d/%m/%Y")}').bold = True
-    p_fecha.alignment = WD_ALIGN_PARAGRAPH.LEFT
+@st.cache_data(max_entries=64, show_spinner=False)
+def figura_barras(df_final, n_val, ip_val, cu_val):
+    """Barras horizontales de E de los métodos seleccionados (pantalla); una
+    por selección, en caché."""
+    import plotly.express as px
 
-    # Sección 1
-    doc.add_heading('1. Datos de Entrada', level=1)
-    
-    # Lista de datos de entrada
-    datos_entrada = [
-        f"Valor N (SPT) de diseño: {n_val} golpes/30 cm",
-        f"Índice de Plasticidad (IP): {ip_val} %",
-        f"Cohesión sin drenaje (Cu): {cu_val} kPa",
-        f"Grado de Sobreconsolidación: {ocr_val}"
-    ]
-    
-    for dato in datos_entrada:
-        p = doc.add_paragraph(dato, style='List Bullet')
-        p.style.font.name = 'Calibri'
+    # Texto combinado
+    df_grafico = df_final.reset_index(drop=True)
+    df_grafico["Texto_Barra"] = df_grafico["Autor"] + ": " + df_grafico["E (MPa)"].map('{:.1f}'.format) + " MPa"
+
+    # Índice único
+    df_grafico["Indice"] = df_grafico.index.astype(str)
+
+    fig = px.bar(
+        df_grafico, 
+        x="E (MPa)", 
+        y="Indice", 
+        text="Texto_Barra",
+        color="Aplicación", 
+        orientation='h', 
+        title=f"Módulo de Elasticidad (N={n_val}, IP={ip_val}, Cu={cu_val})", 
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+
+    fig.update_layout(
+        uniformtext_minsize=14, 
+        uniformtext_mode='show',
+        yaxis={'visible': False, 'showticklabels': False},
+        xaxis_title="E (MPa)",
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=-0.15,
+            xanchor="center",
+            x=0.5
+        ),
+        margin=dict(l=0, r=0, t=40, b=100),
+        height=200 + (len(df_final) * 50) 
+    )
+
+    fig.update_traces(
+        textposition='inside', 
+        insidetextanchor='start',
+        textfont_size=14, 
+        textfont_color='black'
+    )
+    return fig
+
+
+def figura_informe(n_val, ip_val, cu_val, df_final) -> dict:
+    """Gráfica de los informes (dict plotly, ver informes.barras)."""
+    return informes.barras(df_final, f"Módulo de Elasticidad (N={n_val}, IP={ip_val}, Cu={cu_val})",
+                           paleta=informes.PASTEL)
+
+
+@st.cache_data(max_entries=32, ttl=3600, show_spinner="Generando informe…")
+def informe_docx(n_val, ip_val, cu_val, ocr_val, df_final, df_stats,
+                 motor_grafica="matplotlib") -> bytes:
+    """Informe Word de un caso; se cachea por entradas, métodos seleccionados y
+    motor de la gráfica."""
+    fig = figura_informe(n_val, ip_val, cu_val, df_final)
+    return informes.docx_e_arcillas(n_val, ip_val, cu_val, ocr_val, df_final, df_stats, fig,
+                                    motor_grafica)
+
+
+def informe_html(n_val, ip_val, cu_val, ocr_val, df_final, df_stats) -> bytes:
+    """Informe HTML autocontenido de un caso (milisegundos, sin caché)."""
+    fig = figura_informe(n_val, ip_val, cu_val, df_final)
+    return informes_html.html_e_arcillas(n_val, ip_val, cu_val, ocr_val, df_final, df_stats,
+                                         fig)
 
-    # Sección 2 - Tabla
-    doc.add_heading('2. Métodos de Cálculo Seleccionados', level=1)
-    
-    table = doc.add_table(rows=1, cols=4)
-    try:
-        table.style = 'Light List Accent 1'
-    except:
-        table.style = 'Table Grid'
-        
-    table.autofit = False 
-    table.allow_autofit = False
-    
-    widths = [Inches(2.0), Inches(2.0), Inches(1.5), Inches(1.0)]
-    headers = ['Autor', 'Aplicación', 'Fórmula', 'E (MPa)']
-    
-    for i, h in enumerate(headers):
-        cell = table.rows[0].cells[i]
-        cell.text = h
-        cell.width = widths[i]
-        cell.paragraphs[0].runs[0].bold = True
-        cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
-        
-    for _, row in df_final.iterrows():
-        row_cells = table.add_row().cells
-        textos = [str(row['Autor']), str(row['Aplicación']), str(row['Fórmula Original']), f"{row['E (MPa)']:.2f}"]
-        for idx, txt in enumerate(textos):
-            row_cells[idx].text = txt
-            row_cells[idx].width = widths[idx]
-            row_cells[idx].vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
-            row_cells[idx].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-    # Sección 3 - Estadísticas
-    doc.add_heading('3. Análisis Estadístico', level=1)
-    if df_stats is not None:
-        doc.add_paragraph('Resumen estadístico de los métodos seleccionados:')
-        stat_table = doc.add_table(rows=1, cols=5)
-        try:
-            stat_table.style = 'Light List Accent 1'
-        except:
-            stat_table.style = 'Table Grid'
-        stat_table.alignment = WD_TABLE_ALIGNMENT.CENTER
-        stat_table.autofit = True
-        
-        headers_stat = ['Mínimo', 'Máximo', 'Promedio', 'Mediana', 'Desv. Típica']
-        for i, h in enumerate(headers_stat):
-            cell = stat_table.rows[0].cells[i]
-            cell.text = h
-            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT 
-            cell.paragraphs[0].runs[0].bold = True
-
-        vals = stat_table.add_row().cells
-        data_vals = [f"{df_stats.iloc[0][k]:.2f}" for k in headers_stat]
-        for i, val in enumerate(data_vals):
-            vals[i].text = val
-            vals[i].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT 
-
-    # Sección 4 - Gráfica
-    doc.add_heading('4. Gráfica Comparativa', level=1)
-    try:
-        fig_word = copy.deepcopy(fig_plotly_original)
-        fig_word.update_traces(textfont_size=14, textfont_color='black')
-        fig_word.update_layout(uniformtext_minsize=14, uniformtext_mode='show')
-        img_bytes = fig_word.to_image(format="png", width=1300, height=len(df_final)*60 + 200, scale=3)
-        doc.add_paragraph().alignment = WD_ALIGN_PARAGRAPH.CENTER
-        doc.paragraphs[-1].add_run().add_picture(BytesIO(img_bytes), width=Inches(6.0))
-    except Exception as e:
-        doc.add_paragraph(f"[Gráfica no disponible: {str(e)}]")
-
-    doc.add_heading('5. Referencias Bibliográficas', level=1)
-    for ref in BIBLIOGRAFIA:
-        p = doc.add_paragraph(ref, style='List Bullet')
-        p.style.font.name = 'Calibri'
-        p.paragraph_format.space_after = Pt(6) 
-
-    buffer = BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
 
 # ==========================================
 # 3. INTERFAZ STREAMLIT
@@ -282,6 +110,100 @@ def generar_docx(n_val, ip_val, cu_val, ocr_val, df_final, df_stats, fig_plotly_
 st.title("🧱 Estimación Módulo de Elasticidad en Arcillas")
 st.markdown("---")
 
+EJES_BARRIDO = {"N": "N (SPT)", "IP": "IP (%)", "Cu": "Cu (kPa)"}
+
+
+@st.cache_data(show_spinner="Calculando malla…")
+def barrido_arcillas(rangos: dict, puntos: int, ocr_idx: int) -> dict:
+    """Todas las correlaciones sobre la malla N × IP × Cu (OCR fijo)."""
+    ejes = {v: np.linspace(lo, hi, puntos) for v, (lo, hi) in rangos.items()}
+    return barrido.malla("e_arcillas", ejes, {"OCR": ocr_idx})
+
+
+def selector_eje(res: dict, eje: str, key: str) -> float:
+    """Valor de la malla en el que se fija `eje` (por defecto el central)."""
+    opciones = res["ejes"][eje].round(2).tolist()
+    return st.select_slider(EJES_BARRIDO[eje], opciones, value=opciones[len(opciones) // 2],
+                            key=key)
+
+
+modo = st.sidebar.radio("Modo de cálculo", ["Caso individual", "Barrido paramétrico"])
+
+if modo == "Barrido paramétrico":
+    with st.sidebar:
+        st.header("1.📐 Rangos de la malla")
+        rangos = {
+            "N": st.slider("N (SPT)", 1, 100, (5, 50)),
+            "IP": st.slider("IP (%)", 0.0, 100.0, (5.0, 80.0)),
+            "Cu": st.slider("Cu (kPa)", 0.0, 600.0, (25.0, 300.0), step=5.0),
+        }
+        puntos = st.select_slider("Puntos por eje", [25, 50, 100, 200], value=100)
+        ocr_val = st.selectbox("Grado de Sobreconsolidación (OCR):", OCR_CATEGORIAS)
+
+    res = barrido_arcillas(rangos, puntos, OCR_CATEGORIAS.index(ocr_val))
+    import plotly.express as px
+    por_id = {c["id"]: c for c in registro.correlaciones("e_arcillas")}
+    etiqueta = lambda i: f"{por_id[i]['autor']} — {por_id[i]['grupo']}"
+
+    st.caption(f"Malla de {puntos}³ = {puntos ** 3:,} combinaciones × {len(res['ids'])} "
+               f"correlaciones (OCR: {ocr_val}).".replace(",", "."))
+    tab1, tab2 = st.tabs(["🗺️ Mapa de calor", "📈 Ábaco de diseño"])
+
+    with tab1:
+        c1, c2, c3 = st.columns(3)
+        id_mapa = c1.selectbox("Correlación", res["ids"], format_func=etiqueta)
+        eje_x, eje_y = c2.selectbox("Eje X", list(EJES_BARRIDO), index=0), \
+            c3.selectbox("Eje Y", list(EJES_BARRIDO), index=1)
+        if eje_x == eje_y:
+            st.warning("Elija dos ejes distintos.")
+        else:
+            eje_z = next(v for v in EJES_BARRIDO if v not in (eje_x, eje_y))
+            z = selector_eje(res, eje_z, "mapa_fijo")
+            mapa = barrido.corte(res, id_mapa, **{eje_z: z})
+            if mapa.index.name != eje_y:
+                mapa = mapa.T
+            fig_mapa = px.imshow(mapa.to_numpy(), x=mapa.columns, y=mapa.index, origin="lower",
+                                 aspect="auto", color_continuous_scale="Viridis",
+                                 labels=dict(x=EJES_BARRIDO[eje_x], y=EJES_BARRIDO[eje_y],
+                                             color="E (MPa)"),
+                                 title=f"{etiqueta(id_mapa)} ({EJES_BARRIDO[eje_z]} = {z:g})")
+            st.plotly_chart(fig_mapa, use_container_width=True)
+            st.download_button("⬇️ Descargar corte (CSV)",
+                               mapa.to_csv().encode("utf-8-sig"),
+                               f"E_arcillas_{id_mapa}.csv", "text/csv")
+
+    with tab2:
+        c1, c2 = st.columns(2)
+        eje_x = c1.selectbox("Abscisa", list(EJES_BARRIDO), index=0, key="abaco_x")
+        eje_c = c2.selectbox("Familia de curvas", [v for v in EJES_BARRIDO if v != eje_x],
+                             key="abaco_c")
+        eje_f = next(v for v in EJES_BARRIDO if v not in (eje_x, eje_c))
+        fijo = selector_eje(res, eje_f, "abaco_fijo")
+        eje = res["ejes"][eje_c]
+        curvas = np.unique(eje[np.linspace(0, eje.size - 1, 5).astype(int)])
+        ids_abaco = st.multiselect("Correlaciones", res["ids"], default=res["ids"][:1],
+                                   format_func=etiqueta)
+        filas = []
+        for id_ in ids_abaco:
+            for valor in curvas:
+                serie = barrido.corte(res, id_, **{eje_f: fijo, eje_c: valor})
+                filas.append(pd.DataFrame({eje_x: serie.index, "E (MPa)": serie.to_numpy(),
+                                           "Curva": f"{eje_c} = {valor:.3g}",
+                                           "Correlación": etiqueta(id_)}))
+        if filas:
+            abaco = pd.concat(filas, ignore_index=True)
+            fig_abaco = px.line(abaco, x=eje_x, y="E (MPa)", color="Curva",
+                                line_dash="Correlación" if len(ids_abaco) > 1 else None,
+                                labels={eje_x: EJES_BARRIDO[eje_x]},
+                                title=f"Ábaco de E ({EJES_BARRIDO[eje_f]} = {fijo:g}, {ocr_val})")
+            st.plotly_chart(fig_abaco, use_container_width=True)
+            st.download_button("⬇️ Descargar ábaco (CSV)",
+                               abaco.to_csv(index=False).encode("utf-8-sig"),
+                               "E_arcillas_abaco.csv", "text/csv")
+        else:
+            st.info("Seleccione al menos una correlación.")
+    st.stop()
+
 # --- SIDEBAR (INPUTS) ---
 with st.sidebar:
     st.header("1.📝 Parámetros del Suelo")
@@ -294,7 +216,7 @@ with st.sidebar:
     st.header("2. ⚖️ Estado del Suelo")
     ocr_val = st.selectbox(
         "Grado de Sobreconsolidación (OCR):",
-        ["OCR < 3", "3 < OCR < 5", "OCR > 5"],
+        OCR_CATEGORIAS,
         index=0,
         help="Necesario para correlaciones del CTE"
     )
@@ -313,93 +235,66 @@ for _, row in df_completo.iterrows():
     if key not in st.session_state.selecciones_arc:
         st.session_state.selecciones_arc[key] = True
 
-def get_seleccion(row):
-    key = f"{row['Autor']}_{row['Aplicación']}"
-    return st.session_state.selecciones_arc.get(key, True)
-
-df_completo.insert(0, "Seleccionar", df_completo.apply(get_seleccion, axis=1))
 
-# --- EDITOR DE DATOS ---
-st.subheader("1.📋 Tabla de Resultados")
+@st.fragment
+def panel_informe(n_val, ip_val, cu_val, ocr_val, df_final, df_stats):
+    """Informe: elegir el motor o preparar la descarga solo vuelve a ejecutar
+    este fragmento."""
+    motor = selector_motor("motor_arcillas")
+    docx_firma = firma(n_val, ip_val, cu_val, ocr_val, df_final, df_stats, motor)
+    descarga_bajo_demanda("informe_arcillas", docx_firma,
+                          lambda: informe_docx(n_val, ip_val, cu_val, ocr_val, df_final,
+                                               df_stats, motor),
+                          "Informe_E_arcillas.docx")
+    descarga_html("html_arcillas", firma(n_val, ip_val, cu_val, ocr_val, df_final, df_stats),
+                  lambda: informe_html(n_val, ip_val, cu_val, ocr_val, df_final, df_stats),
+                  "Informe_E_arcillas")
 
-col_config = {
-    "Seleccionar": st.column_config.CheckboxColumn("Incluir", width="small"),
-    "E (MPa)": st.column_config.NumberColumn("E (MPa)", format="%.2f")
-}
 
-df_editado = st.data_editor(
-    df_completo,
-    column_config=col_config,
-    disabled=["Autor", "Aplicación", "Fórmula Original", "E (MPa)"],
-    hide_index=True,
-    use_container_width=True,
-    key="editor_arcillas"
-)
+@st.fragment
+def panel_seleccion(df_completo, n_val, ip_val, cu_val, ocr_val):
+    """
+    Tabla de selección, gráfica, estadísticos e informe. Marcar o desmarcar
+    un método solo vuelve a ejecutar este fragmento: las fórmulas salen de
+    calcular_datos_arcillas y la gráfica de una selección ya vista, de la
+    caché; lo único que se recalcula son los estadísticos del subconjunto.
+    """
+    df = elasticidad.con_seleccion(df_completo, st.session_state.selecciones_arc)
+
+    # --- EDITOR DE DATOS ---
+    st.subheader("1.📋 Tabla de Resultados")
+
+    col_config = {
+        "Seleccionar": st.column_config.CheckboxColumn("Incluir", width="small"),
+        "E (MPa)": st.column_config.NumberColumn("E (MPa)", format="%.2f")
+    }
+
+    df_editado = st.data_editor(
+        df,
+        column_config=col_config,
+        disabled=["Autor", "Aplicación", "Fórmula Original", "E (MPa)"],
+        hide_index=True,
+        use_container_width=True,
+        key="editor_arcillas"
+    )
 
-# Actualizar estado
-for _, row in df_editado.iterrows():
-    key = f"{row['Autor']}_{row['Aplicación']}"
-    st.session_state.selecciones_arc[key] = row["Seleccionar"]
+    # Actualizar estado
+    for _, row in df_editado.iterrows():
+        st.session_state.selecciones_arc[elasticidad.clave_seleccion(row)] = row["Seleccionar"]
 
-# --- FILTRADO FINAL ---
-df_final = df_editado[df_editado["Seleccionar"] == True].drop(columns=["Seleccionar"])
-num_seleccionados = len(df_final)
+    # --- FILTRADO FINAL ---
+    df_final = df_editado[df_editado["Seleccionar"] == True].drop(columns=["Seleccionar"])
+    num_seleccionados = len(df_final)
 
-if num_seleccionados > 0:
-    st.subheader("2.📊 Visualización Gráfica")
-    
-    # Texto combinado
-    df_final["Texto_Barra"] = df_final["Autor"] + ": " + df_final["E (MPa)"].map('{:.1f}'.format) + " MPa"
-    
-    # Índice único
-    df_grafico = df_final.reset_index(drop=True)
-    df_grafico["Indice"] = df_grafico.index.astype(str)
-
-    fig = px.bar(
-        df_grafico, 
-        x="E (MPa)", 
-        y="Indice", 
-        text="Texto_Barra",
-        color="Aplicación", 
-        orientation='h', 
-        title=f"Módulo de Elasticidad (N={n_spt}, IP={ip_val}, Cu={cu_val})", 
-        color_discrete_sequence=px.colors.qualitative.Pastel
-    )
-    
-    fig.update_layout(
-        uniformtext_minsize=14, 
-        uniformtext_mode='show',
-        yaxis={'visible': False, 'showticklabels': False},
-        xaxis_title="E (MPa)",
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=-0.15,
-            xanchor="center",
-            x=0.5
-        ),
-        margin=dict(l=0, r=0, t=40, b=100),
-        height=200 + (len(df_final) * 50) 
-    )
-    
-    fig.update_traces(
-        textposition='inside', 
-        insidetextanchor='start',
-        textfont_size=14,     
-        textfont_color='black'
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    st.subheader("3.💻 Análisis Estadístico")
-    if num_seleccionados >= 1: # Permitir stats con 1 solo dato, aunque sea trivial
-        df_stats = pd.DataFrame({
-            "Mínimo": [df_final["E (MPa)"].min()], 
-            "Máximo": [df_final["E (MPa)"].max()],
-            "Promedio": [df_final["E (MPa)"].mean()], 
-            "Mediana": [df_final["E (MPa)"].median()],
-            "Desv. Típica": [df_final["E (MPa)"].std() if len(df_final)>1 else 0]
-        })
+    if num_seleccionados > 0:
+        st.subheader("2.📊 Visualización Gráfica")
+        
+        fig = figura_barras(df_final, n_val, ip_val, cu_val)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.subheader("3.💻 Análisis Estadístico")
+        # Con un solo método los estadísticos son triviales, pero se muestran
+        df_stats = elasticidad.estadisticas(df_final["E (MPa)"])
         
         st.dataframe(
             df_stats.style.format("{:.2f}")
@@ -411,14 +306,23 @@ if num_seleccionados > 0:
             use_container_width=True
         )
 
-    st.markdown("---")
-    st.subheader("4.📜 Generar Informe")
-    docx_file = generar_docx(n_spt, ip_val, cu_val, ocr_val, df_final, df_stats, fig)
-    st.download_button("📄 Descargar Informe Word (.docx)", 
-    docx_file, f"Informe_E_arcillas.docx", 
-    "application/vnd.openxmlformats-officedocument.wordprocessingml.document", type="primary")
-
-else:
-    st.warning("⚠️ No hay métodos seleccionados.")
+        st.markdown("---")
+        st.subheader("4.📜 Generar Informe")
+        panel_informe(n_val, ip_val, cu_val, ocr_val, df_final, df_stats)
+
+    else:
+        st.warning("⚠️ No hay métodos seleccionados.")
+
+
+panel_seleccion(df_completo, n_spt, ip_val, cu_val, ocr_val)
+
+st.markdown("---")
+with st.expander("📈 Curvas de todas las correlaciones"):
+    panel_curvas("e_arcillas", {"N": n_spt, "IP": ip_val, "Cu": cu_val,
+                                "OCR": OCR_CATEGORIAS.index(ocr_val)},
+                 ["N", "IP", "Cu"], key="atlas_arcillas")
+with st.expander("🎲 Incertidumbre de N, IP y Cu (Monte Carlo)"):
+    panel_montecarlo("e_arcillas", {"N": n_spt, "IP": ip_val, "Cu": cu_val,
+                                    "OCR": OCR_CATEGORIAS.index(ocr_val)}, key="mc_arcillas")
 
 st.info("⚠️ **Nota:** Los cálculos se basan en correlaciones empíricas para arcillas (Stroud 1974, CTE DB SE-C).")
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+montecarlo_ui.py
+================
+Panel Streamlit de propagación de incertidumbre (correlaciones.montecarlo),
+común a las calculadoras de Cc, φ y módulo de elasticidad:
+
+    panel_montecarlo(magnitud, valores, key)
+
+Para cada variable de entrada de las correlaciones aplicables al caso
+nominal (`valores`) se elige una distribución: fija, normal o lognormal
+(valor central y coeficiente de variación), uniforme o empírica, remuestreando
+un parámetro de un listado de laboratorio (.xlsx de geolab_engine).
+plotly solo se importa al dibujar los resultados.
+"""
+import io
+import os
+
+import numpy as np
+import streamlit as st
+
+from correlaciones import montecarlo, registro
+
+TIPOS = {"Fijo": "fijo", "Normal": "normal", "Lognormal": "lognormal",
+         "Uniforme": "uniforme", "Empírica (listado)": "empirica"}
+
+
+@st.cache_data(show_spinner="Leyendo listado…")
+def parametros_listado(data: bytes) -> dict:
+    """{parámetro: valores} de todas las muestras del listado."""
+    from geolab_engine import load_and_clean, to_long
+    long = to_long(load_and_clean(io.BytesIO(data)))
+    return {str(p): g["valor"].to_numpy(dtype=float)
+            for p, g in long.groupby("parametro", observed=True)}
+
+
+@st.cache_data(show_spinner="Simulando…", max_entries=8)
+def _simular(magnitud, distribuciones, n, ids, procesos, semilla):
+    return montecarlo.simular(magnitud, distribuciones, n=n, ids=ids,
+                              procesos=procesos, semilla=semilla)
+
+
+def _distribucion(var, spec, nominal, listado, key):
+    """Widgets de la distribución de una variable -> especificación."""
+    etiqueta = f"{var} ({spec.get('unidad', '-')})" if spec.get("unidad") else var
+    if spec.get("categorias"):
+        cat = st.selectbox(etiqueta, spec["categorias"],
+                           index=int(nominal) if nominal is not None else 0,
+                           key=f"{key}_{var}_cat")
+        return {"tipo": "fijo", "valor": spec["categorias"].index(cat)}
+    opciones = list(TIPOS)[:4] + (list(TIPOS)[4:] if listado else [])
+    tipo = TIPOS[st.selectbox(etiqueta, opciones, index=1, key=f"{key}_{var}_tipo")]
+    centro = float(nominal) if nominal is not None else 1.0
+    if tipo == "fijo":
+        return {"tipo": tipo, "valor": st.number_input("Valor", value=centro,
+                                                       key=f"{key}_{var}_v")}
+    if tipo in ("normal", "lognormal"):
+        media = st.number_input("Media", value=centro, key=f"{key}_{var}_m")
+        cv = st.number_input("CV (%)", 0.0, 200.0, 20.0, 5.0, key=f"{key}_{var}_cv")
+        return {"tipo": tipo, "media": media, "desv": abs(media) * cv / 100}
+    if tipo == "uniforme":
+        lo = st.number_input("Mínimo", value=0.8 * centro, key=f"{key}_{var}_lo")
+        hi = st.number_input("Máximo", value=1.2 * centro, key=f"{key}_{var}_hi")
+        return {"tipo": tipo, "min": lo, "max": max(lo, hi)}
+    nombres = sorted(listado)
+    defecto = nombres.index(var) if var in nombres else 0
+    param = st.selectbox("Parámetro del listado", nombres, index=defecto,
+                         key=f"{key}_{var}_param")
+    st.caption(f"{len(listado[param])} valores")
+    return montecarlo.desde_listado(listado[param])
+
+
+def _grafico_rangos(res, unidad):
+    import plotly.graph_objects as go
+
+    fila = res.sort_values("P50")
+    fig = go.Figure()
+    fig.add_trace(go.Bar(y=fila["Correlación"], x=fila["P95"] - fila["P5"], base=fila["P5"],
+                         orientation="h", name="P5–P95", marker_color="#aec7e8"))
+    fig.add_trace(go.Bar(y=fila["Correlación"], x=fila["P75"] - fila["P25"], base=fila["P25"],
+                         orientation="h", name="P25–P75", marker_color="#1f77b4"))
+    fig.add_trace(go.Scatter(y=fila["Correlación"], x=fila["P50"], mode="markers", name="P50",
+                             marker=dict(color="black", symbol="line-ns-open", size=14)))
+    fig.update_layout(barmode="overlay", xaxis_title=unidad, height=150 + 35 * len(fila),
+                      margin=dict(l=0, r=0, t=30, b=0), legend=dict(orientation="h"))
+    return fig
+
+
+def _histograma(cuentas, bordes, unidad):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(x=(bordes[:-1] + bordes[1:]) / 2, y=cuentas / cuentas.sum(),
+                           width=np.diff(bordes), marker_color="#1f77b4"))
+    fig.update_layout(xaxis_title=unidad, yaxis_title="Frecuencia relativa",
+                      margin=dict(l=0, r=0, t=30, b=0), height=350)
+    return fig
+
+
+def panel_montecarlo(magnitud: str, valores: dict, key: str = "mc"):
+    """Panel completo: distribuciones, simulación, resumen e histogramas."""
+    meta = registro.get_magnitud(magnitud)["meta"]
+    unidad = f"{meta.get('simbolo', magnitud)} ({meta['unidad']})" if meta.get("unidad") \
+        else meta.get("simbolo", magnitud)
+    # todas las correlaciones con entradas definidas: las ramas y rangos se
+    # resuelven muestra a muestra
+    por_id = {c["id"]: c for c in registro.correlaciones(magnitud)}
+    ids = [i for i, c in por_id.items()
+           if all(valores.get(v) is not None for v in c["entradas"])]
+    if not ids:
+        st.info("Introduzca los datos del caso para definir las distribuciones.")
+        return
+    usadas = list(dict.fromkeys(v for i in ids for v in por_id[i]["entradas"]))
+    especs = registro.variables(magnitud)
+
+    up = st.file_uploader("Listado de laboratorio (opcional, distribuciones empíricas)",
+                          type=["xlsx"], key=f"{key}_listado")
+    listado = parametros_listado(up.getvalue()) if up is not None else {}
+
+    distribuciones = {}
+    for col, var in zip(st.columns(len(usadas)), usadas):
+        with col:
+            distribuciones[var] = _distribucion(var, especs[var] or {}, valores.get(var),
+                                                listado, key)
+
+    c1, c2, c3 = st.columns(3)
+    n = int(c1.select_slider("Muestras", [10_000, 100_000, 1_000_000, 5_000_000],
+                             value=1_000_000, key=f"{key}_n"))
+    procesos = int(c2.number_input("Procesos", 1, os.cpu_count() or 1, 1, key=f"{key}_proc"))
+    semilla = int(c3.number_input("Semilla", 0, value=0, key=f"{key}_semilla"))
+    if not st.checkbox("🎲 Simular", key=f"{key}_run"):
+        return
+    try:
+        res, hist = _simular(magnitud, distribuciones, n, ids, procesos, semilla)
+    except ValueError as exc:
+        st.error(str(exc))
+        return
+    res = res[res["N"] > 0].assign(
+        Correlación=lambda d: d["Autor"] + " — " + d["Grupo"])
+    if res.empty:
+        st.warning("Ninguna muestra cae en el dominio de las correlaciones.")
+        return
+
+    st.dataframe(res.drop(columns="Correlación").round(3), use_container_width=True,
+                 hide_index=True)
+    st.plotly_chart(_grafico_rangos(res, unidad), use_container_width=True)
+    elegido = st.selectbox("Histograma", list(res.index), key=f"{key}_hist",
+                           format_func=res["Correlación"].get)
+    st.plotly_chart(_histograma(*hist[elegido], unidad), use_container_width=True)
+    st.download_button("⬇️ Descargar percentiles (CSV)",
+                       res.to_csv().encode("utf-8-sig"), f"MonteCarlo_{magnitud}.csv",
+                       "text/csv", key=f"{key}_csv")
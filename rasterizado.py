@@ -0,0 +1,237 @@
+"""
+rasterizado.py — PNG de las gráficas de los informes, con caché
+===============================================================
+Las calculadoras insertan en el informe Word la gráfica plotly rasterizada
+con kaleido. Aquí se centraliza esa conversión:
+
+    png(fig, ancho, alto, escala=3, motor="kaleido") -> bytes
+
+Motores (MOTORES):
+    kaleido     plotly.io.to_image: idéntica a la pantalla, necesita kaleido
+                (Chromium); lento de arrancar y pesado en memoria
+    matplotlib  dibuja las mismas barras horizontales con el backend Agg a
+                partir de las trazas de la figura, sin navegador; admite
+                solo trazas "bar" (la comparación de métodos de los informes)
+
+El PNG se direcciona por contenido: la clave es el sha1 del JSON de la
+figura junto con el tamaño, la escala y el motor. Se busca primero en
+memoria (LRU del proceso) y después en disco (DIR_CACHE, compartido por
+sesiones, procesos y lotes); solo si no está se renderiza. El renderizador de
+kaleido se arranca una vez por proceso y se mantiene caliente, así que los
+informes repetidos o los lotes que comparten gráficas no vuelven a
+renderizar.
+
+`fig` puede ser una figura plotly, su dict (`to_plotly_json()`) o su JSON.
+"""
+from __future__ import annotations
+import atexit
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+VERSION = 1
+MOTORES = ("kaleido", "matplotlib")
+MAX_MEMORIA = 64                     # PNG en la LRU de cada proceso
+DIR_CACHE = Path(os.environ.get("CORRELACIONES_CACHE",
+                                Path.home() / ".cache" / "correlaciones")) / "png"
+
+_memoria: OrderedDict[str, bytes] = OrderedDict()
+_cerrojo = threading.Lock()
+_caliente = False
+
+
+def _json(fig) -> str:
+    if isinstance(fig, str):
+        return fig
+    if isinstance(fig, dict):
+        return json.dumps(fig, sort_keys=True, default=str)
+    return fig.to_json()
+
+
+def clave(fig, ancho: int, alto: int, escala: float = 3, motor: str = "kaleido") -> str:
+    """sha1 del JSON de la figura, el tamaño, la escala y el motor."""
+    h = hashlib.sha1(f"v{VERSION}|{motor}|{int(ancho)}x{int(alto)}@{float(escala):g}|"
+                     .encode())
+    h.update(_json(fig).encode())
+    return h.hexdigest()
+
+
+def ruta(clave_png: str, dir_cache=None) -> Path:
+    return Path(dir_cache or DIR_CACHE) / clave_png[:2] / f"{clave_png}.png"
+
+
+def _arrancar():
+    """Arranca una sola vez el renderizador persistente de kaleido (v1); con
+    kaleido 0.2 el proceso se mantiene vivo tras la primera llamada."""
+    global _caliente
+    if _caliente:
+        return
+    _caliente = True
+    try:
+        import kaleido
+    except ImportError:
+        return
+    if hasattr(kaleido, "start_sync_server"):
+        try:
+            kaleido.start_sync_server()
+        except Exception:          # ya arrancado o sin navegador: to_image lo indicará
+            return
+        atexit.register(getattr(kaleido, "stop_sync_server", lambda: None))
+
+
+def _kaleido(fig, ancho: int, alto: int, escala: float) -> bytes:
+    import plotly.io as pio
+
+    _arrancar()
+    if isinstance(fig, str):
+        fig = pio.from_json(fig)
+    return pio.to_image(fig, format="png", width=ancho, height=alto, scale=escala)
+
+
+# --------------------------------------------------------------------------- #
+# Motor matplotlib: barras horizontales a partir de las trazas plotly
+# --------------------------------------------------------------------------- #
+_RGB = re.compile(r"rgba?\(([^)]*)\)")
+
+
+def _dict(fig) -> dict:
+    if isinstance(fig, str):
+        return json.loads(fig)
+    if isinstance(fig, dict):
+        return fig
+    return fig.to_plotly_json()
+
+
+def _array(v) -> list:
+    """Valores de una traza: lista, array o array tipado de plotly ≥ 6 (bdata)."""
+    if isinstance(v, dict) and "bdata" in v:
+        return np.frombuffer(base64.b64decode(v["bdata"]), dtype=np.dtype(v["dtype"])).tolist()
+    if v is None:
+        return []
+    return list(v) if isinstance(v, (list, tuple)) else np.asarray(v).tolist()
+
+
+def _color(c):
+    """Color plotly ("#rrggbb", "rgb(r, g, b)", "rgba(…)") para matplotlib."""
+    if isinstance(c, (list, tuple)):
+        return [_color(x) for x in c]
+    if isinstance(c, str):
+        m = _RGB.fullmatch(c.replace(" ", ""))
+        if m:
+            partes = [float(x) for x in m.group(1).split(",")]
+            return tuple(x / 255 for x in partes[:3]) + tuple(partes[3:4])
+    return c
+
+
+def _texto(v) -> str:
+    if isinstance(v, dict):
+        return v.get("text") or ""
+    return v or ""
+
+
+def _matplotlib(fig, ancho: int, alto: int, escala: float) -> bytes:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    spec = _dict(fig)
+    layout = spec.get("layout") or {}
+    trazas = spec.get("data") or []
+    if not trazas or any(t.get("type", "bar") != "bar" or t.get("orientation") != "h"
+                         for t in trazas):
+        raise ValueError("el motor matplotlib solo dibuja barras horizontales")
+
+    px_a_pt = 72 / 100                        # 1 px de plotly a 100 dpi lógicos
+    letra = px_a_pt * float(((trazas[0].get("textfont") or {}).get("size")) or 12)
+    figura = Figure(figsize=(ancho / 100, alto / 100), dpi=100 * escala)
+    FigureCanvasAgg(figura)
+    ax = figura.add_subplot()
+    posiciones: dict = {}                     # categoría -> fila (orden de aparición)
+    for t in trazas:
+        y = _array(t.get("y"))
+        x = np.asarray(_array(t.get("x")), dtype=float)
+        filas = [posiciones.setdefault(c, len(posiciones)) for c in y]
+        color = _color((t.get("marker") or {}).get("color"))
+        ax.barh(filas, x, height=0.8, color=color, label=t.get("name"))
+        textos = t.get("text")
+        textos = _array(textos) if textos is not None else []
+        for fila, texto in zip(filas, textos):    # dentro de la barra, al inicio
+            ax.text(0.005, fila, str(texto), transform=ax.get_yaxis_transform(),
+                    va="center", ha="left", fontsize=letra,
+                    color=_color((t.get("textfont") or {}).get("color")) or "black")
+    ax.set_yticks([])
+    ax.set_ylim(-0.5, len(posiciones) - 0.5)
+    ax.set_xlim(left=0)
+    ax.set_xlabel(_texto((layout.get("xaxis") or {}).get("title")), fontsize=px_a_pt * 14)
+    ax.set_title(_texto(layout.get("title")), loc="left", fontsize=px_a_pt * 17)
+    ax.spines[["top", "right", "left"]].set_visible(False)
+    ax.grid(axis="x", color="#e5ecf6")
+    ax.set_axisbelow(True)
+    if any(t.get("name") for t in trazas):
+        ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.15), frameon=False,
+                  ncol=min(len(trazas), 3), fontsize=px_a_pt * 12)
+    figura.tight_layout()
+    buffer = io.BytesIO()
+    # zlib nivel 1: la compresión por defecto es ~la mitad del tiempo total
+    figura.savefig(buffer, format="png", pil_kwargs={"compress_level": 1})
+    return buffer.getvalue()
+
+
+_MOTORES = {"kaleido": _kaleido, "matplotlib": _matplotlib}
+
+
+def _renderizar(fig, ancho: int, alto: int, escala: float, motor: str) -> bytes:
+    return _MOTORES[motor](fig, ancho, alto, escala)
+
+
+def _recordar(clave_png: str, datos: bytes):
+    _memoria[clave_png] = datos
+    _memoria.move_to_end(clave_png)
+    while len(_memoria) > MAX_MEMORIA:
+        _memoria.popitem(last=False)
+
+
+def _guardar(destino: Path, datos: bytes):
+    try:
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        tmp = destino.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(datos)
+        os.replace(tmp, destino)
+    except OSError:                # caché de solo lectura: se sigue sin disco
+        pass
+
+
+def png(fig, ancho: int, alto: int, escala: float = 3, motor: str = "kaleido",
+        dir_cache=None) -> bytes:
+    """PNG de `fig` a `ancho` × `alto` px (× `escala`) con `motor`, desde caché
+    si existe."""
+    if motor not in _MOTORES:
+        raise ValueError(f"Motor desconocido: {motor!r}; use uno de {MOTORES}")
+    k = clave(fig, ancho, alto, escala, motor)
+    with _cerrojo:
+        if k in _memoria:
+            _memoria.move_to_end(k)
+            return _memoria[k]
+    destino = ruta(k, dir_cache)
+    try:
+        datos = destino.read_bytes()
+    except OSError:
+        with _cerrojo:             # ni kaleido ni Agg admiten llamadas concurrentes
+            datos = _renderizar(fig, int(ancho), int(alto), escala, motor)
+        _guardar(destino, datos)
+    with _cerrojo:
+        _recordar(k, datos)
+    return datos
+
+
+def vaciar_memoria():
+    """Olvida la LRU del proceso (la caché en disco se conserva)."""
+    with _cerrojo:
+        _memoria.clear()
@@ -0,0 +1,378 @@
+"""
+servidor_correlaciones.py — API HTTP local de cálculo por lotes
+===============================================================
+Expone las calculadoras (Cc, φ, E en arenas, E en arcillas y (N1)60) a otras
+herramientas mediante JSON sobre HTTP, sin Streamlit y sin red externa (solo
+biblioteca estándar, NumPy y pandas). Escucha en 127.0.0.1 por defecto.
+
+    GET    /                          calculadoras, entradas y límites
+    POST   /calcular/<calculadora>    lote síncrono (hasta MAX_SINCRONO casos)
+    POST   /trabajos/<calculadora>    lote asíncrono -> 202 {"id", "url"}
+    GET    /trabajos/<id>             estado del trabajo
+    GET    /trabajos/<id>/resultado   resultado (202 mientras esté pendiente)
+    DELETE /trabajos/<id>             cancela u olvida el trabajo
+
+El cuerpo es {"casos": [{variable: valor}, ...]} o, más compacto, por
+columnas {"casos": {variable: [valores]}}; la respuesta es
+{"calculadora", "n", "resultados": [{...}, ...]} en el orden de los casos,
+con null donde una correlación no aplica. Cada resultado de Cc, φ y E lleva
+el valor de cada correlación (por id del registro) y los agregados de
+registro.resumir (N, Mediana, P25…); el de (N1)60, las columnas de
+spt.corregir. OCR admite la clase (índice) o su etiqueta.
+
+En (N1)60 el equipo (eficiencia, diametro_mm, cs) puede variar por caso y
+σ'v se da por caso (sigma_v) o sale de un terreno uniforme común al lote:
+{"casos": …, "terreno": {"gamma", "nivel_freatico", "gamma_sat"}}.
+
+Los lotes síncronos se calculan en el hilo de la petición (vectorizados,
+unos milisegundos por millar de casos); los trabajos van a un pool de
+procesos y se guardan en memoria hasta MAX_TRABAJOS terminados. Con
+MAX_PENDIENTES trabajos aún sin terminar, POST /trabajos responde 503 (con
+Retry-After) en lugar de acumular lotes en memoria. Los lotes grandes que
+se repiten se leen de correlaciones.memo en lugar de evaluarlos de nuevo.
+
+Ejecutar:
+    python servidor_correlaciones.py
+    python servidor_correlaciones.py --puerto 8765 -j 4
+"""
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from correlaciones import memo, registro, spt
+
+MAGNITUDES = ("cc", "phi", "e_arenas", "e_arcillas")
+CALCULADORAS = (*MAGNITUDES, "n1_60")
+MAX_SINCRONO = 5_000                 # casos por petición síncrona
+MAX_CUERPO = 256 * 2 ** 20           # bytes por petición
+MAX_TRABAJOS = 200                   # trabajos terminados que se conservan
+MAX_PENDIENTES = 1_000               # trabajos sin terminar antes de responder 503
+
+# (N1)60: equipo (por caso) y terreno uniforme (por lote) con sus valores por defecto
+EQUIPO_SPT = {"eficiencia": spt.ER_REFERENCIA, "diametro_mm": 115, "cs": 1.0}
+TERRENO_SPT = {"gamma": 18.0, "nivel_freatico": None, "gamma_sat": None}
+
+
+class ErrorEntrada(ValueError):
+    """Petición mal formada (400)."""
+
+
+class Saturado(RuntimeError):
+    """Demasiados trabajos pendientes (503)."""
+
+
+def entradas(calculadora: str) -> list[str]:
+    if calculadora == "n1_60":
+        return ["profundidad", "N", *EQUIPO_SPT, "sigma_v"]
+    return list(registro.variables(calculadora))
+
+
+def _n(casos) -> int:
+    """Número de casos (valida la forma del lote)."""
+    if isinstance(casos, dict):
+        return max((np.size(v) for v in casos.values()), default=0)
+    if isinstance(casos, list):
+        return len(casos)
+    raise ErrorEntrada("'casos' debe ser una lista de objetos o un objeto de columnas")
+
+
+def _tabla(casos) -> pd.DataFrame:
+    if isinstance(casos, dict):
+        try:
+            return pd.DataFrame({k: np.atleast_1d(v) for k, v in casos.items()})
+        except ValueError as exc:
+            raise ErrorEntrada(f"columnas de distinta longitud: {exc}") from None
+    if isinstance(casos, list) and all(isinstance(c, dict) for c in casos):
+        return pd.DataFrame.from_records(casos)
+    raise ErrorEntrada("'casos' debe ser una lista de objetos o un objeto de columnas")
+
+
+def _columna(tabla: pd.DataFrame, nombre: str, categorias=None) -> np.ndarray:
+    if nombre not in tabla.columns:
+        return np.full(len(tabla), np.nan)
+    serie = tabla[nombre]
+    if categorias:
+        indices = {c: i for i, c in enumerate(categorias)}
+        serie = serie.map(lambda x: indices.get(x, x))
+    return pd.to_numeric(serie, errors="coerce").to_numpy(dtype=float)
+
+
+def _terreno(terreno) -> dict:
+    if not isinstance(terreno, dict) or set(terreno) - set(TERRENO_SPT):
+        raise ErrorEntrada("'terreno' admite " + ", ".join(TERRENO_SPT))
+    params = TERRENO_SPT | terreno
+    try:
+        return {k: None if v is None else float(v) for k, v in params.items()}
+    except (TypeError, ValueError):
+        raise ErrorEntrada("'terreno' debe tener valores numéricos") from None
+
+
+def _n1_60(tabla: pd.DataFrame, terreno: dict) -> pd.DataFrame:
+    equipo = {p: np.where(np.isnan(col := _columna(tabla, p)), defecto, col)
+              for p, defecto in EQUIPO_SPT.items()}
+    terreno = _terreno(terreno)
+    if terreno["nivel_freatico"] is None:
+        terreno["nivel_freatico"] = np.inf
+    z = _columna(tabla, "profundidad")
+    sv = _columna(tabla, "sigma_v")
+    sv = np.where(np.isnan(sv), spt.tension_efectiva(np.nan_to_num(z), **terreno), sv)
+    return spt.corregir(z, _columna(tabla, "N"), sigma_v=sv, **equipo)
+
+
+def calcular(calculadora: str, casos, terreno: dict | None = None) -> pd.DataFrame:
+    """Resultados de `casos` (lista de objetos o columnas), una fila por caso;
+    `terreno` solo se usa en (N1)60."""
+    if calculadora not in CALCULADORAS:
+        raise KeyError(calculadora)
+    tabla = _tabla(casos)
+    if calculadora == "n1_60":
+        return _n1_60(tabla, terreno or {})
+    variables = registro.variables(calculadora)
+    datos = {v: _columna(tabla, v, (spec or {}).get("categorias"))
+             for v, spec in variables.items()}
+    valores, _ = memo.evaluar(calculadora, datos)
+    ids = [c["id"] for c in registro.correlaciones(calculadora)]
+    return pd.concat([pd.DataFrame(valores, columns=ids), registro.resumir(valores)], axis=1)
+
+
+def respuesta(calculadora: str, casos, terreno: dict | None = None) -> bytes:
+    """Cuerpo JSON de la respuesta de un lote."""
+    res = calcular(calculadora, casos, terreno)
+    return (f'{{"calculadora": "{calculadora}", "n": {len(res)}, "resultados": '
+            f'{res.to_json(orient="records", double_precision=10)}}}').encode()
+
+
+def _calentar() -> int:
+    registro.cargar()
+    return os.getpid()
+
+
+class Servicio:
+    """Estado compartido por las peticiones: pool de procesos y trabajos."""
+
+    def __init__(self, procesos: int | None = None, max_sincrono: int = MAX_SINCRONO,
+                 max_pendientes: int = MAX_PENDIENTES):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.max_sincrono = max_sincrono
+        self.max_pendientes = max_pendientes
+        # spawn: hacer fork desde un servidor con hilos puede heredar cerrojos tomados
+        self.pool = ProcessPoolExecutor(self.procesos,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        for fut in [self.pool.submit(_calentar) for _ in range(self.procesos)]:
+            fut.result()
+        self.trabajos: OrderedDict[str, dict] = OrderedDict()
+        self.pendientes = 0
+        self.cerrojo = threading.Lock()
+
+    def enviar(self, calculadora: str, casos, terreno: dict | None = None) -> dict:
+        id_ = uuid.uuid4().hex
+        trabajo = {"id": id_, "calculadora": calculadora, "estado": "pendiente",
+                   "n": _n(casos),
+                   "creado": time.time()}
+        with self.cerrojo:            # publicado solo cuando ya tiene su futuro
+            if self.pendientes >= self.max_pendientes:
+                raise Saturado(f"{self.pendientes} trabajos pendientes")
+            trabajo["futuro"] = fut = self.pool.submit(respuesta, calculadora, casos, terreno)
+            self.trabajos[id_] = trabajo
+            self.pendientes += 1
+        fut.add_done_callback(lambda f: self._terminar(trabajo, f))
+        return trabajo
+
+    def _terminar(self, trabajo: dict, fut):
+        trabajo["segundos"] = round(time.time() - trabajo["creado"], 3)
+        if fut.cancelled():
+            trabajo["estado"] = "cancelado"
+        elif fut.exception() is not None:
+            exc = fut.exception()
+            trabajo["estado"], trabajo["error"] = "error", f"{type(exc).__name__}: {exc}"
+        else:
+            trabajo["estado"], trabajo["resultado"] = "terminado", fut.result()
+        with self.cerrojo:
+            self.pendientes -= 1
+            terminados = [k for k, t in self.trabajos.items() if t["estado"] != "pendiente"]
+            for k in terminados[:max(len(terminados) - MAX_TRABAJOS, 0)]:
+                del self.trabajos[k]
+
+    def trabajo(self, id_: str) -> dict | None:
+        with self.cerrojo:
+            return self.trabajos.get(id_)
+
+    def olvidar(self, id_: str) -> bool:
+        with self.cerrojo:
+            trabajo = self.trabajos.pop(id_, None)
+        if trabajo is not None:
+            trabajo["futuro"].cancel()
+        return trabajo is not None
+
+    def cerrar(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _estado(trabajo: dict) -> dict:
+    campos = ("id", "calculadora", "estado", "n", "segundos", "error")
+    return {k: trabajo[k] for k in campos if k in trabajo} | \
+        {"url": f"/trabajos/{trabajo['id']}/resultado"}
+
+
+class Manejador(BaseHTTPRequestHandler):
+    server: "ServidorCorrelaciones"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, formato, *args):
+        if self.server.verboso:
+            super().log_message(formato, *args)
+
+    def _enviar(self, estado: HTTPStatus, cuerpo: bytes | dict | None = None, cabeceras=()):
+        datos = cuerpo if isinstance(cuerpo, bytes) or cuerpo is None \
+            else json.dumps(cuerpo, ensure_ascii=False).encode()
+        self.send_response(estado)
+        for k, v in cabeceras:
+            self.send_header(k, v)
+        if datos is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(datos or b"")))
+        self.end_headers()
+        if datos:
+            self.wfile.write(datos)
+
+    def _error(self, estado: HTTPStatus, mensaje: str):
+        self._enviar(estado, {"error": mensaje})
+
+    def _casos(self):
+        longitud = int(self.headers.get("Content-Length") or 0)
+        if longitud > MAX_CUERPO:
+            raise ErrorEntrada(f"cuerpo de más de {MAX_CUERPO // 2 ** 20} MB")
+        try:
+            cuerpo = json.loads(self.rfile.read(longitud) or b"null")
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise ErrorEntrada(f"JSON no válido: {exc}") from None
+        casos = cuerpo.get("casos") if isinstance(cuerpo, dict) else None
+        if not casos:
+            raise ErrorEntrada("falta 'casos'")
+        terreno = cuerpo.get("terreno")
+        if terreno is not None:
+            _terreno(terreno)
+        _n(casos)
+        return casos, terreno
+
+    def do_GET(self):
+        servicio = self.server.servicio
+        if self.path in ("", "/"):
+            return self._enviar(HTTPStatus.OK, {
+                "calculadoras": {c: {"entradas": entradas(c)} for c in CALCULADORAS},
+                "terreno": TERRENO_SPT,
+                "max_sincrono": servicio.max_sincrono, "procesos": servicio.procesos})
+        m = re.fullmatch(r"/trabajos/(\w+)(/resultado)?", self.path)
+        trabajo = servicio.trabajo(m.group(1)) if m else None
+        if trabajo is None:
+            return self._error(HTTPStatus.NOT_FOUND, f"no existe {self.path}")
+        if not m.group(2):
+            return self._enviar(HTTPStatus.OK, _estado(trabajo))
+        if trabajo["estado"] == "terminado":
+            return self._enviar(HTTPStatus.OK, trabajo["resultado"])
+        if trabajo["estado"] == "pendiente":
+            return self._enviar(HTTPStatus.ACCEPTED, _estado(trabajo))
+        return self._enviar(HTTPStatus.INTERNAL_SERVER_ERROR, _estado(trabajo))
+
+    def do_POST(self):
+        servicio = self.server.servicio
+        m = re.fullmatch(r"/(calcular|trabajos)/(\w+)", self.path)
+        if not m or m.group(2) not in CALCULADORAS:
+            return self._error(HTTPStatus.NOT_FOUND, f"no existe {self.path}; calculadoras: "
+                                                     + ", ".join(CALCULADORAS))
+        ruta, calculadora = m.groups()
+        try:
+            casos, terreno = self._casos()
+            if ruta == "trabajos":
+                try:
+                    trabajo = servicio.enviar(calculadora, casos, terreno)
+                except Saturado as exc:
+                    return self._enviar(HTTPStatus.SERVICE_UNAVAILABLE,
+                                        {"error": f"{exc}: reintenta más tarde"},
+                                        [("Retry-After", "1")])
+                return self._enviar(HTTPStatus.ACCEPTED, _estado(trabajo),
+                                    [("Location", f"/trabajos/{trabajo['id']}")])
+            if _n(casos) > servicio.max_sincrono:
+                return self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                   f"más de {servicio.max_sincrono} casos: "
+                                   f"usa POST /trabajos/{calculadora}")
+            return self._enviar(HTTPStatus.OK, respuesta(calculadora, casos, terreno))
+        except ErrorEntrada as exc:
+            return self._error(HTTPStatus.BAD_REQUEST, str(exc))
+        except Exception as exc:             # un lote malo no tumba el servidor
+            return self._error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(exc).__name__}: {exc}")
+
+    def do_DELETE(self):
+        m = re.fullmatch(r"/trabajos/(\w+)", self.path)
+        if not m or not self.server.servicio.olvidar(m.group(1)):
+            return self._error(HTTPStatus.NOT_FOUND, f"no existe {self.path}")
+        self._enviar(HTTPStatus.NO_CONTENT)
+
+
+class ServidorCorrelaciones(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, direccion, servicio: Servicio, verboso: bool = False):
+        super().__init__(direccion, Manejador)
+        self.servicio = servicio
+        self.verboso = verboso
+
+    def server_close(self):
+        super().server_close()
+        self.servicio.cerrar()
+
+
+def crear_servidor(host: str = "127.0.0.1", puerto: int = 8765, procesos: int | None = None,
+                   max_sincrono: int = MAX_SINCRONO, verboso: bool = False,
+                   max_pendientes: int = MAX_PENDIENTES):
+    """Servidor listo para serve_forever() (puerto 0 = uno libre)."""
+    return ServidorCorrelaciones((host, puerto),
+                                 Servicio(procesos, max_sincrono, max_pendientes), verboso)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="API HTTP local de las correlaciones "
+                                             "(Cc, φ, E, (N1)60) por lotes.")
+    ap.add_argument("--host", default="127.0.0.1",
+                    help="Interfaz de escucha (por defecto: solo este equipo)")
+    ap.add_argument("--puerto", type=int, default=8765)
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                    help="Procesos para los trabajos asíncronos (por defecto: nº de núcleos)")
+    ap.add_argument("--max-sincrono", type=int, default=MAX_SINCRONO,
+                    help=f"Casos por petición síncrona (por defecto: {MAX_SINCRONO})")
+    ap.add_argument("--max-pendientes", type=int, default=MAX_PENDIENTES,
+                    help=f"Trabajos sin terminar antes de responder 503 "
+                         f"(por defecto: {MAX_PENDIENTES})")
+    ap.add_argument("-v", "--verboso", action="store_true", help="Registra cada petición")
+    args = ap.parse_args(argv)
+
+    servidor = crear_servidor(args.host, args.puerto, args.jobs, args.max_sincrono,
+                              args.verboso, args.max_pendientes)
+    host, puerto = servidor.server_address[:2]
+    print(f"Correlaciones en http://{host}:{puerto}/ ({servidor.servicio.procesos} "
+          f"proceso(s)); Ctrl+C para salir")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
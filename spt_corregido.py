@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import io
+
+from correlaciones import spt, tensiones
 
 # Configuración de la página
 st.set_page_config(
@@ -24,45 +27,102 @@ st.sidebar.info("Defina aquí las características de la perforadora.")
 # 1. Eficiencia del Martillo (Ce)
 hammer_type = st.sidebar.selectbox(
     "Tipo de Martillo",
-    options=["Martillo Automático (Estándar moderno)", "Martillo de Seguridad (Safety)", "Martillo Donut (Antiguo)"],
+    options=list(spt.MARTILLOS),
     index=0
 )
-
-if "Automático" in hammer_type:
-    er_default = 80
-elif "Seguridad" in hammer_type:
-    er_default = 60
-else:
-    er_default = 45
+er_default = spt.MARTILLOS[hammer_type]
 
 efficiency = st.sidebar.slider(
     "Eficiencia de energía medida (%)", 
     min_value=30, max_value=100, value=er_default, step=5,
     help="Porcentaje de energía teórica que realmente llega al varillaje."
 )
-Ce = efficiency / 60.0
+Ce = float(spt.factor_ce(efficiency))
 
 # 2. Diámetro del Sondeo (Cb)
 borehole_diam = st.sidebar.selectbox(
     "Diámetro del Sondeo (mm)",
-    options=["65 - 115 mm", "150 mm", "200 mm"],
+    options=list(spt.DIAMETROS),
     index=0
 )
-
-if "65 - 115" in borehole_diam:
-    Cb = 1.0
-elif "150" in borehole_diam:
-    Cb = 1.05
-else:
-    Cb = 1.15
+Cb = float(spt.factor_cb(spt.DIAMETROS[borehole_diam]))
 
 # 3. Tipo de Muestreador (Cs)
 sampler_type = st.sidebar.radio(
     "Tipo de Muestreador",
-    options=["Estándar (sin liners)", "Con liners (camisas)"],
+    options=list(spt.MUESTREADORES),
     help="El muestreador con liners aumenta la fricción, por lo que se corrige."
 )
-Cs = 1.0 if "Estándar" in sampler_type else 1.2
+Cs = spt.MUESTREADORES[sampler_type]
+
+EQUIPO = dict(eficiencia=efficiency, diametro_mm=spt.DIAMETROS[borehole_diam], cs=Cs)
+
+st.sidebar.markdown("---")
+modo = st.sidebar.radio("Modo de cálculo", ["Ensayo individual", "Lote (listado / CSV)"])
+
+
+@st.cache_data(show_spinner="Leyendo ensayos SPT...")
+def leer_lote(data: bytes, nombre: str):
+    """Profundidad y N de cada ensayo: listado de laboratorio (.xlsx) o CSV."""
+    if nombre.lower().endswith(".csv"):
+        tabla = pd.read_csv(io.BytesIO(data), sep=None, engine="python")
+        tabla.columns = [str(c).strip() for c in tabla.columns]
+        return tabla.rename(columns={"Profundidad": spt.COL_PROFUNDIDAD, "N": spt.COL_N})
+    from geolab_engine import PAGES, load_and_clean, page_subset
+    return page_subset(load_and_clean(io.BytesIO(data)), PAGES["spt"])
+
+
+if modo == "Lote (listado / CSV)":
+    st.subheader("📂 Corrección por lotes")
+    st.markdown("Sube el listado de laboratorio (columnas *Profundidad inicial* y "
+                "*SPT (valores centrales)*) o un CSV con columnas **Profundidad** y **N**. "
+                "Se aplica el equipo definido en la barra lateral a todos los ensayos.")
+    up = st.file_uploader("Ensayos SPT", type=["xlsx", "csv"])
+    st.markdown("**Perfil del terreno** (estratos contiguos desde la superficie)")
+    estratos = st.data_editor(
+        pd.DataFrame({"techo": [0.0], "base": [30.0], "gamma": [18.0], "gamma_sat": [20.0]}),
+        num_rows="dynamic", hide_index=True, key="estratos_lote",
+        column_config={
+            "techo": st.column_config.NumberColumn("Techo (m)", min_value=0.0),
+            "base": st.column_config.NumberColumn("Base (m)", min_value=0.0),
+            "gamma": st.column_config.NumberColumn("γ (kN/m³)", min_value=10.0),
+            "gamma_sat": st.column_config.NumberColumn("γsat (kN/m³)", min_value=10.0),
+        })
+    c1, c2 = st.columns(2)
+    nf_lote = c1.number_input("Profundidad Nivel Freático (m)", min_value=0.0,
+                              value=10.0, step=0.5, key="nf_lote")
+    q_lote = c2.number_input("Sobrecarga en superficie (kPa)", min_value=0.0,
+                             value=0.0, step=5.0, key="q_lote")
+    try:
+        perfil = tensiones.perfil(estratos.dropna(subset=["techo", "base", "gamma"]),
+                                  nivel_freatico=nf_lote, sobrecarga=q_lote)
+    except ValueError as exc:
+        st.error(f"Perfil no válido: {exc}")
+        st.stop()
+    if up is None:
+        st.stop()
+    tabla = leer_lote(up.getvalue(), up.name)
+    if {spt.COL_PROFUNDIDAD, spt.COL_N} - set(tabla.columns):
+        st.error("El fichero no tiene columnas de profundidad y golpeo N.")
+        st.stop()
+    res = spt.lote(tabla, perfil=perfil, **EQUIPO)
+    if res.empty:
+        st.warning("No hay ensayos con profundidad y N numéricos.")
+        st.stop()
+    meta = [c for c in ("Descripción Muestra", "_prospect") if c in tabla.columns]
+    res = tabla.loc[res.index, meta].rename(columns={"_prospect": "Prospección"}).join(res)
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Ensayos corregidos", len(res))
+    m2.metric("Mediana (N1)60", f"{res['(N1)60'].median():.1f}")
+    m3.metric("Descartados", len(tabla) - len(res))
+    st.scatter_chart(res, x="(N1)60", y="Profundidad",
+                     color="Prospección" if "Prospección" in res else None)
+    st.dataframe(res.round(3), use_container_width=True, hide_index=True)
+    st.download_button("⬇️ Descargar (N1)60 (CSV)",
+                       res.to_csv(index=False).encode("utf-8-sig"),
+                       "spt_n1_60.csv", "text/csv")
+    st.stop()
 
 # --- PANEL PRINCIPAL: DATOS DEL ENSAYO ---
 st.subheader("📝 Datos del Ensayo en Profundidad")
@@ -75,50 +135,17 @@ with col1:
 
 with col2:
     gamma_soil = st.number_input("Peso específico del suelo (kN/m³)", min_value=10.0, value=18.0, step=0.5, help="Valor típico arenas: 17-20 kN/m³")
+    gamma_sat = st.number_input("Peso específico saturado (kN/m³)", min_value=10.0, value=20.0, step=0.5, help="Se aplica por debajo del nivel freático.")
     water_table = st.number_input("Profundidad Nivel Freático (m)", min_value=0.0, value=10.0, step=0.5, help="Si no hay agua, pon un valor mayor a la profundidad del ensayo.")
 
 # --- CÁLCULOS (BACKEND) ---
-
-# 1. Cálculo de Tensión Efectiva (Sigma_v')
-# Asumimos peso del agua = 9.81 kN/m3
-gamma_w = 9.81
-
-if depth <= water_table:
-    # Suelo seco/húmedo todo el camino
-    sigma_v_eff = depth * gamma_soil
-else:
-    # Parte seca + Parte sumergida
-    sigma_v_total = (water_table * gamma_soil) + ((depth - water_table) * gamma_soil)
-    u = (depth - water_table) * gamma_w # Presión de poros
-    sigma_v_eff = sigma_v_total - u
-
-# Evitar división por cero
-if sigma_v_eff < 1:
-    sigma_v_eff = 1.0
-
-# 2. Factor de corrección por sobrecarga (Cn)
-# Fórmula de Liao & Whitman: sqrt(Pa / sigma_v')
-# Pa ≈ 100 kPa (1 atm)
-Cn = (100.0 / sigma_v_eff) ** 0.5
-# Cap (límite máximo) usualmente es 1.7
-if Cn > 1.7:
-    Cn = 1.7
-
-# 3. Corrección por longitud de varillaje (Cr)
-if depth < 3:
-    Cr = 0.75
-elif depth < 4:
-    Cr = 0.80
-elif depth < 6:
-    Cr = 0.85
-elif depth < 10:
-    Cr = 0.95
-else:
-    Cr = 1.0
-
-# 4. Cálculo Final
-N60 = n_raw * Ce * Cb * Cs * Cr
-N1_60 = N60 * Cn
+# σ'v con γ sobre el nivel freático, γsat bajo él y γw = 9.81 kN/m³; Cn de
+# Liao & Whitman con Pa ≈ 100 kPa y tope 1.7; Cr por tramos de longitud de
+# varillaje (ver correlaciones/spt.py y correlaciones/tensiones.py).
+calc = spt.corregir(depth, n_raw, gamma=gamma_soil, gamma_sat=gamma_sat,
+                    nivel_freatico=water_table, **EQUIPO).iloc[0]
+sigma_v_eff, Cn, Cr = calc["σ'v (kPa)"], calc["Cn"], calc["Cr"]
+N60, N1_60 = calc["N60"], calc["(N1)60"]
 
 # --- RESULTADOS ---
 st.markdown("---")
@@ -1,161 +1,41 @@
 import streamlit as st
-from docx import Document
-import io
 import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from correlaciones import registro  # noqa: E402
+import informes  # noqa: E402
+
+NO_ACEPTABLE = "Valor no aceptable para los datos introducidos"
+
 
 def calcular_Cc(LL=None, PL=None, IP=None, w=None, e=None, Gs=None, F=None):
     """
     Calcula el índice de compresión (Cc) según los datos disponibles.
-    Solo aplica fórmulas para las que todos los parámetros necesarios estén disponibles.
+    Solo aplica fórmulas para las que todos los parámetros necesarios estén disponibles
+    (registro correlaciones/data/cc.yaml).
     """
+    tabla = registro.tabla("cc", LL=LL, PL=PL, IP=IP, w=w, e=e, Gs=Gs, F=F)
     resultados = {}
     formulas_usadas = {}
-
-    def valor_aceptable(valor):
-        return valor if valor is not None and valor > 0 else None
-
-    LL = valor_aceptable(LL)
-    PL = valor_aceptable(PL)
-    IP = valor_aceptable(IP)
-    w = valor_aceptable(w)
-    e = valor_aceptable(e)
-    Gs = valor_aceptable(Gs)
-    F = valor_aceptable(F)
-
-    if LL is not None:
-        cc_value = 0.009 * (LL - 10)
-        resultados['Terzaghi & Peck (1967)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Terzaghi & Peck (1967)'] = {'formula': 'Cc = 0.009 × (LL - 10)', 'parametros': ['LL']}
-
-        cc_value = 0.007 * (LL - 7)
-        resultados['Azzouz et al. (1976, arcillas remoldeadas)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Azzouz et al. (1976, arcillas remoldeadas)'] = {'formula': 'Cc = 0.007 × (LL - 7)', 'parametros': ['LL']}
-
-        cc_value = 0.0046 * (LL - 9)
-        resultados['Azzouz et al. (1976, arcillas brasileñas)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Azzouz et al. (1976, arcillas brasileñas)'] = {'formula': 'Cc = 0.0046 × (LL - 9)', 'parametros': ['LL']}
-
-        cc_value = (LL - 13) / 109
-        resultados['Mayne (1980)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Mayne (1980)'] = {'formula': 'Cc = (LL - 13) / 109', 'parametros': ['LL']}
-
-    if e is not None:
-        cc_value = 0.3 * (e - 0.27)
-        resultados['Hough (1957)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Hough (1957)'] = {'formula': 'Cc = 0.3 × (e - 0.27)', 'parametros': ['e']}
-
-        cc_value = 0.156 * e + 0.0107
-        resultados['Azzouz et al. (1976, todas las arcillas)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Azzouz et al. (1976, todas las arcillas)'] = {'formula': 'Cc = 0.156 × e + 0.0107', 'parametros': ['e']}
-
-        cc_value = 0.75 * (e - 0.5)
-        resultados['Azzouz et al. (1976, baja plasticidad)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Azzouz et al. (1976, baja plasticidad)'] = {'formula': 'Cc = 0.75 × (e - 0.5)', 'parametros': ['e']}
-
-        cc_value = 1.21 + 1.005 * (e - 1.87)
-        resultados['Azzouz et al. (1976, São Paulo)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Azzouz et al. (1976, São Paulo)'] = {'formula': 'Cc = 1.21 + 1.005 × (e - 1.87)', 'parametros': ['e']}
-
-        cc_value = 1.15 * (e - 0.35)
-        resultados['Nishida (1956)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Nishida (1956)'] = {'formula': 'Cc = 1.15 × (e - 0.35)', 'parametros': ['e']}
-
-    if w is not None:
-        cc_value = 0.0115 * w
-        resultados['Azzouz et al. (1976, suelos orgánicos)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Azzouz et al. (1976, suelos orgánicos)'] = {'formula': 'Cc = 0.0115 × w', 'parametros': ['w']}
-
-        cc_value = 0.0093 * w
-        resultados['Koppula (1981, a)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Koppula (1981, a)'] = {'formula': 'Cc = 0.0093 × w', 'parametros': ['w']}
-
-        cc_value = 17.66e-5 * w**2 + 5.93e-3 * w - 0.135
-        resultados['Azzouz et al. (1976, Chicago 2)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Azzouz et al. (1976, Chicago 2)'] = {'formula': 'Cc = 17.66 × 10⁻⁵ × w² + 5.93 × 10⁻³ × w - 0.135', 'parametros': ['w']}
-
-    if e is not None and LL is not None and w is not None:
-        cc_value = 0.37 * (e + 0.003 * LL + 0.0004 * w - 0.34)
-        resultados['Azzouz et al. (1976, 678 datos)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Azzouz et al. (1976, 678 datos)'] = {'formula': 'Cc = 0.37 × (e + 0.003 × LL + 0.0004 × w - 0.34)', 'parametros': ['e', 'LL', 'w']}
-
-    if PL is not None and Gs is not None:
-        cc_value = 0.005 * Gs * IP
-        resultados['Wroth & Wood (1978)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Wroth & Wood (1978)'] = {'formula': 'Cc = 0.005 × Gs × IP', 'parametros': ['Gs', 'IP']}
-
-    if IP is not None:
-        cc_value = 0.046 + 0.0104 * IP
-        resultados['Nakase et al. (1988)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Nakase et al. (1988)'] = {'formula': 'Cc = 0.046 + 0.0104 × IP', 'parametros': ['IP']}
-
-    if LL is not None and IP is not None and w is not None and e is not None and F is not None:
-        cc_value = -0.0997 + 0.009 * LL + 0.0014 * IP + 0.0036 * w + 0.1156 * e + 0.0025 * F
-        resultados['Koppula (1981, b)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Koppula (1981, b)'] = {'formula': 'Cc = -0.0997 + 0.009 × LL + 0.0014 × IP + 0.0036 × w + 0.1156 × e + 0.0025 × F', 'parametros': ['LL', 'IP', 'w', 'e', 'F']}
-
-    if w is not None and Gs is not None and PL is not None and IP is not None and F is not None:
-        cc_value = 0.329 * (0.01 * w * Gs - 0.027 * PL + 0.0133 * IP * (1.192 + F / IP))
-        resultados['Carrier (1985)'] = cc_value if cc_value > 0 else "Valor no aceptable para los datos introducidos"
-        formulas_usadas['Carrier (1985)'] = {'formula': 'Cc = 0.329 × (0.01 × w × Gs - 0.027 × PL + 0.0133 × IP × (1.192 + F / IP))', 'parametros': ['w', 'Gs', 'PL', 'IP', 'F']}
-
+    for fila in tabla.itertuples():
+        resultados[fila.Autor] = fila.Valor if pd.notna(fila.Valor) else NO_ACEPTABLE
+        formulas_usadas[fila.Autor] = {'formula': fila.Ecuación, 'parametros': fila.Entradas}
     return resultados, formulas_usadas
 
-def generar_informe(LL, PL, IP, w, e, Gs, F, resultados, formulas_usadas):
-    doc = Document()
-    doc.add_heading('Informe de Cálculo del Índice de Compresión (Cc)', level=1)
-
-    doc.add_heading('Datos Introducidos', level=2)
-    table = doc.add_table(rows=1, cols=2)
-    table.style = 'Table Grid'
-    hdr_cells = table.rows[0].cells
-
-    hdr_cells[0].text = 'Parámetro'
-    hdr_cells[1].text = 'Valor'
-    for cell in hdr_cells:
-        for paragraph in cell.paragraphs:
-            for run in paragraph.runs:
-                run.bold = True
-
-    datos = []
-    if LL is not None:
-        datos.append(("Límite líquido (LL, %)", LL))
-    if PL is not None:
-        datos.append(("Límite plástico (PL, %)", PL))
-    if IP is not None:
-        datos.append(("Índice plástico (IP, %)", IP))
-    if w is not None:
-        datos.append(("Contenido de humedad (w, %)", w))
-    if e is not None:
-        datos.append(("Relación de vacíos (e)", e))
-    if Gs is not None:
-        datos.append(("Gravedad específica (Gs)", Gs))
-    if F is not None:
-        datos.append(("Porcentaje de grano fino (F, %)", F))
-
-    for parametro, valor in datos:
-        row_cells = table.add_row().cells
-        row_cells[0].text = parametro
-        row_cells[1].text = str(valor)
-
-    doc.add_heading('Resultados', level=2)
-    doc.add_paragraph(f"Se calcularon {len(resultados)} correlaciones para Cc con los datos proporcionados.")
-
-    for metodo, valor in resultados.items():
-        doc.add_heading(metodo, level=3)
-        formula_info = formulas_usadas[metodo]
-        p = doc.add_paragraph()
-        run = p.add_run(f"Fórmula: {formula_info['formula']}")
-        run.bold = True
-        doc.add_paragraph(f"Parámetros usados: {', '.join(formula_info['parametros'])}")
-        if isinstance(valor, str):
-            doc.add_paragraph(f"Resultado: {valor}")
-        else:
-            doc.add_paragraph(f"Resultado: Cc = {valor:.4f}")
-
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
+def generar_informe(LL, PL, IP, w, e, Gs, F):
+    """Informe Word de las fórmulas aplicables (informes.docx_cc); None si
+    ninguna da un valor aceptable."""
+    tabla = (registro.tabla("cc", LL=LL, PL=PL, IP=IP, w=w, e=e, Gs=Gs, F=F)
+             .rename(columns={"Grupo": "Variable", "Valor": "Cc"})
+             .dropna(subset=["Cc"]))
+    if tabla.empty:
+        return None
+    otros = [("Límite Plástico (PL)", PL, "%"), ("Humedad natural (w)", w, "%"),
+             ("Índice de poros (e)", e, ""), ("Peso específico de las partículas (Gs)", Gs, ""),
+             ("Porcentaje de finos (F)", F, "%")]
+    return informes.docx_cc(LL, IP, tabla, otros=otros)
 
 def main():
     st.set_page_config(layout="wide")
@@ -240,13 +120,14 @@ def main():
                         st.write(f"Resultado: Cc = {valor:.4f}")
                     st.markdown("---")
 
-                informe_buffer = generar_informe(LL, PL, IP, w, e, Gs, F, resultados, formulas_usadas)
-                st.download_button(
-                    label="Descargar informe en Word",
-                    data=informe_buffer,
-                    file_name="informe_Cc.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                )
+                informe_buffer = generar_informe(LL, PL, IP, w, e, Gs, F)
+                if informe_buffer is not None:
+                    st.download_button(
+                        label="Descargar informe en Word",
+                        data=informe_buffer,
+                        file_name="informe_Cc.docx",
+                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                    )
             else:
                 st.warning("No hay suficientes datos para aplicar ninguna fórmula.")
 
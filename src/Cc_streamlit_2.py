@@ -1,6 +1,11 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from correlaciones import registro  # noqa: E402
 
 # --- CONFIGURACIÓN DE LA PÁGINA ---
 st.set_page_config(page_title="Calculadora Geotécnica de Cc", layout="wide", page_icon="🌍")
@@ -16,59 +21,11 @@ st.sidebar.markdown("Ingresa los límites de Atterberg de tu ensayo de laborator
 LL = st.sidebar.number_input("Límite Líquido (LL) [%]", value=None, min_value=0.0)
 IP = st.sidebar.number_input("Índice de Plasticidad (IP) [%]", value=None, min_value=0.0)
 
-# --- LÓGICA DE SELECCIÓN DE FÓRMULAS ---
-resultados = []
-info_formulas = []
-
-# GRUPO 1: Basadas exclusivamente en Límite Líquido (LL)
-if LL is not None:
-    resultados.extend([
-        {"Variable": "LL", "Autor": "Terzaghi & Peck (1967)", "Cc": 0.009 * (LL - 10)},
-        {"Variable": "LL", "Autor": "Skempton (1944)", "Cc": 0.007 * (LL - 10)},
-        {"Variable": "LL", "Autor": "Mayne (1980)", "Cc": (LL - 13) / 109},
-        {"Variable": "LL", "Autor": "Tsuchida (1991) a", "Cc": 0.009 * (LL - 8)},
-        {"Variable": "LL", "Autor": "Tsuchida (1991) b", "Cc": 0.009 * LL},
-        {"Variable": "LL", "Autor": "Azzouz et al. (1976) a", "Cc": 0.007 * (LL - 7)},
-        {"Variable": "LL", "Autor": "Azzouz et al. (1976) b", "Cc": 0.006 * (LL - 9)},
-        {"Variable": "LL", "Autor": "Cozzolino (1961)", "Cc": 0.0046 * (LL - 9)},
-        {"Variable": "LL", "Autor": "Yamagutshi (1959)", "Cc": 0.013 * (LL - 13.5)},
-        {"Variable": "LL", "Autor": "Shouka (1964)", "Cc": 0.017 * (LL - 20)},
-        {"Variable": "LL", "Autor": "Nishant Dayal et al. (2006)", "Cc": 0.0037 * (LL + 25.5)},
-        {"Variable": "LL", "Autor": "Yoon et al. (2004) a", "Cc": 0.012 * (LL + 16.4)},
-        {"Variable": "LL", "Autor": "Yoon et al. (2004) b", "Cc": 0.011 * (LL - 6.36)},
-        {"Variable": "LL", "Autor": "Yoon et al. (2004) c", "Cc": 0.01 * (LL - 10.9)}
-    ])
-    info_formulas.extend([
-        {"Autor": "Terzaghi & Peck (1967)", "Ecuación": "Cc = 0.009(LL-10)"},
-        {"Autor": "Skempton (1944)", "Ecuación": "Cc = 0.007(LL-10)"},
-        {"Autor": "Mayne (1980)", "Ecuación": "Cc = (LL-13)/109"},
-        {"Autor": "Tsuchida (1991) a", "Ecuación": "Cc = 0.009(LL-8)"},
-        {"Autor": "Tsuchida (1991) b", "Ecuación": "Cc = 0.009(LL)"},
-        {"Autor": "Azzouz et al. (1976) a", "Ecuación": "Cc = 0.007(LL-7)"},
-        {"Autor": "Azzouz et al. (1976) b", "Ecuación": "Cc = 0.006(LL-9)"},
-        {"Autor": "Cozzolino (1961)", "Ecuación": "Cc = 0.0046(LL-9)"},
-        {"Autor": "Yamagutshi (1959)", "Ecuación": "Cc = 0.013(LL-13.5)"},
-        {"Autor": "Shouka (1964)", "Ecuación": "Cc = 0.017(LL-20)"},
-        {"Autor": "Nishant Dayal et al. (2006)", "Ecuación": "Cc = 0.0037(LL+25.5)"},
-        {"Autor": "Yoon et al. (2004) a", "Ecuación": "Cc = 0.012(LL+16.4)"},
-        {"Autor": "Yoon et al. (2004) b", "Ecuación": "Cc = 0.011(LL-6.36)"},
-        {"Autor": "Yoon et al. (2004) c", "Ecuación": "Cc = 0.01(LL-10.9)"}
-    ])
-
-# GRUPO 2: Basadas exclusivamente en Índice de Plasticidad (IP)
-if IP is not None:
-    resultados.extend([
-        {"Variable": "IP", "Autor": "Nacci et al. (1975)", "Cc": 0.02 + 0.014 * IP},
-        {"Variable": "IP", "Autor": "Nakase et al. (1988)", "Cc": 0.046 + 0.0104 * IP},
-        {"Variable": "IP", "Autor": "Nishant Dayal et al. (2006)", "Cc": 0.0042 * IP + 0.165},
-        {"Variable": "IP", "Autor": "Yoon et al. (2004) IP", "Cc": 0.165 + 0.014 * IP}
-    ])
-    info_formulas.extend([
-        {"Autor": "Nacci et al. (1975)", "Ecuación": "Cc = 0.02 + 0.014(IP)"},
-        {"Autor": "Nakase et al. (1988)", "Ecuación": "Cc = 0.046 + 0.0104(IP)"},
-        {"Autor": "Nishant Dayal et al. (2006)", "Ecuación": "Cc = 0.0042(IP) + 0.165"},
-        {"Autor": "Yoon et al. (2004)", "Ecuación": "Cc = 0.165 + 0.014(IP)"}
-    ])
+# --- LÓGICA DE SELECCIÓN DE FÓRMULAS (registro correlaciones/data/cc.yaml) ---
+tabla_cc = registro.tabla("cc", LL=LL, IP=IP)
+resultados = (tabla_cc.rename(columns={"Grupo": "Variable", "Valor": "Cc"})
+              [["Variable", "Autor", "Cc"]].to_dict("records"))
+info_formulas = tabla_cc[["Autor", "Ecuación"]].to_dict("records")
 
 # --- INTERFAZ PRINCIPAL (TABS) ---
 if not resultados:
@@ -1,142 +1,36 @@
 import streamlit as st
-from docx import Document
-import io
 import pandas as pd
-import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from correlaciones import elasticidad, registro  # noqa: E402
+import informes  # noqa: E402
 
 def calcular_modulo_elasticidad(Nspt=None):
     """
     Calcula el módulo de elasticidad (E) según los datos disponibles.
-    Solo aplica fórmulas para las que todos los parámetros necesarios estén disponibles.
+    Solo aplica fórmulas para las que todos los parámetros necesarios estén disponibles
+    (registro correlaciones/data/e_arenas.yaml).
     """
+    tabla = registro.tabla("e_arenas", N=Nspt)
     resultados = {}
     formulas_usadas = {}
-
-    def valor_aceptable(valor):
-        return valor if valor is not None and valor >= 0 else None
-
-    Nspt = valor_aceptable(Nspt)
-
-    if Nspt is not None:
-        # Fórmula de Webb, 1974 para Arenas arcillosas
-        E = 0.324 * (Nspt + 15)
-        resultados['Webb, 1974 (Arenas arcillosas)'] = E
-        formulas_usadas['Webb, 1974 (Arenas arcillosas)'] = {'formula': 'E = 0.324 × (Nspt + 15)', 'parametros': ['Nspt']}
-
-        # Fórmula de Webb, 1974 para Casos intermedios
-        E = 0.392 * (Nspt + 12)
-        resultados['Webb, 1974 (Casos intermedios)'] = E
-        formulas_usadas['Webb, 1974 (Casos intermedios)'] = {'formula': 'E = 0.392 × (Nspt + 12)', 'parametros': ['Nspt']}
-
-        # Fórmula de Denver, 1982 para Arenas
-        E = 7 * math.sqrt(Nspt)
-        resultados['Denver, 1982 (Arenas)'] = E
-        formulas_usadas['Denver, 1982 (Arenas)'] = {'formula': 'E = 7 × √Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Meigh y Nixon, 1961 para Limos y limos arenosos
-        E = 0.491 * Nspt
-        resultados['Meigh y Nixon, 1961 (Limos y limos arenosos)'] = E
-        formulas_usadas['Meigh y Nixon, 1961 (Limos y limos arenosos)'] = {'formula': 'E = 0.491 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Meigh y Nixon, 1961 para Arenas finas
-        E = 0.785 * Nspt
-        resultados['Meigh y Nixon, 1961 (Arenas finas)'] = E
-        formulas_usadas['Meigh y Nixon, 1961 (Arenas finas)'] = {'formula': 'E = 0.785 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de Wroth y Nowatzki, 1986 para Gravas
-        E = 2.22 * Nspt ** 0.886
-        resultados['Wroth y Nowatzki, 1986 (Gravas)'] = E
-        formulas_usadas['Wroth y Nowatzki, 1986 (Gravas)'] = {'formula': 'E = 2.22 × Nspt^0.886', 'parametros': ['Nspt']}
-
-        # Fórmula de Bowles, 1996 para Arenas normalmente consolidadas
-        E = 0.491 * (Nspt + 15)
-        resultados['Bowles, 1996 (Arenas normalmente consolidadas)'] = E
-        formulas_usadas['Bowles, 1996 (Arenas normalmente consolidadas)'] = {'formula': 'E = 0.491 × (Nspt + 15)', 'parametros': ['Nspt']}
-
-        # Fórmula de Bowles, 1996 para Arenas en general
-        E = 0.491 * (Nspt + 15)
-        resultados['Bowles, 1996 (Arenas en general)'] = E
-        formulas_usadas['Bowles, 1996 (Arenas en general)'] = {'formula': 'E = 0.491 × (Nspt + 15)', 'parametros': ['Nspt']}
-
-        # Fórmula de Bowles, 1996 para Gravas (N ≤ 15)
-        E = 0.589 * (Nspt + 6)
-        resultados['Bowles, 1996 (Gravas, N ≤ 15)'] = E
-        formulas_usadas['Bowles, 1996 (Gravas, N ≤ 15)'] = {'formula': 'E = 0.589 × (Nspt + 6)', 'parametros': ['Nspt']}
-
-        # Fórmula de Bowles, 1996 para Gravas (N > 15)
-        E = 0.589 * (Nspt + 6) + 1.962
-        resultados['Bowles, 1996 (Gravas, N > 15)'] = E
-        formulas_usadas['Bowles, 1996 (Gravas, N > 15)'] = {'formula': 'E = 0.589 × (Nspt + 6) + 1.962', 'parametros': ['Nspt']}
-
-        # Fórmula de Bowles, 1996 para Gravas y arenas (N ≤ 15)
-        E = 1.177 * (Nspt + 6)
-        resultados['Bowles, 1996 (Gravas y arenas, N ≤ 15)'] = E
-        formulas_usadas['Bowles, 1996 (Gravas y arenas, N ≤ 15)'] = {'formula': 'E = 1.177 × (Nspt + 6)', 'parametros': ['Nspt']}
-
-        # Fórmula de Bowles, 1996 para Gravas y arenas (N > 15)
-        E = 1.177 * (Nspt + 6) + 3.924
-        resultados['Bowles, 1996 (Gravas y arenas, N > 15)'] = E
-        formulas_usadas['Bowles, 1996 (Gravas y arenas, N > 15)'] = {'formula': 'E = 1.177 × (Nspt + 6) + 3.924', 'parametros': ['Nspt']}
-
-        # Fórmula de Schertmann, 1970 para Arenas
-        E = 0.785 * Nspt
-        resultados['Schertmann, 1970 (Arenas)'] = E
-        formulas_usadas['Schertmann, 1970 (Arenas)'] = {'formula': 'E = 0.785 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de D’Polonia y otros para Arenas normalmente consolidadas
-        E = 21.09 + 1.04 * Nspt
-        resultados['D’Polonia y otros (Arenas normalmente consolidadas)'] = E
-        formulas_usadas['D’Polonia y otros (Arenas normalmente consolidadas)'] = {'formula': 'E = 21.09 + 1.04 × Nspt', 'parametros': ['Nspt']}
-
-        # Fórmula de D’Polonia y otros para Arenas preconsolidadas
-        E = 52.97 + 1.32 * Nspt
-        resultados['D’Polonia y otros (Arenas preconsolidadas)'] = E
-        formulas_usadas['D’Polonia y otros (Arenas preconsolidadas)'] = {'formula': 'E = 52.97 + 1.32 × Nspt', 'parametros': ['Nspt']}
-
+    for fila in tabla.itertuples():
+        metodo = f"{fila.Autor} — {fila.Aplicación}"
+        resultados[metodo] = fila.Valor
+        formulas_usadas[metodo] = {'formula': fila.Ecuación, 'parametros': ['Nspt'],
+                                   'aplicacion': fila.Aplicación}
     return resultados, formulas_usadas
 
-def generar_informe(Nspt, resultados, formulas_usadas):
-    doc = Document()
-    doc.add_heading('Informe de Cálculo del Módulo de Elasticidad (E)', level=1)
-
-    doc.add_heading('Datos Introducidos', level=2)
-    table = doc.add_table(rows=1, cols=2)
-    table.style = 'Table Grid'
-    hdr_cells = table.rows[0].cells
-
-    hdr_cells[0].text = 'Parámetro'
-    hdr_cells[1].text = 'Valor'
-    for cell in hdr_cells:
-        for paragraph in cell.paragraphs:
-            for run in paragraph.runs:
-                run.bold = True
-
-    datos = []
-    if Nspt is not None:
-        datos.append(("Número de golpes SPT (Nspt)", Nspt))
-
-    for parametro, valor in datos:
-        row_cells = table.add_row().cells
-        row_cells[0].text = parametro
-        row_cells[1].text = str(valor)
-
-    doc.add_heading('Resultados', level=2)
-    doc.add_paragraph(f"Se calcularon {len(resultados)} correlaciones para E con los datos proporcionados.")
-
-    for metodo, valor in resultados.items():
-        doc.add_heading(metodo, level=3)
-        formula_info = formulas_usadas[metodo]
-        p = doc.add_paragraph()
-        run = p.add_run(f"Fórmula: {formula_info['formula']}")
-        run.bold = True
-        doc.add_paragraph(f"Aplicación: {metodo.split('(')[1].rstrip(')')}")
-        doc.add_paragraph(f"Parámetros usados: {', '.join(formula_info['parametros'])}")
-        doc.add_paragraph(f"Resultado: E ≈ {valor:.2f} MPa")
-
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
+def generar_informe(Nspt):
+    """Informe Word de todas las correlaciones aplicables (informes.docx_e_arenas)."""
+    tabla = elasticidad.arenas(Nspt)
+    stats = elasticidad.estadisticas(tabla["E (MPa)"]) if len(tabla) >= 2 else None
+    fig = informes.barras(tabla, f"Módulo de Elasticidad (N={Nspt:g})",
+                          etiqueta="{Autor} ({Aplicación}): {valor:.1f} MPa",
+                          paleta=informes.PRISM)
+    return informes.docx_e_arenas(Nspt, tabla, stats, fig, "Mostrar Todo")
 
 def main():
     st.set_page_config(layout="wide")
@@ -180,12 +74,12 @@ def main():
                 for metodo, valor in resultados.items():
                     st.markdown(f"**{metodo}**")
                     st.write(f"Fórmula: {formulas_usadas[metodo]['formula']}")
-                    st.write(f"Aplicación: {metodo.split('(')[1].rstrip(')')}")
+                    st.write(f"Aplicación: {formulas_usadas[metodo]['aplicacion']}")
                     st.write(f"Parámetros usados: {', '.join(formulas_usadas[metodo]['parametros'])}")
                     st.write(f"Resultado: E ≈ {valor:.2f} MPa")
                     st.markdown("---")
 
-                informe_buffer = generar_informe(Nspt, resultados, formulas_usadas)
+                informe_buffer = generar_informe(Nspt)
                 st.download_button(
                     label="Descargar informe en Word",
                     data=informe_buffer,
@@ -208,21 +102,9 @@ def main():
             """, unsafe_allow_html=True)
 
             correlaciones = [
-                {"name": "Webb, 1974 (Arenas arcillosas)", "formula": "E = 0.324 × (Nspt + 15)", "params": "Nspt", "aplicacion": "Arenas arcillosas"},
-                {"name": "Webb, 1974 (Casos intermedios)", "formula": "E = 0.392 × (Nspt + 12)", "params": "Nspt", "aplicacion": "Casos intermedios"},
-                {"name": "Denver, 1982 (Arenas)", "formula": "E = 7 × √Nspt", "params": "Nspt", "aplicacion": "Arenas"},
-                {"name": "Meigh y Nixon, 1961 (Limos y limos arenosos)", "formula": "E = 0.491 × Nspt", "params": "Nspt", "aplicacion": "Limos y limos arenosos"},
-                {"name": "Meigh y Nixon, 1961 (Arenas finas)", "formula": "E = 0.785 × Nspt", "params": "Nspt", "aplicacion": "Arenas finas"},
-                {"name": "Wroth y Nowatzki, 1986 (Gravas)", "formula": "E = 2.22 × Nspt^0.886", "params": "Nspt", "aplicacion": "Gravas"},
-                {"name": "Bowles, 1996 (Arenas normalmente consolidadas)", "formula": "E = 0.491 × (Nspt + 15)", "params": "Nspt", "aplicacion": "Arenas normalmente consolidadas"},
-                {"name": "Bowles, 1996 (Arenas en general)", "formula": "E = 0.491 × (Nspt + 15)", "params": "Nspt", "aplicacion": "Arenas en general"},
-                {"name": "Bowles, 1996 (Gravas, N ≤ 15)", "formula": "E = 0.589 × (Nspt + 6)", "params": "Nspt", "aplicacion": "Gravas (N ≤ 15)"},
-                {"name": "Bowles, 1996 (Gravas, N > 15)", "formula": "E = 0.589 × (Nspt + 6) + 1.962", "params": "Nspt", "aplicacion": "Gravas (N > 15)"},
-                {"name": "Bowles, 1996 (Gravas y arenas, N ≤ 15)", "formula": "E = 1.177 × (Nspt + 6)", "params": "Nspt", "aplicacion": "Gravas y arenas (N ≤ 15)"},
-                {"name": "Bowles, 1996 (Gravas y arenas, N > 15)", "formula": "E = 1.177 × (Nspt + 6) + 3.924", "params": "Nspt", "aplicacion": "Gravas y arenas (N > 15)"},
-                {"name": "Schertmann, 1970 (Arenas)", "formula": "E = 0.785 × Nspt", "params": "Nspt", "aplicacion": "Arenas"},
-                {"name": "D’Polonia y otros (Arenas normalmente consolidadas)", "formula": "E = 21.09 + 1.04 × Nspt", "params": "Nspt", "aplicacion": "Arenas normalmente consolidadas"},
-                {"name": "D’Polonia y otros (Arenas preconsolidadas)", "formula": "E = 52.97 + 1.32 × Nspt", "params": "Nspt", "aplicacion": "Arenas preconsolidadas"}
+                {"name": f"{c['autor']} — {c['aplicacion']}", "formula": c["texto"],
+                 "params": "Nspt", "aplicacion": c["aplicacion"]}
+                for c in registro.correlaciones("e_arenas")
             ]
 
             for correlacion in correlaciones:
@@ -0,0 +1,12 @@
+import pytest
+
+from correlaciones import memo
+
+
+@pytest.fixture(autouse=True, scope="session")
+def memo_temporal(tmp_path_factory):
+    """La memoria de resultados de la sesión de pruebas, fuera de ~/.cache."""
+    original = memo.DIR_CACHE
+    memo.DIR_CACHE = tmp_path_factory.mktemp("memo")
+    yield memo.DIR_CACHE
+    memo.DIR_CACHE = original
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from correlaciones import atlas, registro
+
+
+@pytest.fixture(autouse=True)
+def cache_temporal(tmp_path, monkeypatch):
+    monkeypatch.setattr(atlas, "DIR_CACHE", tmp_path)
+    atlas.cargar.cache_clear()
+    yield tmp_path
+    atlas.cargar.cache_clear()
+
+
+def _aleatorios(magnitud, n, rng):
+    datos = {}
+    for v, spec in registro.variables(magnitud).items():
+        if spec.get("categorias"):
+            datos[v] = rng.integers(0, len(spec["categorias"]), n)
+        else:
+            datos[v] = rng.uniform(*spec["atlas"], n)
+    return datos
+
+
+@pytest.mark.parametrize("magnitud", ["e_arenas", "e_arcillas", "phi", "cc"])
+def test_consulta_igual_al_registro(magnitud):
+    datos = _aleatorios(magnitud, 20_000, np.random.default_rng(0))
+    exacto = registro.evaluar(magnitud, datos)[0]
+    interp = atlas.consultar(magnitud, datos)
+    assert np.array_equal(np.isfinite(exacto), np.isfinite(interp))
+    ok = np.isfinite(exacto)
+    assert np.allclose(interp[ok], exacto[ok], rtol=2 * atlas.TOLERANCIA)
+
+
+def test_saltos_exactos_junto_a_la_frontera():
+    # tramo de IP de la tabla F.2 (30) y rama N = 15 de Bowles
+    datos = {"IP": [29.99, 30.0, 30.01], "Cu": 100, "OCR": 0, "N": 10}
+    assert np.allclose(atlas.consultar("e_arcillas", datos, ["cte_f2"])[:, 0],
+                       registro.evaluar("e_arcillas", datos, ["cte_f2"])[0][:, 0])
+    n = [14.99, 15.0, 15.01]
+    ids = ["bowles_1996_gravas", "bowles_1996_gravas_n15"]
+    assert np.allclose(atlas.consultar("e_arenas", {"N": n}, ids),
+                       registro.evaluar("e_arenas", {"N": n}, ids)[0], equal_nan=True)
+
+
+def test_fuera_de_malla_y_correlaciones_sin_atlas():
+    assert np.isnan(atlas.consultar("e_arenas", {"N": [150.0]})).all()
+    tabla, corrs = atlas.cargar("cc"), registro.correlaciones("cc")
+    sin_atlas = [c["id"] for c in corrs if c["id"] not in tabla]
+    assert sin_atlas
+    assert all(len(c["entradas"]) > atlas.MAX_DIMENSIONES for c in corrs if c["id"] in sin_atlas)
+    datos = {"LL": 50, "PL": 25, "IP": 25, "w": 40, "e": 1.1, "Gs": 2.7, "F": 80}
+    assert np.allclose(atlas.consultar("cc", datos, sin_atlas),
+                       registro.evaluar("cc", datos, sin_atlas)[0], equal_nan=True)
+
+
+def test_cache_en_disco(cache_temporal):
+    a = atlas.cargar("e_arcillas")
+    ruta = atlas.ruta("e_arcillas")
+    assert ruta.parent == cache_temporal and ruta.exists()
+    atlas.cargar.cache_clear()
+    b = atlas.cargar("e_arcillas")
+    assert a.keys() == b.keys()
+    for id_ in a:
+        assert list(a[id_][0]) == list(b[id_][0])
+        assert np.array_equal(a[id_][1], b[id_][1], equal_nan=True)
+        assert np.array_equal(a[id_][2], b[id_][2])
+    ruta.write_bytes(b"no es un npz")            # caché dañada: se reconstruye
+    atlas.cargar.cache_clear()
+    assert atlas.cargar("e_arcillas").keys() == a.keys()
+
+
+def test_curvas():
+    tabla = atlas.curvas("e_arenas", "N")
+    assert tabla["id"].nunique() == len(registro.correlaciones("e_arenas"))
+    assert tabla["N"].min() == 1 and tabla["N"].max() == 100
+    # Stroud necesita IP; el CTE no depende de N
+    arc = atlas.curvas("e_arcillas", "N", {"IP": 30})
+    assert set(arc["id"]) == {"stroud_1974_sup", "stroud_1974_inf",
+                              "stroud_butler_media", "stroud_butler_baja"}
+    assert atlas.curvas("e_arcillas", "Cu").empty
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlaciones import barrido, registro
+
+EJES = {"N": np.linspace(1, 50, 20), "IP": np.linspace(5, 80, 15), "Cu": np.linspace(10, 300, 10)}
+
+
+def test_malla_igual_a_evaluacion_completa():
+    res = barrido.malla("e_arcillas", EJES, {"OCR": 1})
+    assert res["valores"].shape == (20, 15, 10, len(registro.correlaciones("e_arcillas")))
+    n, ip, cu = np.meshgrid(*EJES.values(), indexing="ij")
+    ref, _ = registro.evaluar("e_arcillas", {"N": n.ravel(), "IP": ip.ravel(),
+                                             "Cu": cu.ravel(), "OCR": 1})
+    assert np.allclose(res["valores"].reshape(-1, len(res["ids"])), ref, equal_nan=True)
+
+
+def test_correlacion_constante_en_ejes_de_los_que_no_depende():
+    res = barrido.malla("e_arcillas", EJES, {"OCR": 0}, ids=["stroud_1974_sup", "cte_f2"])
+    stroud, cte = res["valores"][..., 0], res["valores"][..., 1]
+    assert np.all(stroud == stroud[:, :, :1])      # no depende de Cu
+    assert np.all(cte == cte[:1])                  # no depende de N
+
+
+def test_ocr_como_eje():
+    res = barrido.malla("e_arcillas", {"IP": [20, 40, 60], "OCR": [0, 1, 2]},
+                        {"Cu": 100}, ids=["cte_f2"])
+    # K de la tabla F.2 por banda de IP (filas) y clase de OCR (columnas)
+    k = np.array([[160, 120, 60], [70, 50, 26], [30, 20, 10]])
+    assert np.allclose(res["valores"][..., 0], k * 100 / 1000)
+
+
+def test_corte():
+    res = barrido.malla("e_arcillas", EJES, {"OCR": 0})
+    mapa = barrido.corte(res, "cte_f2", N=12)
+    assert isinstance(mapa, pd.DataFrame)
+    assert (mapa.index.name, mapa.columns.name) == ("IP", "Cu")
+    curva = barrido.corte(res, "stroud_1974_sup", IP=30, Cu=100)
+    assert isinstance(curva, pd.Series) and curva.index.name == "N"
+    assert curva.is_monotonic_increasing
+    with pytest.raises(ValueError):
+        barrido.corte(res, "cte_f2")
+
+
+def test_errores_de_ejes():
+    with pytest.raises(ValueError):
+        barrido.malla("e_arcillas", {"N": [10]}, {"N": 10})
+    with pytest.raises(ValueError):
+        barrido.malla("e_arcillas", {"X": [1]})
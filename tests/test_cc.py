@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlaciones import cc
+
+
+def _col(autor):
+    return cc.AUTORES.index(autor)
+
+
+def test_evaluar_escalar_igual_a_la_formula():
+    valores, aplicable = cc.evaluar({"LL": 50, "IP": 25})
+    assert valores.shape == (1, len(cc.FORMULAS))
+    assert valores[0, _col("Terzaghi & Peck (1967)")] == pytest.approx(0.36)
+    assert valores[0, _col("Nakase et al. (1988)")] == pytest.approx(0.306)
+    # sin e ni w, las fórmulas que los requieren no aplican
+    assert not aplicable[0, _col("Hough (1957)")]
+    assert np.isnan(valores[0, _col("Koppula (1981) b")])
+
+
+def test_evaluar_descarta_faltantes_y_negativos():
+    valores, aplicable = cc.evaluar({"LL": [60, np.nan, 8], "e": [1.0, 0.9, np.nan]})
+    j = _col("Terzaghi & Peck (1967)")
+    assert aplicable[:, j].tolist() == [True, False, True]
+    # LL = 8 -> Cc < 0: aplicable pero descartado
+    assert np.isfinite(valores[0, j]) and np.isnan(valores[1:, j]).all()
+    k = _col("Azzouz et al. (1976, 678 datos)")
+    assert aplicable[:, k].tolist() == [False, False, False]
+
+
+def test_lote_tabla_larga_y_resumen():
+    tabla = pd.DataFrame({"LL": [50.0, np.nan, np.nan], "IP": [25.0, 30.0, np.nan],
+                          "Humedad": [20.0, np.nan, np.nan]},
+                         index=pd.Index([10, 11, 12], name="sample_id"))
+    largo, resumen = cc.lote(tabla)
+    assert set(largo.index) == {10, 11}
+    assert (largo["Cc"] > 0).all()
+    assert set(largo.loc[11, "Variable"]) == {"IP"}
+    assert resumen.loc[12, "N"] == 0 and np.isnan(resumen.loc[12, "Mediana"])
+    assert resumen.loc[11, "N"] == 4
+    assert resumen.loc[10, "Mediana"] == pytest.approx(largo.loc[10, "Cc"].median())
+    assert resumen.loc[10, "Mínimo"] <= resumen.loc[10, "P25"] <= resumen.loc[10, "P75"]
+
+
+def test_desde_tabla_prefiere_la_primera_columna():
+    tabla = pd.DataFrame({"W": [30.0, np.nan], "Humedad": [25.0, 18.0]})
+    assert cc.desde_tabla(tabla)["w"].tolist() == [30.0, 18.0]
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from correlaciones import elasticidad, registro
+
+
+def test_arenas_y_filtro():
+    tabla = elasticidad.arenas(20)
+    assert list(tabla.columns) == elasticidad.COLUMNAS
+    assert len(tabla) == len(registro.tabla("e_arenas", N=20))
+    gravas = elasticidad.filtrar_arenas(tabla, "Gravas")
+    assert not gravas.empty
+    assert gravas["Aplicación"].str.lower().str.contains("grava").all()
+    assert elasticidad.filtrar_arenas(tabla, "Mostrar Todo") is tabla
+
+
+def test_arcillas_cte_con_ocr():
+    ocr = elasticidad.OCR_CATEGORIAS[0]
+    tabla = elasticidad.arcillas(20, 30.0, 100.0, ocr)
+    cte = tabla[tabla["Autor"].str.startswith("CTE")]
+    assert len(cte) == 1 and cte["Aplicación"].iloc[0].endswith(f", {ocr}")
+    stroud = tabla[tabla["Fórmula Original"] == "1.2·f2(IP)·N"]
+    assert stroud["E (MPa)"].iloc[0] == pytest.approx(33.6)
+
+
+def test_estadisticas():
+    est = elasticidad.estadisticas([10.0, 20.0, 30.0])
+    assert est.iloc[0].to_dict() == pytest.approx(
+        {"Mínimo": 10, "Máximo": 30, "Promedio": 20, "Mediana": 20, "Desv. Típica": 10})
+    assert elasticidad.estadisticas([5.0])["Desv. Típica"].iloc[0] == 0
+
+
+def test_nucleo_sin_dependencias_de_interfaz():
+    modulos = sorted(p.stem for p in Path(elasticidad.__file__).parent.glob("*.py")
+                     if p.stem != "__init__")
+    codigo = ("import sys\n"
+              + "".join(f"import correlaciones.{m}\n" for m in modulos)
+              + "print(sorted({n.split('.')[0] for n in sys.modules}"
+                " & {'streamlit', 'plotly', 'docx', 'matplotlib'}))")
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                            check=True, cwd=Path(__file__).resolve().parents[1])
+    assert salida.stdout.strip() == "[]"
+
+
+def test_con_seleccion_no_modifica_la_tabla():
+    # un fragmento de Streamlit recibe el mismo DataFrame en cada ejecución
+    tabla = elasticidad.arcillas(20, 15, 80, elasticidad.OCR_CATEGORIAS[0])
+    columnas = list(tabla.columns)
+    marcas = {elasticidad.clave_seleccion(tabla.iloc[0]): False}
+    for _ in range(2):
+        df = elasticidad.con_seleccion(tabla, marcas)
+        assert list(df.columns) == ["Seleccionar", *columnas]
+        assert df["Seleccionar"].tolist() == [False] + [True] * (len(tabla) - 1)
+    assert list(tabla.columns) == columnas
@@ -0,0 +1,85 @@
+"""
+Tests del informe por lotes de GeoLab Viewer (sin Streamlit).
+"""
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("matplotlib")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import geolab_cli as cli  # noqa: E402
+
+
+@pytest.fixture
+def listado():
+    n = 12
+    return pd.DataFrame({
+        "Descripción Muestra": [f"S-{i % 3 + 1} M{i}" for i in range(n)],
+        "Profundidad inicial": np.linspace(1, 12, n),
+        "SPT (valores centrales)": np.arange(n) + 10.0,
+        "LL": np.linspace(30, 60, n),
+        "IP": np.linspace(10, 30, n),
+    })
+
+
+def test_render_page_escribe_tabla_y_figuras(listado, tmp_path):
+    ficheros = cli.render_page(listado, "spt", tmp_path)
+    nombres = {f.name for f in ficheros}
+    assert {"estadisticos.csv", "diagramas_caja.png", "perfil_spt.png",
+            "spt.pdf"} <= nombres
+    assert all(f.exists() for f in ficheros)
+
+
+def test_render_page_sin_datos_no_deja_pdf_vacio(listado, tmp_path):
+    assert cli.render_page(listado, "consol", tmp_path) == []
+    assert not (tmp_path / "consol" / "consol.pdf").exists()
+
+
+def test_render_page_formatos(listado, tmp_path):
+    ficheros = cli.render_page(listado, "intervalos", tmp_path, formatos=["csv"])
+    assert {f.name for f in ficheros} == {
+        "intervalos_global.csv", "intervalos_prospeccion.csv", "intervalos_unidad.csv",
+        "intervalos_uscs.csv"}
+
+
+def test_run_lee_cada_listado_una_vez_y_anota_los_errores(listado, tmp_path,
+                                                          monkeypatch):
+    leidos = []
+
+    def leer(ruta):
+        leidos.append(Path(ruta).name)
+        if "roto" in ruta:
+            raise ValueError("hoja vacía")
+        return listado
+
+    monkeypatch.setattr(cli, "load_and_clean", leer)
+    cli._listado.cache_clear()
+    obra, roto = str(tmp_path / "obra.xlsx"), str(tmp_path / "roto.xlsx")
+    resumen = cli.run([obra, roto], tmp_path / "informes", ["csv"], ["overview", "spt"], jobs=1)
+    assert leidos.count("obra.xlsx") == 1
+    estados = resumen.set_index(["listado", "pagina"])["estado"]
+    assert estados[("obra", "spt")] == "ok"
+    assert estados[("roto", "spt")] == "ValueError: hoja vacía"
+    assert (tmp_path / "informes" / "obra" / "spt" / "estadisticos.csv").exists()
+    assert (tmp_path / "informes" / "resumen.csv").exists()
+    cli._listado.cache_clear()
+
+
+def test_slug_sin_acentos():
+    assert cli._slug("Límite Plástico") == "limite_plastico"
+
+
+def test_render_page_html_autocontenido(listado, tmp_path):
+    ficheros = cli.render_page(listado, "spt", tmp_path, formatos=["html"])
+    assert [f.name for f in ficheros] == ["spt.html"]
+    texto = ficheros[0].read_text(encoding="utf-8")
+    assert texto.count("<svg") == 2 and "<table>" in texto
+    assert "src=" not in texto and "href=\"http" not in texto   # sin recursos externos
+
+
+def test_pagina_html_en_memoria(listado):
+    texto = cli.pagina_html(listado, "spt").decode("utf-8")
+    assert texto.startswith("<!DOCTYPE html>") and texto.count("<svg") == 2
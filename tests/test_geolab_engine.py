@@ -0,0 +1,363 @@
+"""
+Tests del motor de ingesta del listado de laboratorio (GeoLab Viewer).
+
+Usan un listado sintético con los tres bloques de muestra de la hoja real.
+"""
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import geolab_engine as geo  # noqa: E402
+
+
+@pytest.fixture
+def listado():
+    return pd.DataFrame({
+        "Unidad geotécnica":     ["UG1", "UG1", "UG2"],
+        "Descripción Muestra":   ["S-1 M1", "S-1 M2", "S-2 M1"],
+        "Profundidad inicial":   [2.0, 5.0, 3.0],
+        "SPT (valores centrales)": [12, np.nan, 30],
+        "LL":                    [45.0, 38.0, np.nan],
+        "IP":                    [20.0, 15.0, np.nan],
+        "Clasificación USCS":    ["CL", "CL", None],
+        "Descripción Muestra.1": ["S-1 M1", None, None],
+        "Profundidad inicial.1": [2.0, np.nan, np.nan],
+        "Humedad":               [22.5, np.nan, np.nan],
+        "Descripción Muestra.2": ["S-1 M2", "S-2 M1", None],
+        "Profundidad inicial.2": [5.0, 3.0, np.nan],
+        "Indice de Poros":       [0.85, 0.70, np.nan],
+        "CBR":                   [np.nan, 8.0, np.nan],
+    })
+
+
+# --------------------------------------------------------------------------- #
+#  Limpieza                                                                    #
+# --------------------------------------------------------------------------- #
+def test_to_float_coma_decimal():
+    assert geo.to_float("1,5") == 1.5
+    assert np.isnan(geo.to_float("n.d."))
+
+
+def test_prospect_from_sample():
+    assert geo.prospect_from_sample("S-1 M2") == "S-1"
+    assert geo.prospect_from_sample(None) == "Desconocido"
+
+
+# --------------------------------------------------------------------------- #
+#  Formato largo                                                               #
+# --------------------------------------------------------------------------- #
+def test_long_no_guarda_vacios(listado):
+    long = geo.to_long(listado)
+    assert long["valor"].notna().all()
+    n_valores = listado[["SPT (valores centrales)", "LL", "IP", "Humedad",
+                         "Indice de Poros", "CBR"]].notna().sum().sum()
+    assert len(long) == n_valores
+
+
+def test_long_parametro_en_una_sola_familia(listado):
+    long = geo.to_long(listado)
+    fam = long.groupby("parametro", observed=True)["familia"].nunique()
+    assert (fam == 1).all()
+    assert set(long.loc[long["parametro"] == "LL", "familia"]) == {"atterberg"}
+
+
+def test_long_lee_profundidad_del_bloque_de_la_familia(listado):
+    long = geo.to_long(listado)
+    e = long[long["parametro"] == "Indice de Poros"].set_index("muestra")
+    assert e.loc["S-1 M2", "profundidad"] == 5.0
+    assert e.loc["S-2 M1", "profundidad"] == 3.0
+
+
+def test_sample_id_comun_entre_bloques(listado):
+    long = geo.to_long(listado)
+    ids = long[long["muestra"] == "S-1 M2"]["sample_id"].unique()
+    assert len(ids) == 1
+    idx = geo.sample_index(long)
+    assert idx.loc[ids[0], "familias"] == "atterberg, consolidacion"
+
+
+def test_cross_family_alinea_ll_con_e_y_cbr(listado):
+    long = geo.to_long(listado)
+    t = geo.cross_family(long, ["LL", "Indice de Poros", "CBR"]).set_index("muestra")
+    assert t.loc["S-1 M2", "LL"] == 38.0
+    assert t.loc["S-1 M2", "Indice de Poros"] == 0.85
+    assert t.loc["S-2 M1", "CBR"] == 8.0
+    assert np.isnan(t.loc["S-2 M1", "LL"])
+
+
+def test_long_vacio():
+    long = geo.to_long(pd.DataFrame({"Otra": [1]}))
+    assert long.empty and "sample_id" in long.columns
+
+
+# --------------------------------------------------------------------------- #
+#  Agregación por intervalos de profundidad                                    #
+# --------------------------------------------------------------------------- #
+def test_long_propaga_unidad_a_toda_la_muestra(listado):
+    long = geo.to_long(listado)
+    hum = long[long["parametro"] == "Humedad"]
+    assert list(hum["unidad"]) == ["UG1"]
+
+
+def test_make_edges_cubre_el_rango():
+    e = geo.make_edges(2.0, 7.0)
+    assert list(e) == [0.0, 2.0, 4.0, 6.0, 8.0]
+    with pytest.raises(ValueError):
+        geo.make_edges(0, 7.0)
+
+
+def test_depth_bins_global(listado):
+    long = geo.to_long(listado)
+    t = geo.depth_bins(long, [0, 4, 8], params=["LL"])
+    assert list(t["N"]) == [1, 1]
+    assert list(t["Media"]) == [45.0, 38.0]
+    assert list(t["z_med"]) == [2.0, 6.0]
+
+
+def test_depth_bins_por_grupo_y_fuera_de_rango(listado):
+    long = geo.to_long(listado)
+    t = geo.depth_bins(long, [0, 4], by="prospeccion",
+                       params=["SPT (valores centrales)"])
+    assert set(t["grupo"]) == {"S-1", "S-2"}
+    t = geo.depth_bins(long, [10, 20])
+    assert t.empty
+
+
+def test_depth_bins_percentiles_y_envolvente():
+    rng = np.random.default_rng(0)
+    long = pd.DataFrame({
+        "parametro": "X", "prospeccion": "S-1", "unidad": "UG1",
+        "profundidad": rng.uniform(0, 10, 100_000),
+        "valor": rng.normal(10, 2, 100_000),
+    })
+    t = geo.depth_bins(long, geo.make_edges(1.0, 10.0))
+    assert len(t) == 10 and t["N"].sum() == 100_000
+    assert (t["Min"] <= t["P10"]).all() and (t["P10"] <= t["P50"]).all()
+    assert (t["P50"] <= t["P90"]).all() and (t["P90"] <= t["Max"]).all()
+
+
+def test_depth_bins_agrupacion_desconocida(listado):
+    with pytest.raises(ValueError):
+        geo.depth_bins(geo.to_long(listado), [0, 1], by="sondeo")
+
+
+# --------------------------------------------------------------------------- #
+#  Tipos compactos                                                             #
+# --------------------------------------------------------------------------- #
+def test_compact_dtypes_categorias_y_float32(listado):
+    c = geo.compact_dtypes(pd.concat([listado] * 4, ignore_index=True))
+    assert isinstance(c["Unidad geotécnica"].dtype, pd.CategoricalDtype)
+    assert c["LL"].dtype == np.float32
+    c = geo.compact_dtypes(listado)          # una descripción por fila
+    assert not isinstance(c["Descripción Muestra"].dtype, pd.CategoricalDtype)
+
+
+def test_compact_dtypes_respeta_precision():
+    df = pd.DataFrame({"fino": [0.1, 22.35, np.nan], "preciso": [1.0, 1.0000001, 2.0]})
+    c = geo.compact_dtypes(df)
+    assert c["fino"].dtype == np.float32
+    assert c["preciso"].dtype == np.float64
+
+
+def test_compact_dtypes_no_cambia_la_tabla_larga(listado):
+    l1 = geo.to_long(listado)
+    l2 = geo.to_long(geo.compact_dtypes(listado))
+    assert list(l1["muestra"]) == list(l2["muestra"])
+    np.testing.assert_allclose(l1["valor"], l2["valor"], rtol=1e-6)
+
+
+def test_memory_report_total(listado):
+    rep = geo.memory_report(listado, geo.compact_dtypes(listado))
+    assert rep.loc["TOTAL", "KB después"] < rep.loc["TOTAL", "KB antes"]
+    assert rep.loc["TOTAL", "KB antes"] == pytest.approx(rep["KB antes"].iloc[:-1].sum())
+
+
+def test_compact_memory_report_sin_el_original(listado):
+    compacto = geo.compact_dtypes(listado)
+    pd.testing.assert_frame_equal(geo.compact_memory_report(compacto),
+                                  geo.memory_report(listado, compacto))
+
+
+# --------------------------------------------------------------------------- #
+#  Ingesta incremental                                                         #
+# --------------------------------------------------------------------------- #
+def _raw(listado):
+    """Listado tal como llega del Excel: números con coma decimal."""
+    return listado.map(lambda x: str(x).replace(".", ",")
+                       if isinstance(x, float) and not np.isnan(x) else x)
+
+
+def _igual_a_ingesta_completa(estado, raw):
+    df = geo.clean_frame(raw)
+    pd.testing.assert_frame_equal(estado["df"], df, check_dtype=False)
+    pd.testing.assert_frame_equal(estado["long"], geo.to_long(df))
+
+
+def test_ingesta_inicial_equivale_a_completa(listado):
+    raw = _raw(listado)
+    estado, cambios, _ = geo.ingest_incremental(raw)
+    assert cambios == {"nuevas": 3, "modificadas": 0, "sin_cambios": 0,
+                       "eliminadas": 0}
+    _igual_a_ingesta_completa(estado, raw)
+
+
+def test_ingesta_solo_procesa_filas_nuevas(listado, monkeypatch):
+    raw = _raw(listado)
+    estado, _, _ = geo.ingest_incremental(raw)
+    extra = raw.iloc[[0]].assign(**{"Descripción Muestra": "S-3 M1"})
+    raw2 = pd.concat([raw, extra], ignore_index=True)
+
+    limpias = []
+    original = geo.clean_frame
+    monkeypatch.setattr(geo, "clean_frame", lambda r: limpias.append(len(r)) or original(r))
+    estado2, cambios, _ = geo.ingest_incremental(raw2, estado)
+    monkeypatch.undo()
+
+    assert limpias == [1]
+    assert cambios == {"nuevas": 1, "modificadas": 0, "sin_cambios": 3, "eliminadas": 0}
+    _igual_a_ingesta_completa(estado2, raw2)
+
+
+def test_ingesta_detecta_modificadas_y_eliminadas(listado):
+    raw = _raw(listado)
+    estado, _, _ = geo.ingest_incremental(raw)
+    raw2 = raw.drop(index=2).reset_index(drop=True)
+    raw2.loc[0, "LL"] = "47,0"
+    estado2, cambios, _ = geo.ingest_incremental(raw2, estado)
+    assert cambios == {"nuevas": 0, "modificadas": 1, "sin_cambios": 1, "eliminadas": 1}
+    _igual_a_ingesta_completa(estado2, raw2)
+    assert 47.0 in set(estado2["long"]["valor"])
+
+
+def test_ingesta_compacta_solo_las_filas_nuevas(listado, monkeypatch):
+    raw = _raw(pd.concat([listado] * 3, ignore_index=True)
+               .assign(**{"Descripción Muestra": lambda d: [f"S-{i} M1" for i in range(len(d))]}))
+    estado, _, report = geo.ingest_incremental(raw, compact=True)
+    assert set(estado) == {"claves", "huellas", "compacto", "df", "long"}
+    assert report.loc["TOTAL", "KB después"] < report.loc["TOTAL", "KB antes"]
+    extra = raw.iloc[[0]].assign(**{"Descripción Muestra": "S-99 M1"})
+    raw2 = pd.concat([raw, extra], ignore_index=True)
+
+    compactadas = []
+    original = geo.compact_dtypes
+    monkeypatch.setattr(geo, "compact_dtypes", lambda d: compactadas.append(len(d)) or original(d))
+    estado2, cambios, report = geo.ingest_incremental(raw2, estado, compact=True)
+    monkeypatch.undo()
+
+    assert compactadas == [1] and cambios["nuevas"] == 1
+    completo = geo.compact_dtypes(geo.clean_frame(raw2))
+    esperado = geo.memory_report(geo.clean_frame(raw2), estado2["df"])   # todo el listado
+    pd.testing.assert_frame_equal(report, esperado)
+    estado3, _, sin_cambios = geo.ingest_incremental(raw2, estado2, compact=True)
+    pd.testing.assert_series_equal(sin_cambios["KB antes"], esperado["KB antes"])
+    pd.testing.assert_series_equal(estado3["df"].dtypes, completo.dtypes)
+    pd.testing.assert_series_equal(estado2["df"].dtypes, completo.dtypes)
+    pd.testing.assert_frame_equal(estado2["df"], completo)
+    pd.testing.assert_frame_equal(estado2["long"], geo.to_long(geo.clean_frame(raw2)))
+
+
+def test_to_long_fila_apunta_al_listado(listado):
+    long = geo.to_long(listado)
+    ll = long[long["parametro"] == "LL"]
+    assert list(listado.loc[ll["fila"], "LL"]) == list(ll["valor"])
+
+
+# --------------------------------------------------------------------------- #
+#  Valores atípicos                                                            #
+# --------------------------------------------------------------------------- #
+@pytest.fixture
+def long_atipicos():
+    valores = [10, 11, 12, 10, 11, 12, 10, 11, 60]        # 60 es atípico en S-1
+    n = len(valores)
+    return pd.DataFrame({
+        "parametro": pd.Categorical(["X"] * n + ["X"] * 3),
+        "prospeccion": pd.Categorical(["S-1"] * n + ["S-2"] * 3),
+        "uscs": pd.Categorical(["CL"] * (n + 3)),
+        "valor": valores + [55.0, 60.0, 58.0],
+        "fila": list(range(n + 3)),
+    })
+
+
+def test_outlier_flags_todos_los_criterios(long_atipicos):
+    f = geo.outlier_flags(long_atipicos, by="prospeccion")
+    assert list(f.index[f["atipico"]]) == [8]
+    for metodo in geo.OUTLIER_METODOS:
+        assert f.loc[8, metodo]
+
+
+def test_outlier_flags_depende_del_grupo(long_atipicos):
+    # Con todo el listado junto, S-2 (≈ 58) deja de ser llamativo frente a 60
+    por_prosp = geo.outlier_flags(long_atipicos, by="prospeccion")
+    glob = geo.outlier_flags(long_atipicos, by="global")
+    assert por_prosp["atipico"].sum() == 1
+    assert not glob.loc[8, "iqr"]
+
+
+def test_outlier_flags_grupos_pequenos_y_mad_nula():
+    long = pd.DataFrame({"parametro": ["X"] * 5 + ["Y"] * 3,
+                         "valor": [5.0] * 4 + [9.0] + [1.0, 2.0, 50.0]})
+    f = geo.outlier_flags(long)
+    assert not f.loc[5:, "atipico"].any()                 # Y: solo 3 valores
+    assert not f.loc[:4, "mad"].any() and not f.loc[:4, "z_robusto"].any()
+
+
+def test_flag_matrix_por_fila_y_parametro(listado):
+    long = geo.to_long(pd.concat([listado] * 3, ignore_index=True))
+    long.loc[long["parametro"] == "LL", "valor"] = [45.0] * 5 + [400.0]
+    mat = geo.flag_matrix(long, geo.outlier_flags(long))
+    assert mat["LL"].sum() == 1
+    fila = long.loc[(long["parametro"] == "LL") & (long["valor"] == 400.0), "fila"].item()
+    assert mat.loc[fila, "LL"]
+
+
+# --------------------------------------------------------------------------- #
+#  Correlaciones                                                               #
+# --------------------------------------------------------------------------- #
+@pytest.fixture
+def incompletos():
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(500, 4)), columns=["LL", "IP", "W", "CBR"])
+    X["IP"] += 0.8 * X["LL"]
+    return X.mask(rng.random(X.shape) < 0.3)
+
+
+def test_correlation_matrix_igual_a_pandas_por_pares(incompletos):
+    r, n = geo.correlation_matrix(incompletos)
+    pd.testing.assert_frame_equal(r, incompletos.corr(min_periods=3), atol=1e-12)
+    m = incompletos.notna().astype(int)
+    np.testing.assert_array_equal(n.to_numpy(), (m.T @ m).to_numpy())
+
+
+def test_correlation_matrix_spearman_sin_huecos(incompletos):
+    X = incompletos.dropna()
+    r, _ = geo.correlation_matrix(X, "spearman")
+    pd.testing.assert_frame_equal(r, X.corr("spearman"), atol=1e-12)
+
+
+def test_correlation_matrix_spearman_con_huecos_igual_a_pandas(incompletos):
+    X = incompletos.round(1)                            # con empates
+    r, _ = geo.correlation_matrix(X, "spearman")
+    pd.testing.assert_frame_equal(r, X.corr("spearman", min_periods=3), atol=1e-12)
+
+
+def test_correlation_matrix_pocos_pares_y_constantes():
+    X = pd.DataFrame({"a": [1.0, 2.0, 3.0, 4.0], "b": [2.0, np.nan, np.nan, 1.0],
+                      "c": [5.0] * 4})
+    r, n = geo.correlation_matrix(X)
+    assert n.loc["a", "b"] == 2 and np.isnan(r.loc["a", "b"])
+    assert np.isnan(r.loc["a", "c"])
+    with pytest.raises(ValueError):
+        geo.correlation_matrix(X, "kendall")
+
+
+def test_correlations_cruza_familias_por_grupo(listado):
+    long = geo.to_long(pd.concat([listado] * 2, ignore_index=True))
+    res = geo.correlations(long, ["LL", "Indice de Poros", "CBR"], by="unidad")
+    assert set(res) == {"UG1", "UG2"}
+    r, n = res["UG1"]
+    assert list(r.columns) == ["LL", "Indice de Poros", "CBR"]
+    assert n.loc["LL", "Indice de Poros"] == 1          # solo S-1 M2 tiene ambos
@@ -0,0 +1,74 @@
+from pathlib import Path
+import io
+import sys
+
+import pandas as pd
+import pytest
+
+docx = pytest.importorskip("docx")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import informes  # noqa: E402
+import rasterizado  # noqa: E402
+from correlaciones import elasticidad  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache_temporal(tmp_path, monkeypatch):
+    monkeypatch.setattr(rasterizado, "DIR_CACHE", tmp_path / "png")
+
+
+def test_plantilla_leida_una_vez_y_con_estilos():
+    informes._plantilla.cache_clear()
+    a, b = informes.documento(), informes.documento()
+    assert informes._plantilla.cache_info().misses == 1
+    a.add_paragraph("solo en a")
+    assert len(b.paragraphs) == 0                       # copias independientes
+    assert b.styles["Heading 1"].font.name == "Calibri Light"
+    assert b.sections[0].left_margin == docx.shared.Inches(1.25)
+
+
+def test_plantilla_ausente_se_estiliza_en_memoria(tmp_path):
+    doc = informes.documento(tmp_path / "no_existe.docx")
+    assert doc.styles["Title"].font.size == docx.shared.Pt(26)
+    informes._plantilla.cache_clear()
+
+
+def test_agregar_tabla_grande():
+    doc = informes.documento()
+    filas = [[f"A<{i}> & b", "x\ny", i] for i in range(500)]
+    t = informes.agregar_tabla(doc, ["Autor", "Texto", "Valor"], filas,
+                               anchos=[2.0, 2.0, 1.0], alineacion="center", tamano=10)
+    leida = docx.Document(io.BytesIO(informes._guardar(doc))).tables[0]
+    assert len(t.rows) == len(leida.rows) == 501
+    assert [c.text for c in leida.rows[0].cells] == ["Autor", "Texto", "Valor"]
+    assert [c.text for c in leida.rows[8].cells] == ["A<7> & b", "x\ny", "7"]
+    assert leida.rows[0].cells[0].paragraphs[0].runs[0].bold
+    assert leida.rows[1].cells[2].paragraphs[0].runs[0].font.size == docx.shared.Pt(10)
+    assert leida.style.name == "Light List Accent 1"
+    assert leida.columns[0].width == docx.shared.Inches(2.0)
+
+
+def test_informe_arenas_con_cientos_de_metodos():
+    tabla = pd.concat([elasticidad.arenas(20)] * 30, ignore_index=True)
+    stats = elasticidad.estadisticas(tabla["E (MPa)"])
+    datos = informes.docx_e_arenas(20, tabla, stats, {"data": []}, "Mostrar Todo")
+    doc = docx.Document(io.BytesIO(datos))
+    metodos, estadisticos = doc.tables
+    assert len(metodos.rows) == len(tabla) + 1
+    assert metodos.rows[1].cells[3].text == f"{tabla['E (MPa)'].iloc[0]:.2f}"
+    assert [c.text for c in estadisticos.rows[0].cells] == informes.ESTADISTICOS
+    assert any("Gráfica no disponible" in p.text for p in doc.paragraphs)
+
+
+def test_informe_cc_con_otros_datos_de_entrada():
+    from correlaciones import registro
+
+    tabla = (registro.tabla("cc", LL=50, IP=25, e=1.2)
+             .rename(columns={"Grupo": "Variable", "Valor": "Cc"}).dropna(subset=["Cc"]))
+    datos = informes.docx_cc(50, 25, tabla, otros=[("Índice de poros (e)", 1.2, ""),
+                                                   ("Humedad natural (w)", None, "%")])
+    doc = docx.Document(io.BytesIO(datos))
+    textos = [p.text for p in doc.paragraphs]
+    assert "Índice de poros (e): 1.2" in textos
+    assert not any(t.startswith("Humedad") for t in textos)
+    assert len(doc.tables[0].rows) == len(tabla) + 1
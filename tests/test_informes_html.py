@@ -0,0 +1,81 @@
+from pathlib import Path
+import sys
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import informes  # noqa: E402
+import informes_html as ih  # noqa: E402
+from correlaciones import elasticidad, phi, registro  # noqa: E402
+
+
+def _svgs(texto: str):
+    partes = texto.split("<svg")[1:]
+    return [ET.fromstring("<svg" + p[:p.index("</svg>") + 6]) for p in partes]
+
+
+def test_documento_se_emite_por_trozos_y_escapa():
+    filas = ([f"<{i}>", i] for i in range(3))
+    trozos = list(ih.documento("A & B", [ih.parrafo("x < y"), ih.tabla(["a", "b"], filas)]))
+    assert len(trozos) == 1 + 1 + 5 + 1            # cabecera, párrafo, tabla por filas, pie
+    texto = "".join(trozos)
+    assert "<title>A &amp; B</title>" in texto and "<p>x &lt; y</p>" in texto
+    assert "<td>&lt;2&gt;</td><td>2</td>" in texto
+    assert texto.rstrip().endswith("</html>")
+
+
+def test_escribir_en_fichero(tmp_path):
+    ruta = tmp_path / "informe.html"
+    ih.escribir(ruta, "Informe", [ih.tabla_df(pd.DataFrame({"v": [1.23456, None]}),
+                                              index=False)])
+    texto = ruta.read_text(encoding="utf-8")
+    assert "<td>1.235</td>" in texto and "<td></td>" in texto
+
+
+def test_barras_svg_valido():
+    tabla = elasticidad.arenas(20)
+    fig = informes.barras(tabla, "E <arenas>", etiqueta="{Autor}: {valor:.1f} MPa")
+    svg, = _svgs(ih.barras_svg(fig))
+    rects = [r for r in svg.iter("{http://www.w3.org/2000/svg}rect")]
+    n_leyenda = tabla["Aplicación"].nunique()
+    assert len(rects) == len(tabla) + n_leyenda
+    anchos = sorted(float(r.get("width")) for r in rects[:len(tabla)])
+    proporcion = [a / e for a, e in zip(anchos, sorted(tabla["E (MPa)"]))]
+    assert max(proporcion) == pytest.approx(min(proporcion), rel=1e-2)
+
+
+@pytest.mark.parametrize("paso", [(7.3, 2), (0.42, 0.1), (1000, 200)])
+def test_paso_redondo(paso):
+    maximo, esperado = paso
+    assert ih._paso(maximo) == pytest.approx(esperado)
+
+
+def test_informes_de_las_calculadoras():
+    tabla = elasticidad.arenas(20)
+    stats = elasticidad.estadisticas(tabla["E (MPa)"])
+    fig = informes.barras(tabla, "E")
+    arenas = ih.html_e_arenas(20, tabla, stats, fig, "Mostrar Todo").decode()
+    assert arenas.count("<tr>") == len(tabla) + 3 and len(_svgs(arenas)) == 1
+    assert "Referencias Bibliográficas" in arenas
+
+    arcillas = elasticidad.arcillas(10, 20, 80, elasticidad.OCR_CATEGORIAS[0])
+    texto = ih.html_e_arcillas(10, 20, 80, "x", arcillas, None, informes.barras(arcillas, "E"))
+    assert b"Cohesi\xc3\xb3n sin drenaje (Cu): 80 kPa" in texto
+
+    resultados, formulas = phi.calcular(IP=20, Nspt=15)
+    assert "φ ≈" in ih.html_phi(20, 15, resultados, formulas).decode()
+
+    cc = (registro.tabla("cc", LL=45, IP=20)
+          .rename(columns={"Grupo": "Variable", "Valor": "Cc"}))
+    texto = ih.html_cc(45, 20, cc).decode()
+    assert texto.count("<svg") == 1 and "Límite Líquido (LL): 45 %" in texto
+
+
+def test_pdf_sin_weasyprint():
+    if ih.pdf_disponible():
+        assert ih.pdf(ih.render("x", [])).startswith(b"%PDF")
+    else:
+        with pytest.raises(ImportError, match="weasyprint"):
+            ih.pdf(b"<html></html>")
@@ -0,0 +1,56 @@
+from pathlib import Path
+import io
+import sys
+import zipfile
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("docx")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import lote_informes as lote  # noqa: E402
+import rasterizado  # noqa: E402
+
+TABLA = pd.DataFrame({"caso": ["C-1", "C-2", "C-1"], "N": [12, 25, None],
+                      "IP": [20.0, None, 35.0], "Cu": [80.0, None, 150.0]})
+
+
+@pytest.fixture(autouse=True)
+def cache_temporal(tmp_path, monkeypatch):
+    monkeypatch.setenv("CORRELACIONES_CACHE", str(tmp_path))
+    monkeypatch.setattr(rasterizado, "DIR_CACHE", tmp_path / "png")
+
+
+def test_casos_entradas_y_nombres():
+    lista = list(lote.casos(TABLA, ["e_arenas", "e_arcillas", "phi"], col_nombre="caso"))
+    assert len(lista) == 9
+    nombres = [f for f, _, _ in lista]
+    assert "C_1_e_arenas.docx" in nombres and "C_1_3_e_arenas.docx" in nombres
+    por_fichero = {f: e for f, _, e in lista}
+    assert por_fichero["C_2_phi.docx"] == {"IP": None, "Nspt": 25}
+    assert por_fichero["C_1_e_arcillas.docx"]["OCR"] == 0
+    assert por_fichero["C_1_e_arenas.docx"]["tipo_suelo"] == "Mostrar Todo"
+
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_zip_con_resumen(procesos):
+    destino = io.BytesIO()
+    lista = lote.casos(TABLA, ["e_arenas", "phi"], col_nombre="caso")
+    resumen = lote.generar_zip(lista, destino, procesos=procesos, ventana=2)
+    estados = resumen.set_index("fichero")["estado"]
+    assert estados["C_1_3_e_arenas.docx"] == "sin datos"
+    assert (estados.drop("C_1_3_e_arenas.docx") == "ok").all()
+    with zipfile.ZipFile(destino) as zf:
+        nombres = set(zf.namelist())
+        assert nombres == set(estados[estados == "ok"].index) | {"resumen.csv"}
+        from docx import Document
+        doc = Document(io.BytesIO(zf.read("C_1_e_arenas.docx")))
+        assert not any("no disponible" in p.text for p in doc.paragraphs)
+
+
+def test_error_de_un_caso_no_detiene_el_lote():
+    lista = [("malo.docx", "e_arcillas", {"N": 10, "IP": 20, "Cu": 50, "OCR": 99}),
+             *lote.casos(TABLA.iloc[:1], ["phi"])]
+    resumen = lote.generar_zip(lista, io.BytesIO(), procesos=1)
+    assert resumen["estado"].iloc[0].startswith("IndexError")
+    assert resumen["estado"].iloc[1] == "ok"
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlaciones import memo, montecarlo, registro
+
+
+@pytest.fixture(autouse=True)
+def memo_vacia(tmp_path, monkeypatch):
+    monkeypatch.setattr(memo, "DIR_CACHE", tmp_path)
+    monkeypatch.setattr(memo, "ACTIVA", True)
+    monkeypatch.setattr(memo, "MIN_CELDAS", 500)        # lotes de prueba pequeños
+    yield tmp_path
+    monkeypatch.setattr(memo, "_conexion", None)
+    memo._usos.clear()
+
+
+def _datos(n=200, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return {"N": rng.uniform(2, 60, n).round(1), "IP": rng.uniform(0, 40, n).round(1),
+            "Cu": rng.uniform(10, 200, n), "OCR": rng.integers(1, 5, n)}
+
+
+def _contar_evaluaciones(monkeypatch):
+    evaluadas = []
+    original = registro.evaluar
+    monkeypatch.setattr(registro, "evaluar",
+                        lambda m, d, ids=None: evaluadas.append(m) or original(m, d, ids))
+    return evaluadas
+
+
+def test_igual_que_el_registro_con_y_sin_memoria():
+    datos = _datos()
+    esperado = registro.evaluar("e_arcillas", datos)
+    for _ in range(2):                                  # fallo y después acierto
+        valores, aplicable = memo.evaluar("e_arcillas", datos)
+        assert np.array_equal(aplicable, esperado[1])
+        assert np.allclose(valores, esperado[0], equal_nan=True)
+        assert memo.estado()["entradas"] == 1           # una fila por lote
+
+
+def test_los_lotes_pequenos_no_tocan_el_disco(monkeypatch):
+    evaluadas = _contar_evaluaciones(monkeypatch)
+    memo.evaluar("e_arcillas", _datos(10))              # 10 × 5 < MIN_CELDAS
+    memo.evaluar("e_arcillas", _datos(10))
+    assert evaluadas == ["e_arcillas"] * 2
+    assert not (memo.DIR_CACHE / "memo.sqlite").exists()
+
+
+def test_tabla_del_registro_no_usa_la_memoria():
+    registro.tabla("phi", IP=10, Nspt=20)
+    assert not (memo.DIR_CACHE / "memo.sqlite").exists()
+
+
+def test_persiste_entre_conexiones(monkeypatch):
+    datos = _datos()
+    memo.evaluar("e_arcillas", datos)
+    memo._conexion = None                               # como otro proceso
+    evaluadas = _contar_evaluaciones(monkeypatch)
+    memo.evaluar("e_arcillas", datos)
+    assert evaluadas == []
+
+
+def test_la_clave_solo_usa_las_entradas_normalizadas(monkeypatch):
+    datos = _datos()
+    memo.evaluar("e_arcillas", datos)
+    evaluadas = _contar_evaluaciones(monkeypatch)
+    memo.evaluar("e_arcillas", {**datos, "N": datos["N"] * (1 + 1e-15),
+                                "LL": np.zeros(200)})   # LL no la usa ninguna
+    assert evaluadas == []
+    memo.evaluar("e_arcillas", {**datos, "N": datos["N"] + 0.1})
+    assert evaluadas == ["e_arcillas"]
+
+
+def test_subir_la_version_no_coincide_ni_borra_al_abrir(monkeypatch):
+    c = registro.correlaciones("e_arcillas")[0]
+    datos = _datos()
+    memo.evaluar("e_arcillas", datos)
+    monkeypatch.setitem(c, "version", c["version"] + 1)
+    memo._conexion = None                               # otra copia con otra versión
+    assert memo.estado()["entradas"] == 1
+    memo.evaluar("e_arcillas", datos)
+    assert memo.estado()["entradas"] == 2
+
+
+def test_los_aciertos_no_escriben(monkeypatch):
+    datos = _datos()
+    memo.evaluar("e_arcillas", datos)
+    escrituras = []
+    monkeypatch.setattr(memo, "_escribir", lambda con, nuevo=None: escrituras.append(nuevo))
+    memo.evaluar("e_arcillas", datos)
+    memo.evaluar("e_arcillas", datos)
+    assert escrituras == []
+    assert len(memo._usos) == 1
+
+
+def test_la_huella_cambia_con_la_definicion():
+    c = dict(registro.correlaciones("e_arenas")[0])
+    doc = registro.get_magnitud("e_arenas")
+    assert registro._huella(c, doc) == c["huella"]
+    c["rango"] = {"N": [0, 1]}
+    assert registro._huella(c, doc) != c["huella"]
+
+
+def test_recorta_lo_menos_usado(monkeypatch):
+    monkeypatch.setattr(memo, "MAX_BYTES", 40_000)      # ~3 lotes de 200 × 5
+    for semilla in range(6):
+        memo.evaluar("e_arcillas", _datos(200, semilla))
+    estado = memo.estado()
+    assert 0 < estado["entradas"] < 6 and estado["bytes"] <= 40_000
+    evaluadas = _contar_evaluaciones(monkeypatch)
+    memo.evaluar("e_arcillas", _datos(200, 5))
+    assert evaluadas == []                              # lo último sigue guardado
+    memo.evaluar("e_arcillas", _datos(200, 0))
+    assert evaluadas == ["e_arcillas"]                  # lo primero ya salió
+
+
+def test_desactivada_no_escribe(monkeypatch):
+    monkeypatch.setattr(memo, "ACTIVA", False)
+    valores, _ = memo.evaluar("e_arcillas", _datos())
+    assert valores.shape[0] == 200
+    assert not (memo.DIR_CACHE / "memo.sqlite").exists()
+
+
+def test_clave_canonica():
+    a = memo.clave("x", {"b": 1, "a": np.arange(3.0)}, [1, 2])
+    assert a == memo.clave("x", {"a": np.arange(3.0), "b": 1}, [1, 2])
+    assert a != memo.clave("x", {"b": 1, "a": np.arange(3)}, [1, 2])     # otro dtype
+    assert a != memo.clave("x", {"b": 1, "a": np.arange(3.0)}, (1, 2, 3))
+
+
+def test_montecarlo_con_semilla_se_lee_de_la_memoria(monkeypatch):
+    distribuciones = {"N": {"tipo": "normal", "media": 20.0, "desv": 4.0}}
+    a, ha = montecarlo.simular("e_arenas", distribuciones, n=50_000, semilla=3)
+    evaluadas = _contar_evaluaciones(monkeypatch)
+    b, hb = montecarlo.simular("e_arenas", distribuciones, n=50_000, semilla=3)
+    assert evaluadas == []
+    pd.testing.assert_frame_equal(a, b)
+    assert all(np.array_equal(ha[k][0], hb[k][0]) for k in ha)
+    montecarlo.simular("e_arenas", distribuciones, n=50_000)             # sin semilla
+    assert evaluadas
+    assert memo.estado()["entradas"] == 1
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from correlaciones import montecarlo, registro
+
+N_NORMAL = {"N": {"tipo": "normal", "media": 20.0, "desv": 4.0}}
+
+
+def test_percentiles_match_exact_sample():
+    res, hist = montecarlo.simular("e_arenas", N_NORMAL, n=400_000, bloque=100_000,
+                                   semilla=7, ids=["wrench_nowatzki_1986"])
+    # referencia: percentiles exactos de la misma correlación
+    rng = np.random.default_rng(1)
+    n = rng.normal(20, 4, 2_000_000)
+    ref = registro.evaluar("e_arenas", {"N": n}, ["wrench_nowatzki_1986"])[0][:, 0]
+    ref = ref[np.isfinite(ref)]
+    fila = res.loc["wrench_nowatzki_1986"]
+    for q in montecarlo.PERCENTILES:
+        assert fila[f"P{q}"] == pytest.approx(np.percentile(ref, q), rel=0.01)
+    assert fila["Media"] == pytest.approx(ref.mean(), rel=0.01)
+    cuentas, bordes = hist["wrench_nowatzki_1986"]
+    assert len(bordes) == len(cuentas) + 1
+    assert cuentas.sum() == pytest.approx(0.99 * fila["N"], rel=0.01)
+
+
+def test_result_independent_of_processes(monkeypatch):
+    monkeypatch.setattr(montecarlo.memo, "ACTIVA", False)   # calcular las dos veces
+    a, _ = montecarlo.simular("e_arenas", N_NORMAL, n=60_000, bloque=20_000, semilla=3)
+    b, _ = montecarlo.simular("e_arenas", N_NORMAL, n=60_000, bloque=20_000, semilla=3,
+                              procesos=2)
+    assert a.equals(b)
+    # otro tamaño de bloque: otras muestras, misma distribución
+    c, _ = montecarlo.simular("e_arenas", N_NORMAL, n=60_000, bloque=60_000, semilla=3)
+    assert np.allclose(c["P50"], a["P50"], rtol=0.02)
+
+
+def test_samplers():
+    rng = np.random.default_rng(0)
+    ln = montecarlo.muestrear({"tipo": "lognormal", "media": 50, "desv": 10}, 200_000, rng)
+    assert ln.min() > 0
+    assert ln.mean() == pytest.approx(50, rel=0.01)
+    assert ln.std() == pytest.approx(10, rel=0.03)
+    u = montecarlo.muestrear({"tipo": "uniforme", "min": 2, "max": 4}, 1000, rng)
+    assert 2 <= u.min() and u.max() <= 4
+    emp = montecarlo.desde_listado(["12", "x", 15, None])
+    assert set(montecarlo.muestrear(emp, 100, rng)) <= {12.0, 15.0}
+    assert (montecarlo.muestrear({"tipo": "fijo", "valor": 3}, 5, rng) == 3).all()
+    with pytest.raises(ValueError):
+        montecarlo.muestrear({"tipo": "weibull"}, 5, rng)
+    with pytest.raises(ValueError):
+        montecarlo.muestrear({"tipo": "empirica", "valores": []}, 5, rng)
+
+
+def test_invalid_samples_are_not_counted():
+    # N ~ U(-10, 10): solo la mitad de las muestras son válidas (N > 0)
+    d = {"N": {"tipo": "uniforme", "min": -10, "max": 10}}
+    res, _ = montecarlo.simular("e_arenas", d, n=100_000, semilla=1,
+                                ids=["wrench_nowatzki_1986"])
+    assert res.loc["wrench_nowatzki_1986", "N"] == pytest.approx(50_000, rel=0.02)
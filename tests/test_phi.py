@@ -0,0 +1,62 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlaciones import phi, registro, spt
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import geolab_engine as geo  # noqa: E402
+
+
+@pytest.fixture
+def tabla():
+    listado = pd.DataFrame({
+        "Descripción Muestra":     ["S-1 M1", "S-1 M2", "S-1 M3", "S-2 M1"],
+        "Profundidad inicial":     [2.0, 5.0, 9.0, 3.0],
+        "SPT (valores centrales)": [12, 25, np.nan, 30],
+        "IP":                      [20.0, np.nan, 15.0, np.nan],
+    })
+    long = geo.to_long(listado)
+    return geo.cross_family(long, phi.PARAMETROS_LISTADO)
+
+
+def test_evaluar_igual_a_la_tabla_de_un_caso():
+    valores, _ = phi.evaluar({"IP": [20.0], "Nspt": [15.0]})
+    caso = registro.tabla("phi", IP=20.0, Nspt=15.0)
+    por_autor = dict(zip(phi.AUTORES, valores[0]))
+    for fila in caso.itertuples():
+        assert por_autor[fila.Autor] == pytest.approx(fila.Valor)
+
+
+def test_lote_por_muestra(tabla):
+    valores, resumen = phi.lote(tabla)
+    assert list(valores.columns) == phi.AUTORES
+    assert valores.index.equals(tabla.index) and resumen.index.equals(tabla.index)
+    fila = tabla[["muestra"]].join(resumen).set_index("muestra")
+    # S-1 M1: IP y N -> todas las fórmulas; S-1 M3: solo IP -> Jiménez Salas
+    assert fila.loc["S-1 M1", "N"] == len(phi.FORMULAS)
+    assert fila.loc["S-1 M3", "N"] == 1
+    assert (fila["Mínimo"] <= fila["Mediana"]).all() and (fila["Mediana"] <= fila["Máximo"]).all()
+    esperado = phi.evaluar({"IP": 20.0, "Nspt": 12.0})[0][0]
+    s1m1 = valores[tabla["muestra"] == "S-1 M1"].to_numpy()[0]
+    np.testing.assert_allclose(s1m1, esperado)
+
+
+def test_lote_con_n1_60(tabla):
+    parametros = dict(eficiencia=80, gamma=19.0, nivel_freatico=4.0)
+    valores, resumen = phi.lote(tabla, corregir_n=True, **parametros)
+    n160 = spt.corregir(tabla["profundidad"], tabla[spt.COL_N], **parametros)["(N1)60"]
+    np.testing.assert_allclose(resumen["(N1)60"], n160.to_numpy())
+    esperado, _ = phi.evaluar({"IP": tabla["IP"].to_numpy(), "Nspt": n160.to_numpy()})
+    np.testing.assert_allclose(valores.to_numpy(), esperado)
+
+
+def test_calcular_un_caso():
+    resultados, formulas = phi.calcular(IP=20.0)
+    assert set(resultados) == set(formulas) and len(resultados) == 1
+    completo, _ = phi.calcular(IP=20.0, Nspt=15.0)
+    assert len(completo) == len(phi.FORMULAS)
+    assert phi.calcular() == ({}, {})
@@ -0,0 +1,76 @@
+from pathlib import Path
+import sys
+
+import base64
+import io
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import rasterizado  # noqa: E402
+
+FIG = {"data": [{"type": "bar", "orientation": "h", "x": [1.0, 2.0], "y": ["a", "b"],
+                  "text": ["Webb: 1.0 MPa", "Bowles: 2.0 MPa"], "name": "Arenas",
+                  "marker": {"color": "rgb(95, 70, 144)"}}],
+       "layout": {"title": {"text": "E (MPa)"}}}
+
+
+@pytest.fixture
+def renders(tmp_path, monkeypatch):
+    """Cuenta las llamadas al renderizador (sin kaleido en los tests)."""
+    llamadas = []
+
+    def renderizar(fig, ancho, alto, escala, motor):
+        llamadas.append((ancho, alto, escala))
+        return f"PNG {ancho}x{alto}@{escala} {len(llamadas)}".encode()
+
+    monkeypatch.setattr(rasterizado, "DIR_CACHE", tmp_path)
+    monkeypatch.setattr(rasterizado, "_renderizar", renderizar)
+    rasterizado.vaciar_memoria()
+    yield llamadas
+    rasterizado.vaciar_memoria()
+
+
+def test_clave_por_contenido_y_tamano():
+    k = rasterizado.clave(FIG, 1300, 400)
+    assert k == rasterizado.clave(dict(reversed(list(FIG.items()))), 1300, 400)
+    assert k == rasterizado.clave(rasterizado._json(FIG), 1300, 400)
+    assert k != rasterizado.clave(FIG, 1300, 460)
+    assert k != rasterizado.clave(FIG, 1300, 400, escala=2)
+    assert k != rasterizado.clave(FIG, 1300, 400, motor="matplotlib")
+    otra = {**FIG, "layout": {"title": {"text": "φ (°)"}}}
+    assert k != rasterizado.clave(otra, 1300, 400)
+
+
+def test_memoria_y_disco(renders, tmp_path):
+    a = rasterizado.png(FIG, 1300, 400)
+    assert rasterizado.png(FIG, 1300, 400) == a and len(renders) == 1
+    assert rasterizado.ruta(rasterizado.clave(FIG, 1300, 400)).read_bytes() == a
+    rasterizado.vaciar_memoria()                 # otro proceso: lee del disco
+    assert rasterizado.png(FIG, 1300, 400) == a and len(renders) == 1
+    rasterizado.png(FIG, 1300, 460)
+    assert len(renders) == 2 and not list(tmp_path.rglob("*.tmp"))
+
+
+def test_lru_limitada(renders, monkeypatch):
+    monkeypatch.setattr(rasterizado, "MAX_MEMORIA", 3)
+    for alto in range(5):
+        rasterizado.png(FIG, 100, 100 + alto)
+    assert len(rasterizado._memoria) == 3
+
+
+def test_motor_matplotlib(renders):
+    from matplotlib.image import imread
+
+    gravas = {"type": "bar", "orientation": "h", "name": "Gravas", "y": ["c"],
+              "x": {"dtype": "f8", "bdata": base64.b64encode(np.array([3.0]).tobytes()).decode()},
+              "marker": {"color": "#1d6996"}}
+    fig = {**FIG, "data": FIG["data"] + [gravas]}
+    datos = rasterizado._matplotlib(fig, 400, 200, 2)
+    assert datos[:8] == b"\x89PNG\r\n\x1a\n"
+    assert imread(io.BytesIO(datos)).shape[:2] == (400, 800)
+    with pytest.raises(ValueError):
+        rasterizado._matplotlib({"data": [{"type": "scatter", "x": [1], "y": [1]}]}, 400, 200, 1)
+    with pytest.raises(ValueError, match="Motor desconocido"):
+        rasterizado.png(FIG, 400, 200, motor="svg")
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from correlaciones import registro
+
+
+def _valor(magnitud, id_, **datos):
+    return registro.tabla(magnitud, **datos).loc[id_, "Valor"]
+
+
+def test_all_registries_compile():
+    docs = registro.cargar()
+    assert {"cc", "phi", "e_arenas", "e_arcillas"} <= set(docs)
+    for doc in docs.values():
+        assert all(callable(c["fn"]) for c in doc["correlaciones"])
+
+
+def test_scalar_and_array_evaluation_agree():
+    n = np.array([5.0, 15.0, 16.0, 40.0])
+    valores, aplicable = registro.evaluar("e_arenas", {"N": n})
+    ids = [c["id"] for c in registro.correlaciones("e_arenas")]
+    for i, ni in enumerate(n):
+        tabla = registro.tabla("e_arenas", N=ni)
+        assert list(tabla.index) == [ids[j] for j in np.flatnonzero(aplicable[i])]
+        np.testing.assert_allclose(tabla["Valor"], valores[i, aplicable[i]])
+
+
+def test_piecewise_branches_by_condition():
+    assert _valor("e_arenas", "bowles_1996_gravas", N=15) == pytest.approx(21 * 6 * 0.0980665)
+    tabla = registro.tabla("e_arenas", N=16)
+    assert "bowles_1996_gravas" not in tabla.index
+    assert tabla.loc["bowles_1996_gravas_n15", "Valor"] == pytest.approx(
+        (6 * 22 + 20) * 0.0980665)
+
+
+def test_single_source_for_sands():
+    # Wrench & Nowatzki (1986): E = 2.22·N^0.888 MPa en todas las apps
+    assert _valor("e_arenas", "wrench_nowatzki_1986", N=20) == pytest.approx(2.22 * 20 ** 0.888)
+    assert _valor("e_arenas", "webb_1969_arenas_arcillosas", N=10) == pytest.approx(
+        3.3 * 25 * 0.0980665)
+
+
+def test_clays_lookup_and_interpolation():
+    # f2(25) = 1.55 (interpolado), K(IP<30, OCR<3) = 160
+    assert _valor("e_arcillas", "stroud_1974_sup", N=30, IP=25) == pytest.approx(1.2 * 1.55 * 30)
+    assert _valor("e_arcillas", "stroud_1974_inf", N=30, IP=5) == pytest.approx(0.8 * 2.0 * 30)
+    valores, _ = registro.evaluar("e_arcillas", {"IP": [25, 40, 60], "Cu": 100, "OCR": [0, 1, 2]},
+                                  ids=["cte_f2"])
+    np.testing.assert_allclose(valores[:, 0], [16.0, 5.0, 1.0])
+
+
+def test_availability_and_positive_results():
+    tabla = registro.tabla("cc", LL=8.0)
+    assert np.isnan(tabla.loc["terzaghi_peck_1967", "Valor"])     # Cc ≤ 0 descartado
+    assert "hough_1957" not in tabla.index                        # sin e
+    assert registro.tabla("phi").empty
+
+
+def test_unknown_name_in_expression_is_rejected(tmp_path):
+    (tmp_path / "x.yaml").write_text(
+        "meta: {magnitud: x}\nvariables: {a: {}}\n"
+        "correlaciones:\n- {id: m, autor: M, grupo: g, entradas: [a], "
+        "expresion: 2 * b, texto: t}\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="b"):
+        registro.cargar(str(tmp_path))
@@ -0,0 +1,156 @@
+from pathlib import Path
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import servidor_correlaciones as sc  # noqa: E402
+from correlaciones import registro, spt  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def url():
+    servidor = sc.crear_servidor(puerto=0, procesos=1, max_sincrono=50)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield "http://127.0.0.1:%d" % servidor.server_address[1]
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _pedir(url, ruta, cuerpo=None, metodo=None):
+    datos = None if cuerpo is None else json.dumps(cuerpo).encode()
+    req = urllib.request.Request(url + ruta, datos, method=metodo)
+    try:
+        with urllib.request.urlopen(req) as r:
+            return r.status, json.loads(r.read() or b"null")
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"null")
+
+
+def test_indice_de_calculadoras(url):
+    estado, datos = _pedir(url, "/")
+    assert estado == 200
+    assert set(datos["calculadoras"]) == set(sc.CALCULADORAS)
+    assert datos["calculadoras"]["cc"]["entradas"] == list(registro.variables("cc"))
+    assert "sigma_v" in datos["calculadoras"]["n1_60"]["entradas"]
+
+
+@pytest.mark.parametrize("magnitud", sc.MAGNITUDES)
+def test_sincrono_igual_que_el_registro(url, magnitud):
+    rng = np.random.default_rng(0)
+    casos = {v: (rng.integers(0, 3, 20) if spec.get("categorias")
+                 else rng.uniform(*spec["atlas"], 20).round(1)).tolist()
+             for v, spec in registro.variables(magnitud).items()}
+    estado, datos = _pedir(url, f"/calcular/{magnitud}", {"casos": casos})
+    assert estado == 200 and datos["n"] == 20
+    valores = registro.evaluar(magnitud, casos)[0]
+    ids = [c["id"] for c in registro.correlaciones(magnitud)]
+    api = np.array([[np.nan if r[i] is None else r[i] for i in ids] for r in datos["resultados"]])
+    assert np.allclose(api, valores, equal_nan=True)
+    assert [r["N"] for r in datos["resultados"]] == np.isfinite(valores).sum(axis=1).tolist()
+
+
+def test_casos_como_lista_y_ocr_por_etiqueta(url):
+    casos = [{"N": 20, "IP": 15, "Cu": 80, "OCR": registro.variables("e_arcillas")
+              ["OCR"]["categorias"][1]}, {"N": 5}]
+    estado, datos = _pedir(url, "/calcular/e_arcillas", {"casos": casos})
+    assert estado == 200
+    esperado = registro.evaluar("e_arcillas", {"N": [20, 5], "IP": [15, None],
+                                               "Cu": [80, None], "OCR": [1, None]})[0]
+    assert datos["resultados"][0]["cte_f2"] == pytest.approx(esperado[0, -1])
+    assert datos["resultados"][1]["stroud_1974_sup"] is None
+
+
+def test_n1_60_con_terreno_comun(url):
+    cuerpo = {"casos": {"profundidad": [2, 8, 15], "N": [10, 20, 30], "eficiencia": [80, None, 45]},
+              "terreno": {"gamma": 19, "nivel_freatico": 5}}
+    estado, datos = _pedir(url, "/calcular/n1_60", cuerpo)
+    assert estado == 200
+    esperado = spt.corregir([2, 8, 15], [10, 20, 30], [80, 60, 45], gamma=19, nivel_freatico=5)
+    assert [r["(N1)60"] for r in datos["resultados"]] == \
+        pytest.approx(esperado["(N1)60"].tolist())
+
+
+def test_errores(url):
+    assert _pedir(url, "/calcular/gamma", {"casos": [{}]})[0] == 404
+    assert _pedir(url, "/calcular/cc", {"casos": "LL=40"})[0] == 400
+    assert _pedir(url, "/calcular/cc", {})[0] == 400
+    assert _pedir(url, "/calcular/n1_60", {"casos": [{"N": 1}], "terreno": {"rho": 2}})[0] == 400
+    estado, datos = _pedir(url, "/calcular/cc", {"casos": {"LL": list(range(51))}})
+    assert estado == 413 and "/trabajos/cc" in datos["error"]
+
+
+def test_trabajo_asincrono(url):
+    casos = {"IP": np.linspace(0, 40, 500).tolist(), "Nspt": [20] * 500}
+    estado, trabajo = _pedir(url, "/trabajos/phi", {"casos": casos})
+    assert estado == 202 and trabajo["n"] == 500
+    limite = time.time() + 60
+    while (r := _pedir(url, trabajo["url"]))[0] == 202 and time.time() < limite:
+        time.sleep(0.05)
+    estado, datos = r
+    assert estado == 200 and datos["n"] == 500
+    assert _pedir(url, f"/trabajos/{trabajo['id']}")[1]["estado"] == "terminado"
+    assert _pedir(url, f"/trabajos/{trabajo['id']}", metodo="DELETE")[0] == 204
+    assert _pedir(url, f"/trabajos/{trabajo['id']}")[0] == 404
+
+
+class _PoolParado:
+    """Pool cuyos trabajos no empiezan hasta llamar a terminar()."""
+
+    def __init__(self, *args, **kwargs):
+        self.futuros = []
+
+    def submit(self, fn, *args):
+        fut = Future()
+        if fn is sc._calentar:
+            fut.set_result(0)
+        else:
+            self.futuros.append(fut)
+        return fut
+
+    def terminar(self):
+        for fut in self.futuros:
+            if fut.set_running_or_notify_cancel():
+                fut.set_result(b"{}")
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+def test_limite_de_trabajos_pendientes(monkeypatch):
+    monkeypatch.setattr(sc, "ProcessPoolExecutor", _PoolParado)
+    servicio = sc.Servicio(procesos=1, max_pendientes=2)
+    casos = [{"IP": 10, "Nspt": 20}]
+    primero = servicio.enviar("phi", casos)
+    assert servicio.olvidar(primero["id"])                # recién enviado ya tiene futuro
+    assert primero["futuro"].cancelled() and servicio.pendientes == 0
+    servicio.enviar("phi", casos)
+    servicio.enviar("phi", casos)
+    with pytest.raises(sc.Saturado):
+        servicio.enviar("phi", casos)
+    servicio.pool.terminar()
+    assert servicio.pendientes == 0
+    assert servicio.enviar("phi", casos)["estado"] == "pendiente"
+
+
+def test_saturado_responde_503(monkeypatch):
+    monkeypatch.setattr(sc, "ProcessPoolExecutor", _PoolParado)
+    servidor = sc.crear_servidor(puerto=0, procesos=1, max_pendientes=0)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        url = "http://127.0.0.1:%d" % servidor.server_address[1]
+        req = urllib.request.Request(url + "/trabajos/phi",
+                                     json.dumps({"casos": [{"IP": 10}]}).encode())
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(req)
+        assert exc.value.code == 503 and exc.value.headers["Retry-After"] == "1"
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
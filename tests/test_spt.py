@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlaciones import spt
+
+
+def _escalar(depth, n_raw, efficiency, Cb, Cs, gamma_soil, water_table):
+    """Cálculo de un único ensayo tal como lo hacía spt_corregido.py."""
+    if depth <= water_table:
+        sigma = depth * gamma_soil
+    else:
+        sigma = depth * gamma_soil - (depth - water_table) * 9.81
+    sigma = max(sigma, 1.0)
+    Cn = min((100.0 / sigma) ** 0.5, 1.7)
+    Cr = (0.75 if depth < 3 else 0.80 if depth < 4 else 0.85 if depth < 6
+          else 0.95 if depth < 10 else 1.0)
+    return n_raw * efficiency / 60 * Cb * Cs * Cr * Cn
+
+
+def test_vectorizado_igual_que_el_calculo_escalar():
+    z = np.array([0.5, 2.9, 3.0, 4.5, 6.0, 9.99, 10.0, 25.0])
+    n = np.array([3, 8, 12, 15, 20, 25, 30, 50])
+    res = spt.corregir(z, n, eficiencia=80, diametro_mm=150, cs=1.2,
+                       gamma=19.0, nivel_freatico=5.0)
+    esperado = [_escalar(zi, ni, 80, 1.05, 1.2, 19.0, 5.0) for zi, ni in zip(z, n)]
+    np.testing.assert_allclose(res["(N1)60"], esperado)
+    assert res["Cr"].tolist() == [0.75, 0.75, 0.80, 0.85, 0.95, 0.95, 1.0, 1.0]
+    assert res["Cn"].max() <= spt.CN_MAX
+
+
+def test_cb_y_parametros_por_fila():
+    assert spt.factor_cb([100, 115, 150, 200]).tolist() == [1.0, 1.0, 1.05, 1.15]
+    res = spt.corregir([3.0, 3.0], 10, eficiencia=[60, 90])
+    assert res["Ce"].tolist() == [1.0, 1.5]
+    assert res["(N1)60"].iloc[1] == pytest.approx(1.5 * res["(N1)60"].iloc[0])
+
+
+def test_lote_omite_filas_sin_profundidad_o_n():
+    tabla = pd.DataFrame({spt.COL_PROFUNDIDAD: [3.0, np.nan, 6.0, 9.0],
+                          spt.COL_N: [10, 12, None, "R"]},
+                         index=[10, 11, 12, 13])
+    res = spt.lote(tabla)
+    assert list(res.index) == [10]
+    assert res.loc[10, "(N1)60"] == pytest.approx(_escalar(3.0, 10, 60, 1.0, 1.0, 18.0, np.inf))
+
+
+def test_perfil_por_capas_determina_cn():
+    from correlaciones import tensiones
+    p = tensiones.perfil([{"techo": 0, "base": 4, "gamma": 17, "gamma_sat": 19},
+                          {"techo": 4, "base": 20, "gamma": 18, "gamma_sat": 21}],
+                         nivel_freatico=2.0)
+    res = spt.corregir([1.0, 8.0], 20, perfil=p)
+    sigma = [17.0, 2 * 17 + 2 * 19 + 4 * 21 - 6 * 9.81]
+    np.testing.assert_allclose(res["σ'v (kPa)"], sigma)
+    np.testing.assert_allclose(res["Cn"], np.minimum(np.sqrt(100 / np.array(sigma)), 1.7))
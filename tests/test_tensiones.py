@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from correlaciones import tensiones
+
+ESTRATOS = [
+    {"techo": 0.0, "base": 2.0, "gamma": 17.0, "gamma_sat": 19.0},
+    {"techo": 2.0, "base": 6.0, "gamma": 18.0, "gamma_sat": 20.0},
+    {"techo": 6.0, "base": 10.0, "gamma": 19.0},
+]
+
+
+def _manual(z, nf=3.0, q=10.0, gw=9.81):
+    """Integración por tramos de 1 mm como referencia."""
+    dz = 0.001
+    zz = np.arange(0, z, dz) + dz / 2
+    g = np.where(zz < 2, np.where(zz >= nf, 19.0, 17.0),
+                 np.where(zz < 6, np.where(zz >= nf, 20.0, 18.0), 19.0))
+    sv = q + (g * dz).sum()
+    u = gw * max(z - nf, 0.0)
+    return sv, u, sv - u
+
+
+def test_layered_profile_matches_numerical_integration():
+    p = tensiones.perfil(ESTRATOS, nivel_freatico=3.0, sobrecarga=10.0)
+    z = np.array([0.0, 1.0, 2.0, 3.0, 4.5, 6.0, 8.0, 12.0])
+    res = tensiones.tensiones(p, z)
+    for zi, fila in zip(z, res.itertuples(index=False)):
+        sv, u, sve = _manual(zi)
+        assert fila[1] == pytest.approx(sv, abs=1e-6)
+        assert fila[2] == pytest.approx(u)
+        assert fila[3] == pytest.approx(sve, abs=1e-6)
+
+
+def test_uniform_profile_and_water_table_below_profile():
+    p = tensiones.uniforme(18.0, nivel_freatico=5.0, gamma_sat=20.0)
+    sv, u, sve = tensiones.tensiones_arrays(p, [4.0, 8.0])
+    np.testing.assert_allclose(sv, [72.0, 90.0 + 60.0])
+    np.testing.assert_allclose(u, [0.0, 3 * 9.81])
+    # nivel freático por debajo del último estrato: se prolonga γ y luego γsat
+    p = tensiones.perfil(ESTRATOS[:1], nivel_freatico=4.0)
+    assert tensiones.tensiones_arrays(p, 6.0)[0] == pytest.approx(4 * 17.0 + 2 * 19.0)
+
+
+def test_water_above_ground_and_invalid_depths():
+    p = tensiones.uniforme(20.0, nivel_freatico=-1.0)
+    sv, u, sve = tensiones.tensiones_arrays(p, [0.0, 2.0, -1.0, np.nan])
+    np.testing.assert_allclose(sv[:2], [9.81, 9.81 + 40.0])
+    np.testing.assert_allclose(sve[:2], [0.0, 2 * (20.0 - 9.81)])
+    assert np.isnan(sv[2:]).all()
+
+
+def test_rejects_non_contiguous_layers():
+    with pytest.raises(ValueError, match="contiguos"):
+        tensiones.perfil([{"techo": 0, "base": 2, "gamma": 18},
+                          {"techo": 3, "base": 5, "gamma": 19}])
+    with pytest.raises(ValueError, match="superficie"):
+        tensiones.perfil([{"techo": 1, "base": 2, "gamma": 18}])